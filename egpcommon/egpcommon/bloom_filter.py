@@ -0,0 +1,174 @@
+"""BloomFilter class.
+
+A Bloom filter is a compact probabilistic set membership test. It never returns a false
+negative: if an object has been added the filter will always report it as (probably)
+present. It may return a false positive: an object that has not been added may be reported
+as (probably) present with a probability that depends on the number of objects added
+relative to the capacity of the filter.
+
+The intended use is to answer definite negatives without an expensive lookup e.g. a
+database query for a signature that does not exist. See GenePoolInterface.
+"""
+
+from collections.abc import Iterable
+from hashlib import blake2b
+from math import ceil, exp, log
+
+from egpcommon.common_obj import CommonObj
+from egpcommon.egp_log import Logger, egp_logger
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# The size of the digest used to derive the bit indices
+_DIGEST_SIZE: int = 16
+_HALF_DIGEST_SIZE: int = _DIGEST_SIZE // 2
+
+
+def format_bloom_filter_info(
+    name: str,
+    count: int,
+    capacity: int,
+    queries: int,
+    negatives: int,
+    false_positives: int,
+    estimated_fp_rate: float,
+) -> str:
+    """Format Bloom filter information string."""
+    observed: float = (
+        false_positives / (negatives + false_positives) if negatives + false_positives else 0.0
+    )
+    occupancy: float = count / capacity if capacity else 0.0
+    return (
+        f"{name} Bloom filter objects: {count} / {capacity} ({occupancy:.2%})\n"
+        f"{name} Bloom filter queries: {queries}\n"
+        f"{name} Bloom filter definite negatives: {negatives}\n"
+        f"{name} Bloom filter false positives: {false_positives}\n"
+        f"{name} Bloom filter observed false positive rate: {observed:.4%}\n"
+        f"{name} Bloom filter estimated false positive rate: {estimated_fp_rate:.4%}\n"
+    )
+
+
+class BloomFilter(CommonObj):
+    """A Bloom filter of bytes objects e.g. signatures.
+
+    The bit indices are derived by double hashing a BLAKE2b digest of the object.
+    Objects cannot be removed. The filter is sized for a capacity & target false positive
+    rate. Adding more objects than the capacity increases the false positive rate (see
+    saturated()).
+
+    The filter keeps statistics of its use. Queries that return False are definite
+    negatives. The owner of the filter reports the queries that returned True but turned
+    out to be absent with false_positive() so that the observed false positive rate can be
+    compared with the estimated rate.
+    """
+
+    __slots__ = (
+        "_bits",
+        "capacity",
+        "count",
+        "false_positives",
+        "name",
+        "negatives",
+        "num_bits",
+        "num_hashes",
+        "queries",
+        "target_fp_rate",
+    )
+
+    def __init__(self, name: str, capacity: int = 2**16, target_fp_rate: float = 0.01) -> None:
+        """Initialize a BloomFilter object.
+
+        Args:
+            name: Name of the Bloom filter (information purposes only).
+            capacity: The number of objects the filter is sized for.
+            target_fp_rate: The false positive rate when the filter holds capacity objects.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, but is {capacity}")
+        if not 0.0 < target_fp_rate < 1.0:
+            raise ValueError(f"target_fp_rate must be in the range (0, 1), but is {target_fp_rate}")
+        self.name: str = name
+        self.capacity: int = capacity
+        self.target_fp_rate: float = target_fp_rate
+        # Optimal number of bits, m = -n.ln(p) / ln(2)^2 & hashes, k = m/n.ln(2)
+        self.num_bits: int = max(8, ceil(-capacity * log(target_fp_rate) / log(2) ** 2))
+        self.num_hashes: int = max(1, round(self.num_bits / capacity * log(2)))
+        self._bits: bytearray = bytearray((self.num_bits + 7) // 8)
+        self.count: int = 0
+        self.queries: int = 0
+        self.negatives: int = 0
+        self.false_positives: int = 0
+
+    def __contains__(self, obj: bytes) -> bool:
+        """Return False if obj has definitely not been added else True."""
+        self.queries += 1
+        bits: bytearray = self._bits
+        for index in self._indices(obj):
+            if not bits[index >> 3] & (1 << (index & 7)):
+                self.negatives += 1
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of objects added (including any duplicates)."""
+        return self.count
+
+    def _indices(self, obj: bytes) -> list[int]:
+        """Return the bit indices for obj."""
+        digest: bytes = blake2b(obj, digest_size=_DIGEST_SIZE).digest()
+        h1: int = int.from_bytes(digest[:_HALF_DIGEST_SIZE])
+        h2: int = int.from_bytes(digest[_HALF_DIGEST_SIZE:]) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, obj: bytes) -> None:
+        """Add an object to the filter."""
+        bits: bytearray = self._bits
+        for index in self._indices(obj):
+            bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def clear(self) -> None:
+        """Remove all objects from the filter & reset the statistics."""
+        self._bits = bytearray(len(self._bits))
+        self.count = self.queries = self.negatives = self.false_positives = 0
+
+    def estimated_fp_rate(self) -> float:
+        """Return the estimated false positive rate for the number of objects added."""
+        return (1.0 - exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def false_positive(self, num: int = 1) -> None:
+        """Record that num queries that returned True were for absent objects."""
+        self.false_positives += num
+
+    def info(self) -> str:
+        """Log and return the Bloom filter statistics."""
+        info_str: str = format_bloom_filter_info(
+            self.name,
+            self.count,
+            self.capacity,
+            self.queries,
+            self.negatives,
+            self.false_positives,
+            self.estimated_fp_rate(),
+        )
+        _logger.info(info_str)
+        return info_str
+
+    def saturated(self) -> bool:
+        """Return True if more objects than the capacity have been added."""
+        return self.count > self.capacity
+
+    def update(self, objs: Iterable[bytes]) -> None:
+        """Add the objects in the iterable objs to the filter."""
+        for obj in objs:
+            self.add(obj)
+
+    def verify(self) -> None:
+        """Verify the BloomFilter object."""
+        if len(self._bits) * 8 < self.num_bits:
+            raise ValueError("Bloom filter bit array is smaller than the number of bits.")
+        if self.negatives > self.queries:
+            raise ValueError("Bloom filter definite negatives exceed the number of queries.")
+        super().verify()
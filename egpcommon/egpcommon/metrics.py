@@ -0,0 +1,238 @@
+"""Metrics module.
+
+A uniform set of statistics for the stores, caches & deduplicators in EGP so that cache sizing
+in production is data driven. Each instrumented object owns a Metrics object which counts:
+
+- hits: Items found.
+- misses: Items not found (for a cache, items fetched from the next level).
+- evictions: Items evicted (purged) to make space.
+- write_backs: Dirty items written back to the next level.
+- bytes: Bytes read from & written to the backing storage (where it is known).
+- rejections: Items not stored e.g. because they are too large for the storage.
+- fetch_latency: A histogram of the time taken to fetch from the next level (or backing storage).
+
+Counters are plain integer attributes incremented in the hot path. All the live Metrics
+objects are in the metrics_registry and can be exported with metrics_snapshot() as a dictionary
+or with prometheus_text() in the Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from itertools import count
+from math import isinf
+from typing import Any
+from weakref import WeakSet
+
+from egpcommon.common_obj import CommonObj
+from egpcommon.egp_log import Logger, egp_logger
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Default fetch latency histogram bucket upper bounds in seconds
+LATENCY_BUCKETS: tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+# Prometheus metric name prefix
+PROMETHEUS_PREFIX: str = "egp_store"
+# Counters: Metrics attribute name & Prometheus help text
+_COUNTERS: tuple[tuple[str, str], ...] = (
+    ("hits", "Number of items found."),
+    ("misses", "Number of items not found or fetched from the next level."),
+    ("evictions", "Number of items evicted to make space."),
+    ("write_backs", "Number of dirty items written back to the next level."),
+    ("bytes", "Number of bytes read from & written to the backing storage."),
+    ("rejections", "Number of items not stored e.g. too large."),
+)
+# Unique instance number of each Metrics object (distinguishes objects with the same name)
+_INSTANCE = count()
+
+
+# All live Metrics objects
+metrics_registry: WeakSet[Metrics] = WeakSet()
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def metrics_snapshot(metrics: Iterable[Metrics] | None = None) -> dict[str, dict[str, Any]]:
+    """Return a snapshot of the metrics indexed by 'name:instance'.
+
+    Args:
+        metrics: The metrics to snapshot. Defaults to all the registered metrics.
+    """
+    objs: Iterable[Metrics] = metrics_registry if metrics is None else metrics
+    return {f"{m.name}:{m.instance}": m.snapshot() for m in sorted(objs, key=_sort_key)}
+
+
+def prometheus_text(metrics: Iterable[Metrics] | None = None) -> str:
+    """Return the metrics in the Prometheus text exposition format.
+
+    Each Metrics object is labelled with its name & instance number.
+
+    Args:
+        metrics: The metrics to export. Defaults to all the registered metrics.
+    """
+    objs: list[Metrics] = sorted(metrics_registry if metrics is None else metrics, key=_sort_key)
+    snapshots: list[tuple[str, dict[str, Any]]] = [
+        (f'name="{_escape(m.name)}",instance="{m.instance}"', m.snapshot()) for m in objs
+    ]
+    lines: list[str] = []
+    for attr, help_text in _COUNTERS:
+        family: str = f"{PROMETHEUS_PREFIX}_{attr}_total"
+        lines.append(f"# HELP {family} {help_text}")
+        lines.append(f"# TYPE {family} counter")
+        lines.extend(f"{family}{{{labels}}} {snapshot[attr]}" for labels, snapshot in snapshots)
+    family = f"{PROMETHEUS_PREFIX}_fetch_latency_seconds"
+    lines.append(f"# HELP {family} Time taken to fetch items from the next level.")
+    lines.append(f"# TYPE {family} histogram")
+    for labels, snapshot in snapshots:
+        histogram: dict[str, Any] = snapshot["fetch_latency"]
+        for bound, cumulative in histogram["buckets"].items():
+            le: str = "+Inf" if isinf(bound) else repr(bound)
+            lines.append(f'{family}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{family}_sum{{{labels}}} {histogram['sum']!r}")
+        lines.append(f"{family}_count{{{labels}}} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _sort_key(metrics: Metrics) -> tuple[str, int]:
+    """Sort metrics by name then instance."""
+    return metrics.name, metrics.instance
+
+
+class Histogram(CommonObj):
+    """A fixed bucket histogram (e.g. of latencies in seconds).
+
+    counts[i] is the number of observations <= bounds[i] (and > bounds[i - 1]).
+    The last count is of the observations greater than the largest bound.
+    """
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram.
+
+        Args:
+            bounds: The ascending bucket upper bounds.
+        """
+        self.bounds: tuple[float, ...] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def reset(self) -> None:
+        """Remove all the observations."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the cumulative bucket counts (by upper bound), sum & count."""
+        buckets: dict[float, int] = {}
+        cumulative: int = 0
+        for bound, num in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += num
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": self.total, "count": cumulative}
+
+    def verify(self) -> None:
+        """Verify the histogram."""
+        if list(self.bounds) != sorted(set(self.bounds)):
+            raise ValueError(f"Histogram bounds must be unique & ascending: {self.bounds}")
+        if len(self.counts) != len(self.bounds) + 1:
+            raise ValueError("Histogram must have a count for each bound and one more.")
+        super().verify()
+
+
+class Metrics(CommonObj):
+    """Statistics for a store, cache or deduplicator.
+
+    Objects that derive their statistics from elsewhere (e.g. functools.lru_cache) define a
+    collector which is called to update the metrics before a snapshot is taken.
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "bytes",
+        "collector",
+        "evictions",
+        "fetch_latency",
+        "hits",
+        "instance",
+        "misses",
+        "name",
+        "rejections",
+        "write_backs",
+    )
+
+    def __init__(self, name: str, collector: Callable[[Metrics], None] | None = None) -> None:
+        """Initialize & register the metrics.
+
+        Args:
+            name: The name of the metrics e.g. the class name of the store.
+            collector: An optional function to update the metrics before a snapshot.
+        """
+        self.name: str = name
+        self.instance: int = next(_INSTANCE)
+        self.collector: Callable[[Metrics], None] | None = collector
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.write_backs: int = 0
+        self.bytes: int = 0
+        self.rejections: int = 0
+        self.fetch_latency: Histogram = Histogram()
+        metrics_registry.add(self)
+
+    def hit_rate(self) -> float:
+        """Return the hit rate (0.0 if there have been no lookups)."""
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def info(self) -> str:
+        """Log and return the metrics."""
+        snapshot: dict[str, Any] = self.snapshot()
+        info_str: str = "".join(f"{self.name} {attr}: {snapshot[attr]}\n" for attr, _ in _COUNTERS)
+        info_str += f"{self.name} hit rate: {self.hit_rate():.2%}\n"
+        if snapshot["fetch_latency"]["count"]:
+            mean: float = snapshot["fetch_latency"]["sum"] / snapshot["fetch_latency"]["count"]
+            info_str += f"{self.name} mean fetch latency: {mean * 1e6:.1f} us\n"
+        _logger.info(info_str)
+        return info_str
+
+    def prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        return prometheus_text((self,))
+
+    def reset(self) -> None:
+        """Reset the metrics to zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.write_backs = 0
+        self.bytes = 0
+        self.rejections = 0
+        self.fetch_latency.reset()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a snapshot of the metrics."""
+        if self.collector is not None:
+            self.collector(self)
+        retval: dict[str, Any] = {attr: getattr(self, attr) for attr, _ in _COUNTERS}
+        retval["fetch_latency"] = self.fetch_latency.snapshot()
+        return retval
+
+    def verify(self) -> None:
+        """Verify the metrics."""
+        for attr, _ in _COUNTERS:
+            if getattr(self, attr) < 0:
+                raise ValueError(f"{self.name} {attr} must be >= 0: {getattr(self, attr)}")
+        self.fetch_latency.verify()
+        super().verify()
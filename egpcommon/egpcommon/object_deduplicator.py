@@ -12,6 +12,7 @@ from typing import Any, TypeVar
 
 from egpcommon.common_obj import CommonObj
 from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.metrics import Metrics
 
 # Standard EGP logging pattern
 _logger: Logger = egp_logger(name=__name__)
@@ -54,7 +55,7 @@ class ObjectDeduplicator(CommonObj):
     the cached instance is returned; otherwise the new object is stored and returned.
     """
 
-    __slots__ = ("_objects", "name", "target_rate")
+    __slots__ = ("_objects", "metrics", "name", "target_rate")
 
     def __init__(self, name: str, size: int = 2**12, target_rate: float = 0.811) -> None:
         """Initialize a ObjectDeduplicator object.
@@ -84,8 +85,7 @@ class ObjectDeduplicator(CommonObj):
             self._objects = cached_hash
             self.name: str = name
             self.target_rate: float = target_rate
-
-            # TODO: In MONITOR mode and below send stats to prometheus
+            self.metrics: Metrics = Metrics(name, self._collect)
 
     def __contains__(self, obj: Hashable) -> bool:
         """Test if an object is in the deduplicator."""
@@ -102,8 +102,17 @@ class ObjectDeduplicator(CommonObj):
             return deduplicators_registry[name]
         return super().__new__(cls)
 
+    def _collect(self, metrics: Metrics) -> None:
+        """Update the metrics from the cache statistics.
+        Every miss adds an object so the objects not in the cache have been evicted.
+        """
+        info = self._objects.cache_info()
+        metrics.hits = info.hits
+        metrics.misses = info.misses
+        metrics.evictions = info.misses - info.currsize
+
     def clear(self) -> None:
-        """Clear the deduplicator cache."""
+        """Clear the deduplicator cache (and the cache statistics)."""
         self._objects.cache_clear()
 
     def info(self) -> str:
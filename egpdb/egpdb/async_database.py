@@ -0,0 +1,431 @@
+"""Asynchronous (asyncio) postgresql database access.
+
+The asynchronous mode of psycopg2 is used so no additional database driver is required: a
+query is sent without blocking and the event loop waits for the connection socket to be
+readable or writable until the result is available (see wait()).
+
+Asynchronous connections are pooled per event loop (see pool.py) & shared by the tasks of
+the loop with at most pool_size (config['pool_size'] or DEFAULT_POOL_SIZE if 0) connections
+to each database. Connection backoff, transaction retries and re-establishing connections
+follow the same logic as the synchronous functions in database.py.
+
+Asynchronous connections are always in autocommit mode: each SQL string is executed in its own
+transaction (a multi-statement SQL string is a single transaction). db_transaction_async()
+fetches the result with a client-side cursor. db_stream_async() streams large results in
+batches with a server-side cursor. COPY and prepared statements are only supported by the
+synchronous API.
+"""
+
+from asyncio import AbstractEventLoop, Future, get_running_loop
+from asyncio import sleep as async_sleep
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from copy import deepcopy
+from functools import partial
+from os import register_at_fork
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from psycopg2 import Error, InterfaceError, OperationalError, ProgrammingError, connect, sql
+from psycopg2.extensions import POLL_OK, POLL_READ, POLL_WRITE, TRANSACTION_STATUS_IDLE
+
+from egpcommon.egp_log import FLOW, Logger, egp_logger
+from egpcommon.text_token import TextToken
+from egpdb.common import backoff_generator
+from egpdb.database import (
+    _BACKOFF_FUZZ,
+    _BACKOFF_STEPS,
+    _CTYPE,
+    _CURSOR_NAME,
+    _DB_RECONNECTIONS,
+    _DB_TRANSACTION_ATTEMPTS,
+    _INITIAL_DELAY,
+    _ITERSIZE,
+    _inherited,
+)
+from egpdb.pool import DEFAULT_POOL_SIZE, AsyncConnectionPool, close
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Asynchronous connection pools by event loop: {loop: {(host, dbname): pool}}
+_pools: WeakKeyDictionary[AbstractEventLoop, dict[tuple[str, str], AsyncConnectionPool]] = (
+    WeakKeyDictionary()
+)
+_DECLARE_SQL = sql.SQL("BEGIN; DECLARE {0} NO SCROLL CURSOR FOR ")
+_FETCH_SQL = sql.SQL("FETCH FORWARD {0} FROM {1}")
+_CLOSE_SQL = sql.SQL("CLOSE {0}; COMMIT")
+
+
+def _done(future: Future) -> None:
+    """Reader/writer callback: the socket is ready. It may be called more than once."""
+    if not future.done():
+        future.set_result(None)
+
+
+def _forget_pools() -> None:
+    """Forget the asynchronous connections inherited from the parent process after a fork."""
+    for pools in _pools.values():
+        for pool in pools.values():
+            _inherited.extend(pool.forget())
+    _pools.clear()
+
+
+register_at_fork(after_in_child=_forget_pools)
+
+
+async def wait(connection: Any) -> None:
+    """Wait for an asynchronous connection operation (connect or execute) to complete.
+
+    Errors that occur in the operation are raised.
+
+    Args
+    ----
+    connection: A psycopg2 asynchronous connection.
+    """
+    loop: AbstractEventLoop = get_running_loop()
+    while (state := connection.poll()) != POLL_OK:
+        # The socket may change while connecting
+        fileno: int = connection.fileno()
+        future: Future = loop.create_future()
+        if state == POLL_READ:
+            loop.add_reader(fileno, _done, future)
+            try:
+                await future
+            finally:
+                loop.remove_reader(fileno)
+        elif state == POLL_WRITE:
+            loop.add_writer(fileno, _done, future)
+            try:
+                await future
+            finally:
+                loop.remove_writer(fileno)
+        else:
+            raise OperationalError(f"Unexpected asynchronous connection poll state: {state}")
+
+
+async def _connect_core(dbname: str, config: dict[str, Any]) -> tuple[Any | None, Exception | None]:
+    """Make one attempt at an asynchronous connection to the specified database.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_transaction()).
+
+    Returns
+    -------
+    A tuple of (connection, error) where connection is a psycopg2 asynchronous
+    connection object or None on failure, and error is the exception that occurred
+    or None on success.
+    """
+    connection = None
+    try:
+        # deepcode ignore MissingClose: Code design to keep connection open
+        connection = connect(
+            host=config["host"],
+            port=config["port"],
+            user=config["user"],
+            password=config["password"],
+            dbname=dbname,
+            connect_timeout=2,
+            async_=True,
+        )
+        await wait(connection)
+    except (InterfaceError, OperationalError) as exc:
+        if connection is not None:
+            close(connection)
+        _logger.warning(TextToken({"W04001": {"dbname": dbname, "config": config, "error": exc}}))
+        return None, exc
+    except BaseException:
+        # e.g. Cancelled while connecting
+        if connection is not None:
+            close(connection)
+        raise
+    _logger.log(FLOW, TextToken({"I04000": {"dbname": dbname, "config": config}}))
+    return connection, None
+
+
+async def _connect_backoff(dbname: str, config: dict[str, Any]) -> Any:
+    """Asynchronously connect to the specified database.
+
+    If a connection cannot be established, step through an increasing
+    backoff delay and try again up to config['retries'] attempts.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_reconnect()).
+
+    Returns
+    -------
+    A psycopg2 asynchronous connection object with an open connection.
+    """
+    backoff_gen = backoff_generator(_INITIAL_DELAY, _BACKOFF_STEPS, _BACKOFF_FUZZ)
+    attempts = 0
+    connection, error = await _connect_core(dbname, config)
+    while connection is None and attempts < config["retries"]:
+        backoff = next(backoff_gen)
+        attempts += 1
+        _logger.warning(
+            TextToken(
+                {
+                    "W04000": {
+                        "attempts": attempts,
+                        "dbname": dbname,
+                        "config": config,
+                        "backoff": backoff,
+                    }
+                }
+            )
+        )
+        await async_sleep(backoff)
+        connection, error = await _connect_core(dbname, config)
+    if connection is None:
+        raise error if error is not None else RuntimeError("Something went horribly wrong!")
+    return connection
+
+
+async def ping(connection: Any) -> bool:
+    """Return True if the asynchronous connection can execute a trivial query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            await wait(connection)
+    except Error:
+        return False
+    return True
+
+
+def db_pool_async(dbname: str, config: dict[str, Any]) -> AsyncConnectionPool:
+    """Return the asynchronous connection pool for the specified database.
+
+    The pool is created on first use in the running event loop.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_reconnect()). The maximum
+        number of pooled connections is config['pool_size'] or DEFAULT_POOL_SIZE
+        if it is missing or 0.
+
+    Returns
+    -------
+    The asynchronous connection pool of the running event loop.
+    """
+    pools: dict[tuple[str, str], AsyncConnectionPool] = _pools.setdefault(get_running_loop(), {})
+    pool: AsyncConnectionPool | None = pools.get((config["host"], dbname))
+    if pool is None:
+        pool = AsyncConnectionPool(
+            partial(_connect_backoff, dbname, config),
+            ping,
+            config.get("pool_size", 0) or DEFAULT_POOL_SIZE,
+        )
+        pools[(config["host"], dbname)] = pool
+    return pool
+
+
+async def db_disconnect_async(dbname: str, config: dict[str, Any]) -> None:
+    """Close the asynchronous connection pool for dbname in the running event loop.
+
+    Connections in use are closed when they are released.
+    If the pool does not exist this function is a no-op.
+
+    Args
+    ----
+    dbname: Name of the database to disconnect from.
+    config: Database server details. Must have keys:
+        'host' (str): Fully qualified host name of the DB server.
+    """
+    pool: AsyncConnectionPool | None = _pools.get(get_running_loop(), {}).pop(
+        (config["host"], dbname), None
+    )
+    if pool is not None:
+        await pool.close()
+
+
+async def db_disconnect_all_async() -> None:
+    """Close all the asynchronous connection pools in the running event loop."""
+    for pool in _pools.pop(get_running_loop(), {}).values():
+        await pool.close()
+
+
+async def _db_retry(
+    dbname: str,
+    config: dict[str, Any],
+    operation: Callable[[Any], Awaitable[Any]],
+    read: bool,
+    recons: int,
+    hold: bool = False,
+) -> Any:
+    """Await operation(connection) with retry and reconnection logic.
+
+    The asynchronous equivalent of database._db_retry(). A connection is acquired
+    from the pool for each attempt & released after it. Re-establishing the
+    connection replaces all the connections in the pool.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_transaction()).
+    operation: Executes the SQL on the connection & returns the result.
+    read: True if the operation only reads the database (for logging).
+    recons: >= 1. The number of reconnection attempts before erroring out.
+    hold: If True the connection is not released when operation succeeds. The caller
+        must release it to the pool (the result of operation should include it).
+
+    Returns
+    -------
+    The result of operation.
+    """
+    token2 = {
+        "rw": ("write", "read")[read],
+        "dbname": dbname,
+        "total": _DB_TRANSACTION_ATTEMPTS,
+        "error": None,
+    }
+    token3 = deepcopy(token2)
+    token3["attempts"] = _DB_TRANSACTION_ATTEMPTS
+    token3["total"] = recons
+    pool: AsyncConnectionPool = db_pool_async(dbname, config)
+    backoff_gen = backoff_generator(_INITIAL_DELAY, _BACKOFF_STEPS, _BACKOFF_FUZZ)
+    for reconnection in range(1, recons + 1):
+        for transaction_attempt in range(1, _DB_TRANSACTION_ATTEMPTS + 1):
+            token2["attempt"] = transaction_attempt
+            connection = await pool.acquire()
+            try:
+                retval = await operation(connection)
+            except (InterfaceError, OperationalError) as exc:
+                await pool.release(connection)
+                token2["code"] = exc.pgcode
+                token2["error"] = exc
+                _logger.warning(TextToken({"W04002": token2}))
+            except BaseException:
+                await pool.release(connection)
+                raise
+            else:
+                if not hold:
+                    await pool.release(connection)
+                return retval
+            await async_sleep(next(backoff_gen))
+            break
+        token3["reconnection"] = reconnection
+        _logger.warning(TextToken({"W04003": token3}))
+        await pool.reset()
+    _logger.error(TextToken({"E04000": {"dbname": dbname}}))
+    raise ProgrammingError
+
+
+async def db_transaction_async(
+    dbname: str,
+    config: dict[str, Any],
+    sql_str: Any,
+    read: bool = True,
+    recons: int = _DB_RECONNECTIONS,
+    ctype: str = "tuple",
+) -> Any:
+    """Asynchronously execute an SQL statement with retry and reconnection logic.
+
+    The asynchronous equivalent of database.db_transaction(). The SQL statement is
+    executed in its own transaction with a client-side cursor i.e. all the rows of
+    a read are fetched when the coroutine completes.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_transaction()).
+    sql_str: A valid SQL string or psycopg2 sql.Composed object.
+    read: True if the SQL only reads the database (for logging).
+    recons: >= 1. The number of reconnection attempts before erroring out.
+    ctype: Cursor type - one of 'tuple', 'namedtuple', 'dict'.
+
+    Returns
+    -------
+    A psycopg2 cursor object.
+    """
+    cursor_type = _CTYPE[ctype]
+
+    async def operation(connection: Any) -> Any:
+        cursor = connection.cursor(cursor_factory=cursor_type)
+        cursor.execute(sql_str)
+        await wait(connection)
+        return cursor
+
+    return await _db_retry(dbname, config, operation, read, recons)
+
+
+async def db_stream_async(
+    dbname: str,
+    config: dict[str, Any],
+    sql_str: Any,
+    recons: int = _DB_RECONNECTIONS,
+    ctype: str = "tuple",
+    itersize: int = _ITERSIZE,
+) -> AsyncGenerator[Any, None]:
+    """Asynchronously execute a read SQL statement and stream the result.
+
+    The asynchronous equivalent of a database.db_transaction() read with a named
+    cursor. A server-side cursor is declared for sql_str (with retry and reconnection
+    logic) and the returned asynchronous generator FETCHes its rows in batches of
+    itersize rows. The pooled connection is held by the generator until it is
+    exhausted or closed so the generator should be consumed promptly (or closed with
+    aclose()).
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see database.db_transaction()).
+    sql_str: A valid SQL read (e.g. SELECT) string or psycopg2 sql.Composed object.
+    recons: >= 1. The number of reconnection attempts before erroring out.
+    ctype: Cursor type - one of 'tuple', 'namedtuple', 'dict'.
+    itersize: The number of rows fetched from the server at a time.
+
+    Returns
+    -------
+    An asynchronous generator of rows of the type defined by ctype.
+    """
+    cursor_type = _CTYPE[ctype]
+    name = sql.Identifier(next(_CURSOR_NAME))
+    declare_sql = _DECLARE_SQL.format(name) + (
+        sql.SQL(sql_str) if isinstance(sql_str, str) else sql_str
+    )
+
+    async def operation(connection: Any) -> tuple[Any, Any]:
+        cursor = connection.cursor(cursor_factory=cursor_type)
+        cursor.execute(declare_sql)
+        await wait(connection)
+        return connection, cursor
+
+    connection, cursor = await _db_retry(dbname, config, operation, True, recons, hold=True)
+    return _fetch(db_pool_async(dbname, config), connection, cursor, name, itersize)
+
+
+async def _fetch(
+    pool: AsyncConnectionPool, connection: Any, cursor: Any, name: sql.Identifier, itersize: int
+) -> AsyncGenerator[Any, None]:
+    """Yield the rows of the declared cursor name then release the connection."""
+    try:
+        fetch_sql: sql.Composed = _FETCH_SQL.format(sql.Literal(itersize), name)
+        while True:
+            cursor.execute(fetch_sql)
+            await wait(connection)
+            rows: list[Any] = cursor.fetchall()
+            for row in rows:
+                yield row
+            if len(rows) < itersize:
+                break
+        cursor.execute(_CLOSE_SQL.format(name))
+        await wait(connection)
+    finally:
+        # Not exhausted (closed early or an error): end the transaction. If that is not
+        # possible the pool closes the connection.
+        if (
+            not connection.closed
+            and not connection.isexecuting()
+            and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE
+        ):
+            try:
+                cursor.execute("ROLLBACK")
+                await wait(connection)
+            except Error as exc:
+                _logger.debug("Failed to roll back streamed query: %s", exc)
+        await pool.release(connection)
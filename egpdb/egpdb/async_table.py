@@ -0,0 +1,298 @@
+"""Asynchronous (asyncio) queries of RawTable & Table.
+
+AsyncRawTable & AsyncTable are the asyncio counterparts of RawTable & Table for the
+select(), upsert(), delete() & recursive_select() queries. The queries are coroutines
+executed with async_database.py so the event loop can do other work (e.g. evaluate
+fitness) while the database responds.
+
+Creating (or waiting for) the database & table, populating it and reading the table
+metadata are one off operations done by the wrapped synchronous RawTable or Table when it
+is created. The SQL is composed by the wrapped RawTable so is identical to its
+synchronous equivalent.
+
+Bounded selects (see raw_table.is_bounded()), upserts & deletes fetch all the rows
+with the query. Other selects stream the rows from a server-side cursor as they are
+consumed: the result must be consumed promptly (or closed with aclose()) as it holds a
+pooled connection.
+"""
+
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, Literal
+
+from egpcommon.egp_log import Logger, egp_logger
+from egpdb.async_database import db_stream_async, db_transaction_async
+from egpdb.raw_table import RawTable, is_bounded
+from egpdb.row_iterators import (
+    AsyncRowIter,
+    BaseIter,
+    DictIter,
+    GenIter,
+    NamedTupleIter,
+    RawCType,
+    TupleIter,
+    async_rows,
+)
+from egpdb.table import Table
+
+# The SQL is composed by the private RawTable methods shared with the synchronous queries
+# pylint: disable=protected-access
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Row iterator types by container name. Any other container is a dict.
+_CONTAINERS: dict[str, type[BaseIter]] = {
+    "tuple": TupleIter,
+    "namedtuple": NamedTupleIter,
+    "generator": GenIter,
+}
+
+
+class AsyncRawTable:
+    """Asynchronous queries of a RawTable.
+
+    The query results are the same as the RawTable equivalents except the rows of streamed
+    selects are returned by an asynchronous iterator.
+    """
+
+    def __init__(self, raw: RawTable) -> None:
+        """Wrap raw.
+
+        Args
+        ----
+        raw: The synchronous table. It creates the database & table if required.
+        """
+        self.raw: RawTable = raw
+
+    async def _db_transaction(self, sql_str, read=True, ctype: RawCType = "tuple") -> Any:
+        """Wrap db_transaction_async."""
+        return await db_transaction_async(
+            self.raw.config["database"]["dbname"],
+            self.raw.config["database"],
+            sql_str,
+            read,
+            ctype=ctype,
+        )
+
+    async def _db_stream(self, sql_str, ctype: RawCType = "tuple") -> AsyncIterator[Any]:
+        """Wrap db_stream_async."""
+        return await db_stream_async(
+            self.raw.config["database"]["dbname"],
+            self.raw.config["database"],
+            sql_str,
+            ctype=ctype,
+        )
+
+    async def delete(
+        self,
+        query_str,
+        literals: dict[str, Any] | None = None,
+        returning=tuple(),
+        ctype: RawCType = "tuple",
+    ) -> Any:
+        """Delete rows from the table. See RawTable.delete().
+
+        Returns
+        -------
+        A psycopg2 cursor of a type defined by ctype of the values specified by returning for
+        each deleted row.
+        """
+        return await self._db_transaction(
+            self.raw._delete_sql(query_str, literals, returning),
+            read=False,
+            ctype=ctype,
+        )
+
+    async def recursive_select(
+        self,
+        query_str: str,
+        literals: dict[str, Any] | None = None,
+        columns: Literal["*"] | Iterable[str] = "*",
+        ctype: RawCType = "tuple",
+        dedupe: bool = True,
+        max_depth: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """Recursive select of columns to return for rows matching query_str.
+
+        See RawTable.recursive_select(). The result is streamed.
+
+        Returns
+        -------
+        An asynchronous iterator of rows of a type defined by ctype of the values specified
+        by columns for the specified recursive query_str and pointer map.
+        """
+        sql_str = self.raw._recursive_select_sql(query_str, literals, columns, dedupe, max_depth)
+        return await self._db_stream(sql_str, ctype)
+
+    async def select(
+        self,
+        query_str: str = "",
+        literals: dict[str, Any] | None = None,
+        columns: Literal["*"] | Iterable[str] = "*",
+        ctype: RawCType = "tuple",
+        bounded: bool | None = None,
+    ) -> Any:
+        """Select columns to return for rows matching query_str. See RawTable.select().
+
+        Args
+        ----
+        bounded: True if the query returns few rows e.g. a primary key equality lookup. All
+        the rows are fetched with the query rather than streamed. If None the query is
+        bounded if it has a small LIMIT (see is_bounded()).
+
+        Returns
+        -------
+        A psycopg2 cursor of a type defined by ctype if bounded else an asynchronous iterator
+        of rows of a type defined by ctype.
+        """
+        if literals is None:
+            literals = {}
+        if bounded is None:
+            bounded = is_bounded(query_str)
+        if not isinstance(columns, str):
+            columns = tuple(columns)
+        sql_str = self.raw._select_sql(query_str, literals, columns)
+        if bounded:
+            return await self._db_transaction(sql_str, ctype=ctype)
+        return await self._db_stream(sql_str, ctype)
+
+    async def upsert(
+        self,
+        columns,
+        values,
+        update_str=None,
+        literals: dict[str, Any] | None = None,
+        returning=tuple(),
+        ctype: RawCType = "tuple",
+    ) -> Any:
+        """Upsert values. See RawTable.upsert().
+
+        Returns
+        -------
+        A psycopg2 cursor of a type defined by ctype of the values specified by returning for
+        each updated row.
+        """
+        sql_str = self.raw._upsert_sql(columns, values, update_str, literals, returning)
+        if sql_str is None:
+            return iter(tuple())
+        return await self._db_transaction(sql_str, read=False, ctype=ctype)
+
+
+class AsyncTable:
+    """Asynchronous queries of a Table.
+
+    The query coroutines return asynchronous generators of decoded rows in the same
+    containers as the Table equivalents (see row_iterators.async_rows()). e.g.
+        async for row in await table.select("WHERE {fitness} > {min}", {"min": 0.5}):
+            ...
+    Literal values for encoded columns must be encoded. See Table.encode_value().
+    """
+
+    def __init__(self, table: Table) -> None:
+        """Wrap table.
+
+        Args
+        ----
+        table: The synchronous table. It creates & populates the table if required and
+        defines the column conversions.
+        """
+        self.table: Table = table
+        self.raw: AsyncRawTable = AsyncRawTable(table.raw)
+
+    def _return_container(
+        self, columns: Literal["*"] | Iterable[str], values, container: str = "dict"
+    ) -> AsyncRowIter:
+        """Return an asynchronous generator of containers of decoded values."""
+        _columns: Iterable[str] = self.table.raw.columns if columns == "*" else columns
+        return async_rows(_CONTAINERS.get(container, DictIter), _columns, values, self.table)
+
+    async def delete(
+        self,
+        query_str,
+        literals: dict[str, Any] | None = None,
+        returning=tuple(),
+        container="dict",
+    ) -> AsyncRowIter:
+        """Delete rows from the table. See Table.delete().
+
+        Returns
+        -------
+        An asynchronous generator of the values specified by returning for each deleted row.
+        """
+        return self._return_container(
+            returning, await self.raw.delete(query_str, literals, returning), container
+        )
+
+    async def recursive_select(
+        self,
+        query_str: str = "",
+        literals: dict[str, Any] | None = None,
+        columns: Literal["*"] | Iterable[str] = "*",
+        container: str = "dict",
+        dedupe: bool = True,
+        max_depth: int | None = None,
+    ) -> AsyncRowIter:
+        """Recursive select of columns to return for rows matching query_str.
+
+        See Table.recursive_select(). The result is streamed.
+
+        Returns
+        -------
+        An asynchronous generator of the values specified by columns for the specified
+        recursive query_str and pointer map.
+        """
+        values = await self.raw.recursive_select(
+            query_str, literals, columns, dedupe=dedupe, max_depth=max_depth
+        )
+        return self._return_container(columns, values, container)
+
+    async def select(
+        self,
+        query_str: str = "",
+        literals: dict[str, Any] | None = None,
+        columns: Literal["*"] | Iterable[str] = "*",
+        container: str = "dict",
+        bounded: bool | None = None,
+    ) -> AsyncRowIter:
+        """Select columns to return for rows matching query_str.
+
+        See Table.select(). Unbounded results are streamed.
+
+        Returns
+        -------
+        An asynchronous generator of the values specified by columns for the specified
+        query_str.
+        """
+        if not isinstance(columns, str):
+            columns = tuple(columns)
+        values = await self.raw.select(query_str, literals, columns, bounded=bounded)
+        return self._return_container(columns, values, container)
+
+    async def upsert(
+        self,
+        values_dict,
+        update_str=None,
+        literals: dict[str, Any] | None = None,
+        returning=tuple(),
+        container="dict",
+        exclude=tuple(),
+    ) -> AsyncRowIter:
+        """Upsert values. See Table.upsert().
+
+        Returns
+        -------
+        An asynchronous generator of the values specified by returning for each updated row.
+        """
+        retval = []
+        for columns, values in self.table.raw.batch_dict_data(values_dict, exclude):
+            results = await self.raw.upsert(
+                columns,
+                TupleIter(columns, iter(values), self.table, "encode"),
+                update_str,
+                literals,
+                returning,
+            )
+            if returning:
+                retval.extend(results)
+        return self._return_container(returning, retval, container)
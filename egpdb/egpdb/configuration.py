@@ -31,6 +31,7 @@ class DatabaseConfig(Validator, DictTypeAccessor, CommonObj):
         "_host",
         "_maintenance_db",
         "_password",
+        "_pool_size",
         "_port",
         "_retries",
         "_user",
@@ -53,6 +54,7 @@ class DatabaseConfig(Validator, DictTypeAccessor, CommonObj):
         maintenance_db: str = "postgres",
         retries: int = 3,
         user: str = "postgres",
+        pool_size: int = 0,
     ) -> None:
         """Initialize the class."""
         setattr(self, "dbname", dbname)
@@ -62,6 +64,7 @@ class DatabaseConfig(Validator, DictTypeAccessor, CommonObj):
         setattr(self, "maintenance_db", maintenance_db)
         setattr(self, "retries", retries)
         setattr(self, "user", user)
+        setattr(self, "pool_size", pool_size)
 
     @property
     def dbname(self) -> str:
@@ -123,6 +126,20 @@ class DatabaseConfig(Validator, DictTypeAccessor, CommonObj):
             raise ValueError(f"password file is not accessible: {value}")
         self._password = value
 
+    @property
+    def pool_size(self) -> int:
+        """Get the pool size."""
+        return self._pool_size
+
+    @pool_size.setter
+    def pool_size(self, value: int) -> None:
+        """The maximum number of pooled connections. 0 = one connection per thread."""
+        if not self._is_int("pool_size", value):
+            raise ValueError(f"pool_size must be an int, but is {type(value)}")
+        if not self._in_range("pool_size", value, 0, 1024):
+            raise ValueError(f"pool_size must be between 0 and 1024, but is {value}")
+        self._pool_size = value
+
     @property
     def port(self) -> int:
         """Get the port."""
@@ -164,6 +181,7 @@ class DatabaseConfig(Validator, DictTypeAccessor, CommonObj):
             "host": self.host,
             # NOTE: Returns the path to the file not the actual password.
             "password": self._password,
+            "pool_size": self.pool_size,
             "port": self.port,
             "maintenance_db": self.maintenance_db,
             "retries": self.retries,
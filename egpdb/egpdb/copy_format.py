@@ -0,0 +1,109 @@
+"""Encode Python values as PostgreSQL COPY text format rows.
+
+COPY FROM STDIN streams rows to the server without composing (and the server parsing) an
+SQL statement with a literal for every value. See the 'Text Format' section of
+https://www.postgresql.org/docs/current/sql-copy.html
+
+Columns are tab separated, rows are newline terminated and NULL is '\\N'. Backslash, tab,
+newline & carriage return characters in values are backslash escaped. Values are encoded in
+the PostgreSQL text input format of the column type:
+
+- bool: 't' or 'f'
+- bytes, bytearray & memoryview: BYTEA hex format e.g. '\\x0123'
+- list & tuple: Array literal e.g. '{1,2,3}' (unless the column is JSON)
+- date, time & datetime: ISO 8601
+- JSON columns & dict values: JSON text
+- Everything else: str()
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, time
+from json import dumps
+from typing import Any
+
+from psycopg2.extras import Json
+
+from egpcommon.egp_log import Logger, egp_logger
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# COPY text format NULL & escapes
+COPY_NULL: str = "\\N"
+_COPY_ESCAPES: dict[int, str] = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def array_literal(values: Iterable[Any]) -> str:
+    """Return the PostgreSQL array literal text for values (which may be nested)."""
+    elements: list[str] = []
+    for value in values:
+        if value is None:
+            elements.append("NULL")
+        elif isinstance(value, (list, tuple)):
+            elements.append(array_literal(value))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            elements.append(text_value(value))
+        else:
+            text: str = text_value(value)
+            elements.append('"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(elements) + "}"
+
+
+def copy_row(row: Sequence[Any], json_mask: Sequence[bool]) -> str:
+    """Return a COPY text format line for row.
+
+    Args:
+        row: The column values of the row.
+        json_mask: True for each column that is JSON (or JSONB).
+    """
+    return (
+        "\t".join(
+            COPY_NULL if value is None else copy_value(value, json)
+            for value, json in zip(row, json_mask, strict=True)
+        )
+        + "\n"
+    )
+
+
+def copy_rows(rows: Iterable[Sequence[Any]], json_mask: Sequence[bool]) -> Iterator[str]:
+    """Generate COPY text format lines for rows (see copy_row())."""
+    return (copy_row(row, json_mask) for row in rows)
+
+
+def copy_value(value: Any, json: bool = False) -> str:
+    """Return the COPY text format (escaped) text for a value that is not None.
+
+    Args:
+        value: The value to encode.
+        json: True if the value is for a JSON (or JSONB) column.
+    """
+    text: str = json_text(value) if json else text_value(value)
+    return text.translate(_COPY_ESCAPES)
+
+
+def json_text(value: Any) -> str:
+    """Return the JSON text for value."""
+    return dumps(value.adapted if isinstance(value, Json) else value)
+
+
+def text_value(value: Any) -> str:
+    """Return the PostgreSQL text input format of value (not escaped for COPY)."""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, int):
+        # int.__repr__ so that IntEnum & IntFlag values are numbers
+        return int.__repr__(value)
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, (list, tuple)):
+        return array_literal(value)
+    if isinstance(value, (dict, Json)):
+        return json_text(value)
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
@@ -1,22 +1,28 @@
 """postgresql database management.
 
 Only one connection per database is maintained following the design principle
-of a single threaded process.
+of a single threaded process. If the database configuration has a non-zero pool_size
+the connections to the database are instead pooled (see pool.py) & shared by all the
+threads of the process with at most pool_size connections to the database.
 """
 
 # TODO: Look into VACUUM & ANALYZE  pylint: disable=fixme
 # See https://bbengfort.github.io/2017/12/psycopg2-transactions/
 
 
+from collections.abc import Callable, Hashable, Sequence
 from copy import deepcopy
+from functools import cache, partial
+from os import register_at_fork
 from random import choice
 from string import ascii_letters
 from threading import enumerate as thread_enumerate
 from threading import get_ident
 from time import sleep
-from typing import Any, Generator
+from typing import IO, Any, Generator
+from weakref import WeakKeyDictionary
 
-from psycopg2 import InterfaceError, OperationalError, ProgrammingError, connect, errors, sql
+from psycopg2 import Error, InterfaceError, OperationalError, ProgrammingError, connect, errors, sql
 from psycopg2.extensions import cursor as TupleCursor
 from psycopg2.extensions import register_adapter
 from psycopg2.extras import DictCursor, Json, NamedTupleCursor, register_default_json, register_uuid
@@ -24,6 +30,7 @@ from psycopg2.extras import DictCursor, Json, NamedTupleCursor, register_default
 from egpcommon.egp_log import DEBUG, FLOW, Logger, egp_logger
 from egpcommon.text_token import TextToken, register_token_code
 from egpdb.common import backoff_generator
+from egpdb.pool import ConnectionPool
 
 # Standard EGP logging pattern
 _logger: Logger = egp_logger(name=__name__)
@@ -38,6 +45,15 @@ register_adapter(dict, Json)
 # Global connection tracking
 # {host: {dbname: {thread_ident: connection | None}}}
 _connections: dict[str, dict[str, dict[int, Any]]] = {}
+# Connections inherited from the parent process when forked. They share the parent's
+# sockets so must not be used or closed (closing terminates the parent's session).
+# References are kept so they are never deallocated (forked children exit with os._exit()).
+_inherited: list[Any] = []
+# Server-side prepared statements by connection: {connection: {key: statement name}}
+# Prepared statements last for the database session so are discarded with the connection.
+_prepared: WeakKeyDictionary[Any, dict[Hashable, str]] = WeakKeyDictionary()
+# Connection pools: {host: {dbname: pool}}
+_pools: dict[str, dict[str, ConnectionPool]] = {}
 
 
 register_token_code(
@@ -91,8 +107,11 @@ def cursor_name_generator() -> Generator[str, Any, None]:
 
 
 _CURSOR_NAME: Generator[str, Any, None] = cursor_name_generator()
+_STATEMENT_NAME: Generator[str, Any, None] = cursor_name_generator()
 _ITERSIZE = 10000
 _CURSOR_NAME_PREFIX: str = "".join(choice(ascii_letters) for i in range(8)) + "_"
+# Maximum number of prepared statements per connection
+MAX_PREPARED: int = 2**10
 _INITIAL_DELAY = 0.125
 _BACKOFF_STEPS = 13
 _BACKOFF_FUZZ = True
@@ -101,6 +120,8 @@ _DB_RECONNECTIONS = 3
 _DB_EXISTS_SQL = sql.SQL("SELECT datname FROM pg_database")
 _DB_CREATE_SQL = sql.SQL("CREATE DATABASE {}")
 _DB_DELETE_SQL = sql.SQL("DROP DATABASE IF EXISTS {}")
+_PREPARE_SQL = sql.SQL("PREPARE {0} AS ")
+_DEALLOCATE_SQL = sql.SQL("DEALLOCATE {0}")
 _CTYPE: dict[str, Any] = {
     "tuple": TupleCursor,
     "namedtuple": NamedTupleCursor,
@@ -108,6 +129,18 @@ _CTYPE: dict[str, Any] = {
 }
 
 
+class PrepareError(Exception):
+    """A statement could not be prepared."""
+
+
+@cache
+def _execute_sql(num_params: int) -> sql.SQL:
+    """Return the EXECUTE SQL for a prepared statement with num_params parameters."""
+    if not num_params:
+        return sql.SQL("EXECUTE {0}")
+    return sql.SQL("EXECUTE {0} (" + ", ".join(("%s",) * num_params) + ")")
+
+
 def _clean_connections() -> None:
     """If threads no longer exist close any connections they may have had."""
     idents: list[int | None] = [
@@ -185,6 +218,23 @@ def _connect_core(dbname: str, config: dict[str, Any]) -> tuple[Any | None, Exce
     return connection, err
 
 
+def _forget_connections() -> None:
+    """Forget the connections inherited from the parent process after a fork.
+    New connections are made by the child process as needed.
+    """
+    for dbs in _connections.values():
+        for threads in dbs.values():
+            _inherited.extend(c for c in threads.values() if c is not None)
+    _connections.clear()
+    for pools in _pools.values():
+        for pool in pools.values():
+            _inherited.extend(pool.forget())
+    _pools.clear()
+
+
+register_at_fork(after_in_child=_forget_connections)
+
+
 def _get_connection(dbname: str, host: str) -> Any:
     dbs = _connections.setdefault(host, {})
     threads = dbs.setdefault(dbname, {})
@@ -280,6 +330,9 @@ def db_disconnect(dbname: str, config: dict[str, Any]) -> None:
     config: Database server details. Must have keys:
         'host' (str): Fully qualified host name of the DB server.
     """
+    pool: ConnectionPool | None = _pools.get(config["host"], {}).pop(dbname, None)
+    if pool is not None:
+        pool.close()
     connection = _get_connection(dbname, config["host"])
     if connection is not None:
         try:
@@ -303,13 +356,17 @@ def db_disconnect(dbname: str, config: dict[str, Any]) -> None:
 def db_disconnect_all() -> None:
     """Disconnect all connections.
 
-    Iterates over all tracked connections, closes them, and
-    clears all internal state from the _connections dict.
+    Iterates over all tracked connections & pools, closes them, and
+    clears all internal state from the _connections & _pools dicts.
     """
     for host, db_dict in tuple(_connections.items()):
         for dbname in db_dict.keys():
             db_disconnect(dbname, {"host": host})
         del _connections[host]
+    for pools in _pools.values():
+        for pool in pools.values():
+            pool.close()
+    _pools.clear()
 
 
 def db_exists(dbname: str, config: dict[str, Any]) -> bool:
@@ -370,6 +427,35 @@ def db_exists(dbname: str, config: dict[str, Any]) -> bool:
     return retval
 
 
+def db_pool(dbname: str, config: dict[str, Any]) -> ConnectionPool | None:
+    """Return the connection pool for the specified database.
+
+    The pool is created on first use. Connections to the maintenance DB are
+    never pooled: they are short lived & may be in autocommit mode.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see db_reconnect()). The maximum number of
+        pooled connections is config['pool_size']. If it is missing or 0 the
+        database connections are not pooled.
+
+    Returns
+    -------
+    The connection pool or None if the database connections are not pooled.
+    """
+    pools: dict[str, ConnectionPool] = _pools.setdefault(config["host"], {})
+    pool: ConnectionPool | None = pools.get(dbname)
+    if pool is None:
+        pool_size: int = config.get("pool_size", 0)
+        if not pool_size or dbname == config.get("maintenance_db"):
+            return None
+        pool = pools.setdefault(
+            dbname, ConnectionPool(partial(_connect_backoff, dbname, config), pool_size)
+        )
+    return pool
+
+
 def db_reconnect(dbname: str, config: dict[str, Any]) -> Any:
     """Reconnect to the specified database.
 
@@ -396,6 +482,26 @@ def db_reconnect(dbname: str, config: dict[str, Any]) -> Any:
     connection = _get_connection(dbname, config["host"])
     if connection is not None:
         db_disconnect(dbname, config)
+    connection = _connect_backoff(dbname, config)
+    _connections[config["host"]][dbname][get_ident()] = connection
+    return connection
+
+
+def _connect_backoff(dbname: str, config: dict[str, Any]) -> Any:
+    """Connect to the specified database.
+
+    If a connection cannot be established, step through an increasing
+    backoff delay and try again up to config['retries'] attempts.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see db_reconnect()).
+
+    Returns
+    -------
+    A psycopg2 connection object with an open connection.
+    """
     backoff_gen = backoff_generator(_INITIAL_DELAY, _BACKOFF_STEPS, _BACKOFF_FUZZ)
     attempts = 0
     connection, error = _connect_core(dbname, config)
@@ -423,46 +529,38 @@ def db_reconnect(dbname: str, config: dict[str, Any]) -> Any:
         raise error
     if connection is None:
         raise RuntimeError("Something went horribly wrong!")
-    _connections[config["host"]][dbname][get_ident()] = connection
     return connection
 
 
-def db_transaction(
+def _db_retry(
     dbname: str,
     config: dict[str, Any],
-    sql_str: Any,
-    read: bool = True,
-    recons: int = _DB_RECONNECTIONS,
-    ctype: str = "tuple",
+    operation: Callable[[Any], Any],
+    read: bool,
+    recons: int,
 ) -> Any:
-    """Execute an SQL statement with retry and reconnection logic.
+    """Execute operation(connection) with retry and reconnection logic.
 
-    If read is False the SQL statement will be committed in a single transaction.
-    If an error occurs the transaction will be rolled back.
-    If read is True a server-side named cursor is used for efficient iteration.
-
-    If an InterfaceError or OperationalError occurs the transaction will be reattempted
-    using backoff for _DB_TRANSACTION_ATTEMPTS attempts. If it is still failing
-    the database connection will be re-established and the transaction attempts tried again with
-    increasing backoff. The whole process will be done for `recons` reconnections
-    after which the caught error is raised.
+    If operation raises an InterfaceError or OperationalError the transaction is rolled back
+    (if not read) and reattempted using backoff for _DB_TRANSACTION_ATTEMPTS attempts. If it is
+    still failing the database connection will be re-established and the transaction attempts
+    tried again with increasing backoff. The whole process will be done for `recons`
+    reconnections after which a ProgrammingError is raised. If operation succeeds the
+    transaction is committed. If the database connections are pooled (see db_pool())
+    a connection is acquired from the pool for each attempt & released after it and
+    re-establishing the connection replaces all the connections in the pool.
 
     Args
     ----
     dbname: Name of the database to connect to.
-    config: Database server details. Must have keys:
-        'host' (str): Fully qualified host name of the DB server.
-        'port' (int): Port to access database server on.
-        'user' (str): Username to login with.
-        'password' (str): Password to login with.
-    sql_str: A valid SQL string or psycopg2 sql.Composed object.
-    read: If False transaction will be committed.
+    config: Database server details (see db_transaction()).
+    operation: Executes the transaction SQL on the connection & returns the result.
+    read: If True the transaction is not rolled back on error.
     recons: >= 1. The number of reconnection attempts before erroring out.
-    ctype: Cursor type - one of 'tuple', 'namedtuple', 'dict'.
 
     Returns
     -------
-    A psycopg2 cursor object.
+    The result of operation.
     """
     token2 = {
         "rw": ("write", "read")[read],
@@ -473,26 +571,14 @@ def db_transaction(
     token3 = deepcopy(token2)
     token3["attempts"] = _DB_TRANSACTION_ATTEMPTS
     token3["total"] = recons
+    pool: ConnectionPool | None = db_pool(dbname, config)
     backoff_gen = backoff_generator(_INITIAL_DELAY, _BACKOFF_STEPS, _BACKOFF_FUZZ)
-    cursor_type = _CTYPE[ctype]
     for reconnection in range(1, recons + 1):
         for transaction_attempt in range(1, _DB_TRANSACTION_ATTEMPTS + 1):
             token2["attempt"] = transaction_attempt
-            connection = db_connect(dbname, config)
-            if read:
-                try:
-                    cursor_name = next(_CURSOR_NAME)
-                except StopIteration:
-                    _logger.error("Cursor name generator exhausted.")
-                    raise
-                cursor = connection.cursor(
-                    name=cursor_name, cursor_factory=cursor_type, withhold=True
-                )
-                cursor.itersize = _ITERSIZE
-            else:
-                cursor = connection.cursor(cursor_factory=cursor_type)
+            connection = db_connect(dbname, config) if pool is None else pool.acquire()
             try:
-                cursor.execute(sql_str)
+                retval = operation(connection)
             except (InterfaceError, OperationalError) as exc:
                 if not read:
                     connection.rollback()
@@ -505,10 +591,207 @@ def db_transaction(
                     _logger.error("Backoff generator exhausted.")
                     raise
                 break
-            connection.commit()
-            return cursor
+            else:
+                connection.commit()
+                return retval
+            finally:
+                if pool is not None:
+                    pool.release(connection)
         token3["reconnection"] = reconnection
         _logger.warning(TextToken({"W04003": token3}))
-        db_reconnect(dbname, config)
+        if pool is None:
+            db_reconnect(dbname, config)
+        else:
+            pool.reset()
     _logger.error(TextToken({"E04000": {"dbname": dbname}}))
     raise ProgrammingError
+
+
+def db_copy(
+    dbname: str,
+    config: dict[str, Any],
+    copy_sql: Any,
+    data: IO[str],
+    pre_sql: Any = None,
+    post_sql: Any = None,
+    recons: int = _DB_RECONNECTIONS,
+) -> int:
+    """Stream data into the database with COPY FROM STDIN with retry and reconnection logic.
+
+    pre_sql (if defined), the COPY and post_sql (if defined) are committed in a single
+    transaction. e.g. pre_sql creates a temporary table, copy_sql copies data into it and
+    post_sql inserts the temporary table rows into a table. If an error occurs the transaction
+    will be rolled back. Retry and reconnection logic is the same as db_transaction() with the
+    data rewound before each attempt.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see db_transaction()).
+    copy_sql: A valid 'COPY ... FROM STDIN' SQL string or psycopg2 sql.Composed object.
+    data: A seekable file like object of rows in the format defined by copy_sql.
+    pre_sql: A valid SQL string or psycopg2 sql.Composed object executed before the COPY.
+    post_sql: A valid SQL string or psycopg2 sql.Composed object executed after the COPY.
+    recons: >= 1. The number of reconnection attempts before erroring out.
+
+    Returns
+    -------
+    The number of rows affected by post_sql (or copied if post_sql is None).
+    """
+
+    def operation(connection: Any) -> int:
+        data.seek(0)
+        try:
+            with connection.cursor() as cursor:
+                if pre_sql is not None:
+                    cursor.execute(pre_sql)
+                cursor.copy_expert(
+                    copy_sql if isinstance(copy_sql, str) else copy_sql.as_string(connection),
+                    data,
+                )
+                if post_sql is not None:
+                    cursor.execute(post_sql)
+                return cursor.rowcount
+        except (InterfaceError, OperationalError):
+            raise
+        except Error:
+            connection.rollback()
+            raise
+
+    return _db_retry(dbname, config, operation, False, recons)
+
+
+def db_prepared(
+    dbname: str,
+    config: dict[str, Any],
+    key: Hashable,
+    statement: Any,
+    params: Sequence[Any] = tuple(),
+    recons: int = _DB_RECONNECTIONS,
+    ctype: str = "tuple",
+) -> Any:
+    """Execute a server-side prepared statement with retry and reconnection logic.
+
+    The statement is PREPAREd the first time key is used on a connection. Subsequent uses of key
+    on the same connection EXECUTE the prepared statement with params bound to its $1, $2, ...
+    parameters so the server does not parse & plan it again. Each connection has its own
+    registry of prepared statements (prepared statements last for the database session) which
+    is discarded with the connection. A connection holds at most MAX_PREPARED statements: when
+    it is full the oldest statement is deallocated to make room. A named cursor cannot be
+    declared for an EXECUTE so a client-side cursor is used i.e. the statement should be a
+    bounded read or a write.
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details (see db_transaction()).
+    key: A unique key for the statement e.g. the query template.
+    statement: A valid SQL string or psycopg2 sql.Composed object with $n parameters.
+    params: The parameter values in $n order.
+    recons: >= 1. The number of reconnection attempts before erroring out.
+    ctype: Cursor type - one of 'tuple', 'namedtuple', 'dict'.
+
+    Returns
+    -------
+    A psycopg2 cursor object.
+
+    Raises
+    ------
+    PrepareError: If the statement cannot be prepared e.g. a parameter type cannot be
+    inferred. The transaction is rolled back.
+    """
+    cursor_type = _CTYPE[ctype]
+
+    def operation(connection: Any) -> Any:
+        statements: dict[Hashable, str] = _prepared.setdefault(connection, {})
+        name: str | None = statements.get(key)
+        cursor = connection.cursor(cursor_factory=cursor_type)
+        if name is None:
+            if len(statements) >= MAX_PREPARED:
+                oldest: str = statements.pop(next(iter(statements)))
+                cursor.execute(_DEALLOCATE_SQL.format(sql.Identifier(oldest)))
+            name = next(_STATEMENT_NAME)
+            try:
+                cursor.execute(_PREPARE_SQL.format(sql.Identifier(name)) + statement)
+            except (InterfaceError, OperationalError):
+                raise
+            except Error as exc:
+                connection.rollback()
+                raise PrepareError(str(exc)) from exc
+            statements[key] = name
+        try:
+            cursor.execute(_execute_sql(len(params)).format(sql.Identifier(name)), params or None)
+        except (InterfaceError, OperationalError):
+            raise
+        except Error:
+            connection.rollback()
+            raise
+        return cursor
+
+    return _db_retry(dbname, config, operation, False, recons)
+
+
+def db_transaction(
+    dbname: str,
+    config: dict[str, Any],
+    sql_str: Any,
+    read: bool = True,
+    recons: int = _DB_RECONNECTIONS,
+    ctype: str = "tuple",
+    bounded: bool = False,
+) -> Any:
+    """Execute an SQL statement with retry and reconnection logic.
+
+    If read is False the SQL statement will be committed in a single transaction.
+    If an error occurs the transaction will be rolled back.
+    If read is True a server-side named cursor is used for efficient iteration of
+    large results unless bounded is True. Bounded reads (e.g. LIMIT n, primary key
+    equality or COUNT queries) return few rows so a client-side cursor is used: the
+    rows are fetched by the execute avoiding the DECLARE, FETCH & CLOSE round trips
+    of a named cursor.
+
+    If an InterfaceError or OperationalError occurs the transaction will be reattempted
+    using backoff for _DB_TRANSACTION_ATTEMPTS attempts. If it is still failing
+    the database connection will be re-established and the transaction attempts tried again with
+    increasing backoff. The whole process will be done for `recons` reconnections
+    after which the caught error is raised.
+
+    If the database connections are pooled the connection is released back to the pool
+    when the transaction is committed. A named cursor is declared WITH HOLD so remains
+    valid on the shared connection until it is closed (or the connection is replaced).
+
+    Args
+    ----
+    dbname: Name of the database to connect to.
+    config: Database server details. Must have keys:
+        'host' (str): Fully qualified host name of the DB server.
+        'port' (int): Port to access database server on.
+        'user' (str): Username to login with.
+        'password' (str): Password to login with.
+    sql_str: A valid SQL string or psycopg2 sql.Composed object.
+    read: If False transaction will be committed.
+    recons: >= 1. The number of reconnection attempts before erroring out.
+    ctype: Cursor type - one of 'tuple', 'namedtuple', 'dict'.
+    bounded: If True and read is True the result is small enough to use a client-side cursor.
+
+    Returns
+    -------
+    A psycopg2 cursor object.
+    """
+    cursor_type = _CTYPE[ctype]
+
+    def operation(connection: Any) -> Any:
+        if read and not bounded:
+            try:
+                cursor_name = next(_CURSOR_NAME)
+            except StopIteration:
+                _logger.error("Cursor name generator exhausted.")
+                raise
+            cursor = connection.cursor(name=cursor_name, cursor_factory=cursor_type, withhold=True)
+            cursor.itersize = _ITERSIZE
+        else:
+            cursor = connection.cursor(cursor_factory=cursor_type)
+        cursor.execute(sql_str)
+        return cursor
+
+    return _db_retry(dbname, config, operation, read, recons)
@@ -0,0 +1,353 @@
+"""Bounded database connection pools.
+
+By default database.py maintains one connection per database per thread. A process with many
+threads (or an asyncio event loop with many tasks) would then need as many connections. A pool
+bounds the number of connections to a database and shares them between the threads
+(ConnectionPool) or the tasks (AsyncConnectionPool) of a process.
+
+Connections are acquired for a transaction and released back to the pool when it is done.
+Idle connections that have been idle for more than health_check_interval seconds are health
+checked before they are reused and unhealthy connections are closed and replaced. The pools
+do not connect to the database themselves: connections are created by a connect function
+(with the backoff & retries of database.py) and health checked by a check function.
+"""
+
+from asyncio import Condition as AsyncCondition
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from threading import Condition
+from time import monotonic
+from typing import Any
+
+from psycopg2 import Error
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from egpcommon.egp_log import Logger, egp_logger
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Default maximum number of connections in a pool
+DEFAULT_POOL_SIZE: int = 4
+# Idle connections are health checked before reuse if idle for longer than this (seconds)
+HEALTH_CHECK_INTERVAL: float = 30.0
+
+
+def close(connection: Any) -> None:
+    """Close a connection ignoring errors e.g. the connection is already broken."""
+    try:
+        connection.close()
+    except Error as exc:
+        _logger.debug("Error closing pooled connection: %s", exc)
+
+
+def ping(connection: Any) -> bool:
+    """Return True if the connection can execute a trivial query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        connection.rollback()
+    except Error:
+        return False
+    return True
+
+
+class PoolBase:
+    """Connection bookkeeping common to the synchronous and asynchronous pools.
+
+    Idle connections are reused last in first out so that as few connections as possible stay
+    warm. Every reset() starts a new generation: connections of an older generation are
+    closed rather than reused.
+    """
+
+    __slots__ = (
+        "_generation",
+        "_idle",
+        "_in_use",
+        "_pending",
+        "health_check_interval",
+        "maxconn",
+    )
+
+    def __init__(self, maxconn: int, health_check_interval: float) -> None:
+        """Initialize the pool.
+
+        Args
+        ----
+        maxconn: >= 1. The maximum number of connections (idle, in use & being connected).
+        health_check_interval: Idle time (seconds) after which a connection is health checked.
+        """
+        if maxconn < 1:
+            raise ValueError(f"maxconn must be >= 1 but is {maxconn}.")
+        self.maxconn: int = maxconn
+        self.health_check_interval: float = health_check_interval
+        self._generation: int = 0
+        # [(connection, generation, time released), ...]
+        self._idle: list[tuple[Any, int, float]] = []
+        # {connection: generation}
+        self._in_use: dict[Any, int] = {}
+        # Number of connections being health checked or created
+        self._pending: int = 0
+
+    def __len__(self) -> int:
+        """Return the number of connections (idle, in use & being connected)."""
+        return len(self._idle) + len(self._in_use) + self._pending
+
+    def _acquired(self, connection: Any | None, generation: int) -> None:
+        """Complete an acquisition started by _take(). connection is None on failure."""
+        self._pending -= 1
+        if connection is not None:
+            self._in_use[connection] = generation
+
+    def _available(self) -> bool:
+        """Return True if a connection can be acquired without waiting."""
+        return bool(self._idle) or len(self) < self.maxconn
+
+    def _released(self, connection: Any, reusable: bool) -> None:
+        """Return a released connection to the idle connections or close it."""
+        generation: int | None = self._in_use.pop(connection, None)
+        if (
+            reusable
+            and generation is not None
+            and generation == self._generation
+            and not connection.closed
+        ):
+            self._idle.append((connection, generation, monotonic()))
+        else:
+            close(connection)
+
+    def _stale(self) -> list[Any]:
+        """Start a new generation and return the idle connections (to be closed)."""
+        self._generation += 1
+        connections: list[Any] = [connection for connection, _, _ in self._idle]
+        self._idle.clear()
+        return connections
+
+    def _take(self) -> tuple[Any | None, bool]:
+        """Start an acquisition when _available() is True.
+
+        The slot is reserved (pending) until _acquired() is called so that the pool is never
+        over subscribed while a connection is health checked or created.
+
+        Returns
+        -------
+        (connection, check) where connection is an idle connection (None if a new connection
+        must be created) and check is True if it must be health checked before it is used.
+        """
+        self._pending += 1
+        while self._idle:
+            connection, generation, released = self._idle.pop()
+            if generation == self._generation and not connection.closed:
+                return connection, monotonic() - released >= self.health_check_interval
+            close(connection)
+        return None, False
+
+    def forget(self) -> list[Any]:
+        """Forget all the connections without closing them and return them.
+
+        After a fork the child process shares the connection sockets of the parent so must
+        not use or close them.
+        """
+        connections: list[Any] = [connection for connection, _, _ in self._idle]
+        connections.extend(self._in_use)
+        self._idle.clear()
+        self._in_use.clear()
+        return connections
+
+    def idle(self) -> int:
+        """Return the number of idle connections."""
+        return len(self._idle)
+
+
+class ConnectionPool(PoolBase):
+    """A bounded, thread safe, pool of connections to a database."""
+
+    __slots__ = ("_check", "_condition", "_connect")
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        maxconn: int = DEFAULT_POOL_SIZE,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+        check: Callable[[Any], bool] = ping,
+    ) -> None:
+        """Initialize the pool.
+
+        Args
+        ----
+        connect: Returns a new connection.
+        maxconn: >= 1. The maximum number of connections (idle, in use & being connected).
+        health_check_interval: Idle time (seconds) after which a connection is health checked.
+        check: Returns True if a connection is healthy.
+        """
+        super().__init__(maxconn, health_check_interval)
+        self._connect: Callable[[], Any] = connect
+        self._check: Callable[[Any], bool] = check
+        self._condition: Condition = Condition()
+
+    def acquire(self, timeout: float | None = None) -> Any:
+        """Acquire a connection waiting for one to be available if necessary.
+
+        Args
+        ----
+        timeout: The maximum time (seconds) to wait for a connection. None waits forever.
+
+        Returns
+        -------
+        An open connection.
+
+        Raises
+        ------
+        TimeoutError: If no connection is available within timeout seconds.
+        """
+        with self._condition:
+            if not self._condition.wait_for(self._available, timeout):
+                raise TimeoutError(f"No connection available within {timeout} seconds.")
+            generation: int = self._generation
+            connection, check = self._take()
+        try:
+            if check and not self._check(connection):
+                close(connection)
+                connection = None
+            if connection is None:
+                connection = self._connect()
+        finally:
+            with self._condition:
+                self._acquired(connection, generation)
+                self._condition.notify()
+        return connection
+
+    def close(self) -> None:
+        """Close the idle connections. Connections in use are closed when released."""
+        with self._condition:
+            stale: list[Any] = self._stale()
+            self._condition.notify_all()
+        for connection in stale:
+            close(connection)
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Any]:
+        """Acquire a connection for the duration of the context (see acquire())."""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def release(self, connection: Any) -> None:
+        """Release an acquired connection back to the pool.
+
+        An open transaction is rolled back. Connections that are closed, broken or were
+        acquired before a reset() are closed.
+        """
+        reusable: bool = not connection.closed
+        if reusable and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Error:
+                reusable = False
+        with self._condition:
+            self._released(connection, reusable)
+            self._condition.notify()
+
+    def reset(self) -> None:
+        """Replace all the connections e.g. after the database server has restarted.
+
+        Idle connections are closed now and connections in use are closed when released.
+        """
+        self.close()
+
+
+class AsyncConnectionPool(PoolBase):
+    """A bounded pool of asynchronous connections to a database shared by asyncio tasks.
+
+    The pool is not thread safe: it must only be used by the tasks of one event loop.
+    """
+
+    __slots__ = ("_check", "_condition", "_connect")
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        check: Callable[[Any], Awaitable[bool]],
+        maxconn: int = DEFAULT_POOL_SIZE,
+        health_check_interval: float = HEALTH_CHECK_INTERVAL,
+    ) -> None:
+        """Initialize the pool.
+
+        Args
+        ----
+        connect: Returns a new asynchronous connection.
+        check: Returns True if an asynchronous connection is healthy.
+        maxconn: >= 1. The maximum number of connections (idle, in use & being connected).
+        health_check_interval: Idle time (seconds) after which a connection is health checked.
+        """
+        super().__init__(maxconn, health_check_interval)
+        self._connect: Callable[[], Awaitable[Any]] = connect
+        self._check: Callable[[Any], Awaitable[bool]] = check
+        self._condition: AsyncCondition = AsyncCondition()
+
+    async def acquire(self) -> Any:
+        """Acquire a connection waiting for one to be available if necessary.
+
+        Use asyncio.timeout() or asyncio.wait_for() to limit the wait.
+
+        Returns
+        -------
+        An open asynchronous connection.
+        """
+        async with self._condition:
+            await self._condition.wait_for(self._available)
+            generation: int = self._generation
+            connection, check = self._take()
+        try:
+            if check and not await self._check(connection):
+                close(connection)
+                connection = None
+            if connection is None:
+                connection = await self._connect()
+        finally:
+            async with self._condition:
+                self._acquired(connection, generation)
+                self._condition.notify()
+        return connection
+
+    async def close(self) -> None:
+        """Close the idle connections. Connections in use are closed when released."""
+        async with self._condition:
+            for connection in self._stale():
+                close(connection)
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        """Acquire a connection for the duration of the context (see acquire())."""
+        connection = await self.acquire()
+        try:
+            yield connection
+        finally:
+            await self.release(connection)
+
+    async def release(self, connection: Any) -> None:
+        """Release an acquired connection back to the pool.
+
+        Asynchronous connections are always in autocommit mode so are only in a transaction
+        if one was explicitly begun. Connections that are closed, still executing (e.g. the
+        task was cancelled), in a transaction or were acquired before a reset() are closed.
+        """
+        reusable: bool = (
+            not connection.closed
+            and not connection.isexecuting()
+            and connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+        )
+        async with self._condition:
+            self._released(connection, reusable)
+            self._condition.notify()
+
+    async def reset(self) -> None:
+        """Replace all the connections e.g. after the database server has restarted.
+
+        Idle connections are closed now and connections in use are closed when released.
+        """
+        await self.close()
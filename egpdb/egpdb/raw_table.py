@@ -1,20 +1,35 @@
 """Simplified database table access."""
 
-from copy import deepcopy
+from io import StringIO
+from itertools import islice
 from json import load
 from os.path import join
 from pprint import pformat
-from time import sleep
+from re import IGNORECASE
+from re import compile as re_compile
+from time import perf_counter, sleep
 from typing import Any, Generator, Iterable, Literal
 
 from psycopg2 import ProgrammingError, errors, sql
-from psycopg2.extras import Json
 
 from egpcommon.egp_log import DEBUG, FLOW, Logger, egp_logger
 from egpcommon.text_token import TextToken, register_token_code
 from egpdb.common import backoff_generator
 from egpdb.configuration import ColumnSchema, TableConfig
-from egpdb.database import db_connect, db_create, db_delete, db_exists, db_transaction
+from egpdb.copy_format import copy_rows
+from egpdb.database import (
+    PrepareError,
+    db_connect,
+    db_copy,
+    db_create,
+    db_delete,
+    db_exists,
+    db_pool,
+    db_prepared,
+    db_transaction,
+)
+from egpdb.pool import ConnectionPool
+from egpdb.raw_table_sql import INSERT_CONFLICT_STR, RawTableSQL
 from egpdb.row_iterators import RawCType
 
 # Standard EGP logging pattern
@@ -58,9 +73,6 @@ register_token_code(
     "E05005",
     "Table {table} does not exist in database {dbname} and will not be created.",
 )
-register_token_code(
-    "E05006", "Recursive select on table {table} requires ptr_map to be configured."
-)
 register_token_code(
     "E05007",
     "Database {dbname} does not exist and will not be created.",
@@ -69,6 +81,14 @@ register_token_code(
     "I05008",
     "Database {dbname} does not yet exist. Waiting {backoff:.2}s to retry.",
 )
+register_token_code(
+    "W05000",
+    "Query {query} on table {table} cannot be prepared: {error} Literals will be inlined.",
+)
+register_token_code(
+    "I05009",
+    "Bulk upsert of {rows} rows into table {table} in {seconds:.3f}s ({rate:.0f} rows/s).",
+)
 
 
 _INITIAL_DELAY = 0.125
@@ -102,6 +122,9 @@ _TYPE_ALIGNMENTS: dict[str, int] = {
     "JSONB": 0,
 }
 TYPES = tuple(_TYPE_ALIGNMENTS.keys())
+# A query with a LIMIT no greater than this is a bounded query (see is_bounded())
+_BOUNDED_LIMIT = 2**10
+_LIMIT_RE = re_compile(r"\bLIMIT\s+(\d+)\b", IGNORECASE)
 _TABLE_LEN_SQL = sql.SQL("SELECT COUNT(*) FROM {0}")
 _TABLE_EXISTS_SQL = sql.SQL(
     "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_schema = 'public'"
@@ -125,19 +148,17 @@ _TABLE_CREATE_SQL = sql.SQL("CREATE TABLE {0} ({1})")
 _TABLE_INDEX_SQL = sql.SQL("CREATE INDEX {0} ON {1}")
 _TABLE_INDEX_COLUMN_SQL = sql.SQL("({0})")
 _TABLE_DELETE_TABLE_SQL = sql.SQL("DROP TABLE IF EXISTS {0} CASCADE")
-_TABLE_RECURSIVE_SELECT = sql.SQL(
-    "WITH RECURSIVE rq AS (SELECT {0} FROM {1} {2} UNION {5}SELECT {3} FROM {1} t INNER JOIN"
-    " rq r ON {4}) SELECT * FROM rq"
-)
-_TABLE_SELECT_SQL = sql.SQL("SELECT {0} FROM {1} {2}")
-_TABLE_INSERT_SQL = sql.SQL("INSERT INTO {0} ({1}) VALUES {2} ON CONFLICT ")
-_TABLE_INSERT_CONFLICT_STR = "DO NOTHING"
-_TABLE_UPSERT_CONFLICT_STR = "{0} DO UPDATE SET "
-_TABLE_UPDATE_WHERE_SQL = sql.SQL("UPDATE {0} SET {1} WHERE {2}")
-_TABLE_UPDATE_SQL = sql.SQL("UPDATE {0} SET {1}")
-_TABLE_DELETE_SQL = sql.SQL("DELETE FROM {0} WHERE {1}")
-_TABLE_RETURNING_SQL = sql.SQL(" RETURNING ")
-_DEFAULT_UPDATE_STR = "{{{0}}}={{EXCLUDED.{0}}}"
+# Default number of rows streamed per COPY (transaction) by bulk_upsert()
+COPY_CHUNK_SIZE: int = 2**14
+
+
+def is_bounded(query_str: str) -> bool:
+    """Return True if query_str has a LIMIT of no more than _BOUNDED_LIMIT rows.
+
+    Bounded queries return few rows and are faster with a client-side cursor.
+    """
+    match = _LIMIT_RE.search(query_str)
+    return match is not None and int(match.group(1)) <= _BOUNDED_LIMIT
 
 
 def default_config() -> TableConfig:
@@ -145,7 +166,7 @@ def default_config() -> TableConfig:
     return TableConfig()
 
 
-class RawTable:
+class RawTable(RawTableSQL):
     """Connects to (or creates as needed) a postgres database & table.
 
     The intention of raw_table is to provide a simple interface to instanciate,
@@ -165,7 +186,9 @@ class RawTable:
         self.db_creator = False
         self.populate = populate
         self._table = sql.Identifier(self.config["table"])
-        self.ptr_map_def(self.config["ptr_map"])
+        # Prepared select statement & parameter labels by query template (None if unpreparable)
+        self._templates: dict[tuple, tuple[sql.Composed, tuple[str, ...]] | None] = {}
+        super().__init__(self.config["ptr_map"])
         if self.config["delete_db"]:
             self.delete_db()
         if not self._db_exists(self.config["wait_for_db"]):
@@ -200,7 +223,7 @@ class RawTable:
     def __len__(self) -> int:
         """Return the number of entries in the table."""
         try:
-            return next(self._db_transaction(_TABLE_LEN_SQL.format(self._table)))[0]
+            return next(self._db_transaction(_TABLE_LEN_SQL.format(self._table), bounded=True))[0]
         except StopIteration as exc:
             raise RuntimeError(
                 "Could not determine table length. Query returned no value."
@@ -328,34 +351,19 @@ class RawTable:
             return True
         return db_exists(self.config["database"]["dbname"], self.config["database"])
 
-    def _db_transaction(self, sql_str, read=True, ctype="tuple"):
+    def _db_transaction(self, sql_str, read=True, ctype="tuple", bounded=False):
         """Wrap db_transaction."""
-        _logger.log(DEBUG, "SQL: %s", self._sql_to_string(sql_str))
+        if _logger.isEnabledFor(DEBUG):
+            _logger.log(DEBUG, "SQL: %s", self._sql_to_string(sql_str))
         return db_transaction(
             self.config["database"]["dbname"],
             self.config["database"],
             sql_str,
             read,
             ctype=ctype,
+            bounded=bounded,
         )
 
-    def _format_dict(
-        self, literals: dict[str, Any] | None
-    ) -> dict[str, sql.Identifier | sql.Literal]:
-        """Create a formatting dict of literals and column identifiers."""
-        format_dict: dict[str, sql.Identifier | sql.Literal] = {
-            k: sql.Identifier(k) for k in self.columns
-        }
-        format_dict[self.config["table"]] = self._table
-        if literals is not None:
-            dupes: set[str] = set(literals.keys()).intersection(self.columns)
-            if dupes:
-                raise ValueError(
-                    f"Literals cannot have keys that are the names of table columns:{dupes}"
-                )
-            format_dict.update({k: sql.Literal(v) for k, v in literals.items()})
-        return format_dict
-
     def _get_primary_key(self) -> str | None:
         """Identify the primary key.
 
@@ -404,13 +412,60 @@ class RawTable:
                 )
                 with open(abspath, "r", encoding="utf-8") as file_ptr:
                     for columns, values in self.batch_dict_data(load(file_ptr)):
-                        self.insert(columns, values)
+                        self.bulk_insert(columns, values)
+
+    def _prepared_select(
+        self,
+        query_str: str,
+        literals: dict[str, Any],
+        columns: str | tuple[str, ...],
+        ctype: RawCType,
+    ):
+        """Select using a server-side prepared statement. See select().
+
+        The query template (query_str & columns) is prepared once per connection and literals
+        are bound as parameters rather than inlined. Returns None if the template cannot be
+        prepared (e.g. a literal type cannot be inferred) in which case it never will be.
+        """
+        key: tuple = (self.config["table"], query_str, columns)
+        template = self._templates.get(key)
+        if template is None:
+            if key in self._templates:
+                return None
+            template = self._templates[key] = self._select_template(query_str, columns)
+            if template is None:
+                return None
+        statement, labels = template
+        self._check_literals(literals)
+        params: tuple[Any, ...] = tuple(literals[label] for label in labels)
+        if _logger.isEnabledFor(DEBUG):
+            _logger.log(DEBUG, "SQL: %s %s", self._sql_to_string(statement), params)
+        try:
+            return db_prepared(
+                self.config["database"]["dbname"],
+                self.config["database"],
+                key,
+                statement,
+                params,
+                ctype=ctype,
+            )
+        except PrepareError as exc:
+            _logger.warning(
+                TextToken(
+                    {"W05000": {"query": query_str, "table": self.config["table"], "error": exc}}
+                )
+            )
+            self._templates[key] = None
+            return None
 
     def _sql_to_string(self, sql_str) -> str:
         """Wrap sql.SQL.as_string() to convert sql.SQL to a string (usually for logging)."""
-        return sql_str.as_string(
-            db_connect(self.config["database"]["dbname"], self.config["database"])
-        )
+        dbname: str = self.config["database"]["dbname"]
+        pool: ConnectionPool | None = db_pool(dbname, self.config["database"])
+        if pool is None:
+            return sql_str.as_string(db_connect(dbname, self.config["database"]))
+        with pool.connection() as connection:
+            return sql_str.as_string(connection)
 
     def _table_definition(self) -> set[str]:
         """Get the table schema when it is defined in the database.
@@ -526,6 +581,7 @@ class RawTable:
         literals: dict[str, Any] | None = None,
         read: bool = True,
         ctype: RawCType = "tuple",
+        bounded: bool | None = None,
     ):
         """Exectue the arbitrary SQL string sql_str.
 
@@ -539,6 +595,7 @@ class RawTable:
         literals (dict): Keys are labels used in sql_str. Values are literals to replace the labels.
         read (bool): True if the SQL does not make changes to the database.
         ctype (str): One of 'tuple', 'namedtuple', 'dict'
+        bounded (bool): True if the SQL returns few rows (see select()).
 
         Returns
         -------
@@ -549,7 +606,9 @@ class RawTable:
         """
         format_dict: dict[str, sql.Identifier | sql.Literal] = self._format_dict(literals)
         _sql_str: sql.Composed = sql.SQL(sql_str).format(**format_dict)
-        return self._db_transaction(_sql_str, read, ctype)
+        if bounded is None:
+            bounded = is_bounded(sql_str)
+        return self._db_transaction(_sql_str, read, ctype, bounded)
 
     def batch_dict_data(self, data, exclude=tuple(), ordered=False):
         """Generate to break up an iterable of dictionaries into batches with the same keys.
@@ -597,6 +656,74 @@ class RawTable:
             for datum_keys_hash, batch in batches.items():
                 yield ordered_keys[datum_keys_hash], batch
 
+    def bulk_insert(self, columns, values, chunk_size: int = COPY_CHUNK_SIZE) -> int:
+        """Insert values streamed with COPY FROM STDIN. See bulk_upsert().
+
+        Rows that conflict with an existing row are not inserted.
+        """
+        return self.bulk_upsert(columns, values, INSERT_CONFLICT_STR, chunk_size=chunk_size)
+
+    def bulk_upsert(
+        self,
+        columns,
+        values,
+        update_str=None,
+        literals: dict[str, Any] | None = None,
+        chunk_size: int = COPY_CHUNK_SIZE,
+    ) -> int:
+        """Upsert values streamed with COPY FROM STDIN.
+
+        A faster alternative to upsert() for large numbers of rows that does not compose
+        an SQL literal for every value. Rows are streamed chunk_size rows at a time into a
+        temporary table which is then upserted with INSERT ... SELECT ... ON CONFLICT. Each
+        chunk is a single transaction. Rows cannot be returned.
+
+        Args
+        ----
+        columns: Column names for each of the rows in values.
+        values: Iterable of rows (ordered iterables) with values in the order as columns.
+        update_str: Update SQL (see upsert()).
+        literals: Keys are labels used in update_str. Values are literals to replace the labels.
+        chunk_size: The maximum number of rows streamed in one COPY.
+
+        Returns
+        -------
+        The number of rows inserted or updated.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be >= 1: {chunk_size}")
+        pre_sql, copy_sql, post_sql = self._bulk_upsert_sql(columns, update_str, literals)
+        json_mask: tuple[bool, ...] = tuple(col in self._json_columns for col in columns)
+        dbname: str = self.config["database"]["dbname"]
+        if _logger.isEnabledFor(DEBUG):
+            _logger.log(DEBUG, "SQL: %s", self._sql_to_string(post_sql))
+        start: float = perf_counter()
+        num_rows: int = 0
+        num_upserted: int = 0
+        iterator = iter(values)
+        while chunk := tuple(islice(iterator, chunk_size)):
+            data = StringIO("".join(copy_rows(chunk, json_mask)))
+            num_upserted += db_copy(
+                dbname, self.config["database"], copy_sql, data, pre_sql, post_sql
+            )
+            num_rows += len(chunk)
+        if num_rows:
+            seconds: float = perf_counter() - start
+            _logger.log(
+                FLOW,
+                TextToken(
+                    {
+                        "I05009": {
+                            "rows": num_rows,
+                            "table": self.config["table"],
+                            "seconds": seconds,
+                            "rate": num_rows / seconds,
+                        }
+                    }
+                ),
+            )
+        return num_upserted
+
     def delete(
         self,
         query_str,
@@ -629,17 +756,9 @@ class RawTable:
             'namedtuple': NamedTupleCursor
             'dict': DictCursor
         """
-        if literals is None:
-            literals = {}
-        if returning == "*":
-            returning = self.columns
-        format_dict = self._format_dict(literals)
-        sql_str = _TABLE_DELETE_SQL.format(self._table, sql.SQL(query_str).format(**format_dict))
-        if returning:
-            sql_str += _TABLE_RETURNING_SQL + sql.SQL(",").join(
-                [sql.Identifier(column) for column in returning]
-            )
-        return self._db_transaction(sql_str, read=False, ctype=ctype)
+        return self._db_transaction(
+            self._delete_sql(query_str, literals, returning), read=False, ctype=ctype
+        )
 
     def delete_db(self) -> None:
         """Delete the database."""
@@ -662,27 +781,7 @@ class RawTable:
         returning: The columns to be returned on update. If None or empty no columns will be
         returned.
         """
-        return self.upsert(columns, values, _TABLE_INSERT_CONFLICT_STR, returning=returning)
-
-    def ptr_map_def(self, ptr_map: dict[str, str]) -> None:
-        """Define how a recursive select traverses the graph.
-
-        If the rows in the table define nodes in a graph then the pointer map defines
-        the edges between nodes.
-
-        self.config['ptr_map'] is of the form {
-            "column X": "column Y",
-            ...
-        }
-        where columns X contains a reference to a node identified by column Y.
-        """
-        pm_sql: list[sql.Composed] = [
-            sql.SQL("r.") + sql.Identifier(r) + sql.SQL("=t.") + sql.Identifier(i)
-            for r, i in ptr_map.items()
-        ]
-        self._pm_sql: sql.Composed = sql.SQL(" OR ").join(pm_sql)
-        self._pm: dict[str, str] = deepcopy(ptr_map)
-        self._pm_columns: set[str] = set(ptr_map.keys()) | set(ptr_map.values())
+        return self.upsert(columns, values, INSERT_CONFLICT_STR, returning=returning)
 
     # TODO: Add delta (results in A but not in B) & intersection (results in A & B)  pylint: disable=fixme
     # recursive queries https://www.postgresql.org/docs/8.3/queries-union.html
@@ -694,6 +793,7 @@ class RawTable:
         columns: Literal["*"] | Iterable[str] = "*",
         ctype: RawCType = "tuple",
         dedupe: bool = True,
+        max_depth: int | None = None,
     ):
         """Recursive select of columns to return for rows matching query_str.
 
@@ -718,6 +818,9 @@ class RawTable:
         columns: The columns to be returned on update. If '*' defined all columns are returned.
         ctype: One of 'tuple', 'namedtuple', 'dict'
         dedupe: Duplicate entries are removed from the result when True.
+        max_depth: The maximum number of pointers followed from the rows matching query_str.
+            0 returns only the matching rows. None (the default) follows all pointers. NOTE:
+            when limited a row reachable at different depths is returned once per depth.
 
         Returns
         -------
@@ -727,30 +830,10 @@ class RawTable:
             'namedtuple': NamedTupleCursor
             'dict': DictCursor
         """
-        if literals is None:
-            literals = {}
-        if not self._pm:
-            raise ValueError(TextToken({"E05006": {"table": self.config["table"]}}))
-
-        if columns == "*":
-            columns = self.columns
-        else:
-            columns = list(columns)
-            for ptr in self._pm_columns:
-                if ptr not in columns:
-                    columns.append(ptr)
-        t_columns: sql.Composed = sql.SQL("t.") + sql.SQL(", t.").join(map(sql.Identifier, columns))
-        _columns: sql.Composed = sql.SQL(", ").join(map(sql.Identifier, columns))
-        format_dict: dict[str, sql.Identifier | sql.Literal] = self._format_dict(literals)
-        sql_str: sql.Composed = _TABLE_RECURSIVE_SELECT.format(
-            _columns,
-            self._table,
-            sql.SQL(query_str).format(**format_dict),
-            t_columns,
-            self._pm_sql,
-            sql.SQL(("ALL ", "")[dedupe]),
+        return self._db_transaction(
+            self._recursive_select_sql(query_str, literals, columns, dedupe, max_depth),
+            ctype=ctype,
         )
-        return self._db_transaction(sql_str, ctype=ctype)
 
     def select(
         self,
@@ -758,6 +841,8 @@ class RawTable:
         literals: dict[str, Any] | None = None,
         columns: Literal["*"] | Iterable[str] = "*",
         ctype: RawCType = "tuple",
+        bounded: bool | None = None,
+        prepare: bool = True,
     ):
         """Select columns to return for rows matching query_str.
 
@@ -778,6 +863,14 @@ class RawTable:
 
         ctype: One of 'tuple', 'namedtuple', 'dict'
 
+        bounded: True if the query returns few rows e.g. a primary key equality lookup. A
+        client-side cursor is used rather than a server-side named cursor. If None the query
+        is bounded if it has a small LIMIT (see is_bounded()).
+
+        prepare: If True (and the query is bounded) the query template (query_str & columns)
+        is executed as a server-side prepared statement with the literals as parameters. This
+        saves composing the SQL and the server parsing & planning it for repeated queries.
+
         Returns
         -------
         A psycopg2 cursor of a type defined by ctype:
@@ -787,17 +880,17 @@ class RawTable:
         """
         if literals is None:
             literals = {}
-        if columns == "*":
-            columns = self.columns
-        format_dict: dict[str, sql.Identifier | sql.Literal] = self._format_dict(literals)
-        if isinstance(columns, str):
-            _columns: sql.Composed = sql.SQL(columns).format(**format_dict)
-        else:
-            _columns = sql.SQL(", ").join(map(sql.Identifier, columns))
-        sql_str: sql.Composed = _TABLE_SELECT_SQL.format(
-            _columns, self._table, sql.SQL(query_str).format(**format_dict)
+        if bounded is None:
+            bounded = is_bounded(query_str)
+        if not isinstance(columns, str):
+            columns = tuple(columns)
+        if bounded and prepare:
+            cursor = self._prepared_select(query_str, literals, columns, ctype)
+            if cursor is not None:
+                return cursor
+        return self._db_transaction(
+            self._select_sql(query_str, literals, columns), ctype=ctype, bounded=bounded
         )
-        return self._db_transaction(sql_str, ctype=ctype)
 
     def update(
         self,
@@ -834,29 +927,12 @@ class RawTable:
             'namedtuple': NamedTupleCursor
             'dict': DictCursor
         """
-        if literals is None:
-            literals = {}
-        if returning == "*":
-            returning = self.columns
-        format_dict = self._format_dict(literals)
-        if query_str is not None:
-            sql_str = _TABLE_UPDATE_WHERE_SQL.format(
-                self._table,
-                sql.SQL(update_str).format(**format_dict),
-                sql.SQL(query_str).format(**format_dict),
-            )
-        else:
-            sql_str = _TABLE_UPDATE_SQL.format(
-                self._table, sql.SQL(update_str).format(**format_dict)
-            )
-        if returning:
-            sql_str += _TABLE_RETURNING_SQL + sql.SQL(",").join(
-                [sql.Identifier(column) for column in returning]
-            )
-        return self._db_transaction(sql_str, read=False, ctype=ctype)
+        return self._db_transaction(
+            self._update_sql(update_str, query_str, literals, returning), read=False, ctype=ctype
+        )
 
-    # TODO: This could overflow an SQL statement size limit. In which case  pylint: disable=fixme
-    # should we use a COPY https://www.postgresql.org/docs/12/dml-insert.html
+    # NOTE: This could overflow an SQL statement size limit. Use bulk_upsert() for large
+    # numbers of rows.
     def upsert(
         self,
         columns,
@@ -900,43 +976,9 @@ class RawTable:
             'namedtuple': NamedTupleCursor
             'dict': DictCursor
         """
-        if literals is None:
-            literals = {}
-        if returning == "*":
-            returning = self.columns
-        if update_str is None:
-            update_str = ",".join(
-                (_DEFAULT_UPDATE_STR.format(k) for k in columns if k != self.primary_key)
-            )
-        if update_str != _TABLE_INSERT_CONFLICT_STR:
-            if self.primary_key is None:
-                raise ValueError("Can only upsert if a primary key is defined.")
-            update_str = (
-                _TABLE_UPSERT_CONFLICT_STR.format("({" + self.primary_key + "})") + update_str
-            )
-        columns_sql = sql.SQL(",").join([sql.Identifier(k) for k in columns])
-        values_sql = sql.SQL(",").join(
-            sql.SQL("({0})").format(
-                sql.SQL(",").join(
-                    (sql.Literal(Json(value)) if col in self._json_columns else sql.Literal(value))
-                    for value, col in zip(row, columns)
-                )
-            )
-            for row in values
+        sql_str: sql.Composed | None = self._upsert_sql(
+            columns, values, update_str, literals, returning
         )
-        if not values_sql.seq:
+        if sql_str is None:
             return iter(tuple())
-        format_dict = self._format_dict(literals)
-        format_dict.update(
-            {"EXCLUDED." + k: sql.SQL("EXCLUDED.") + sql.Identifier(k) for k in columns}
-        )
-        update_sql = sql.SQL(update_str).format(**format_dict)
-        if returning:
-            update_sql += _TABLE_RETURNING_SQL + sql.SQL(",").join(
-                [sql.Identifier(column) for column in returning]
-            )
-        return self._db_transaction(
-            _TABLE_INSERT_SQL.format(self._table, columns_sql, values_sql) + update_sql,
-            read=False,
-            ctype=ctype,
-        )
+        return self._db_transaction(sql_str, read=False, ctype=ctype)
@@ -0,0 +1,312 @@
+"""SQL composition for RawTable.
+
+The RawTableSQL mixin composes the (psycopg2.sql) SQL of the RawTable queries without
+executing it. The same SQL is executed synchronously by RawTable and asynchronously by
+AsyncRawTable (see async_table.py).
+"""
+
+from copy import deepcopy
+from string import Formatter
+from typing import Any, Iterable, Literal
+
+from psycopg2 import sql
+from psycopg2.extras import Json
+
+from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.text_token import TextToken, register_token_code
+from egpdb.configuration import TableConfig
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+register_token_code(
+    "E05006", "Recursive select on table {table} requires ptr_map to be configured."
+)
+
+
+# Parses the '{column/literal}' labels in query strings
+_FORMATTER = Formatter()
+_TABLE_RECURSIVE_SELECT = sql.SQL(
+    "WITH RECURSIVE rq AS (SELECT {0} FROM {1} {2} UNION {5}SELECT {3} FROM {1} t INNER JOIN"
+    " rq r ON {4}) SELECT * FROM rq"
+)
+_TABLE_RECURSIVE_DEPTH_SELECT = sql.SQL(
+    "WITH RECURSIVE rq AS (SELECT {0}, 0 AS {6} FROM {1} {2} UNION {5}SELECT {3}, r.{6} + 1"
+    " FROM {1} t INNER JOIN rq r ON ({4}) WHERE r.{6} < {7}) SELECT {0} FROM rq"
+)
+_TABLE_RECURSIVE_DEPTH_COLUMN = sql.Identifier("_rq_depth")
+_TABLE_SELECT_SQL = sql.SQL("SELECT {0} FROM {1} {2}")
+_TABLE_INSERT_SQL = sql.SQL("INSERT INTO {0} ({1}) VALUES {2} ON CONFLICT ")
+_TABLE_COPY_TEMP_SQL = sql.SQL(
+    "CREATE TEMP TABLE {0} ON COMMIT DROP AS SELECT {1} FROM {2} WITH NO DATA"
+)
+_TABLE_COPY_SQL = sql.SQL("COPY {0} ({1}) FROM STDIN")
+_TABLE_COPY_INSERT_SQL = sql.SQL("INSERT INTO {0} ({1}) SELECT {1} FROM {2} ON CONFLICT ")
+# The update_str of an insert (see RawTable.insert())
+INSERT_CONFLICT_STR = "DO NOTHING"
+_TABLE_UPSERT_CONFLICT_STR = "{0} DO UPDATE SET "
+_TABLE_UPDATE_WHERE_SQL = sql.SQL("UPDATE {0} SET {1} WHERE {2}")
+_TABLE_UPDATE_SQL = sql.SQL("UPDATE {0} SET {1}")
+_TABLE_DELETE_SQL = sql.SQL("DELETE FROM {0} WHERE {1}")
+_TABLE_RETURNING_SQL = sql.SQL(" RETURNING ")
+_DEFAULT_UPDATE_STR = "{{{0}}}={{EXCLUDED.{0}}}"
+
+
+class RawTableSQL:  # pylint: disable=too-few-public-methods
+    """Compose the SQL of the RawTable queries. A mixin for RawTable."""
+
+    # Defined by RawTable
+    columns: set[str]
+    config: TableConfig
+    primary_key: str | None
+    _json_columns: set[str]
+    _table: sql.Identifier
+
+    def __init__(self, ptr_map: dict[str, str]) -> None:
+        """Define the pointer map of recursive selects (see ptr_map_def())."""
+        self._pm: dict[str, str] = {}
+        self._pm_columns: set[str] = set()
+        self._pm_sql: sql.Composed = sql.Composed([])
+        self.ptr_map_def(ptr_map)
+
+    def _bulk_upsert_sql(
+        self, columns, update_str, literals: dict[str, Any] | None
+    ) -> tuple[sql.Composed, sql.Composed, sql.Composed]:
+        """Compose the bulk_upsert() SQL: create the temporary table, COPY & upsert."""
+        conflict_sql: sql.Composed = self._conflict_sql(columns, update_str, literals)
+        temp_table = sql.Identifier("_copy_" + self.config["table"])
+        columns_sql = sql.SQL(",").join([sql.Identifier(k) for k in columns])
+        pre_sql = _TABLE_COPY_TEMP_SQL.format(temp_table, columns_sql, self._table)
+        copy_sql = _TABLE_COPY_SQL.format(temp_table, columns_sql)
+        post_sql = (
+            _TABLE_COPY_INSERT_SQL.format(self._table, columns_sql, temp_table) + conflict_sql
+        )
+        return pre_sql, copy_sql, post_sql
+
+    def _check_literals(self, literals: dict[str, Any]) -> None:
+        """Raise a ValueError if a literal has the name of a table column."""
+        dupes: set[str] = set(literals.keys()).intersection(self.columns)
+        if dupes:
+            raise ValueError(
+                f"Literals cannot have keys that are the names of table columns:{dupes}"
+            )
+
+    def _conflict_sql(
+        self, columns, update_str=None, literals: dict[str, Any] | None = None
+    ) -> sql.Composed:
+        """Return the SQL after ON CONFLICT for an upsert of columns. See upsert()."""
+        if literals is None:
+            literals = {}
+        if update_str is None:
+            update_str = ",".join(
+                (_DEFAULT_UPDATE_STR.format(k) for k in columns if k != self.primary_key)
+            )
+        if update_str != INSERT_CONFLICT_STR:
+            if self.primary_key is None:
+                raise ValueError("Can only upsert if a primary key is defined.")
+            update_str = (
+                _TABLE_UPSERT_CONFLICT_STR.format("({" + self.primary_key + "})") + update_str
+            )
+        format_dict = self._format_dict(literals)
+        format_dict.update(
+            {"EXCLUDED." + k: sql.SQL("EXCLUDED.") + sql.Identifier(k) for k in columns}
+        )
+        return sql.SQL(update_str).format(**format_dict)
+
+    def _delete_sql(
+        self, query_str: str, literals: dict[str, Any] | None, returning
+    ) -> sql.Composed:
+        """Compose the delete() SQL."""
+        if literals is None:
+            literals = {}
+        if returning == "*":
+            returning = self.columns
+        format_dict = self._format_dict(literals)
+        sql_str = _TABLE_DELETE_SQL.format(self._table, sql.SQL(query_str).format(**format_dict))
+        if returning:
+            sql_str += _TABLE_RETURNING_SQL + sql.SQL(",").join(
+                [sql.Identifier(column) for column in returning]
+            )
+        return sql_str
+
+    def _format_dict(
+        self, literals: dict[str, Any] | None
+    ) -> dict[str, sql.Identifier | sql.Literal]:
+        """Create a formatting dict of literals and column identifiers."""
+        format_dict: dict[str, sql.Identifier | sql.Literal] = {
+            k: sql.Identifier(k) for k in self.columns
+        }
+        format_dict[self.config["table"]] = self._table
+        if literals is not None:
+            self._check_literals(literals)
+            format_dict.update({k: sql.Literal(v) for k, v in literals.items()})
+        return format_dict
+
+    def _recursive_select_sql(
+        self,
+        query_str: str,
+        literals: dict[str, Any] | None,
+        columns: Literal["*"] | Iterable[str],
+        dedupe: bool,
+        max_depth: int | None,
+    ) -> sql.Composed:
+        """Compose the recursive_select() SQL."""
+        if literals is None:
+            literals = {}
+        if not self._pm:
+            raise ValueError(TextToken({"E05006": {"table": self.config["table"]}}))
+
+        if columns == "*":
+            columns = self.columns
+        else:
+            columns = list(columns)
+            for ptr in self._pm_columns:
+                if ptr not in columns:
+                    columns.append(ptr)
+        t_columns: sql.Composed = sql.SQL("t.") + sql.SQL(", t.").join(map(sql.Identifier, columns))
+        _columns: sql.Composed = sql.SQL(", ").join(map(sql.Identifier, columns))
+        format_dict: dict[str, sql.Identifier | sql.Literal] = self._format_dict(literals)
+        if max_depth is None:
+            sql_str: sql.Composed = _TABLE_RECURSIVE_SELECT.format(
+                _columns,
+                self._table,
+                sql.SQL(query_str).format(**format_dict),
+                t_columns,
+                self._pm_sql,
+                sql.SQL(("ALL ", "")[dedupe]),
+            )
+        else:
+            if max_depth < 0:
+                raise ValueError("max_depth must be >= 0")
+            sql_str = _TABLE_RECURSIVE_DEPTH_SELECT.format(
+                _columns,
+                self._table,
+                sql.SQL(query_str).format(**format_dict),
+                t_columns,
+                self._pm_sql,
+                sql.SQL(("ALL ", "")[dedupe]),
+                _TABLE_RECURSIVE_DEPTH_COLUMN,
+                sql.Literal(max_depth),
+            )
+        return sql_str
+
+    def _select_sql(
+        self,
+        query_str: str,
+        literals: dict[str, Any],
+        columns: Literal["*"] | str | tuple[str, ...],
+    ) -> sql.Composed:
+        """Compose the select() SQL with literals inlined."""
+        if columns == "*":
+            columns = tuple(self.columns)
+        format_dict: dict[str, sql.Identifier | sql.Literal] = self._format_dict(literals)
+        if isinstance(columns, str):
+            _columns: sql.Composed = sql.SQL(columns).format(**format_dict)
+        else:
+            _columns = sql.SQL(", ").join(map(sql.Identifier, columns))
+        return _TABLE_SELECT_SQL.format(
+            _columns, self._table, sql.SQL(query_str).format(**format_dict)
+        )
+
+    def _select_template(
+        self, query_str: str, columns: str | tuple[str, ...]
+    ) -> tuple[sql.Composed, tuple[str, ...]] | None:
+        """Return the select statement with $n parameters for literals and the literal labels.
+
+        Labels that are not column (or the table) names are literals. Parameters are numbered
+        in the order the labels first appear in query_str. Returns None if there is a literal
+        in the columns: the server does not infer the type of a select list parameter (it is
+        text) so those literals must be inlined.
+        """
+        format_dict: dict[str, sql.Composable] = {k: sql.Identifier(k) for k in self.columns}
+        format_dict[self.config["table"]] = self._table
+        if isinstance(columns, str) and columns != "*":
+            for _, label, _, _ in _FORMATTER.parse(columns):
+                if label is not None and label not in format_dict:
+                    return None
+        labels: list[str] = []
+        for _, label, _, _ in _FORMATTER.parse(query_str):
+            if label is not None and label not in format_dict:
+                labels.append(label)
+                format_dict[label] = sql.SQL(f"${len(labels)}")
+        if columns == "*":
+            _columns: sql.Composable = sql.SQL(", ").join(map(sql.Identifier, self.columns))
+        elif isinstance(columns, str):
+            _columns = sql.SQL(columns).format(**format_dict)
+        else:
+            _columns = sql.SQL(", ").join(map(sql.Identifier, columns))
+        statement: sql.Composed = _TABLE_SELECT_SQL.format(
+            _columns, self._table, sql.SQL(query_str).format(**format_dict)
+        )
+        return statement, tuple(labels)
+
+    def _update_sql(
+        self, update_str, query_str, literals: dict[str, Any] | None, returning
+    ) -> sql.Composed:
+        """Compose the update() SQL."""
+        if literals is None:
+            literals = {}
+        if returning == "*":
+            returning = self.columns
+        format_dict = self._format_dict(literals)
+        if query_str is not None:
+            sql_str = _TABLE_UPDATE_WHERE_SQL.format(
+                self._table,
+                sql.SQL(update_str).format(**format_dict),
+                sql.SQL(query_str).format(**format_dict),
+            )
+        else:
+            sql_str = _TABLE_UPDATE_SQL.format(
+                self._table, sql.SQL(update_str).format(**format_dict)
+            )
+        if returning:
+            sql_str += _TABLE_RETURNING_SQL + sql.SQL(",").join(
+                [sql.Identifier(column) for column in returning]
+            )
+        return sql_str
+
+    def _upsert_sql(
+        self, columns, values, update_str, literals: dict[str, Any] | None, returning
+    ) -> sql.Composed | None:
+        """Compose the upsert() SQL. None if there are no values to upsert."""
+        if returning == "*":
+            returning = self.columns
+        update_sql: sql.Composed = self._conflict_sql(columns, update_str, literals)
+        columns_sql = sql.SQL(",").join([sql.Identifier(k) for k in columns])
+        values_sql = sql.SQL(",").join(
+            sql.SQL("({0})").format(
+                sql.SQL(",").join(
+                    (sql.Literal(Json(value)) if col in self._json_columns else sql.Literal(value))
+                    for value, col in zip(row, columns)
+                )
+            )
+            for row in values
+        )
+        if not values_sql.seq:
+            return None
+        if returning:
+            update_sql += _TABLE_RETURNING_SQL + sql.SQL(",").join(
+                [sql.Identifier(column) for column in returning]
+            )
+        return _TABLE_INSERT_SQL.format(self._table, columns_sql, values_sql) + update_sql
+
+    def ptr_map_def(self, ptr_map: dict[str, str]) -> None:
+        """Define how a recursive select traverses the graph.
+
+        If the rows in the table define nodes in a graph then the pointer map defines
+        the edges between nodes.
+
+        self.config['ptr_map'] is of the form {
+            "column X": "column Y",
+            ...
+        }
+        where columns X contains a reference to a node identified by column Y.
+        """
+        pm_sql: list[sql.Composed] = [
+            sql.SQL("r.") + sql.Identifier(r) + sql.SQL("=t.") + sql.Identifier(i)
+            for r, i in ptr_map.items()
+        ]
+        self._pm_sql = sql.SQL(" OR ").join(pm_sql)
+        self._pm = deepcopy(ptr_map)
+        self._pm_columns = set(ptr_map.keys()) | set(ptr_map.values())
@@ -1,6 +1,11 @@
-"""Row iterators for decoding database cursor results into Python containers."""
+"""Row iterators for decoding database cursor results into Python containers.
+
+async_rows() is the asynchronous generator equivalent of the row iterators for asynchronous
+(asyncio) query results (see async_table.py).
+"""
 
 from collections import namedtuple
+from collections.abc import AsyncGenerator, AsyncIterable, Sequence
 from typing import Any, Callable, Iterable, Literal, Self
 
 from psycopg2.extensions import cursor
@@ -42,30 +47,31 @@ class BaseIter:
         return self
 
     def __next__(self) -> Any:
-        """Never gets run."""
+        """Return next value."""
+        # deepcode ignore unguarded~next~call: next() is guarded by the outer next() call
+        return self.convert(next(self.values))
+
+    def convert(self, row: Sequence[Any]) -> Any:
+        """Return the container of the decoded values of row. Defined by subclasses."""
         raise NotImplementedError
 
 
 class GenIter(BaseIter):
     """Iterator returning a generator for decoded values from values."""
 
-    def __next__(self) -> Any:
-        """Return next value."""
+    def convert(self, row: Sequence[Any]) -> Any:
+        """Return a generator of the decoded values of row."""
         # No strict because pk may be tagged on the end of the values but not in the columns
-        # deepcode ignore unguarded~next~call: next() is guarded by the outer next() call
-        return (v if f is None else f(v) for f, v in zip(self.conversions, next(self.values)))
+        return (v if f is None else f(v) for f, v in zip(self.conversions, row))
 
 
 class TupleIter(BaseIter):
     """Iterator returning a tuple for decoded values from values."""
 
-    def __next__(self) -> Any:
-        """Return next value."""
-        return tuple(
-            # No strict because pk may be tagged on the end of the values but not in the columns
-            # deepcode ignore unguarded~next~call: next() is guarded by the outer next() call
-            (v if f is None else f(v) for f, v in zip(self.conversions, next(self.values)))
-        )
+    def convert(self, row: Sequence[Any]) -> Any:
+        """Return a tuple of the decoded values of row."""
+        # No strict because pk may be tagged on the end of the values but not in the columns
+        return tuple((v if f is None else f(v) for f, v in zip(self.conversions, row)))
 
 
 class NamedTupleIter(BaseIter):
@@ -75,27 +81,55 @@ class NamedTupleIter(BaseIter):
         super().__init__(columns, values, _table, code)
         self.namedtuple = namedtuple("row", columns)
 
-    def __next__(self) -> Any:
-        """Return next value."""
-        return self.namedtuple(
+    def convert(self, row: Sequence[Any]) -> Any:
+        """Return a namedtuple of the decoded values of row."""
+        return self.namedtuple._make(
             # No strict because pk may be tagged on the end of the values but not in the columns
-            # deepcode ignore unguarded~next~call: next() is guarded by the outer next() call
-            (v if f is None else f(v) for f, v in zip(self.conversions, next(self.values)))
+            v if f is None else f(v)
+            for f, v in zip(self.conversions, row)
         )
 
 
 class DictIter(BaseIter):
     """Iterator returning a dict for decoded values from values."""
 
-    def __next__(self) -> Any:
-        """Return next value."""
+    def convert(self, row: Sequence[Any]) -> Any:
+        """Return a dict of the decoded values of row."""
         return {
             c: v if f is None else f(v)
             # No strict because pk may be tagged on the end of the values but not in the columns
-            # deepcode ignore unguarded~next~call: next() is guarded by the outer next() call
-            for c, f, v in zip(self.columns, self.conversions, next(self.values))
+            for c, f, v in zip(self.columns, self.conversions, row)
         }
 
 
 RowIter = TupleIter | NamedTupleIter | GenIter | DictIter
 RawCType = Literal["tuple", "namedtuple", "dict"]
+AsyncRowIter = AsyncGenerator[Any, None]
+
+
+async def async_rows(
+    iter_type: type[BaseIter],
+    columns: Iterable[str],
+    values: AsyncIterable[Sequence[Any]] | Iterable[Sequence[Any]],
+    _table,
+    code: str = "decode",
+) -> AsyncRowIter:
+    """Asynchronous generator equivalent of the row iterator iter_type.
+
+    Yields the same containers of decoded values as iter_type(columns, values, _table, code)
+    would return. e.g. async_rows(DictIter, ...) yields dicts.
+
+    Args
+    ----
+    iter_type: The row iterator class e.g. DictIter.
+    columns: Column names for each of the rows in values.
+    values: Asynchronous iterable (e.g. a streamed query result) or iterable (e.g. a cursor
+        of fetched rows) of rows with values in the order of columns.
+    """
+    converter: BaseIter = iter_type(columns, None, _table, code)
+    if isinstance(values, AsyncIterable):
+        async for row in values:
+            yield converter.convert(row)
+    else:
+        for row in values:
+            yield converter.convert(row)
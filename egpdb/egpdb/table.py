@@ -7,7 +7,7 @@ from typing import Any, Callable, Iterable, Literal
 from egpcommon.egp_log import FLOW, Logger, egp_logger
 from egpcommon.text_token import TextToken
 from egpdb.configuration import TableConfig
-from egpdb.raw_table import RawTable
+from egpdb.raw_table import COPY_CHUNK_SIZE, RawTable
 from egpdb.row_iterators import DictIter, GenIter, NamedTupleIter, RowIter, TupleIter
 
 # Standard EGP logging pattern
@@ -48,6 +48,7 @@ class Table:
                 self.select(
                     "WHERE {" + self.raw.primary_key + "} = {_pk_value}",
                     {"_pk_value": encoded_pk_value},
+                    bounded=True,
                 )
             )
         except StopIteration:
@@ -93,6 +94,7 @@ class Table:
                 self.select(
                     "WHERE {" + self.raw.primary_key + "} = {_pk_value}",
                     {"_pk_value": encoded_pk_value},
+                    bounded=True,
                 )
             )
         except StopIteration as stop_iteration:
@@ -145,7 +147,7 @@ class Table:
                     TextToken({"I05004": {"table": self.raw.config["table"], "file": abspath}}),
                 )
                 with open(abspath, "r", encoding="utf-8") as file_ptr:
-                    self.insert(load(file_ptr))
+                    self.bulk_insert(load(file_ptr))
 
     def _return_container(self, columns: Iterable[str], values, container="dict") -> RowIter:
         _columns: Iterable[str] = self.raw.columns if columns == "*" else columns
@@ -157,6 +159,55 @@ class Table:
             return GenIter(_columns, values, self)
         return DictIter(_columns, values, self)
 
+    def bulk_insert(self, values_dict, exclude=tuple(), chunk_size: int = COPY_CHUNK_SIZE) -> int:
+        """Insert values streamed with COPY FROM STDIN. See bulk_upsert().
+
+        Rows that conflict with an existing row are not inserted.
+        """
+        return sum(
+            self.raw.bulk_insert(
+                columns, TupleIter(columns, iter(values), self, "encode"), chunk_size
+            )
+            for columns, values in self.raw.batch_dict_data(values_dict, exclude)
+        )
+
+    def bulk_upsert(
+        self,
+        values_dict,
+        update_str=None,
+        literals: dict[str, Any] | None = None,
+        exclude=tuple(),
+        chunk_size: int = COPY_CHUNK_SIZE,
+    ) -> int:
+        """Upsert values streamed with COPY FROM STDIN.
+
+        A faster alternative to upsert() for large numbers of rows. Rows cannot be returned.
+        See RawTable.bulk_upsert().
+
+        Args
+        ----
+        values_dict: Keys are column names. Values will be encoded by the registered conversion
+            function (if any).
+        update_str: Update SQL (see upsert()).
+        literals: Keys are labels used in update_str. Values are literals to replace the labels.
+        exclude: Iterable of columns to exclude from the upsert.
+        chunk_size: The maximum number of rows streamed in one COPY.
+
+        Returns
+        -------
+        The number of rows inserted or updated.
+        """
+        return sum(
+            self.raw.bulk_upsert(
+                columns,
+                TupleIter(columns, iter(values), self, "encode"),
+                update_str,
+                literals,
+                chunk_size,
+            )
+            for columns, values in self.raw.batch_dict_data(values_dict, exclude)
+        )
+
     def columns(self) -> set[str]:
         """Return a tuple of all column names."""
         return self.raw.columns
@@ -239,6 +290,7 @@ class Table:
                 self.select(
                     "WHERE {" + self.raw.primary_key + "} = {_pk_value}",
                     {"_pk_value": encoded_pk_value},
+                    bounded=True,
                 )
             )
         except StopIteration:
@@ -280,6 +332,7 @@ class Table:
         columns: Literal["*"] | Iterable[str] = "*",
         container: str = "dict",
         dedupe: bool = True,
+        max_depth: int | None = None,
     ) -> RowIter:
         """Recursive select of columns to return for rows matching query_str.
 
@@ -315,12 +368,17 @@ class Table:
 
         dedupe (bool): Duplicate entries are removed from the result when True.
 
+        max_depth (int | None): The maximum number of pointers followed from the rows matching
+        query_str. None follows all pointers. See RawTable.recursive_select().
+
         Returns
         -------
         An iterator of the values specified by columns for the specified recursive query_str
         and pointer map.
         """
-        values = self.raw.recursive_select(query_str, literals, columns, dedupe=dedupe)
+        values = self.raw.recursive_select(
+            query_str, literals, columns, dedupe=dedupe, max_depth=max_depth
+        )
         return self._return_container(columns, values, container)
 
     def register_conversion(self, column, encode_func, decode_func):
@@ -346,6 +404,7 @@ class Table:
         literals: dict[str, Any] | None = None,
         columns: Literal["*"] | Iterable[str] = "*",
         container: str = "dict",
+        bounded: bool | None = None,
     ) -> RowIter:
         """Select columns to return for rows matching query_str.
 
@@ -371,12 +430,15 @@ class Table:
         namedtuples are in the order of columns & have column names.
         Any other value: Returns an iterator that returns dicts where the keys are column names.
 
+        bounded: True if the query returns few rows (uses a client-side cursor). If None
+        determined from the query_str LIMIT. See RawTable.select().
+
         Returns
         -------
         An iterator of the values specified by columns for the specified query_str.
         """
         return self._return_container(
-            columns, self.raw.select(query_str, literals, columns), container
+            columns, self.raw.select(query_str, literals, columns, bounded=bounded), container
         )
 
     def update(
@@ -47,6 +47,8 @@ GC_TABLE_CONVERSIONS: tuple[tuple[str, Callable | None, Callable | None], ...] =
     for name, field in GGC_KVT.items()
     if field.get("signature", False)
 )
+# The GCA & GCB columns reference sub-GC rows by signature (see RawTable.recursive_select())
+GC_TABLE_PTR_MAP: dict[str, str] = {"gca": "signature", "gcb": "signature"}
 META_TABLE_SCHEMA: dict[str, ColumnSchema] = {
     "created": ColumnSchema(db_type="TIMESTAMP", nullable=False),
     "creator": ColumnSchema(db_type="UUID", nullable=False),
@@ -185,6 +187,7 @@ class DBManager:
             create_table=True,
             delete_table=self._delete,
             conversions=GC_TABLE_CONVERSIONS,
+            ptr_map=GC_TABLE_PTR_MAP,
         )
         return Table(table_config)
 
@@ -5,6 +5,7 @@ from os.path import dirname, join
 from typing import Any, Literal
 from uuid import uuid4
 
+from egpcommon.bloom_filter import BloomFilter
 from egpcommon.common import EGP_DEV_PROFILE, EGP_PROFILE
 from egpcommon.egp_log import Logger, egp_logger
 from egpcommon.manage_github_data import download_data
@@ -12,12 +13,15 @@ from egpcommon.security import load_signature_data, load_signed_json_list
 from egpdb.table import RowIter
 from egpdbmgr.db_manager import DBManager, DBManagerConfig
 from egppy.gene_pool.gene_pool_interface_abc import GPIABC
+from egppy.genetic_code.frozen_ggc import FrozenGGC
 from egppy.genetic_code.genetic_code import GCABC
 from egppy.genetic_code.ggc_dict import GGCDict
 from egppy.genetic_code.gpg_view import GPGCView
 from egppy.populations.configuration import PopulationConfig
 from egppy.storage.cache.cache import DictCache
 from egppy.storage.store.db_table_store import DBTableStore
+from egppy.storage.store.shared_memory_store import SharedMemoryStore
+from egppy.storage.store.store_abc import StoreABC
 
 # Standard EGP logging pattern
 _logger: Logger = egp_logger(name=__name__)
@@ -27,6 +31,11 @@ _logger: Logger = egp_logger(name=__name__)
 SOURCE_FILES = tuple(
     join(dirname(__file__), "..", "data", filename) for filename in ("codons.json",)
 )
+# Known signatures Bloom filter minimum capacity & target false positive rate
+KNOWN_MIN_CAPACITY: int = 2**16
+KNOWN_FP_RATE: float = 0.01
+# Maximum size of a JSON serialized GGC in the shared memory store
+SHARED_VALUE_SIZE: int = 2**13
 
 
 class GenePoolInterface(GPIABC, Hashable):
@@ -37,8 +46,28 @@ class GenePoolInterface(GPIABC, Hashable):
     and provides methods to pull and push Genetic Codes to and from it.
     """
 
-    def __init__(self, config: DBManagerConfig, cache_size: int = 2**16) -> None:
-        """Initialize the Gene Pool Interface."""
+    def __init__(
+        self,
+        config: DBManagerConfig,
+        cache_size: int = 2**16,
+        shared_cache_size: int = 0,
+        single_writer: bool = False,
+    ) -> None:
+        """Initialize the Gene Pool Interface.
+
+        Args:
+            config: The Gene Pool DB Manager configuration.
+            cache_size: The maximum number of GC's in the local (process) cache.
+            shared_cache_size: The maximum number of GC's in the host level shared memory
+                store between the local cache & the database. The store is shared with
+                worker processes forked after the GPI is created. 0 = no shared store.
+            single_writer: True if this GPI is the only writer to the Gene Pool. Lookups of
+                signatures not in the known signatures Bloom filter then return without
+                querying the database. Must be False if any other process (including
+                worker processes sharing the shared memory store) adds GC's.
+        """
+        if single_writer and shared_cache_size > 0:
+            raise ValueError("A GPI with a shared memory store cannot be the single writer.")
         # Ensure latest data files are available before loading sources
         download_data()
         self._dbm = DBManager(config)
@@ -46,13 +75,20 @@ class GenePoolInterface(GPIABC, Hashable):
         if self._should_reload_sources():
             _logger.info("Developer mode: Reloading Gene Pool data sources.")
             self._dbm = DBManager(config, delete=True)
-        self._local_dbt = DBTableStore(self._dbm.managed_gc_table.raw.config, GPGCView, GGCDict)
+        self._local_dbt = DBTableStore(self._dbm.managed_gc_table.raw.config, GPGCView, FrozenGGC)
+        self._shared: SharedMemoryStore | None = None
+        next_level: StoreABC = self._local_dbt
+        if shared_cache_size > 0:
+            self._shared = SharedMemoryStore(
+                FrozenGGC, shared_cache_size, self._local_dbt, value_size=SHARED_VALUE_SIZE
+            )
+            next_level = self._shared
         self._ggc_cache = DictCache(
             {
                 "max_items": cache_size,
                 "purge_count": cache_size // 4,
-                "flavor": GGCDict,
-                "next_level": self._local_dbt,
+                "flavor": FrozenGGC,
+                "next_level": next_level,
             }
         )
 
@@ -64,7 +100,7 @@ class GenePoolInterface(GPIABC, Hashable):
 
                 # Load the data into the GGC cache
                 for ggc_json in load_signed_json_list(filename):
-                    ggc = GGCDict(ggc_json)
+                    ggc = FrozenGGC(ggc_json)
                     self._ggc_cache[ggc["signature"]] = ggc
 
                 # Add the source file to the sources table
@@ -75,9 +111,27 @@ class GenePoolInterface(GPIABC, Hashable):
             # Make sure all data is written to the database
             self._ggc_cache.copyback()
 
+        # Signatures known to be in the Gene Pool. Used to answer definite negatives
+        # without querying the database. GC's inserted into the database by other
+        # processes are not known so the filter is only used by a single writer.
+        self._known: BloomFilter | None = (
+            self._build_known(KNOWN_MIN_CAPACITY) if single_writer else None
+        )
+
     def __contains__(self, signature: bytes) -> bool:
-        """Check if a Genetic Code exists in the local cache using its signature."""
-        return signature in self._ggc_cache
+        """Check if a Genetic Code exists in the Gene Pool using its signature.
+        Without a known signatures Bloom filter (see single_writer) only the local cache is
+        checked. With one the Gene Pool database is also queried for signatures that may be
+        in it (see _may_exist()).
+        """
+        if signature in self._ggc_cache:
+            return True
+        if self._known is None or not self._may_exist(signature):
+            return False
+        if signature in self._local_dbt:
+            return True
+        self._false_positive()
+        return False
 
     def __eq__(self, other: object) -> bool:
         """Check if two Gene Pool Interfaces are equal based on their hash."""
@@ -88,20 +142,76 @@ class GenePoolInterface(GPIABC, Hashable):
     def __hash__(self) -> int:
         return hash(self.uuid)
 
-    def __getitem__(self, gc: bytes | GGCDict) -> GGCDict:
+    def __getitem__(self, gc: bytes | GCABC) -> GCABC:
         """Get a Genetic Code by its signature."""
         # TODO: Need to handle the case where the GC is not found in the GP.
         # In that case we fall back to the microbiome GPL (which will fallback
         # to the biome GPL etc.) and we could receive a timeout or rate limit
         # response.
-        assert isinstance(gc, (bytes, GGCDict)), "gc must be bytes or GGCDict"
-        return self._ggc_cache[gc["signature"] if isinstance(gc, GGCDict) else gc]
+        assert isinstance(gc, (bytes, GCABC)), "gc must be bytes or GCABC"
+        signature: bytes = gc["signature"] if isinstance(gc, GCABC) else gc
+        if signature in self._ggc_cache:
+            return self._ggc_cache[signature]
+        if not self._may_exist(signature):
+            raise KeyError(f"Genetic Code {signature.hex()} is not in the Gene Pool.")
+        try:
+            return self._ggc_cache[signature]
+        except KeyError:
+            self._false_positive()
+            raise
 
     def __setitem__(self, signature: bytes, value: GCABC) -> None:
         """Place a genetic code in the cache. NB: It is not persisted to the
         database until the cache is flushed / purged.
         """
-        self._ggc_cache[signature] = value if isinstance(value, GGCDict) else GGCDict(value)
+        self._ggc_cache[signature] = value if isinstance(value, FrozenGGC) else FrozenGGC(value)
+        self._add_known(signature)
+
+    def _add_known(self, signature: bytes) -> None:
+        """Add a signature to the known signatures Bloom filter (if there is one).
+        A saturated filter is rebuilt when it is next queried (see _may_exist()) rather
+        than here, on the write path.
+        """
+        if self._known is not None:
+            self._known.add(signature)
+
+    def _build_known(self, min_capacity: int) -> BloomFilter:
+        """Build the known signatures Bloom filter.
+
+        The filter is built from the signatures in the Gene Pool database & the local
+        cache (which may not have been written to the database yet).
+
+        Args:
+            min_capacity: The minimum capacity of the filter.
+
+        Returns:
+            The Bloom filter of known signatures.
+        """
+        signatures: set[bytes] = set(self._local_dbt.keys())
+        signatures.update(self._ggc_cache)
+        known = BloomFilter(
+            "Known signatures", max(min_capacity, 2 * len(signatures)), KNOWN_FP_RATE
+        )
+        known.update(signatures)
+        return known
+
+    def _false_positive(self, num: int = 1) -> None:
+        """Record num known signatures Bloom filter false positives (if there is one)."""
+        if self._known is not None:
+            self._known.false_positive(num)
+
+    def _may_exist(self, signature: bytes) -> bool:
+        """Return False if the signature is definitely not in the Gene Pool database.
+        Without a known signatures Bloom filter (see single_writer) any signature may be.
+        A saturated filter is rebuilt with twice the capacity before it is queried.
+        """
+        known: BloomFilter | None = self._known
+        if known is None:
+            return True
+        if known.saturated():
+            _logger.info("Known signatures Bloom filter is saturated: Rebuilding.")
+            self._known = known = self._build_known(2 * known.capacity)
+        return signature in known
 
     def _should_reload_sources(self) -> bool:
         """Determine if the Gene Pool sources should be reloaded.
@@ -125,7 +235,7 @@ class GenePoolInterface(GPIABC, Hashable):
             return bool(hashes)
         return num_entries < len(SOURCE_FILES)
 
-    def add(self, value: GCABC) -> GGCDict:
+    def add(self, value: GCABC) -> GCABC:
         """Place a genetic code in the cache. NB: It is not persisted to the
         database until the cache is flushed / purged.
 
@@ -133,18 +243,102 @@ class GenePoolInterface(GPIABC, Hashable):
         and the value is returned from the cache.
         """
         signature = value["signature"]
-        self._ggc_cache[signature] = value if isinstance(value, GGCDict) else GGCDict(value)
+        self._ggc_cache[signature] = value if isinstance(value, FrozenGGC) else FrozenGGC(value)
+        self._add_known(signature)
         return self._ggc_cache[signature]
 
+    def bloom_filter_info(self) -> str:
+        """Log and return the known signatures Bloom filter statistics."""
+        if self._known is None:
+            info_str = "Known signatures Bloom filter disabled: not a single writer."
+            _logger.info(info_str)
+            return info_str
+        return self._known.info()
+
+    def close(self) -> None:
+        """Write the local cache back to the Gene Pool and release the shared memory store."""
+        self._ggc_cache.copyback()
+        if self._shared is not None:
+            _logger.info(self._shared.info())
+            self._shared.close()
+            self._shared = None
+
     def consistency(self) -> None:
         """Check the consistency of the Gene Pool."""
         pass
 
+    def get_many(self, signatures: Iterable[bytes]) -> dict[bytes, GCABC]:
+        """Get multiple Genetic Codes by their signatures.
+
+        Genetic Codes that are not in the local cache are fetched from the Gene Pool
+        database in a single query (per DBTableStore batch) rather than one query each.
+        Signatures that are definitely not in the Gene Pool (see _may_exist()) are not
+        queried.
+
+        Args:
+            signatures: The signatures of the Genetic Codes to get.
+
+        Returns:
+            The Genetic Codes found indexed by signature. Signatures that are not
+            found are omitted.
+        """
+        cache: DictCache = self._ggc_cache
+        candidates: list[bytes] = [
+            sig for sig in dict.fromkeys(signatures) if sig in cache or self._may_exist(sig)
+        ]
+        retval: dict[bytes, GCABC] = cache.get_many(candidates)  # type: ignore
+        if len(retval) < len(candidates):
+            self._false_positive(len(candidates) - len(retval))
+        return retval
+
     def initial_generation_query(self, pconfig: PopulationConfig) -> list[bytes]:
         """Query the Gene Pool for the initial generation of this population."""
         # Place holder for the actual implementation
         return []
 
+    def most_referenced(self, limit: int) -> tuple[bytes, ...]:
+        """Return the signatures of the most referenced Genetic Codes in the Gene Pool.
+
+        Args:
+            limit: The maximum number of signatures to return.
+
+        Returns:
+            Signatures in descending reference count order.
+        """
+        row_iter = self._dbm.managed_gc_table.select(
+            " ORDER BY {reference_count} DESC LIMIT {limit}",
+            {"limit": limit},
+            columns=("signature",),
+            container="tuple",
+        )
+        return tuple(row[0] for row in row_iter)
+
+    def prefetch_tree(self, signature: bytes, max_depth: int | None = None) -> int:
+        """Load the sub-GC closure of a Genetic Code into the local cache.
+
+        The Genetic Code and all the Genetic Codes reachable through the GCA & GCB
+        pointers are fetched from the Gene Pool database with one recursive query.
+
+        Args:
+            signature: The signature of the root Genetic Code.
+            max_depth: The maximum depth of the sub-GC tree to fetch. None fetches the
+                whole closure.
+
+        Returns:
+            The number of Genetic Codes in the closure. 0 if the Genetic Code is already
+            cached (nothing is fetched) or is not in the Gene Pool.
+        """
+        if signature in self._ggc_cache or not self._may_exist(signature):
+            return 0
+        row_iter = self._dbm.managed_gc_table.recursive_select(
+            "WHERE {signature} = {_signature}", {"_signature": signature}, max_depth=max_depth
+        )
+        rows = ((row["signature"], FrozenGGC.from_row(row)) for row in row_iter)
+        num: int = len(self._ggc_cache.load(rows))
+        if not num:
+            self._false_positive()
+        return num
+
     def select(
         self,
         filter_sql: str,
@@ -1,12 +1,12 @@
 """The Gene Pool Interface Abstract Base Class."""
 
 from abc import abstractmethod
+from collections.abc import Iterable
 
 from egpcommon.common_obj_abc import CommonObjABC
 from egpcommon.egp_log import Logger, egp_logger
 from egpdbmgr.configuration import DBManagerConfig
 from egppy.genetic_code.genetic_code import GCABC
-from egppy.genetic_code.ggc_dict import GGCDict
 from egppy.populations.configuration import PopulationConfig
 
 # Standard EGP logging pattern
@@ -32,7 +32,7 @@ class GPIABC(CommonObjABC):
         raise NotImplementedError("GPIABC.__contains__ must be overridden")
 
     @abstractmethod
-    def __getitem__(self, item: bytes) -> GGCDict:
+    def __getitem__(self, item: bytes) -> GCABC:
         """Get a Genetic Code by its signature."""
         raise NotImplementedError("GPIABC.__getitem__ must be overridden")
 
@@ -42,7 +42,7 @@ class GPIABC(CommonObjABC):
         raise NotImplementedError("GPIABC.__setitem__ must be overridden")
 
     @abstractmethod
-    def add(self, value: GCABC) -> GGCDict:
+    def add(self, value: GCABC) -> GCABC:
         """Place a genetic code in the cache. NB: It is not persisted to the
         database until the cache is flushed / purged.
 
@@ -51,7 +51,21 @@ class GPIABC(CommonObjABC):
         """
         raise NotImplementedError("GPIABC.add must be overridden")
 
+    @abstractmethod
+    def get_many(self, signatures: Iterable[bytes]) -> dict[bytes, GCABC]:
+        """Get multiple Genetic Codes by their signatures.
+        Signatures that are not found are omitted from the returned dictionary.
+        """
+        raise NotImplementedError("GPIABC.get_many must be overridden")
+
     @abstractmethod
     def initial_generation_query(self, pconfig: PopulationConfig) -> list[bytes]:
         """Query the Gene Pool for the initial generation of this population."""
         raise NotImplementedError("GPIABC.initial_generation_query must be overridden")
+
+    @abstractmethod
+    def prefetch_tree(self, signature: bytes, max_depth: int | None = None) -> int:
+        """Load the sub-GC closure of a Genetic Code into the local cache.
+        Returns the number of Genetic Codes in the closure.
+        """
+        raise NotImplementedError("GPIABC.prefetch_tree must be overridden")
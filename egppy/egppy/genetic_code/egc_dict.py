@@ -81,6 +81,13 @@ class EGCDict(CacheableDict, GCABC):  # type: ignore
                 value["references"][(self["uid"], key)] = self
         super().__setitem__(key, value)
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "EGCDict":
+        """Construct from a row dictionary. An EGC is a working copy of a genetic code so the
+        members are always set (and checked) by set_members(). The row is not copied.
+        """
+        return cls(row)
+
     def set_members(self, gcabc: GCABC | dict[str, Any]) -> GCABC:
         """Set the attributes of the EGC.
 
@@ -0,0 +1,194 @@
+"""
+Frozen General Genetic Code implementation.
+
+This module provides a memory-efficient, immutable General Genetic Code implementation.
+A GGCDict is a CacheableDict i.e. an object with an instance dictionary wrapping a data
+dictionary of ~25 members. A FrozenGGC has no instance dictionary: its members are stored
+in a single tuple with a fixed offset for each member derived from GGC_KVT.
+
+The FrozenGGC class is particularly useful for:
+- Caching large numbers of genetic codes e.g. the Gene Pool Interface local cache
+- Ensuring genetic code immutability guarantees
+
+A FrozenGGC is constructed from a GGCDict (or anything a GGCDict can be constructed from)
+so the members are derived exactly as they are for a GGCDict. A FrozenGGC is not a GGCDict:
+code that accepts either should check for a GCABC (and _frozen if it must be immutable).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from egpcommon.common_obj import CommonObj
+from egpcommon.egp_log import DEBUG, Logger, egp_logger
+from egpcommon.gp_db_config import GGC_KVT
+from egppy.genetic_code.egc_dict import EGCDict
+from egppy.genetic_code.genetic_code import GCABC
+from egppy.genetic_code.ggc_dict import GGCDict
+from egppy.genetic_code.gpg_view import GPGCView
+from egppy.storage.cache.cacheable_obj_mixin import CacheableObjMixin
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# GGC_KVT keys that are derived by the GPGCView (and not members of a GGC)
+_VIEW_KEYS: frozenset[str] = frozenset(
+    {"input_types", "inputs", "meta_data", "output_types", "outputs", "updated"}
+)
+# GGC members that are not GGC_KVT keys (see GGCDict.set_members())
+_EXTRA_KEYS: tuple[str, ...] = ("description", "io_map", "name", "num_inputs", "num_outputs")
+# GGCDict members that are not GGC members (EGC reference tracking)
+_EGC_KEYS: frozenset[str] = frozenset({"references", "uid"})
+# The FrozenGGC members in offset order
+GGC_FIELDS: tuple[str, ...] = tuple(key for key in GGC_KVT if key not in _VIEW_KEYS) + _EXTRA_KEYS
+_OFFSETS: dict[str, int] = {key: offset for offset, key in enumerate(GGC_FIELDS)}
+
+
+class _Unset:
+    """The value of a member that is not set e.g. io_map if there was no meta data."""
+
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        """Pickle as a reference to the module singleton."""
+        return "_UNSET"
+
+    def __repr__(self) -> str:
+        """Return the representation of the unset value."""
+        return "_UNSET"
+
+
+_UNSET = _Unset()
+
+
+class FrozenGGC(CacheableObjMixin, CommonObj, GCABC):
+    """Frozen General Genetic Code Class.
+
+    Immutable-by-construction: mutation attempts raise TypeError.
+    Members that are not set (see GGCDict.set_members()) are not in the mapping.
+    Unlike a GGCDict, getting a member does not touch() the object.
+    """
+
+    __slots__ = ("_values",)
+
+    GC_KEY_TYPES: dict[str, dict[str, Any]] = GGC_KVT
+
+    # Immutable GC's are identified by _frozen (see EGCDict.set_members())
+    _frozen: bool = True
+
+    def __init__(self, gcabc: GCABC | dict[str, Any] | None = None) -> None:
+        """Construct a FrozenGGC.
+
+        Args:
+            gcabc: A GGCDict, FrozenGGC or anything a GGCDict can be constructed from.
+        """
+        super().__init__()
+        self.set_members(gcabc if gcabc is not None else {})
+        if _logger.isEnabledFor(DEBUG):
+            self.verify()
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if the member is set."""
+        offset: int | None = _OFFSETS.get(key)  # type: ignore
+        return offset is not None and self._values[offset] is not _UNSET
+
+    def __delitem__(self, key: str) -> None:
+        """FrozenGGC is immutable."""
+        raise TypeError(f"FrozenGGC is immutable: cannot delete '{key}'.")
+
+    def __eq__(self, other: object) -> bool:
+        """Equal if other is a GGC with the same signature."""
+        if not isinstance(other, GCABC) or not getattr(other, "_frozen", False):
+            return False
+        return self["signature"] is other["signature"]
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a member."""
+        value: Any = self._values[_OFFSETS[key]]
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __hash__(self) -> int:
+        """Uses the signature for hashing."""
+        return hash(self["signature"])
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the members that are set."""
+        return (key for key, value in zip(GGC_FIELDS, self._values) if value is not _UNSET)
+
+    def __len__(self) -> int:
+        """Return the number of members that are set."""
+        return sum(value is not _UNSET for value in self._values)
+
+    def __repr__(self) -> str:
+        """Return the representation of the FrozenGGC."""
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """FrozenGGC is immutable."""
+        raise TypeError(f"FrozenGGC is immutable: cannot set '{key}'.")
+
+    def as_gpc_view(self) -> GPGCView:
+        """Return a GPGCView of the FrozenGGC."""
+        return GPGCView(self)
+
+    def consistency(self) -> None:
+        """Check the genetic code object for consistency."""
+        self["cgraph"].consistency()
+        super().consistency()
+
+    @classmethod
+    def from_row(cls, row: GCABC | dict[str, Any]) -> FrozenGGC:
+        """Construct a FrozenGGC from a trusted row (see GGCDict.from_row()).
+        A FrozenGGC is immutable and is returned as is.
+        """
+        if isinstance(row, FrozenGGC):
+            return row
+        return cls(GGCDict.from_row(row))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a member or default if it is not set."""
+        offset: int | None = _OFFSETS.get(key)
+        if offset is None:
+            return default
+        value: Any = self._values[offset]
+        return default if value is _UNSET else value
+
+    # The GC type queries only use the mapping interface
+    is_codon = EGCDict.is_codon
+    is_conditional = EGCDict.is_conditional
+    is_empty = EGCDict.is_empty
+    is_pgc = EGCDict.is_pgc
+    is_standard = EGCDict.is_standard
+    logical_mermaid_chart = EGCDict.logical_mermaid_chart
+
+    def set_members(self, gcabc: GCABC | dict[str, Any]) -> GCABC:
+        """Set the members of the FrozenGGC. This can only be done once (by __init__()).
+
+        Args:
+            gcabc: A GGCDict, FrozenGGC or anything a GGCDict can be constructed from.
+        """
+        if hasattr(self, "_values"):
+            raise TypeError("FrozenGGC is immutable: cannot set members.")
+        ggc: GCABC = gcabc if isinstance(gcabc, (GGCDict, FrozenGGC)) else GGCDict(gcabc)
+        self._values: tuple[Any, ...] = tuple(ggc.get(key, _UNSET) for key in GGC_FIELDS)
+        return self
+
+    def to_json(self) -> dict[str, int | str | float | list | dict]:
+        """Return a JSON serializable dictionary."""
+        return GPGCView(self).to_json()
+
+    def verify(self) -> None:
+        """Verify the genetic code object.
+        The members are verified as a GGCDict (which has the same members).
+        """
+        if len(self._values) != len(GGC_FIELDS):
+            raise ValueError("FrozenGGC must have a value for every field.")
+        ggc = GGCDict(self)
+        ggc.verify()
+        missing: set[str] = set(ggc) - set(self) - _EGC_KEYS
+        if missing:
+            raise ValueError(f"FrozenGGC is missing GGCDict members: {sorted(missing)}")
+        super().verify()
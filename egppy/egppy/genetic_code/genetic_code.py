@@ -146,6 +146,8 @@ class GCABC(MutableMapping[str, Any], CacheableObjABC):
     and items as mixin methods.
     """
 
+    __slots__ = ()
+
     GC_KEY_TYPES: dict[str, dict[str, str | bool]]
 
     @abstractmethod
@@ -8,8 +8,10 @@ by considered to be a dict[str, Any] object with the additional constraints of t
 
 from datetime import UTC, datetime
 from typing import Any
+from uuid import UUID
 
 from egpcommon.common import (
+    ANONYMOUS_CREATOR,
     EGP_EPOCH,
     NULL_STR,
     NULL_TUPLE,
@@ -18,16 +20,17 @@ from egpcommon.common import (
     sha256_signature,
 )
 from egpcommon.common_obj import CommonObj
-from egpcommon.deduplication import int_store, signature_store
-from egpcommon.egp_log import DEBUG, OBJECT, Logger, egp_logger
+from egpcommon.deduplication import int_store, properties_store, signature_store, uuid_store
+from egpcommon.egp_log import DEBUG, OBJECT, Integrity, Logger, egp_logger
 from egpcommon.gp_db_config import GGC_KVT
 from egpcommon.properties import BASIC_CODON_PROPERTIES, CGraphType, GCType, PropertiesBD
-from egppy.genetic_code.c_graph_constants import DstIfKey, SrcIfKey
-from egppy.genetic_code.egc_dict import EGCDict
+from egppy.genetic_code.c_graph_constants import DstIfKey, JSONCGraph, SrcIfKey
+from egppy.genetic_code.egc_dict import UID_GENERATOR, EGCDict
 from egppy.genetic_code.frozen_c_graph import FrozenCGraph, frozen_cgraph_store
 from egppy.genetic_code.genetic_code import GCABC
 from egppy.genetic_code.gpg_view import GPGCView
 from egppy.genetic_code.import_def import ImportDef
+from egppy.genetic_code.json_cgraph import json_cgraph_to_interfaces
 from egppy.storage.cache.cacheable_obj import CacheableDict
 
 # Standard EGP logging pattern
@@ -71,7 +74,7 @@ class GGCDict(EGCDict):
         Returns:
             True if the GGCDicts are equal, False otherwise.
         """
-        if not isinstance(other, GGCDict):
+        if not isinstance(other, GCABC) or not getattr(other, "_frozen", False):
             return False
         return self["signature"] is other["signature"]
 
@@ -97,6 +100,61 @@ class GGCDict(EGCDict):
         """Return a GPGCView of the GGCDict."""
         return GPGCView(self)
 
+    @classmethod
+    def from_row(cls, row: GCABC | dict[str, Any]) -> "GGCDict":
+        """Construct a GGCDict from a trusted row e.g. a Gene Pool database row (see DictIter).
+
+        Rows from the Gene Pool are GGC's that were verified when they were created. Below
+        the VERIFY integrity level the frozen connection graph is built directly from the
+        JSON connection graph (rather than via a mutable CGraph), the row signature is not
+        recalculated and the type checks of set_members() are skipped. At or above the VERIFY
+        integrity level this is the same as GGCDict(row). The row is not modified. A GGCDict
+        is immutable and is returned as is.
+
+        Args:
+            row: A GGCDict or a dictionary with the GGC keys.
+        """
+        if isinstance(row, GGCDict):
+            return row
+        if Integrity.is_enabled_for(Integrity.VERIFY) or not isinstance(row, dict):
+            return cls(row)
+        ggc: GGCDict = cls.__new__(cls)
+        CacheableDict.__init__(ggc)
+        # The EGC members (see EGCDict.__init__() & EGCDict.set_members())
+        data: dict[str, Any] = ggc.data
+        data["uid"] = next(UID_GENERATOR)
+        data["references"] = {}
+        cgraph: FrozenCGraph | JSONCGraph = row["cgraph"]
+        if isinstance(cgraph, dict):
+            cgraph = FrozenCGraph(json_cgraph_to_interfaces(cgraph))  # type: ignore
+        elif type(cgraph) is not FrozenCGraph:  # pylint: disable=unidiomatic-typecheck
+            cgraph = FrozenCGraph(cgraph)
+        data["cgraph"] = frozen_cgraph_store[cgraph]
+        for key in ("gca", "gcb", "ancestora", "ancestorb", "pgc"):
+            sig: bytes | str | None = row.get(key)
+            data[key] = (
+                None
+                if sig is None
+                else signature_store[sig if isinstance(sig, bytes) else bytes.fromhex(sig)]
+            )
+        prps: int | dict[str, Any] = row.get("properties", 0)
+        data["properties"] = properties_store[
+            prps if isinstance(prps, int) else PropertiesBD(prps, False).to_int()
+        ]
+        creator: UUID | str = row.get("creator", ANONYMOUS_CREATOR)
+        data["creator"] = uuid_store[UUID(creator) if isinstance(creator, str) else creator]
+        # A trusted row signature does not need to be recalculated
+        signature: bytes | str | None = row.get("signature")
+        if signature is not None:
+            data["signature"] = signature_store[
+                signature if isinstance(signature, bytes) else bytes.fromhex(signature)
+            ]
+        ggc._set_ggc_members(row)
+        object.__setattr__(ggc, "_frozen", True)
+        if _logger.isEnabledFor(DEBUG):
+            ggc.verify()
+        return ggc
+
     def set_members(self, gcabc: GCABC | dict[str, Any]) -> GCABC:
         """Set the attributes of the GGC.
 
@@ -118,38 +176,69 @@ class GGCDict(EGCDict):
             self["cgraph"] = frozen_cgraph_store[self["cgraph"]]
 
         # A GGCdict cannot be created if the GCA, GCB, Ancestor A, Ancestor B or PGC are not
-        # None, bytes or a GGCDict object. This is because the GGCdict needs to be able to resolve
-        # the signatures of these objects. i.e. they must be constant.
+        # None, bytes or a frozen GC (GGCDict or FrozenGGC). This is because the GGCdict needs to be
+        # able to resolve the signatures of these objects. i.e. they must be constant.
         gca = self["gca"]
-        if isinstance(gca, GGCDict):
+        if isinstance(gca, GCABC) and getattr(gca, "_frozen", False):
             self["gca"] = gca["signature"]
         elif not isinstance(gca, bytes) and gca is not None:
             raise ValueError("GCA must be a GGCDict, bytes (signature) or None.")
 
         gcb = self["gcb"]
-        if isinstance(gcb, GGCDict):
+        if isinstance(gcb, GCABC) and getattr(gcb, "_frozen", False):
             self["gcb"] = gcb["signature"]
         elif not isinstance(gcb, bytes) and gcb is not None:
             raise ValueError("GCB must be a GGCDict, bytes (signature) or None.")
 
         ancestora = self["ancestora"]
-        if isinstance(ancestora, GGCDict):
+        if isinstance(ancestora, GCABC) and getattr(ancestora, "_frozen", False):
             self["ancestora"] = ancestora["signature"]
         elif not isinstance(ancestora, bytes) and ancestora is not None:
             raise ValueError("Ancestor A must be a GGCDict, bytes (signature) or None.")
 
         ancestorb = self["ancestorb"]
-        if isinstance(ancestorb, GGCDict):
+        if isinstance(ancestorb, GCABC) and getattr(ancestorb, "_frozen", False):
             self["ancestorb"] = ancestorb["signature"]
         elif not isinstance(ancestorb, bytes) and ancestorb is not None:
             raise ValueError("Ancestor B must be a GGCDict, bytes (signature) or None.")
 
         pgc = self["pgc"]
-        if isinstance(pgc, GGCDict):
+        if isinstance(pgc, GCABC) and getattr(pgc, "_frozen", False):
             self["pgc"] = pgc["signature"]
         elif not isinstance(pgc, bytes) and pgc is not None:
             raise ValueError("PGC must be a GGCDict, bytes (signature) or None.")
 
+        self._set_ggc_members(gcabc)
+
+        # If this is an EGCDict being converted to a GGCDict then
+        # we need to replace all references to that EGCDict with this object.
+        if isinstance(gcabc, EGCDict):
+            for (_, field), egc in tuple(gcabc["references"].items()):
+                # Sanity checks
+                assert isinstance(egc, EGCDict), "Referenced GC must be an EGCDict"
+                assert field in egc, "Referenced field must exist in the EGCDict"
+                assert egc[field] is gcabc, "Referenced field must be gcabc"
+                egc[field] = self
+                if _logger.isEnabledFor(DEBUG):
+                    _logger.debug(
+                        "Replaced reference to EGCDict with GGCDict %s in field %s",
+                        self["signature"].hex(),
+                        field,
+                    )
+
+        # Immutability is now enforced by _frozen attribute set in __init__
+        # after set_members() completes (immutable-by-construction, WP6).
+        # NOTE: verify()/consistency() are called from __init__ after _frozen is set,
+        # not here, because _frozen must be True before verify() checks it.
+
+        return self
+
+    def _set_ggc_members(self, gcabc: GCABC | dict[str, Any]) -> None:
+        """Set the GGC members that are not EGC members (see set_members() & from_row()).
+
+        Args:
+            gcabc: The genetic code object or dictionary to set the attributes.
+        """
         self["code_depth"] = int_store[gcabc["code_depth"]]
         self["generation"] = int_store[gcabc["generation"]]
         self["num_codes"] = int_store[gcabc["num_codes"]]
@@ -209,29 +298,6 @@ class GGCDict(EGCDict):
                 )
             ]
 
-        # If this is an EGCDict being converted to a GGCDict then
-        # we need to replace all references to that EGCDict with this object.
-        if isinstance(gcabc, EGCDict):
-            for (_, field), egc in tuple(gcabc["references"].items()):
-                # Sanity checks
-                assert isinstance(egc, EGCDict), "Referenced GC must be an EGCDict"
-                assert field in egc, "Referenced field must exist in the EGCDict"
-                assert egc[field] is gcabc, "Referenced field must be gcabc"
-                egc[field] = self
-                if _logger.isEnabledFor(DEBUG):
-                    _logger.debug(
-                        "Replaced reference to EGCDict with GGCDict %s in field %s",
-                        self["signature"].hex(),
-                        field,
-                    )
-
-        # Immutability is now enforced by _frozen attribute set in __init__
-        # after set_members() completes (immutable-by-construction, WP6).
-        # NOTE: verify()/consistency() are called from __init__ after _frozen is set,
-        # not here, because _frozen must be True before verify() checks it.
-
-        return self
-
     def to_json(self) -> dict[str, int | str | float | list | dict]:
         """Return a JSON serializable dictionary."""
         return GPGCView(self).to_json()
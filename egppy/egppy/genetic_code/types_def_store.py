@@ -8,10 +8,12 @@ from itertools import product
 from json import dumps, loads
 from os.path import dirname, join
 from re import findall
+from time import perf_counter
 from typing import Any, Container
 
 from egpcommon.common import EGP_DEV_PROFILE, EGP_PROFILE
 from egpcommon.egp_log import TRACE, Logger, egp_logger
+from egpcommon.metrics import Metrics
 from egpcommon.object_deduplicator import format_deduplicator_info
 from egpcommon.security import InvalidSignatureError, load_signature_data, verify_signed_file
 from egpcommon.type_string_parser import TypeNode, TypeStringParser
@@ -121,22 +123,19 @@ class TypesDefStore(Container):
     _cache: dict[int | str, TypesDef] = {}
     _cache_order: list[int | str] = []
     _cache_maxsize: int = 1024
-    _cache_hits: int = 0
-    _cache_misses: int = 0
+    _cache_metrics: Metrics = Metrics("TypesDefStore")
 
     # Always cached by UID
     _ancestors_cache: dict[int, frozenset[TypesDef]] = {}
     _ancestors_cache_order: list[int] = []
     _ancestors_cache_maxsize: int = 128
-    _ancestors_cache_hits: int = 0
-    _ancestors_cache_misses: int = 0
+    _ancestors_cache_metrics: Metrics = Metrics("TypesDefStore.ancestors")
 
     # Always cached by UID
     _descendants_cache: dict[int, frozenset[TypesDef]] = {}
     _descendants_cache_order: list[int] = []
     _descendants_cache_maxsize: int = 128
-    _descendants_cache_hits: int = 0
-    _descendants_cache_misses: int = 0
+    _descendants_cache_metrics: Metrics = Metrics("TypesDefStore.descendants")
 
     def __contains__(self, key: object) -> bool:
         """Check if the key is in the store."""
@@ -181,13 +180,14 @@ class TypesDefStore(Container):
 
         # Check cache first
         if key in TypesDefStore._cache:
-            TypesDefStore._cache_hits += 1
+            TypesDefStore._cache_metrics.hits += 1
             _logger.log(TRACE, "TypesDefStore cache hit for key: %s", key)
             return TypesDefStore._cache[key]
 
         _logger.log(TRACE, "TypesDefStore cache miss for key: %s", key)
-        TypesDefStore._cache_misses += 1
+        TypesDefStore._cache_metrics.misses += 1
 
+        start: float = perf_counter()
         if isinstance(key, int):
             td = TypesDefStore._db_store.get(key, {})
             if not td:
@@ -197,6 +197,7 @@ class TypesDefStore(Container):
             td = tds[0] if len(tds) == 1 else {}
         else:
             raise TypeError(f"Invalid key type: {type(key)}")
+        TypesDefStore._cache_metrics.fetch_latency.observe(perf_counter() - start)
         if not td:
             if not create:
                 raise KeyError(f"Type not found with name: {key}")
@@ -301,6 +302,7 @@ class TypesDefStore(Container):
 
         # LRU eviction if cache is full
         if len(TypesDefStore._cache_order) > TypesDefStore._cache_maxsize:
+            TypesDefStore._cache_metrics.evictions += 1
             evict_key = TypesDefStore._cache_order.pop(0)
             assert isinstance(evict_key, str), "1st evict key must be a string (name)."
             del TypesDefStore._cache[evict_key]
@@ -490,10 +492,10 @@ class TypesDefStore(Container):
         td = self[key] if not isinstance(key, TypesDef) else key
 
         if td.uid in TypesDefStore._ancestors_cache:
-            TypesDefStore._ancestors_cache_hits += 1
+            TypesDefStore._ancestors_cache_metrics.hits += 1
             return TypesDefStore._ancestors_cache[td.uid]
 
-        TypesDefStore._ancestors_cache_misses += 1
+        TypesDefStore._ancestors_cache_metrics.misses += 1
 
         stack: set[TypesDef] = {td}
         ancestors: set[TypesDef] = set()
@@ -508,6 +510,7 @@ class TypesDefStore(Container):
         TypesDefStore._ancestors_cache_order.append(td.uid)
 
         if len(TypesDefStore._ancestors_cache_order) > TypesDefStore._ancestors_cache_maxsize:
+            TypesDefStore._ancestors_cache_metrics.evictions += 1
             evict_key = TypesDefStore._ancestors_cache_order.pop(0)
             del TypesDefStore._ancestors_cache[evict_key]
 
@@ -547,10 +550,10 @@ class TypesDefStore(Container):
         td = self[key] if not isinstance(key, TypesDef) else key
 
         if td.uid in TypesDefStore._descendants_cache:
-            TypesDefStore._descendants_cache_hits += 1
+            TypesDefStore._descendants_cache_metrics.hits += 1
             return TypesDefStore._descendants_cache[td.uid]
 
-        TypesDefStore._descendants_cache_misses += 1
+        TypesDefStore._descendants_cache_metrics.misses += 1
 
         stack: set[TypesDef] = {td}
         descendants: set[TypesDef] = set()
@@ -565,6 +568,7 @@ class TypesDefStore(Container):
         TypesDefStore._descendants_cache_order.append(td.uid)
 
         if len(TypesDefStore._descendants_cache_order) > TypesDefStore._descendants_cache_maxsize:
+            TypesDefStore._descendants_cache_metrics.evictions += 1
             evict_key = TypesDefStore._descendants_cache_order.pop(0)
             del TypesDefStore._descendants_cache[evict_key]
 
@@ -594,24 +598,24 @@ class TypesDefStore(Container):
                 format_deduplicator_info(
                     "TypesDefStore",
                     0.649,
-                    TypesDefStore._cache_hits,
-                    TypesDefStore._cache_misses,
+                    TypesDefStore._cache_metrics.hits,
+                    TypesDefStore._cache_metrics.misses,
                     len(TypesDefStore._cache),
                     TypesDefStore._cache_maxsize,
                 ),
                 format_deduplicator_info(
                     "Ancestors",
                     0.649,
-                    TypesDefStore._ancestors_cache_hits,
-                    TypesDefStore._ancestors_cache_misses,
+                    TypesDefStore._ancestors_cache_metrics.hits,
+                    TypesDefStore._ancestors_cache_metrics.misses,
                     len(TypesDefStore._ancestors_cache),
                     TypesDefStore._ancestors_cache_maxsize,
                 ),
                 format_deduplicator_info(
                     "Descendants",
                     0.649,
-                    TypesDefStore._descendants_cache_hits,
-                    TypesDefStore._descendants_cache_misses,
+                    TypesDefStore._descendants_cache_metrics.hits,
+                    TypesDefStore._descendants_cache_metrics.misses,
                     len(TypesDefStore._descendants_cache),
                     TypesDefStore._descendants_cache_maxsize,
                 ),
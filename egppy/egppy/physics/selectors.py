@@ -1,6 +1,7 @@
 """The selectors module."""
 
 from egpcommon.properties import CODON_MASK
+from egppy.genetic_code.genetic_code import GCABC
 from egppy.genetic_code.ggc_dict import GGCDict
 from egppy.genetic_code.types_def_store import types_def_store
 from egppy.physics.runtime_context import RuntimeContext
@@ -54,7 +55,7 @@ def _expand_types_descendants(types: list[int]) -> list[int]:
     return sorted(expanded)
 
 
-def random_codon_selector(rtctxt: RuntimeContext) -> GGCDict:
+def random_codon_selector(rtctxt: RuntimeContext) -> GCABC:
     """Select a random codon from the gene pool.
 
     This function uses the runtime context to access the gene pool interface
@@ -63,17 +64,17 @@ def random_codon_selector(rtctxt: RuntimeContext) -> GGCDict:
     Args:
         rtctxt: The runtime context.
     Returns:
-        GGCDict: A random codon genetic code.
+        GCABC: A random codon genetic code.
     """
     ggc = rtctxt.gpi.select_gc(
         "{codon_mask} & {properties} = {zero}",
         literals={"codon_mask": CODON_MASK, "zero": 0},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
+def random_pgc_selector(rtctxt: RuntimeContext) -> GCABC:
     """Select a random PGC (mutation) from the gene pool.
 
     This function uses the runtime context to access the gene pool interface
@@ -82,7 +83,7 @@ def random_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
     Args:
         rtctxt: The runtime context.
     Returns:
-        GGCDict: A random PGC (mutation) genetic code.
+        GCABC: A random PGC (mutation) genetic code.
     """
     # Any GC returning an EGCode output type is a valid mutation candidate.
     ggc = rtctxt.gpi.select_gc(
@@ -90,10 +91,10 @@ def random_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
         literals={"eg_code_td": types_def_store["EGCode"].uid},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_simple_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
+def random_simple_pgc_selector(rtctxt: RuntimeContext) -> GCABC:
     """Select a random PGC (mutation) from the gene pool that takes a single GCABC input
     and produces a single EGCode output.
 
@@ -103,7 +104,7 @@ def random_simple_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
     Args:
         rtctxt: The runtime context.
     Returns:
-        GGCDict: A random PGC (mutation) genetic code.
+        GCABC: A random PGC (mutation) genetic code.
     """
     # Any GC returning an EGCode output type is a valid mutation candidate.
     ggc = rtctxt.gpi.select_gc(
@@ -114,7 +115,7 @@ def random_simple_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
         },
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Exact Type Match (= operator) ---
@@ -123,7 +124,7 @@ def random_simple_pgc_selector(rtctxt: RuntimeContext) -> GGCDict:
 
 def random_exact_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC with exactly matching input and output types.
 
     Args:
@@ -142,10 +143,10 @@ def random_exact_io_selector(
         literals={"itypes": input_types, "otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_exact_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GGCDict:
+def random_exact_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GCABC:
     """Select a random GC with exactly matching input types.
 
     Args:
@@ -163,10 +164,10 @@ def random_exact_input_selector(rtctxt: RuntimeContext, input_types: list[int])
         literals={"itypes": input_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_exact_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GGCDict:
+def random_exact_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GCABC:
     """Select a random GC with exactly matching output types.
 
     Args:
@@ -184,7 +185,7 @@ def random_exact_output_selector(rtctxt: RuntimeContext, output_types: list[int]
         literals={"otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Subset Match (<@ operator) ---
@@ -193,7 +194,7 @@ def random_exact_output_selector(rtctxt: RuntimeContext, output_types: list[int]
 
 def random_subset_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC whose input and output types are subsets of the given types.
 
     Args:
@@ -212,10 +213,10 @@ def random_subset_io_selector(
         literals={"itypes": input_types, "otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_subset_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GGCDict:
+def random_subset_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GCABC:
     """Select a random GC whose input types are a subset of the given types.
 
     Args:
@@ -233,10 +234,10 @@ def random_subset_input_selector(rtctxt: RuntimeContext, input_types: list[int])
         literals={"itypes": input_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_subset_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GGCDict:
+def random_subset_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GCABC:
     """Select a random GC whose output types are a subset of the given types.
 
     Args:
@@ -254,7 +255,7 @@ def random_subset_output_selector(rtctxt: RuntimeContext, output_types: list[int
         literals={"otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Superset Match (@> operator) ---
@@ -263,7 +264,7 @@ def random_subset_output_selector(rtctxt: RuntimeContext, output_types: list[int
 
 def random_superset_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC whose input and output types are supersets of the given types.
 
     Args:
@@ -282,10 +283,10 @@ def random_superset_io_selector(
         literals={"itypes": input_types, "otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_superset_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GGCDict:
+def random_superset_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GCABC:
     """Select a random GC whose input types are a superset of the given types.
 
     Args:
@@ -303,10 +304,10 @@ def random_superset_input_selector(rtctxt: RuntimeContext, input_types: list[int
         literals={"itypes": input_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_superset_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GGCDict:
+def random_superset_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GCABC:
     """Select a random GC whose output types are a superset of the given types.
 
     Args:
@@ -324,7 +325,7 @@ def random_superset_output_selector(rtctxt: RuntimeContext, output_types: list[i
         literals={"otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Overlap Match (&& operator) ---
@@ -333,7 +334,7 @@ def random_superset_output_selector(rtctxt: RuntimeContext, output_types: list[i
 
 def random_overlap_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC whose input and output types overlap with the given types.
 
     At least one input type and at least one output type must be in common.
@@ -354,7 +355,7 @@ def random_overlap_io_selector(
         literals={"itypes": input_types, "otypes": output_types},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Compatible Type Match (ancestor/descendant expansion + && operator) ---
@@ -365,7 +366,7 @@ def random_overlap_io_selector(
 
 def random_compatible_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC with type-compatible inputs and outputs.
 
     Input types are expanded to include ancestors (upcast-compatible) and output
@@ -390,10 +391,10 @@ def random_compatible_io_selector(
         literals={"itypes": expanded_inputs, "otypes": expanded_outputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_compatible_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GGCDict:
+def random_compatible_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GCABC:
     """Select a random GC with type-compatible inputs.
 
     Input types are expanded to include all ancestor types (upcast-compatible).
@@ -415,10 +416,10 @@ def random_compatible_input_selector(rtctxt: RuntimeContext, input_types: list[i
         literals={"itypes": expanded_inputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_compatible_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GGCDict:
+def random_compatible_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GCABC:
     """Select a random GC with type-compatible outputs.
 
     Output types are expanded to include all descendant types. The GC must
@@ -440,7 +441,7 @@ def random_compatible_output_selector(rtctxt: RuntimeContext, output_types: list
         literals={"otypes": expanded_outputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
 # --- Downcast-Compatible Type Match (reverse expansion + && operator) ---
@@ -452,7 +453,7 @@ def random_compatible_output_selector(rtctxt: RuntimeContext, output_types: list
 
 def random_downcast_io_selector(
     rtctxt: RuntimeContext, input_types: list[int], output_types: list[int]
-) -> GGCDict:
+) -> GCABC:
     """Select a random GC with downcast-compatible inputs and outputs.
 
     Input types are expanded to include descendants (downcast) and output types
@@ -480,10 +481,10 @@ def random_downcast_io_selector(
         literals={"itypes": expanded_inputs, "otypes": expanded_outputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_downcast_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GGCDict:
+def random_downcast_input_selector(rtctxt: RuntimeContext, input_types: list[int]) -> GCABC:
     """Select a random GC with downcast-compatible inputs.
 
     Input types are expanded to include all descendant types (downcast).
@@ -508,10 +509,10 @@ def random_downcast_input_selector(rtctxt: RuntimeContext, input_types: list[int
         literals={"itypes": expanded_inputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
 
 
-def random_downcast_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GGCDict:
+def random_downcast_output_selector(rtctxt: RuntimeContext, output_types: list[int]) -> GCABC:
     """Select a random GC with downcast-compatible outputs.
 
     Output types are expanded to include all ancestor types (downcast).
@@ -536,4 +537,4 @@ def random_downcast_output_selector(rtctxt: RuntimeContext, output_types: list[i
         literals={"otypes": expanded_outputs},
         order_by="ORDER BY RANDOM()",
     )
-    return GGCDict(ggc) if not isinstance(ggc, GGCDict) else ggc
+    return ggc if isinstance(ggc, GCABC) else GGCDict(ggc)
@@ -1,7 +1,10 @@
 """A python dictionary based cache."""
 
-from collections.abc import Hashable, Iterator
-from typing import Any, Callable
+from collections import OrderedDict
+from collections.abc import Hashable, ItemsView, Iterable, Iterator, ValuesView
+from itertools import islice
+from time import perf_counter
+from typing import Any, cast
 
 from egpcommon.egp_log import Logger, egp_logger
 from egppy.storage.cache.cache_abc import CacheABC, CacheConfig
@@ -13,19 +16,21 @@ from egppy.storage.cache.cacheable_obj_abc import CacheableObjABC
 _logger: Logger = egp_logger(name=__name__)
 
 
-# Function to select sequence numbers for sorting
-_KEY: Callable[[tuple[Any, int]], int] = lambda x: x[1]
-
-
 class DictCache(CacheBase, CacheMixin, CacheABC):
     """Dictionary based cache. The cache functions wrap the builtin dict methods.
     Providing all the automated function of a cache with a small overhead.
+
+    The items are kept in least recently used (LRU) order: getting or setting an item
+    moves it to the most recently used end so touching an item is O(1) and purging
+    k items is O(k). Iteration is over a snapshot of the keys so that items may be
+    got (which changes the order) while iterating. items() & values() do not change
+    the order.
     """
 
     def __init__(self, config: CacheConfig, level_one: bool = True) -> None:
         """Initialize the cache."""
         super().__init__(config=config, level_one=level_one)
-        self.data: dict[Hashable, CacheableObjABC] = {}
+        self.data: OrderedDict[Hashable, CacheableObjABC] = OrderedDict()
 
     def __contains__(self, key: Hashable) -> bool:
         """Check if the cache contains a key."""
@@ -36,23 +41,30 @@ class DictCache(CacheBase, CacheMixin, CacheABC):
         value: CacheableObjABC = self.data[key]
         if value.is_dirty():
             self.next_level[key] = value
+            self.metrics.write_backs += 1
         del self.data[key]
 
     def __getitem__(self, key: Hashable) -> Any:
         """Get an item from the cache."""
         if key not in self:
             # Need to ask the next level for the item. First check if we have space.
+            self.metrics.misses += 1
             self.purge_check()
             # The next level object type must be flavored (cast) to the type stored here.
+            start: float = perf_counter()
             value = self.next_level[key]
+            self.metrics.fetch_latency.observe(perf_counter() - start)
             self.data[key] = self.flavor(value) if self._convert else value  # type: ignore
+        else:
+            self.metrics.hits += 1
+            self.data.move_to_end(key)
         item: CacheableObjABC = self.data[key]
         item.touch()
         return item
 
     def __iter__(self) -> Iterator:
-        """Return an iterator over the cache."""
-        return iter(self.data)
+        """Return an iterator over a snapshot of the cache keys."""
+        return iter(tuple(self.data))
 
     def __len__(self) -> int:
         """Return the number of items in the cache."""
@@ -62,6 +74,8 @@ class DictCache(CacheBase, CacheMixin, CacheABC):
         """Set an item in the cache. If the cache is full make space first."""
         if key not in self:
             self.purge_check()
+        else:
+            self.data.move_to_end(key)
 
         # The value must be flavored (cast) to the type stored here. At a minimum this is a shallow
         # copy so the next layer cache dirty flag is not affected.
@@ -70,13 +84,63 @@ class DictCache(CacheBase, CacheMixin, CacheABC):
         self.data[key] = item  # type: ignore
         item.dirty()  # type: ignore
 
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Get multiple items from the cache.
+        The items that are not in the cache are fetched from the next level with a
+        single StoreABC.get_many() call. Keys that are not found are omitted.
+        """
+        data: OrderedDict[Hashable, CacheableObjABC] = self.data
+        retval: dict[Hashable, Any] = {}
+        misses: list[Hashable] = []
+        for key in keys:
+            if key in data:
+                data.move_to_end(key)
+                retval[key] = data[key]
+            else:
+                misses.append(key)
+        self.metrics.hits += len(retval)
+        if misses:
+            self.metrics.misses += len(misses)
+            start: float = perf_counter()
+            fetched: dict[Hashable, Any] = self.next_level.get_many(misses)
+            self.metrics.fetch_latency.observe(perf_counter() - start)
+            retval.update(self.load(fetched.items()))
+        for item in retval.values():
+            item.touch()
+        return retval
+
+    def items(self) -> ItemsView:
+        """Return a view of the cache items. The LRU order is not changed."""
+        return self.data.items()
+
+    def load(self, items: Iterable[tuple[Hashable, Any]]) -> dict[Hashable, Any]:
+        """Place items read from the next level in the cache.
+        Items that are already in the cache are not replaced (the cached item may have
+        been modified). Returns the cached items indexed by key.
+        """
+        data: OrderedDict[Hashable, CacheableObjABC] = self.data
+        retval: dict[Hashable, Any] = {}
+        for key, value in items:
+            if key in data:
+                retval[key] = data[key]
+            else:
+                self.purge_check()
+                # The flavor is a CacheableObjABC (see CacheBase.__init__())
+                value = cast(CacheableObjABC, self.flavor(value) if self._convert else value)
+                data[key] = retval[key] = value
+        return retval
+
     def purge(self, num: int) -> None:
-        """Purge the cache of count items."""
+        """Purge the cache of the num least recently used items."""
+        self.metrics.evictions += min(num, len(self))
         if num >= len(self):
             self.flush()
             return
-        victims: list[tuple[Any, int]] = sorted(
-            ((k, v.seq_num()) for k, v in self.data.items()), key=_KEY
-        )[: self.purge_count]
-        for key, _ in victims:
-            del self[key]
+        data: OrderedDict[Hashable, CacheableObjABC] = self.data
+        self.write_back(kv for kv in islice(data.items(), num) if kv[1].is_dirty())
+        for _ in range(num):
+            data.popitem(last=False)
+
+    def values(self) -> ValuesView:
+        """Return a view of the cache values. The LRU order is not changed."""
+        return self.data.values()
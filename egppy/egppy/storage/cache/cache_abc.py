@@ -1,9 +1,11 @@
 """Cache Base Abstract Base Class"""
 
 from abc import abstractmethod
-from typing import TypedDict
+from collections.abc import Hashable, Iterable
+from typing import NotRequired, TypedDict
 
 from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.metrics import Metrics
 from egppy.storage.cache.cacheable_obj_abc import CacheableObjABC
 from egppy.storage.store.storable_obj_abc import StorableObjABC
 from egppy.storage.store.store_abc import StoreABC
@@ -12,6 +14,10 @@ from egppy.storage.store.store_abc import StoreABC
 _logger: Logger = egp_logger(name=__name__)
 
 
+# Default number of dirty items written back to the next level in one StoreABC.set_many() call
+DEFAULT_BATCH_SIZE: int = 2**10
+
+
 class CacheConfig(TypedDict):
     """Cache configuration."""
 
@@ -19,6 +25,7 @@ class CacheConfig(TypedDict):
     purge_count: int  # Number of items to purge when the cache is full
     next_level: StoreABC  # The next level of caching or storage
     flavor: type[CacheableObjABC]  # The type of item stored in the cache
+    batch_size: NotRequired[int]  # Number of dirty items written back per batch
 
 
 class CacheABC(StoreABC):
@@ -35,6 +42,8 @@ class CacheABC(StoreABC):
         self.purge_count: int = config["purge_count"]
         self.next_level: StoreABC = config["next_level"]
         self.flavor: type[StorableObjABC] = config["flavor"]
+        self.batch_size: int = config.get("batch_size", DEFAULT_BATCH_SIZE)
+        self.metrics: Metrics = Metrics(type(self).__name__)
 
         # If the cache is the level one cache
         self.level_one: bool = level_one
@@ -76,3 +85,11 @@ class CacheABC(StoreABC):
         which case purge() behaves like flush() (which may be an optimisation).
         """
         raise NotImplementedError("purge must be overridden")
+
+    @abstractmethod
+    def write_back(self, items: Iterable[tuple[Hashable, CacheableObjABC]]) -> None:
+        """Write items back to the next level store.
+        The items are written in batches of at most batch_size items using the
+        next level StoreABC.set_many(). The items are not marked clean.
+        """
+        raise NotImplementedError("write_back must be overridden")
@@ -1,7 +1,7 @@
 """Cache Base class module."""
 
 from egpcommon.egp_log import Logger, egp_logger
-from egppy.storage.cache.cache_abc import CacheConfig
+from egppy.storage.cache.cache_abc import DEFAULT_BATCH_SIZE, CacheConfig
 from egppy.storage.cache.cacheable_obj_abc import CacheableObjABC
 from egppy.storage.store.store_abc import StoreABC
 from egppy.storage.store.store_base import StoreBase
@@ -18,11 +18,13 @@ class CacheBase(StoreBase):
         self.max_items: int = config["max_items"]
         self.purge_count: int = config["purge_count"]
         self.next_level: StoreABC = config["next_level"]
+        self.batch_size: int = config.get("batch_size", DEFAULT_BATCH_SIZE)
         super().__init__(config["flavor"])
         self.validate_cache_config(config)
         assert issubclass(self.flavor, CacheableObjABC)
         assert isinstance(self.next_level, StoreBase)
-        self._convert = self.flavor != self.next_level.flavor
+        # Objects read from the next level are load_flavor objects
+        self._convert = self.flavor != self.next_level.load_flavor
         self.level_one: bool = level_one
 
     def validate_cache_config(self, config: CacheConfig) -> None:
@@ -41,3 +43,7 @@ class CacheBase(StoreBase):
             raise ValueError("purge_count must be >= 0")
         if config["max_items"] < config["purge_count"]:
             raise ValueError("purge_count must be <= max_items")
+        if not isinstance(config.get("batch_size", DEFAULT_BATCH_SIZE), int):
+            raise ValueError("batch_size must be an integer")
+        if config.get("batch_size", DEFAULT_BATCH_SIZE) < 1:
+            raise ValueError("batch_size must be >= 1")
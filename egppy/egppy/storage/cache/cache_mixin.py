@@ -1,6 +1,7 @@
 """Cache Base class module."""
 
-from collections.abc import Hashable
+from collections.abc import Hashable, Iterable, Iterator
+from itertools import islice
 
 from egpcommon.egp_log import Logger, egp_logger
 from egppy.storage.cache.cache_abc import CacheABC
@@ -27,8 +28,11 @@ class CacheMixin:
         """Copy the cache back to the next level."""
         if not isinstance(self, CacheABC):
             raise RuntimeError("CacheMixin consistency called on non-CacheABC object.")
-        for key, value in (x for x in self.items() if x[1].is_dirty()):
-            self.next_level[key] = value
+        dirty: list[tuple[Hashable, CacheableObjABC]] = [
+            (key, value) for key, value in self.items() if value.is_dirty()
+        ]
+        self.write_back(dirty)
+        for _, value in dirty:
             value.clean()
 
     def copythrough(self) -> None:
@@ -50,15 +54,12 @@ class CacheMixin:
         """Purge num items from the cache."""
         if not isinstance(self, CacheABC):
             raise RuntimeError("CacheMixin consistency called on non-CacheABC object.")
+        self.metrics.evictions += min(num, len(self))
         if num >= len(self):
             self.flush()
             return
-        for _ in range(num):
-            key: Hashable
-            value: CacheableObjABC
-            key, value = self.popitem()
-            if value.is_dirty():
-                self.next_level[key] = value
+        victims: list[tuple[Hashable, CacheableObjABC]] = [self.popitem() for _ in range(num)]
+        self.write_back(victim for victim in victims if victim[1].is_dirty())
 
     def purge_check(self) -> None:
         """Check if the cache needs to be purged."""
@@ -71,6 +72,15 @@ class CacheMixin:
                 )
             self.purge(num=self.purge_count)
 
+    def write_back(self, items: Iterable[tuple[Hashable, CacheableObjABC]]) -> None:
+        """Write items back to the next level store in batches (see StoreABC.set_many())."""
+        if not isinstance(self, CacheABC):
+            raise RuntimeError("CacheMixin write_back called on non-CacheABC object.")
+        iterator: Iterator = iter(items)
+        while batch := tuple(islice(iterator, self.batch_size)):
+            self.next_level.set_many(batch)
+            self.metrics.write_backs += len(batch)
+
     def verify(self) -> None:
         """Verify the cache.
         Every object stored in the cache is verified as well as basic
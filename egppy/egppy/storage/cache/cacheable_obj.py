@@ -69,6 +69,15 @@ class CacheableDict(MutableMapping, CacheableObjMixin, CommonObj, CacheableObjAB
         self.data[key] = value
         self.dirty()
 
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "CacheableDict":
+        """Construct from a trusted row dictionary e.g. a database row (see DictIter).
+        The row is adopted rather than deep copied: the caller must not use it afterwards.
+        """
+        obj = cls()
+        obj.data = row
+        return obj
+
     def get(self, key: Any, default: Any = None) -> Any:
         """Get an item from the dictionary."""
         self.touch()
@@ -18,6 +18,8 @@ class CacheableObjABC(StorableObjABC):
     objects in EGP. Cacheable objects are objects that can be stored in a CacheABC.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def clean(self) -> None:
         """Mark the Cacheable object as clean.
@@ -1,5 +1,8 @@
 """Database Table store module."""
 
+from collections.abc import Callable, Hashable, Iterable
+from itertools import islice
+from time import perf_counter
 from typing import Any, Iterator
 
 from egpcommon.egp_log import Logger, egp_logger
@@ -14,13 +17,30 @@ from egppy.storage.store.store_base import StoreBase
 _logger: Logger = egp_logger(name=__name__)
 
 
+# Default maximum number of rows selected or upserted in one statement by get_many() & set_many()
+DEFAULT_BATCH_SIZE: int = 2**10
+
+
 class DBTableStore(StoreBase, StoreABC):
     """An in memory store class that can be used for testing."""
 
     def __init__(
-        self, config: TableConfig, flavor: type = StorableDict, load_flavor: type | None = None
+        self,
+        config: TableConfig,
+        flavor: type = StorableDict,
+        load_flavor: type | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ) -> None:
-        """Initialize the store."""
+        """Initialize the store.
+
+        Args:
+            config: The database table configuration.
+            flavor: The type of object stored.
+            load_flavor: The type of object loaded (defaults to flavor).
+            batch_size: The maximum number of rows selected or upserted in one statement
+                by get_many() or set_many().
+        """
+        self.batch_size: int = batch_size
         self.table = Table(config=config)
         pk: None | str = self.table.raw.primary_key
         if pk is None:
@@ -28,6 +48,10 @@ class DBTableStore(StoreBase, StoreABC):
         self._pk = pk
         self._columns = tuple(col for col in self.table.raw.columns if col != self._pk)
         StoreBase.__init__(self, flavor=flavor, load_flavor=load_flavor)
+        # Rows are fresh, trusted dictionaries: use the fast construction path if there is one
+        self._from_row: Callable[[dict[str, Any]], Any] = getattr(
+            self.load_flavor, "from_row", self.load_flavor
+        )
 
     def __contains__(self, key: Any) -> bool:
         """Check if an item is in the store."""
@@ -39,15 +63,20 @@ class DBTableStore(StoreBase, StoreABC):
 
     def __getitem__(self, key: Any) -> Any:
         """Get an item from the store."""
+        start: float = perf_counter()
         retval = tuple(
             self.table.select(
                 f"WHERE {self._pk}" + " = {_key_}",
                 literals={"_key_": key},
+                bounded=True,
             )
         )
+        self.metrics.fetch_latency.observe(perf_counter() - start)
         if len(retval) != 1:
+            self.metrics.misses += 1
             raise KeyError(f"{len(retval)} keys found key = '{key}'")
-        return self.load_flavor(retval[0])
+        self.metrics.hits += 1
+        return self._from_row(retval[0])
 
     def __iter__(self) -> Iterator:
         """Iterate over the store."""
@@ -61,6 +90,45 @@ class DBTableStore(StoreBase, StoreABC):
         """Set an item in the store. NOTE this is an UPSERT operation."""
         self.table[key] = value if isinstance(value, self.flavor) else self.flavor(value)
 
+    def set_many(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Set multiple items in the store. NOTE this is an UPSERT operation.
+        Rows are upserted batch_size rows at a time streamed with COPY (one transaction
+        per batch) rather than one transaction per item.
+        """
+        iterator: Iterator = iter(items)
+        while batch := tuple(islice(iterator, self.batch_size)):
+            rows: list[StorableObjABC] = []
+            for key, value in batch:
+                if value[self._pk] != key:
+                    raise ValueError("Primary key value must match")
+                rows.append(value if isinstance(value, self.flavor) else self.flavor(value))
+            self.table.bulk_upsert(rows, chunk_size=self.batch_size)
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Get multiple items from the store.
+        Rows are selected batch_size keys at a time with a single
+        WHERE pk = ANY(keys) query rather than one query per key. At most batch_size
+        rows are returned so the query is bounded (a client-side cursor is used).
+        Keys that are not in the store are omitted.
+        """
+        retval: dict[Hashable, Any] = {}
+        iterator: Iterator = iter(keys)
+        while batch := list(islice(iterator, self.batch_size)):
+            start: float = perf_counter()
+            rows: tuple[dict[str, Any], ...] = tuple(
+                self.table.select(
+                    f"WHERE {self._pk}" + " = ANY({_keys_})",
+                    literals={"_keys_": batch},
+                    bounded=True,
+                )
+            )
+            self.metrics.fetch_latency.observe(perf_counter() - start)
+            self.metrics.hits += len(rows)
+            self.metrics.misses += len(batch) - len(rows)
+            for row in rows:
+                retval[row[self._pk]] = self._from_row(row)
+        return retval
+
     def items(self) -> Iterator:  # type: ignore
         """Get the items of the store."""
         return (
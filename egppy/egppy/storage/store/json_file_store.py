@@ -89,10 +89,13 @@ class JSONFileStore(StoreBase, StoreABC):
         self.mmap_obj.seek(0)  # Start from the beginning of the file
         pos: int = self.mmap_obj.find(search_str)
         if pos == -1:
+            self.metrics.misses += 1
             raise KeyError(f"Key {key} not found.")
         start = self.mmap_obj.rfind(b"\n", 0, pos) + 1  # Find the start of the line
         self.mmap_obj.seek(start)
         line: bytes = self.mmap_obj.readline()
+        self.metrics.hits += 1
+        self.metrics.bytes += len(line)
         data = loads(s=line)
         return self.flavor(data["__value__"])
 
@@ -130,3 +133,4 @@ class JSONFileStore(StoreBase, StoreABC):
         self.mmap_obj.seek(self.file_size)  # Move to the end of the file
         self.mmap_obj.write(new_data)
         self.file_size = self.mmap_obj.size()
+        self.metrics.bytes += len(new_data)
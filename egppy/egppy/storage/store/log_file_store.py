@@ -0,0 +1,319 @@
+"""Log File store module.
+
+A LogFileStore is a local, persistent store backed by a single append-only binary log file.
+It is intended for offline runs and tests that do not have a PostgreSQL database and is a
+fast replacement for the JSONFileStore (which searches the whole file for every access).
+
+The file starts with a header followed by records. Each record is a fixed size record header
+(record type, key type, key length, value length) followed by the key and the JSON serialized
+value (see StorableObjABC.to_json()). Setting an item appends a record. Deleting an item
+appends a tombstone record (no value). An in-memory index of key to the offset & length of
+the latest value is built by scanning the log when the file is opened so that getting an item
+is a single positional read.
+
+Overwritten values and tombstones are dead space. When the dead space exceeds a ratio of the
+file size the live records are rewritten to a new file which replaces the log (compaction).
+A partially written record at the end of the file (e.g. from a crash) is truncated on open.
+"""
+
+from collections.abc import Hashable, Iterable
+from io import FileIO
+from json import dumps, loads
+from mmap import ACCESS_READ, mmap
+from os import fsync, pread, replace
+from os.path import exists, getsize
+from struct import Struct
+from tempfile import TemporaryFile
+from time import perf_counter
+from typing import Any, Iterator
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.storage.store.storable_obj_abc import StorableObjABC
+from egppy.storage.store.store_abc import StoreABC
+from egppy.storage.store.store_base import StoreBase
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# File header
+_HEADER = b"EGP Log File Store v1\n"
+# Record header: record type, key type, key length, value length
+_RECORD = Struct("<BBII")
+# Record types
+_PUT: int = 0
+_TOMBSTONE: int = 1
+# Key types
+_BYTES_KEY: int = 0
+_STR_KEY: int = 1
+_INT_KEY: int = 2
+
+
+def _encode_key(key: Hashable) -> tuple[int, bytes]:
+    """Return the key type and encoded key."""
+    if isinstance(key, bytes):
+        return _BYTES_KEY, key
+    if isinstance(key, str):
+        return _STR_KEY, key.encode("utf-8")
+    if isinstance(key, int):
+        return _INT_KEY, str(key).encode("utf-8")
+    raise TypeError(f"Key must be bytes, str or int, not {type(key)} for LogFileStore.")
+
+
+def _decode_key(key_type: int, data: bytes) -> Hashable:
+    """Return the key decoded from data."""
+    if key_type == _BYTES_KEY:
+        return data
+    if key_type == _STR_KEY:
+        return data.decode("utf-8")
+    if key_type == _INT_KEY:
+        return int(data)
+    raise ValueError(f"Invalid log file store key type: {key_type}")
+
+
+def _record(key: Hashable, value: StorableObjABC | None) -> bytes:
+    """Return the encoded record. A value of None is a tombstone."""
+    key_type, kdata = _encode_key(key)
+    if value is None:
+        return _RECORD.pack(_TOMBSTONE, key_type, len(kdata), 0) + kdata
+    vdata: bytes = dumps(value.to_json()).encode("utf-8")
+    return _RECORD.pack(_PUT, key_type, len(kdata), len(vdata)) + kdata + vdata
+
+
+class LogFileStore(StoreBase, StoreABC):
+    """A file based store for StorableObjABC objects using an append-only log.
+
+    Keys may be bytes (e.g. signatures), str or int. Iteration is over the keys in the
+    order they were first set (since the last compaction).
+    """
+
+    def __init__(
+        self,
+        flavor: type[StorableObjABC],
+        file_path: str | None = None,
+        compact_ratio: float = 0.5,
+        compact_size: int = 2**20,
+    ) -> None:
+        """Open (or create) a log file store.
+
+        Args:
+            flavor: The type of object stored.
+            file_path: The path to the log file. If None a temporary file is used.
+            compact_ratio: Compact when the dead space is more than this ratio of the file.
+            compact_size: Do not compact automatically if the file is smaller than this.
+        """
+        if not 0.0 < compact_ratio < 1.0:
+            raise ValueError(f"compact_ratio must be in the range (0, 1), but is {compact_ratio}")
+        super().__init__(flavor=flavor)
+        self.file_path: str | None = file_path
+        self.compact_ratio: float = compact_ratio
+        self.compact_size: int = compact_size
+        self.index: dict[Hashable, tuple[int, int]] = {}
+        self.file_size: int = 0
+        self.dead_size: int = 0
+        self.compactions: int = 0
+        self.file: FileIO = self._open()
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if an item is in the store."""
+        return key in self.index
+
+    def __del__(self) -> None:
+        """Close the file."""
+        if hasattr(self, "file"):
+            self.close()
+
+    def __delitem__(self, key: Hashable) -> None:
+        """Delete an item from the store by appending a tombstone."""
+        entry: tuple[int, int] = self.index.pop(key)
+        record: bytes = _record(key, None)
+        self._append(record)
+        # Both the deleted record and the tombstone are dead space
+        self.dead_size += self._record_size(key, entry) + len(record)
+        self._auto_compact()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        """Get an item from the store with a single read."""
+        entry: tuple[int, int] | None = self.index.get(key)
+        if entry is None:
+            self.metrics.misses += 1
+            raise KeyError(f"Key {key!r} not found.")
+        offset, length = entry
+        start: float = perf_counter()
+        data: bytes = pread(self.file.fileno(), length, offset)
+        self.metrics.fetch_latency.observe(perf_counter() - start)
+        self.metrics.hits += 1
+        self.metrics.bytes += length
+        return self.flavor(loads(data))
+
+    def __iter__(self) -> Iterator:
+        """Iterate over a snapshot of the keys in the store."""
+        return iter(tuple(self.index))
+
+    def __len__(self) -> int:
+        """Return the number of items in the store."""
+        return len(self.index)
+
+    def __setitem__(self, key: Hashable, value: StorableObjABC) -> None:
+        """Set an item in the store by appending a record."""
+        self.set_many(((key, value),))
+
+    def _append(self, data: bytes) -> None:
+        """Append data to the log."""
+        self.file.write(data)
+        self.file_size += len(data)
+        self.metrics.bytes += len(data)
+
+    def _auto_compact(self) -> None:
+        """Compact the log if the dead space is too large."""
+        if self.file_size >= self.compact_size:
+            if self.dead_size > self.compact_ratio * self.file_size:
+                self.compact()
+
+    def _open(self) -> FileIO:
+        """Open the log file and build the index."""
+        if self.file_path is None:
+            file: FileIO = TemporaryFile(mode="w+b", buffering=0, suffix=".log")  # type: ignore
+        else:
+            empty: bool = not exists(self.file_path) or not getsize(self.file_path)
+            file = open(self.file_path, mode="a+b", buffering=0)
+            if not empty:
+                self._scan(file)
+                return file
+        file.write(_HEADER)
+        self.file_size = len(_HEADER)
+        return file
+
+    def _scan(self, file: FileIO) -> None:
+        """Build the index by scanning the log file."""
+        index: dict[Hashable, tuple[int, int]] = {}
+        size: int = file.seek(0, 2)
+        with mmap(file.fileno(), length=0, access=ACCESS_READ) as data:
+            if data[: len(_HEADER)] != _HEADER:
+                raise ValueError(f"{self.file_path} is not a log file store.")
+            offset: int = len(_HEADER)
+            live: int = 0
+            while offset + _RECORD.size <= size:
+                rtype, key_type, klen, vlen = _RECORD.unpack_from(data, offset)
+                end: int = offset + _RECORD.size + klen + vlen
+                if end > size:
+                    break
+                key: Hashable = _decode_key(key_type, data[offset + _RECORD.size : end - vlen])
+                if key in index:
+                    live -= self._record_size(key, index.pop(key))
+                if rtype == _PUT:
+                    index[key] = (end - vlen, vlen)
+                    live += end - offset
+                offset = end
+        if offset != size:
+            _logger.warning(
+                "Truncating %d bytes of partial record from %s.", size - offset, self.file_path
+            )
+            file.truncate(offset)
+        self.index = index
+        self.file_size = offset
+        self.dead_size = offset - len(_HEADER) - live
+
+    def _record_size(self, key: Hashable, entry: tuple[int, int]) -> int:
+        """Return the size of the put record for key with index entry (value offset, length)."""
+        return _RECORD.size + len(_encode_key(key)[1]) + entry[1]
+
+    def clear(self) -> None:
+        """Remove all the items from the store (truncates the log)."""
+        self.file.truncate(len(_HEADER))
+        self.file.seek(0, 2)
+        self.file_size = len(_HEADER)
+        self.dead_size = 0
+        self.index.clear()
+
+    def close(self) -> None:
+        """Close the log file. The store cannot be used after it is closed."""
+        if not self.file.closed:
+            self.file.close()
+
+    def compact(self) -> None:
+        """Rewrite the live records to a new log file and replace the current log."""
+        fd: int = self.file.fileno()
+        if self.file_path is None:
+            new_file: FileIO = TemporaryFile(mode="w+b", buffering=0, suffix=".log")  # type: ignore
+        else:
+            new_file = open(self.file_path + ".compact", mode="w+b", buffering=0)
+        new_file.write(_HEADER)
+        index: dict[Hashable, tuple[int, int]] = {}
+        size: int = len(_HEADER)
+        for key, (offset, length) in self.index.items():
+            record_size: int = self._record_size(key, (offset, length))
+            new_file.write(pread(fd, record_size, offset + length - record_size))
+            size += record_size
+            index[key] = (size - length, length)
+        self.file.close()
+        if self.file_path is not None:
+            fsync(new_file.fileno())
+            new_file.close()
+            replace(self.file_path + ".compact", self.file_path)
+            new_file = open(self.file_path, mode="a+b", buffering=0)
+        self.file = new_file
+        self.index = index
+        self.file_size = size
+        self.dead_size = 0
+        self.compactions += 1
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Get multiple items from the store. Keys that are not found are omitted.
+        The values are read in file order.
+        """
+        index: dict[Hashable, tuple[int, int]] = self.index
+        keys = tuple(keys)
+        found: list[Hashable] = [key for key in keys if key in index]
+        fd: int = self.file.fileno()
+        retval: dict[Hashable, Any] = {}
+        start: float = perf_counter()
+        for key in sorted(found, key=lambda k: index[k][0]):
+            offset, length = index[key]
+            retval[key] = loads(pread(fd, length, offset))
+            self.metrics.bytes += length
+        if found:
+            self.metrics.fetch_latency.observe(perf_counter() - start)
+        self.metrics.hits += len(found)
+        self.metrics.misses += len(keys) - len(found)
+        return {key: self.flavor(retval[key]) for key in found}
+
+    def info(self) -> str:
+        """Log and return the store statistics."""
+        info_str: str = (
+            f"Log file store {self.file_path} items: {len(self.index)}\n"
+            f"Log file store {self.file_path} size: {self.file_size} bytes\n"
+            f"Log file store {self.file_path} dead space: {self.dead_size} bytes\n"
+            f"Log file store {self.file_path} compactions: {self.compactions}\n"
+        )
+        _logger.info(info_str)
+        return info_str
+
+    def set_many(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Set multiple items in the store with a single append."""
+        records: list[bytes] = []
+        entries: list[tuple[Hashable, int, int]] = []
+        size: int = self.file_size
+        for key, value in items:
+            record: bytes = _record(key, value)
+            length: int = _RECORD.unpack_from(record)[3]
+            size += len(record)
+            records.append(record)
+            entries.append((key, size - length, length))
+        self._append(b"".join(records))
+        index: dict[Hashable, tuple[int, int]] = self.index
+        for key, offset, length in entries:
+            if key in index:
+                self.dead_size += self._record_size(key, index[key])
+            index[key] = (offset, length)
+        self._auto_compact()
+
+    def verify(self) -> None:
+        """Verify the store."""
+        if pread(self.file.fileno(), len(_HEADER), 0) != _HEADER:
+            raise ValueError("Invalid log file store header.")
+        if any(offset + length > self.file_size for offset, length in self.index.values()):
+            raise ValueError("Log file store index entry is beyond the end of the file.")
+        if not 0 <= self.dead_size < self.file_size:
+            raise ValueError(f"Invalid log file store dead space: {self.dead_size} bytes")
+        super().verify()
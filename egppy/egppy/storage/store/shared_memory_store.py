@@ -0,0 +1,328 @@
+"""Shared Memory store module.
+
+A SharedMemoryStore is a host level (L2) store shared by the worker processes on the same
+host. It sits between the per-process (L1) cache and the next level store (typically a
+DBTableStore) so that N worker processes do not each fetch the same popular objects from
+the database.
+
+The store is a fixed size, set associative hash table in a multiprocessing.shared_memory
+segment. Each key hashes to a bucket of a number of ways (slots). A slot holds the key and
+the JSON serialized object. When all the ways of a bucket are occupied the ways are evicted
+round robin. Objects that serialize to more than the slot value size are not stored (they
+are counted as metrics rejections).
+
+Writers are serialized with a multiprocessing lock. Readers do not take the lock: each slot
+has a version number (a seqlock) that is odd while the slot is being written. A reader
+retries if the version is odd or changes while the slot is read. Objects fetched from the
+next level on a miss are only stored if the lock is free so that the misses of processes
+starting at the same time (a cold start) are not serialized.
+
+The store is shared with processes forked (see egppy.worker.executor.shared_context) after
+it is created. The creating process owns the shared memory segment and unlinks it on close().
+"""
+
+from collections.abc import Callable, Hashable, Iterable
+from hashlib import blake2b
+from json import dumps, loads
+from math import ceil
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+from os import getpid
+from struct import Struct
+from time import perf_counter
+from typing import Any, Iterator
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.storage.store.storable_obj_abc import StorableObjABC
+from egppy.storage.store.store_abc import StoreABC
+from egppy.storage.store.store_base import StoreBase
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Header: magic, number of buckets, ways per bucket, key size, value size
+_HEADER = Struct("<8sIIII")
+_MAGIC = b"EGPSHMS1"
+# Bucket: the next way to evict
+_BUCKET = Struct("<I")
+# Slot: version (odd while being written), length of the value (0 = empty)
+_SLOT = Struct("<II")
+_VERSION = Struct("<I")
+_VERSION_MASK: int = 2**32 - 1
+# Maximum number of attempts to read a slot that is being written before a miss is returned
+_MAX_READ_ATTEMPTS: int = 2**10
+
+
+class SharedMemoryStore(StoreBase, StoreABC):
+    """A store shared between processes on the same host using shared memory.
+
+    Keys are bytes of key_size bytes e.g. 32 byte GC signatures. Values are stored as JSON
+    (see StorableObjABC.to_json()) and loaded as flavor objects with the trusted flavor
+    from_row() constructor if there is one (e.g. FrozenGGC.from_row() of a Gene Pool row)
+    like a DBTableStore.
+
+    If a next level store is defined the store is read-through (misses are fetched from the
+    next level and stored) and write-through (items set are written to the next level).
+    Without a next level the store is a bounded shared cache. Iteration & length are of the
+    objects in the shared memory only.
+    """
+
+    def __init__(
+        self,
+        flavor: type[StorableObjABC],
+        capacity: int = 2**12,
+        next_level: StoreABC | None = None,
+        ways: int = 4,
+        key_size: int = 32,
+        value_size: int = 2**12,
+    ) -> None:
+        """Create a shared memory store.
+
+        Args:
+            flavor: The type of object stored.
+            capacity: The maximum number of objects stored.
+            next_level: The optional next level store.
+            ways: The number of slots in each bucket.
+            key_size: The size of the keys in bytes.
+            value_size: The maximum size of a JSON serialized object in bytes.
+        """
+        if capacity < ways or ways < 1:
+            raise ValueError(f"capacity ({capacity}) must be >= ways ({ways}) & ways >= 1")
+        super().__init__(flavor=flavor)
+        self.next_level: StoreABC | None = next_level
+        self.num_buckets: int = ceil(capacity / ways)
+        self.ways: int = ways
+        self.key_size: int = key_size
+        self.value_size: int = value_size
+        self._slot_size: int = _SLOT.size + key_size + value_size
+        self._bucket_size: int = _BUCKET.size + ways * self._slot_size
+        self._shm = SharedMemory(
+            create=True, size=_HEADER.size + self.num_buckets * self._bucket_size
+        )
+        self._buf: memoryview = self._shm.buf  # type: ignore
+        _HEADER.pack_into(self._buf, 0, _MAGIC, self.num_buckets, ways, key_size, value_size)
+        self._lock = Lock()
+        self._owner: int = getpid()
+        self._from_row: Callable[[dict[str, Any]], Any] = getattr(flavor, "from_row", flavor)
+
+    def __contains__(self, key: Any) -> bool:
+        """Check if an item is in the store (or the next level)."""
+        if self._find(key) is not None:
+            return True
+        return self.next_level is not None and key in self.next_level
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete an item from the store (and the next level)."""
+        found: bool = self._delete(key)
+        if self.next_level is not None:
+            if key in self.next_level:
+                del self.next_level[key]
+                found = True
+        if not found:
+            raise KeyError(f"Key {key!r} not found.")
+
+    def __getitem__(self, key: Any) -> Any:
+        """Get an item from the store. Misses are fetched from the next level (if any)."""
+        data: bytes | None = self._find(key)
+        if data is not None:
+            self.metrics.hits += 1
+            self.metrics.bytes += len(data)
+            return self._from_row(loads(data))
+        self.metrics.misses += 1
+        if self.next_level is None:
+            raise KeyError(f"Key {key!r} not found.")
+        start: float = perf_counter()
+        value = self.next_level[key]
+        self.metrics.fetch_latency.observe(perf_counter() - start)
+        self._write(key, value, False)
+        return value if isinstance(value, self.flavor) else self.flavor(value)
+
+    def __iter__(self) -> Iterator:
+        """Iterate over a snapshot of the keys in the shared memory."""
+        return iter(tuple(key for key, _ in self._slots()))
+
+    def __len__(self) -> int:
+        """Return the number of items in the shared memory."""
+        return sum(1 for _ in self._slots())
+
+    def __setitem__(self, key: Any, value: StorableObjABC) -> None:
+        """Set an item in the store (and the next level)."""
+        if self.next_level is not None:
+            self.next_level[key] = value
+        self._write(key, value)
+
+    def _bucket(self, key: bytes) -> int:
+        """Return the offset of the bucket for key."""
+        assert (
+            isinstance(key, bytes) and len(key) == self.key_size
+        ), f"Key must be {self.key_size} bytes for SharedMemoryStore."
+        index: int = int.from_bytes(blake2b(key, digest_size=8).digest()) % self.num_buckets
+        return _HEADER.size + index * self._bucket_size
+
+    def _delete(self, key: bytes) -> bool:
+        """Delete the slot for key. Return True if it was found."""
+        buf: memoryview = self._buf
+        base: int = self._bucket(key) + _BUCKET.size
+        ksize: int = self.key_size
+        with self._lock:
+            for offset in range(base, base + self.ways * self._slot_size, self._slot_size):
+                version, length = _SLOT.unpack_from(buf, offset)
+                if length and buf[offset + _SLOT.size : offset + _SLOT.size + ksize] == key:
+                    _VERSION.pack_into(buf, offset, (version + 1) & _VERSION_MASK)
+                    _SLOT.pack_into(buf, offset, (version + 2) & _VERSION_MASK, 0)
+                    return True
+        return False
+
+    def _find(self, key: bytes) -> bytes | None:
+        """Return the serialized value for key or None if it is not in the shared memory."""
+        buf: memoryview = self._buf
+        base: int = self._bucket(key) + _BUCKET.size
+        kstart: int = _SLOT.size
+        vstart: int = _SLOT.size + self.key_size
+        for offset in range(base, base + self.ways * self._slot_size, self._slot_size):
+            for _ in range(_MAX_READ_ATTEMPTS):
+                version, length = _SLOT.unpack_from(buf, offset)
+                if version & 1:
+                    continue
+                data: bytes | None = None
+                if length and buf[offset + kstart : offset + vstart] == key:
+                    data = bytes(buf[offset + vstart : offset + vstart + length])
+                if _VERSION.unpack_from(buf, offset)[0] == version:
+                    if data is not None:
+                        return data
+                    break
+        return None
+
+    def _slots(self) -> Iterator[tuple[bytes, int]]:
+        """Generate the (key, offset) of the occupied slots."""
+        buf: memoryview = self._buf
+        kend: int = _SLOT.size + self.key_size
+        for bucket in range(self.num_buckets):
+            base: int = _HEADER.size + bucket * self._bucket_size + _BUCKET.size
+            for offset in range(base, base + self.ways * self._slot_size, self._slot_size):
+                if _SLOT.unpack_from(buf, offset)[1]:
+                    yield bytes(buf[offset + _SLOT.size : offset + kend]), offset
+
+    def _write(self, key: bytes, value: StorableObjABC, block: bool = True) -> None:
+        """Write the serialized value for key into the shared memory.
+
+        Args:
+            key: The key.
+            value: The value.
+            block: If False the value is not written if another process holds the lock.
+        """
+        data: bytes = dumps(value.to_json()).encode("utf-8")
+        if len(data) > self.value_size:
+            self.metrics.rejections += 1
+            _logger.debug(
+                "Shared memory store value for %s is %d > %d bytes: Not stored.",
+                key.hex(),
+                len(data),
+                self.value_size,
+            )
+            return
+        buf: memoryview = self._buf
+        bucket: int = self._bucket(key)
+        base: int = bucket + _BUCKET.size
+        kstart: int = _SLOT.size
+        vstart: int = _SLOT.size + self.key_size
+        if not self._lock.acquire(block):
+            return
+        try:
+            target: int = -1
+            for offset in range(base, base + self.ways * self._slot_size, self._slot_size):
+                length: int = _SLOT.unpack_from(buf, offset)[1]
+                if length and buf[offset + kstart : offset + vstart] == key:
+                    target = offset
+                    break
+                if not length and target == -1:
+                    target = offset
+            if target == -1:
+                way: int = _BUCKET.unpack_from(buf, bucket)[0]
+                _BUCKET.pack_into(buf, bucket, (way + 1) % self.ways)
+                target = base + way * self._slot_size
+                self.metrics.evictions += 1
+            version: int = _VERSION.unpack_from(buf, target)[0]
+            _VERSION.pack_into(buf, target, (version + 1) & _VERSION_MASK)
+            buf[target + kstart : target + vstart] = key
+            buf[target + vstart : target + vstart + len(data)] = data
+            _SLOT.pack_into(buf, target, (version + 2) & _VERSION_MASK, len(data))
+        finally:
+            self._lock.release()
+        self.metrics.bytes += len(data)
+
+    def clear(self) -> None:
+        """Clear the shared memory. The next level (if any) is not cleared."""
+        for key, _ in tuple(self._slots()):
+            self._delete(key)
+
+    def close(self) -> None:
+        """Close the shared memory. The creating process also unlinks (destroys) it."""
+        self._shm.close()
+        if getpid() == self._owner:
+            self._shm.unlink()
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Get multiple items from the store.
+        Misses are fetched from the next level (if any) with a single get_many() call.
+        Keys that are not found are omitted.
+        """
+        retval: dict[Hashable, Any] = {}
+        misses: list[Hashable] = []
+        for key in keys:
+            data: bytes | None = self._find(key)  # type: ignore
+            if data is None:
+                misses.append(key)
+            else:
+                self.metrics.bytes += len(data)
+                retval[key] = self._from_row(loads(data))
+        self.metrics.hits += len(retval)
+        self.metrics.misses += len(misses)
+        if misses and self.next_level is not None:
+            start: float = perf_counter()
+            fetched: dict[Hashable, Any] = self.next_level.get_many(misses)
+            self.metrics.fetch_latency.observe(perf_counter() - start)
+            for key, value in fetched.items():
+                self._write(key, value, False)  # type: ignore
+                retval[key] = value if isinstance(value, self.flavor) else self.flavor(value)
+        return retval
+
+    def info(self) -> str:
+        """Log and return the store statistics (for this process)."""
+        info_str: str = (
+            f"Shared memory store {self._shm.name} size: {self._shm.size} bytes\n"
+            f"Shared memory store hits: {self.metrics.hits}\n"
+            f"Shared memory store misses: {self.metrics.misses}\n"
+            f"Shared memory store hit rate: {self.metrics.hit_rate():.2%}\n"
+            f"Shared memory store evictions: {self.metrics.evictions}\n"
+            f"Shared memory store oversize values: {self.metrics.rejections}\n"
+        )
+        _logger.info(info_str)
+        return info_str
+
+    def set_many(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Set multiple items in the store.
+        The items are written to the next level (if any) with a single set_many() call.
+        """
+        batch: tuple[tuple[Hashable, Any], ...] = tuple(items)
+        if self.next_level is not None:
+            self.next_level.set_many(batch)
+        for key, value in batch:
+            self._write(key, value)  # type: ignore
+
+    def verify(self) -> None:
+        """Verify the store."""
+        magic, num_buckets, ways, key_size, value_size = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Invalid shared memory store magic: {magic!r}")
+        if (num_buckets, ways, key_size, value_size) != (
+            self.num_buckets,
+            self.ways,
+            self.key_size,
+            self.value_size,
+        ):
+            raise ValueError("Shared memory store header does not match the configuration.")
+        if self.next_level is not None:
+            self.next_level.verify()
+        super().verify()
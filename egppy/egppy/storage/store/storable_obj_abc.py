@@ -25,6 +25,8 @@ class StorableObjABC(CommonObjABC):
     it is passed to the constructor.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def __init__(self, *args, **kwargs) -> None:
         """Initialize the Storeable object."""
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections.abc import MutableMapping
+from collections.abc import Hashable, Iterable, MutableMapping
+from typing import Any
 
 from egpcommon.common_obj_abc import CommonObjABC
 from egpcommon.egp_log import Logger, egp_logger
@@ -23,14 +24,35 @@ class StoreABC(MutableMapping, CommonObjABC):
         """Initialize the Store."""
         raise NotImplementedError("StoreABC.__init__ must be overridden")
 
-    # TODO: Implement
-    # @abstractmethod
-    # def set_bulk(self, items: dict[str, object]) -> None:
-    #    """Set multiple items in the store. The intent of this method is to
-    #    allow the store to optimize the setting of multiple items at once.
-    #    This method is used by CacheABC when purging items from the cache.
-    #
-    #    Args:
-    #        items (dict[str, object]): The items to set in the store.
-    #    """
-    #    raise NotImplementedError("StoreABC.set_bulk must be overridden")
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Get multiple items from the store. The intent of this method is to
+        allow the store to optimize the getting of multiple items at once e.g. one
+        query rather than one query per item. Keys that are not in the store are
+        omitted from the returned dictionary (no KeyError is raised).
+        The default implementation gets the items one at a time.
+
+        Args:
+            keys (Iterable[Hashable]): The keys of the items to get.
+
+        Returns:
+            dict[Hashable, Any]: The items found in the store indexed by key.
+        """
+        retval: dict[Hashable, Any] = {}
+        for key in keys:
+            try:
+                retval[key] = self[key]
+            except KeyError:
+                pass
+        return retval
+
+    def set_many(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Set multiple items in the store. The intent of this method is to
+        allow the store to optimize the setting of multiple items at once.
+        This method is used by CacheABC when writing dirty items back to the next level.
+        The default implementation sets the items one at a time.
+
+        Args:
+            items (Iterable[tuple[Hashable, Any]]): The (key, value) items to set in the store.
+        """
+        for key, value in items:
+            self[key] = value
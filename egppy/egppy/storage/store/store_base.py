@@ -3,6 +3,7 @@
 from egpcommon.common_obj import CommonObj
 from egpcommon.common_obj_abc import CommonObjABC
 from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.metrics import Metrics
 from egppy.storage.store.storable_obj_abc import StorableObjABC
 from egppy.storage.store.store_abc import StoreABC
 
@@ -20,6 +21,7 @@ class StoreBase(CommonObj, CommonObjABC):
         The flavor is the type of object that the store stores.
         The load flavor is the type of object that the store loads.
         If the load flavor is not provided, it defaults to the flavor.
+        Every store has metrics (see egpcommon.metrics) named after the store class.
         Args:
             flavor (type[StorableObjABC]): The type of object that the store stores.
             load_flavor (type[StorableObjABC] | None, optional): The type of object that
@@ -27,6 +29,7 @@ class StoreBase(CommonObj, CommonObjABC):
         """
         self.flavor: type[StorableObjABC] = flavor
         self.load_flavor: type[StorableObjABC] = load_flavor if load_flavor is not None else flavor
+        self.metrics: Metrics = Metrics(type(self).__name__)
 
     def setdefault(self, key: str, value: StorableObjABC | None = None) -> StorableObjABC:
         """Set a default value for a key in the store. This method implements
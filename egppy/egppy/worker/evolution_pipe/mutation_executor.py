@@ -20,6 +20,11 @@ _logger: Logger = egp_logger(name=__name__)
 _mec = ExecutionContext(GenePoolInterface(LOCAL_DB_MANAGER_CONFIG), 50)
 
 
+def mutation_execution_context() -> ExecutionContext:
+    """Return the mutation execution context e.g. to pre-warm it before forking workers."""
+    return _mec
+
+
 def mutation_executor(pgc: GGCDict, tgc: GCABC) -> None:
     """Execute the mutation."""
     outputs = _mec.execute(pgc, (tgc,))
@@ -6,12 +6,19 @@ See [The Genetic Code Executor](docs/executor.md) for more information.
 
 from __future__ import annotations
 
+from ast import literal_eval
+from dataclasses import replace
 from itertools import chain, count
-from typing import Any
+from math import isfinite
+from types import CodeType
+from typing import Any, Callable, Iterable
+
+from numpy import array
+from numpy.typing import NDArray
 
 from egpcommon.common import NULL_STR
 from egpcommon.egp_log import DEBUG, TRACE, Logger, egp_logger
-from egpcommon.properties import CGraphType
+from egpcommon.properties import CGraphType, PropertiesBD
 from egppy.gene_pool.gene_pool_interface import GenePoolInterface
 from egppy.genetic_code.c_graph_constants import DstIfKey, DstRow, SrcIfKey, SrcRow
 from egppy.genetic_code.ggc_dict import GCABC, NULL_GC
@@ -23,9 +30,17 @@ from egppy.worker.executor.code_connection import (
     CodeEndPoint,
     code_connection_from_iface,
 )
+from egppy.worker.executor.function_cache import (
+    FunctionCache,
+    FunctionCacheEntry,
+    FunctionRecord,
+    rename_functions,
+    rename_source,
+)
 from egppy.worker.executor.function_info import NULL_EXECUTABLE, NULL_FUNCTION_MAP, FunctionInfo
 from egppy.worker.executor.fw_config import FWCONFIG_DEFAULT, FWConfig
 from egppy.worker.executor.gc_node import NULL_GC_NODE, GCNode, GCNodeCodeIterable
+from egppy.worker.executor.result_cache import DEFAULT_CACHE_BUDGET, CacheBudget, ResultCache
 
 # Standard EGP logging pattern
 _logger: Logger = egp_logger(name=__name__)
@@ -36,6 +51,10 @@ _logger: Logger = egp_logger(name=__name__)
 # Limit is representation as a variable name f"t{number:05d}"
 MAX_NUM_LOCALS: int = 99999
 UNUSED_VAR_NAME: str = "_"
+# Maximum length of the code string of a constant evaluated (folded) result
+MAX_FOLDED_LEN: int = 256
+# Immutable types that have a python literal representation
+LITERAL_TYPES: tuple[type, ...] = (bool, int, str, bytes, type(None))
 
 
 # For sorting connections for naming
@@ -55,6 +74,27 @@ def connection_key(connection: CodeConnection) -> int:
     return 2
 
 
+def is_pure(gc: GCABC) -> bool:
+    """Return True if the GC is deterministic and has no side effects.
+    A pure GC always returns the same outputs for the same inputs and so
+    may be evaluated once and the result reused.
+    """
+    properties = gc["properties"]
+    return PropertiesBD.fast_fetch("deterministic", properties) and not PropertiesBD.fast_fetch(
+        "side_effects", properties
+    )
+
+
+def is_literal(obj: Any) -> bool:
+    """Return True if obj is immutable and repr(obj) is a python literal that creates it."""
+    if type(obj) is tuple:  # pylint: disable=unidiomatic-typecheck
+        return all(is_literal(o) for o in obj)
+    if type(obj) is float:  # pylint: disable=unidiomatic-typecheck
+        # inf & nan do not have literal representations
+        return isfinite(obj)
+    return type(obj) in LITERAL_TYPES
+
+
 def i_cstr(n: int) -> str:
     """Return the code string for the nth input.
     GC inputs are always implemented as a tuple named 'i'.
@@ -102,14 +142,33 @@ class ExecutionContext:
         "_line_limit",
         "_global_index",
         "_codon_register",
+        "_callers",
+        "_fwconfig",
+        "_cache_budget",
+        "result_caches",
+        "function_cache",
+        "_written",
         "gpi",
     )
 
-    def __init__(self, gpi: GenePoolInterface, line_limit: int = 64) -> None:
+    def __init__(
+        self,
+        gpi: GenePoolInterface,
+        line_limit: int = 64,
+        fwconfig: FWConfig = FWCONFIG_DEFAULT,
+        cache_budget: int = DEFAULT_CACHE_BUDGET,
+        function_cache: FunctionCache | None = None,
+    ) -> None:
         """Create a new execution context.
         Args:
             gpi (GenePoolInterface): The gene pool interface used to look up GC's.
             line_limit (int): The maximum number of lines in a function.
+            fwconfig (FWConfig): The function write configuration for functions defined
+                in this context e.g. which optimisations to apply.
+            cache_budget (int): The memory budget in bytes for all the function result
+                caches in this context.
+            function_cache (FunctionCache | None): The persistent on-disk cache of function
+                definitions shared by execution contexts. None disables it.
         """
         # The globals passed to exec() when defining objects in the context
         # The GenePoolInterface instance is stored in the namespace as "GPI"
@@ -127,26 +186,36 @@ class ExecutionContext:
         # Codon register - codons that have been processed in this context
         # Used to save trying to re-process the same codon e.g. imports.
         self._codon_register: set[bytes] = set()
-
-    def get_dependent_nodes(
-        self, connections: list[CodeConnection], rtc: list[CodeConnection], root: GCNode
-    ) -> set[GCNode]:
-        """Get all nodes that are dependencies for the given connections."""
+        # Direct call fast path - signature to resolved function caller
+        # Populated on first execution of a GC function so that subsequent executions
+        # are a dictionary lookup and a call.
+        self._callers: dict[bytes, Callable[[tuple[Any, ...]], Any]] = {}
+        # The function write configuration used when defining functions
+        self._fwconfig: FWConfig = fwconfig
+        # Function result caches (memoisation) by signature & their shared memory budget
+        self._cache_budget: CacheBudget = CacheBudget(cache_budget)
+        self.result_caches: dict[bytes, ResultCache] = {}
+        # Persistent function definition cache & the functions defined since the last write
+        self.function_cache: FunctionCache | None = function_cache
+        self._written: list[tuple[FunctionRecord, list[GCNode]]] = []
+
+    def get_dependent_nodes(self, connections: list[CodeConnection], root: GCNode) -> set[GCNode]:
+        """Get all nodes that are dependencies for the given connections.
+        The dependencies are found by walking the root connection index (see
+        GCNode.index_connections()) from destination to source nodes.
+        """
         nodes = set()
         work_list = [c.src.node for c in connections if c.src.node is not root]
-        visited = set()
+        incoming: dict[GCNode, list[CodeConnection]] = root.incoming
 
         while work_list:
             node = work_list.pop()
-            if node in visited or node is root:
+            if node in nodes or node is root:
                 continue
-            visited.add(node)
             nodes.add(node)
 
             # Add this node's dependencies
-            for conn in rtc:
-                if conn.dst.node is node and conn.src.node is not root:
-                    work_list.append(conn.src.node)
+            work_list.extend(c.src.node for c in incoming.get(node, ()) if c.src.node is not root)
 
         return nodes
 
@@ -194,20 +263,23 @@ class ExecutionContext:
 
         # Build dependency graph: which nodes feed into Row O and Row P
 
-        o_path_nodes = self.get_dependent_nodes(o_connections, rtc, root)
-        p_path_nodes = self.get_dependent_nodes(p_connections, rtc, root)
+        o_path_nodes = self.get_dependent_nodes(o_connections, root)
+        p_path_nodes = self.get_dependent_nodes(p_connections, root)
 
         # Condition node dependencies should execute before the if
         condition_deps = (
-            self.get_dependent_nodes([condition_conn], rtc, root)
+            self.get_dependent_nodes([condition_conn], root)
             if condition_conn.src.node is not root
             else set()
         )
 
+        # The nodes to write in code order (shared by all the paths)
+        code_nodes: list[GCNode] = self.code_nodes(root)
+
         # Step 4: Generate code before the conditional
         # This includes condition evaluation and any shared computations
-        for node in condition_deps:
-            if node.terminal and node.num_lines:
+        for node in code_nodes:
+            if node in condition_deps:
                 scmnt = (
                     f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
                 )
@@ -218,8 +290,8 @@ class ExecutionContext:
 
         # Only include nodes that are in O path but not in condition deps
         true_only_nodes = o_path_nodes - condition_deps
-        for node in GCNodeCodeIterable(root):
-            if node in true_only_nodes and node.terminal and node.num_lines:
+        for node in code_nodes:
+            if node in true_only_nodes:
                 scmnt = (
                     f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
                 )
@@ -238,8 +310,8 @@ class ExecutionContext:
             # IF_THEN_ELSE: Execute GCB
             # Only include nodes that are in P path but not in condition deps
             false_only_nodes = p_path_nodes - condition_deps
-            for node in GCNodeCodeIterable(root):
-                if node in false_only_nodes and node.terminal and node.num_lines:
+            for node in code_nodes:
+                if node in false_only_nodes:
                     scmnt = (
                         f"  # Sig: ...{node.gc['signature'].hex()[-8:]}"
                         if fwconfig.inline_sigs
@@ -331,32 +403,13 @@ class ExecutionContext:
         # Nodes that must execute before the loop starts
         init_conns = [c for c in [l_conn, w_conn, s_conn] if c is not None]
 
-        def get_dependent_nodes(connections: list[CodeConnection]) -> set[GCNode]:
-            """Get all nodes that are dependencies for the given connections."""
-            nodes = set()
-            work_list = [c.src.node for c in connections if c.src.node is not root]
-            visited = set()
-
-            while work_list:
-                node = work_list.pop()
-                if node in visited or node is root:
-                    continue
-                visited.add(node)
-                nodes.add(node)
-
-                # Add this node's dependencies
-                for conn in rtc:
-                    if conn.dst.node is node and conn.src.node is not root:
-                        work_list.append(conn.src.node)
-
-            return nodes
-
-        init_deps = get_dependent_nodes(init_conns)
+        init_deps = self.get_dependent_nodes(init_conns, root)
 
         # Determine loop variables (Ls, Ss, Ws)
-        ls_conns = [c for c in rtc if c.src.node is root and c.src.row == SrcRow.L]
-        ss_conns = [c for c in rtc if c.src.node is root and c.src.row == SrcRow.S]
-        ws_conns = [c for c in rtc if c.src.node is root and c.src.row == SrcRow.W]
+        root_conns: list[CodeConnection] = root.outgoing.get(root, [])
+        ls_conns = [c for c in root_conns if c.src.row == SrcRow.L]
+        ss_conns = [c for c in root_conns if c.src.row == SrcRow.S]
+        ws_conns = [c for c in root_conns if c.src.row == SrcRow.W]
 
         ls_var = ls_conns[0].var_name if ls_conns else "unused_ls"
         ss_var = ss_conns[0].var_name if ss_conns else "unused_ss"
@@ -369,9 +422,12 @@ class ExecutionContext:
         if root.graph_type == CGraphType.WHILE_LOOP and ws_var == "unused_ws":
             ws_var = t_cstr(next(root.local_counter))
 
+        # The nodes to write in code order (shared by the initialization & loop body)
+        code_nodes: list[GCNode] = self.code_nodes(root)
+
         # Step 3: Generate initialization code
-        for node in GCNodeCodeIterable(root):
-            if node in init_deps and node.terminal and node.num_lines:
+        for node in code_nodes:
+            if node in init_deps:
                 scmnt = (
                     f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
                 )
@@ -401,28 +457,44 @@ class ExecutionContext:
         # The terminal connections for the loop body are those feeding into T, X, and O.
 
         body_conns = [c for c in [t_conn, x_conn] if c is not None] + o_connections
-        body_nodes = get_dependent_nodes(body_conns)
-
-        # Nodes that are strictly inside the loop (depend on loop inputs)
-        # vs nodes that are constant relative to the loop (calculated outside).
-        # For simplicity in this implementation, we'll put all body_nodes inside the loop
-        # unless they were already written in init_deps.
-        # Ideally, we should only put nodes that depend on loop variables inside.
-
-        # Generate body code
-        # We iterate through nodes in topological order (GCNodeCodeIterable does this?)
-        # We filter for nodes that are in `body_nodes` and not `init_deps` (unless re-eval needed?)
-        # Safe bet: write all body_nodes inside loop, except those strictly constant?
-        # For now, write all body_nodes inside.
-
-        loop_nodes = (
-            body_nodes  # - init_deps? If we exclude init_deps, we assume they are constant.
-        )
+        body_nodes = self.get_dependent_nodes(body_conns, root)
+
+        # Loop invariant hoisting: Body nodes that do not depend (transitively) on a loop
+        # sourced variable (Ls, Ss or Ws) compute the same result every iteration and are
+        # written in a block only executed in the first iteration. Only pure codons are
+        # hoisted (see is_pure()) as anything else may need to be executed every iteration,
+        # and neither are nodes that define an output (the output must be assigned in the
+        # loop to override the Row P value). Hoisted nodes are not written before the loop
+        # as they would then be executed (and could raise) when the loop iterates zero times.
+        # Code order is a topological order so a node's dependencies are classified first.
+        loop_nodes: set[GCNode] = set()
+        hoisted_nodes: list[GCNode] = []
+        loop_rows: tuple[SrcRow, ...] = (SrcRow.L, SrcRow.S, SrcRow.W)
+        for node in (n for n in code_nodes if n in body_nodes):
+            variant: bool = any(
+                c.src.node in loop_nodes or (c.src.node is root and c.src.row in loop_rows)
+                for c in root.incoming.get(node, ())
+            )
+            hoistable: bool = node.is_codon and not node.is_pgc and is_pure(node.gc)
+            if variant or not hoistable or self._is_output_node(root, node):
+                loop_nodes.add(node)
+            elif node not in init_deps:
+                hoisted_nodes.append(node)
+
+        if hoisted_nodes:
+            first: str = t_cstr(next(root.local_counter))
+            code.append(f"{first} = True")
+            loop_body_code.append(f"if {first}:")
+            for node in hoisted_nodes:
+                scmnt = (
+                    f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
+                )
+                loop_body_code.append(f"\t{self.inline_cstr(root=root, node=node)}{scmnt}")
+            loop_body_code.append(f"\t{first} = False")
 
-        for node in GCNodeCodeIterable(root):
-            if node in loop_nodes and node.terminal and node.num_lines:
-                # Check if node was already written in init and is constant?
-                # For now, just write it.
+        # Generate body code in code (topological) order
+        for node in code_nodes:
+            if node in loop_nodes:
                 scmnt = (
                     f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
                 )
@@ -559,6 +631,112 @@ class ExecutionContext:
 
         return code
 
+    def _is_output_node(self, root: GCNode, node: GCNode) -> bool:
+        """Return True if the node directly defines a Row O output of the root."""
+        return any(
+            c.dst.node is root and c.dst.row == DstRow.O for c in root.outgoing.get(node, ())
+        )
+
+    def batch_code(self, root: GCNode, body: list[str]) -> list[str]:
+        """Wrap the function body code lines in a loop over a batch of input tuples.
+
+        The input tuple for each iteration is assigned to 'i' so the body code is unchanged.
+        The return statement of the body (if any) is replaced by appending the result to
+        the output batch list 'ob' which is returned after the loop.
+
+        Args:
+            root: The GC node being written.
+            body: The function body code lines (not including any docstring).
+
+        Returns:
+            The batch variant function body code lines.
+        """
+        num_outputs: int = root.gc["num_outputs"]
+        result: str = "None"
+        if num_outputs > 0:
+            assert body and body[-1].startswith("return "), "Expected a return statement."
+            result = body[-1][len("return ") :]
+            body = body[:-1]
+            if num_outputs > 1:
+                result = f"({result})"
+        code: list[str] = ["ob = []", "for i in ib:"]
+        code.extend(f"\t{line}" for line in body)
+        code.append(f"\tob.append({result})")
+        code.append("return ob")
+        return code
+
+    def caller(
+        self, gcsig: bytes | GCABC, rtctxt: RuntimeContext | None = None
+    ) -> Callable[[tuple[Any, ...]], Any]:
+        """Return a callable that executes the GC function with an arguments tuple.
+
+        The function executable is resolved once per signature and the returned caller
+        is cached in the context. Subsequent calls with the same signature return the
+        cached caller without any name resolution or code compilation.
+
+        Args:
+            gcsig (bytes | GCABC): The signature of the GC (or the GC) to get the caller for.
+            rtctxt (RuntimeContext | None): A runtime context to pre-bind to a PGC function.
+                If None a new RuntimeContext is created for each call of a PGC function
+                (as the RuntimeContext holds state). Ignored if the GC is not a PGC.
+                Callers with a pre-bound runtime context are not cached.
+
+        Returns:
+            Callable: A function taking the tuple of GC inputs and returning the GC outputs.
+        """
+        signature = gcsig["signature"] if isinstance(gcsig, GCABC) else gcsig
+        assert isinstance(signature, bytes), f"Invalid signature type: {type(signature)}"
+        if rtctxt is None and signature in self._callers:
+            return self._callers[signature]
+
+        # Ensure the function is defined & get its info
+        if signature not in self.function_map:
+            self.write_executable(gcsig)
+        finfo = self.function_map[signature]
+        if finfo.executable is NULL_EXECUTABLE:
+            raise RuntimeError(
+                "Function was created with executable=False: "
+                "Re-create the execution context and re-write using "
+                "executable=True. You cannot patch the context."
+            )
+
+        # Functions with no inputs have no input tuple parameter. Wrap as needed
+        # so that all callers have the same signature.
+        executable: Callable = finfo.executable
+        fcall: Callable[[tuple[Any, ...]], Any]
+        if finfo.gc.is_pgc():
+            # NB: RuntimeContext is not used if the GC is not a PGC
+            # TODO: Need to pass in creator info here
+            gpi, gc = self.gpi, finfo.gc
+            if finfo.gc["num_inputs"]:
+
+                def pgc_call(i: tuple[Any, ...]) -> Any:
+                    """Call the PGC function with a runtime context."""
+                    return executable(RuntimeContext(gpi, gc) if rtctxt is None else rtctxt, i)
+
+                fcall = pgc_call
+            else:
+
+                def pgc_call_no_inputs(_: tuple[Any, ...]) -> Any:
+                    """Call the PGC function (with no inputs) with a runtime context."""
+                    return executable(RuntimeContext(gpi, gc) if rtctxt is None else rtctxt)
+
+                fcall = pgc_call_no_inputs
+            if rtctxt is not None:
+                return fcall
+        elif finfo.gc["num_inputs"]:
+            fcall = executable
+        else:
+
+            def call_no_inputs(_: tuple[Any, ...]) -> Any:
+                """Call the function (with no inputs)."""
+                return executable()
+
+            fcall = call_no_inputs
+
+        self._callers[signature] = fcall
+        return fcall
+
     def code_graph(self, root: GCNode) -> GCNode:
         """The inputs and outputs of each function are determined by the connections between GC's.
         This function traverses the function sub-graph and makes the connections between terminal
@@ -704,6 +882,9 @@ class ExecutionContext:
                     )
                 )
 
+        # Index the connections by destination for the code writers
+        root.index_connections()
+
         # Return the original node with the connections made
         return root
 
@@ -724,46 +905,156 @@ class ExecutionContext:
             self.constant_evaluation(root)
         if fwconfig.cse:
             self.common_subexpression_elimination(root)
+            # Output connections may have been renamed
+            ovns = self.name_connections(root)
         if fwconfig.simplification:
             self.simplification(root)
         if fwconfig.result_cache:
-            # TODO: Add condition to check if the GC is eligible for caching
             self.result_cache(root)
 
         # Check if this is a conditional GC and route to specialized handler
         if root.is_conditional:
-            return code + self._generate_conditional_function_code(root, fwconfig, ovns)
+            body: list[str] = self._generate_conditional_function_code(root, fwconfig, ovns)
 
         # Check if this is a loop GC and route to specialized handler
-        if root.is_loop:
-            return code + self._generate_loop_function_code(root, fwconfig, ovns)
-
-        # Write a line for each terminal node that has lines to write in the graph
-        # Special case: If the root is a codon, it needs to be written as it IS the function body
-        for node in (
-            tn
-            for tn in GCNodeCodeIterable(root)
-            if tn.terminal and tn.num_lines and (tn is not root or root.is_codon)
-        ):
-            scmnt = f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
-            code.append(self.inline_cstr(root=root, node=node) + scmnt)
-
-        # Add a return statement if the function has outputs
-        if root.gc["num_outputs"] > 0:
-            code.append(f"return {', '.join(ovns)}")
-        return code
+        elif root.is_loop:
+            body = self._generate_loop_function_code(root, fwconfig, ovns)
+
+        else:
+            # Write a line for each terminal node that has lines to write in the graph
+            # Special case: If the root is a codon, it needs to be written as it IS the
+            # function body
+            body = []
+            for node in (tn for tn in self.code_nodes(root) if tn is not root or root.is_codon):
+                scmnt = (
+                    f"  # Sig: ...{node.gc['signature'].hex()[-8:]}" if fwconfig.inline_sigs else ""
+                )
+                body.append(self.inline_cstr(root=root, node=node) + scmnt)
+
+            # Add a return statement if the function has outputs
+            if root.gc["num_outputs"] > 0:
+                body.append(f"return {', '.join(ovns)}")
+
+        # The batch variant loops over the batch of inputs inside the function
+        if fwconfig.batch:
+            return code + self.batch_code(root, body)
+        return code + body
+
+    def code_nodes(self, root: GCNode) -> list[GCNode]:
+        """Return the terminal nodes of the function that have lines to write in code order."""
+        return [tn for tn in GCNodeCodeIterable(root) if tn.terminal and tn.num_lines]
 
     def common_subexpression_elimination(self, root: GCNode) -> None:
         """Apply common subexpression elimination to the GC function.
         This optimisations identifies code paths that have identical expressions
         and replaces them with a single expression that is assigned to a variable.
+
+        Crossover & wrapping frequently duplicate sub-GC's so the same inline codons
+        with the same input variables can appear many times in a function.
+        The code is SSA like (every variable is assigned once) so two codon nodes
+        with the same signature and the same input variable names compute the same
+        outputs if the codon is pure (see is_pure()). The first such node is kept and the
+        connections from the outputs of the duplicates are redirected to it. The duplicates
+        are then not written (zero lines).
+
+        Only codons are eliminated as codon properties are defined with the codon
+        implementation rather than inherited. Only straight line functions are optimised:
+        in a conditional or loop function the first node may not be executed on every path
+        the duplicate would be. PGC's are never eliminated. The pass is idempotent as the
+        code lines for a node graph may be generated more than once.
         """
+        if root.is_conditional or root.is_loop:
+            return
+
+        # The output connections of every terminal node (kept up to date as sources change)
+        oconns: dict[GCNode, list[CodeConnection]] = root.outgoing
+
+        # The first node (in code order) for each (signature, input variable names)
+        first: dict[tuple[bytes, tuple[str, ...]], GCNode] = {}
+        for node in GCNodeCodeIterable(root):
+            if not (node.is_codon and node.num_lines) or node is root or node.is_pgc:
+                continue
+            if not is_pure(node.gc):
+                continue
+            nivns = {c.dst.idx: c.var_name for c in root.incoming.get(node, ())}
+            key = (node.gc["signature"], tuple(nivns[idx] for idx in sorted(nivns)))
+            fnode: GCNode = first.setdefault(key, node)
+            if fnode is node:
+                continue
+
+            # Redirect the duplicate node outputs to the first node. If the first node
+            # already has a variable for the output it is used else the duplicate's
+            # variable name is now assigned by the first node.
+            fvns: dict[int, str] = {c.src.idx: c.var_name for c in oconns.get(fnode, [])}
+            for connection in oconns.pop(node, []):
+                idx: int = connection.src.idx
+                connection.var_name = fvns.setdefault(idx, connection.var_name)
+                connection.src.node = fnode
+                oconns.setdefault(fnode, []).append(connection)
+            node.num_lines = 0
 
     def constant_evaluation(self, root: GCNode) -> None:
         """Apply constant evaluation to the GC function.
         This optimisations identifies code paths that always return the same result
         and replaces them with the constant result.
+
+        Pure codons (see is_pure()) with no inputs e.g. literal codons, are constants.
+        A pure codon with constant inputs is evaluated at write time and, if the outputs
+        have python literal representations (see is_literal()), the codon is written as
+        an assignment of the literal result i.e. it is folded. Evaluation follows the
+        code order so folded codons become constant inputs to later codons. Constant codons
+        whose outputs are then only used by folded codons are not written (zero lines).
+
+        Codons that raise an exception when evaluated are not folded so that the exception
+        is raised at execution time. PGC's are never evaluated. The pass is idempotent as
+        the code lines for a node graph may be generated more than once.
         """
+        rtc: list[CodeConnection] = root.terminal_connections
+
+        # Evaluate constant codons in code order
+        consts: dict[str, Any] = {}
+        cnodes: list[GCNode] = []
+        for node in GCNodeCodeIterable(root):
+            if not (node.is_codon and node.num_lines) or node is root or node.is_pgc:
+                continue
+            if not is_pure(node.gc):
+                continue
+            nivns = {c.dst.idx: c.var_name for c in root.incoming.get(node, ())}
+            if not node.folded and not all(ivn in consts for ivn in nivns.values()):
+                continue
+            self.import_codon(node.gc)
+            if node.folded:
+                code: str = node.folded
+            else:
+                code = node.gc["inline"].format_map({f"i{i}": ivn for i, ivn in nivns.items()})
+            try:
+                value = eval(code, self.namespace, consts)  # pylint: disable=eval-used
+                values = (
+                    value if node.gc["num_outputs"] > 1 and isinstance(value, tuple) else (value,)
+                )
+                if not is_literal(values) or len(values) != node.gc["num_outputs"]:
+                    continue
+                folded: str = node.folded
+                if nivns and not folded:
+                    # repr() can raise (e.g. int_max_str_digits) & must recreate the values
+                    folded = ", ".join(repr(v) for v in values)
+                    if len(folded) > MAX_FOLDED_LEN or literal_eval(f"({folded},)") != values:
+                        continue
+            except Exception:  # pylint: disable=broad-exception-caught
+                continue
+            node.folded = folded
+            for connection in root.outgoing.get(node, ()):
+                consts[connection.var_name] = values[connection.src.idx]
+            cnodes.append(node)
+
+        # Dead code elimination: Constants only used by folded codons are no longer needed
+        used: set[GCNode] = {
+            c.src.node
+            for c in rtc
+            if c.dst.node is root or (c.dst.node.num_lines and not c.dst.node.folded)
+        }
+        for node in (cn for cn in cnodes if cn not in used):
+            node.num_lines = 0
 
     def create_code_graphs(self, root: GCNode, executable: bool = True) -> list[GCNode]:
         """Return the list of GCNode instances that need to be written. i.e. that need code graphs.
@@ -805,7 +1096,7 @@ class ExecutionContext:
         root.line_count(self._line_limit)
         return root, self.create_code_graphs(root, executable)
 
-    def define(self, code: str) -> None:
+    def define(self, code: str | CodeType) -> None:
         """Define a function in the execution context."""
         exec(code, self.namespace)  # pylint: disable=exec-used
 
@@ -844,49 +1135,96 @@ class ExecutionContext:
         return dstr
 
     def execute(self, gcsig: bytes | GCABC, args: tuple[Any, ...]) -> Any:
-        """Execute the function in the execution context."""
+        """Execute the function in the execution context.
+        The function is called directly (no per call code compilation). See caller().
+        """
         signature = gcsig["signature"] if isinstance(gcsig, GCABC) else gcsig
         assert isinstance(signature, bytes), f"Invalid signature type: {type(signature)}"
+        fcall = self._callers.get(signature)
+        if fcall is None:
+            fcall = self.caller(gcsig)
+        return fcall(args)
 
-        # Ensure the function is defined & get its info
-        if signature not in self.function_map:
-            self.write_executable(gcsig)
-        finfo = self.function_map[signature]
-        if finfo.executable is NULL_EXECUTABLE:
-            raise RuntimeError(
-                "Function was created with executable=False: "
-                "Re-create the execution context and re-write using "
-                "executable=True. You cannot patch the context."
-            )
+    def execute_batch(
+        self, gcsig: bytes | GCABC, args: Iterable[tuple[Any, ...]], as_array: bool = False
+    ) -> list[Any] | NDArray:
+        """Execute the function for each input tuple in a batch.
+
+        The batch variant of the function loops over the batch inside the function body
+        so the call overhead is paid once per batch rather than once per input tuple.
+        The batch variant is written on first use. PGC batch variants are called with
+        a single new RuntimeContext for the whole batch.
 
-        # NB: RuntimeContext is not used if the GC is not a PGC
-        rtctxt = ""
-        lns: dict[str, Any] = {"i": args}
+        Args:
+            gcsig (bytes | GCABC): The signature of the GC (or the GC) to execute.
+            args (Iterable[tuple[Any, ...]]): The batch of GC input tuples.
+            as_array (bool): Return the results as a NumPy array rather than a list.
+
+        Returns:
+            list[Any] | NDArray: The GC results in the same order as the input tuples.
+        """
+        signature = gcsig["signature"] if isinstance(gcsig, GCABC) else gcsig
+        assert isinstance(signature, bytes), f"Invalid signature type: {type(signature)}"
+        finfo = self.function_map.get(signature, NULL_FUNCTION_MAP)
+        if finfo.batch_executable is NULL_EXECUTABLE:
+            finfo = self.new_batch_function(gcsig)
         if finfo.gc.is_pgc():
             # TODO: Need to pass in creator info here
-            lns["rtctxt"] = RuntimeContext(self.gpi, finfo.gc)
-            rtctxt = "rtctxt, "
-
-        execution_str = f"result = {finfo.name()}({rtctxt}{'i' if args else ''})"
-        exec(execution_str, self.namespace, lns)  # pylint: disable=exec-used
-        return lns["result"]
+            results = finfo.batch_executable(RuntimeContext(self.gpi, finfo.gc), args)
+        else:
+            results = finfo.batch_executable(args)
+        return array(results) if as_array else results
+
+    def function_cache_entry(self) -> FunctionCacheEntry:
+        """Return the function cache entry for the functions written since the last entry."""
+        defined: set[bytes] = {record.signature for record, _ in self._written}
+        calls: dict[bytes, str] = {}
+        codons: set[bytes] = set()
+        for _, nodes in self._written:
+            for node in nodes:
+                signature: bytes = node.gc["signature"]
+                if node.is_codon:
+                    codons.add(signature)
+                elif signature not in defined:
+                    calls[signature] = node.finfo.name()
+        entry = FunctionCacheEntry(
+            tuple(record for record, _ in self._written),
+            tuple((name, signature) for signature, name in calls.items()),
+            tuple(codons),
+        )
+        self._written.clear()
+        return entry
 
     def function_def(self, node: GCNode, fwconfig: FWConfig = FWCONFIG_DEFAULT) -> str:
         """Create the function definition in the execution context including the imports."""
         code = self.code_lines(node, fwconfig)
-        fstr = node.function_def(fwconfig.hints)
+        fstr = node.function_def(fwconfig.hints, fwconfig.batch)
         code.insert(0, fstr)
         return "\n\t".join(code)
 
+    def import_codon(self, gc: GCABC) -> None:
+        """Define the imports required by a codon in the execution context.
+        Only codons have imports or introduce new types (which may have imports).
+        """
+        if gc["signature"] not in self._codon_register:
+            # Make sure the imports are captured
+            self._codon_register.add(gc["signature"])
+            # Make an import chain
+            ifc = chain(gc["cgraph"][SrcIfKey.IS], gc["cgraph"][DstIfKey.OD])
+            ic = chain(gc["imports"], chain.from_iterable(t.typ.imports for t in ifc))
+            # Only import what we have not already imported.
+            for impt in (i for i in ic if i not in self.imports):
+                self.define(str(impt))
+                self.imports.add(impt)
+
     def inline_cstr(self, root: GCNode, node: GCNode) -> str:
         """Return the code string for the GC inline code."""
         # By default the ovns is underscore (unused) for all outputs. This is then
         # overridden by any connection that starts (is source endpoint) at this node.
         ngc = node.gc
         ovns: list[str] = ["_"] * ngc["num_outputs"]
-        rtc: list[CodeConnection] = root.terminal_connections
-        for ovn, idx in ((c.var_name, c.src.idx) for c in rtc if c.src.node is node):
-            ovns[idx] = ovn
+        for connection in root.outgoing.get(node, ()):
+            ovns[connection.src.idx] = connection.var_name
 
         # Similary the ivns are defined. However, they must have variable names as they
         # cannot be undefined.
@@ -896,24 +1234,17 @@ class ExecutionContext:
         if node.is_codon and node is root:
             ivns = [i_cstr(i) for i in range(ngc["num_inputs"])]
         else:
-            for ivn, idx in ((c.var_name, c.dst.idx) for c in rtc if c.dst.node is node):
-                ivns[idx] = ivn
+            for connection in root.incoming.get(node, ()):
+                ivns[connection.dst.idx] = connection.var_name
             assert all(ivn != NULL_STR for ivn in ivns), "All input variable names must be defined."
 
         # Is this node a codon?
         assignment = ", ".join(ovns) + " = "
+        if node.folded:
+            # Constant evaluated codon
+            return assignment + node.folded
         if node.is_codon:
-            if ngc["signature"] not in self._codon_register:
-                # Only codons have imports or introduce new types (which may have imports)
-                # Make sure the imports are captured
-                self._codon_register.add(ngc["signature"])
-                # Make an import chain
-                ifc = chain(ngc["cgraph"][SrcIfKey.IS], ngc["cgraph"][DstIfKey.OD])
-                ic = chain(ngc["imports"], chain.from_iterable(t.typ.imports for t in ifc))
-                # Only import what we have not already imported.
-                for impt in (i for i in ic if i not in self.imports):
-                    self.define(str(impt))
-                    self.imports.add(impt)
+            self.import_codon(ngc)
             ivns_map: dict[str, str] = {f"i{i}": ivn for i, ivn in enumerate(ivns)}
             if node.is_pgc:
                 ivns_map["pgc"] = "rtctxt, "
@@ -924,16 +1255,66 @@ class ExecutionContext:
         """Return the maximum number of lines in a function."""
         return self._line_limit
 
+    def load_functions(self, entry: FunctionCacheEntry) -> None:
+        """Define the functions of a function cache entry in the execution context.
+
+        Functions are renamed to the next available names in this context. Functions
+        that already exist in this context are not redefined and calls to them use the
+        existing function. Called functions that do not exist are written.
+
+        Args:
+            entry: The function cache entry.
+        """
+        names: dict[str, str] = {}
+        for name, signature in entry.calls:
+            if signature not in self.function_map:
+                self.write_executable(signature)
+            names[name] = self.function_map[signature].name()
+        new_functions: list[tuple[FunctionRecord, FunctionInfo]] = []
+        for record in entry.functions:
+            finfo = self.function_map.get(record.signature)
+            if finfo is None:
+                finfo = FunctionInfo(
+                    NULL_EXECUTABLE,
+                    next(self._global_index),
+                    record.line_count,
+                    self.gpi[record.signature],
+                )
+                self.function_map[record.signature] = finfo
+                new_functions.append((record, finfo))
+            names[record.name] = finfo.name()
+        for signature in entry.codons:
+            self.import_codon(self.gpi[signature])
+
+        rename: bool = any(old != new for old, new in names.items())
+        for record, finfo in new_functions:
+            # Debugging
+            if _logger.isEnabledFor(DEBUG):
+                _logger.log(DEBUG, "Cached Function:\n%s", finfo.name())
+                _logger.log(DEBUG, "Code:\n%s", rename_source(record.source, names))
+            self.define(rename_functions(record.code, names) if rename else record.code)
+            if self._fwconfig.result_cache:
+                self.new_result_cache(finfo.gc, finfo.name())
+            self.set_executable(finfo)
+
     def name_connections(self, root: GCNode) -> list[str]:
-        """Name the source variable of the connection between two code endpoints."""
+        """Name the source variable of the connection between two code endpoints.
+        The named connections are also bucketed by source node (GCNode.outgoing) so the
+        outputs of a node can be looked up without scanning all the terminal connections.
+        Connections are bucketed by destination node when the code graph is made
+        (see GCNode.index_connections()).
+        """
 
         # Gather the output variable names to catch the case where an input is
         # directly connected to an output
         _ovns: list[str] = ["" for _ in range(root.gc["num_outputs"])]
         root.terminal_connections.sort(key=connection_key)
         src_connection_map: dict[CodeEndPoint, CodeConnection] = {}
+        outgoing: dict[GCNode, list[CodeConnection]] = {}
+        root.outgoing = outgoing
         for connection in root.terminal_connections:
             dst: CodeEndPoint = connection.dst
+            outgoing.setdefault(connection.src.node, []).append(connection)
             # If the code for this function is being regenerated then the
             # connections have already been named, but we still need to
             # make sure the return
@@ -981,14 +1362,66 @@ class ExecutionContext:
                 _ovns[dst.idx] = connection.var_name
         return _ovns
 
+    def new_batch_function(self, gcsig: bytes | GCABC) -> FunctionInfo:
+        """Create the batch variant of a GC function in the execution context.
+
+        The GC function is written first if it does not already exist and its node & code
+        graphs are reused. Otherwise the graphs are not persisted so they are regenerated for
+        the GC treating it as unwritten. Any sub-GC functions that are needed and do not exist
+        are written as normal but are not added to the function cache.
+
+        Args:
+            gcsig (bytes | GCABC): The signature of the GC (or the GC).
+
+        Returns:
+            FunctionInfo: The function information with the batch executable defined.
+        """
+        signature = gcsig["signature"] if isinstance(gcsig, GCABC) else gcsig
+        assert isinstance(signature, bytes), f"Invalid signature type: {type(signature)}"
+        root: GCNode | None = None
+        if signature not in self.function_map:
+            root = self.write_executable(gcsig)
+        finfo = self.function_map[signature]
+        if finfo.executable is NULL_EXECUTABLE:
+            raise RuntimeError(
+                "Function was created with executable=False: "
+                "Re-create the execution context and re-write using "
+                "executable=True. You cannot patch the context."
+            )
+
+        if root is None:
+            root = self.node_graph(finfo.gc, rewrite=True)
+            root.line_count(self._line_limit)
+            self.create_code_graphs(root)
+            self.code_graph(root)
+            # Sub-GC functions written for the batch variant are not cached
+            self._written.clear()
+        root.finfo = finfo
+        code = self.function_def(root, replace(self._fwconfig, batch=True))
+
+        # Debugging
+        if _logger.isEnabledFor(DEBUG):
+            _logger.log(DEBUG, "Batch Function:\n%s", finfo.batch_name())
+            _logger.log(DEBUG, "Code:\n%s", code)
+
+        self.define(code)
+        finfo.batch_executable = self.namespace[finfo.batch_name()]
+        return finfo
+
     def new_context(self) -> ExecutionContext:
         """Create a new empty execution context with the same parameters as this one."""
-        new_ec = ExecutionContext(self.gpi, self._line_limit)
+        new_ec = ExecutionContext(
+            self.gpi,
+            self._line_limit,
+            self._fwconfig,
+            self._cache_budget.size,
+            self.function_cache,
+        )
         return new_ec
 
     def new_function(self, node: GCNode) -> FunctionInfo:
         """Create a new function in the execution context."""
-        code = self.function_def(node)
+        code = self.function_def(node, self._fwconfig)
 
         # Debugging
         if _logger.isEnabledFor(DEBUG):
@@ -996,9 +1429,17 @@ class ExecutionContext:
             _logger.log(DEBUG, "Code:\n%s", code)
 
         # Add to the execution context
-        self.define(code)
-        node.finfo.executable = self.namespace[node.finfo.name()]
-        return node.finfo
+        if self.function_cache is None:
+            self.define(code)
+        else:
+            # Keep the compiled code & the nodes it uses for the function cache entry
+            compiled: CodeType = compile(code, "<string>", "exec")
+            self.define(compiled)
+            record = FunctionRecord(
+                node.gc["signature"], node.finfo.name(), node.finfo.line_count, code, compiled
+            )
+            self._written.append((record, self.code_nodes(node)))
+        return self.set_executable(node.finfo)
 
     def new_function_placeholder(self, node: GCNode) -> FunctionInfo:
         """Create a placeholder for a new function in the execution context.
@@ -1012,7 +1453,19 @@ class ExecutionContext:
         node.finfo = newf
         return newf
 
-    def node_graph(self, gc: GCABC) -> GCNode:
+    def new_result_cache(self, gc: GCABC, fname: str) -> None:
+        """Create a result cache for the GC function fname if the GC is eligible.
+        See result_cache().
+        """
+        if gc["signature"] in self.result_caches:
+            return
+        if not gc["num_inputs"] or gc.is_pgc() or not is_pure(gc):
+            return
+        if PropertiesBD.fast_fetch("consider_cache", gc["properties"]):
+            name: str = f"{fname} ...{gc['signature'].hex()[-8:]}"
+            self.result_caches[gc["signature"]] = ResultCache(name, self._cache_budget)
+
+    def node_graph(self, gc: GCABC, rewrite: bool = False) -> GCNode:
         """Build the bi-directional graph of GC's.
 
         The graph is a graph of GCNode objects. A GCNode object for a GC references nodes
@@ -1024,6 +1477,8 @@ class ExecutionContext:
 
         Args:
             gc: Is the root of the graph.
+            rewrite: If True the root GC is treated as not having a function in this
+                context even if it does. Used to write variants of an existing function.
 
         Returns:
             GCNode: The graph root node.
@@ -1033,13 +1488,36 @@ class ExecutionContext:
         ), f"Invalid lines limit: {self._line_limit} must be 2 <= limit <= 32767"
 
         half_limit: int = self._line_limit // 2
-        finfo = self.function_map.get(gc["signature"], NULL_FUNCTION_MAP)
+        finfo = (
+            NULL_FUNCTION_MAP
+            if rewrite
+            else self.function_map.get(gc["signature"], NULL_FUNCTION_MAP)
+        )
+        if gc["signature"] not in self.function_map:
+            # A rewritten function only fetches the sub-GC's it needs level by level
+            self.prefetch_tree(gc)
         node_stack: list[GCNode] = [
             gc_node_graph := GCNode(gc, None, SrcRow.I, finfo, gpi=self.gpi)
         ]
 
         # Define the GCNode data
+        # The sub-GC's of each level of the GC tree are fetched in one query (see prefetch())
+        # when the first node of the level is assessed.
+        level_remaining: int = 0
         while node_stack:
+            if not level_remaining:
+                level_remaining = len(node_stack)
+                # Only unknown executables hold sub-GC signatures (see GCNode.__init__())
+                self.prefetch(
+                    xgc
+                    for lnode in node_stack
+                    if not (lnode.is_codon or lnode.unknown)
+                    for xgc in (lnode.gca, lnode.gcb)
+                    if isinstance(xgc, GCABC)
+                    and xgc is not NULL_GC
+                    and xgc["signature"] not in self.function_map
+                )
+            level_remaining -= 1
             # See [Assessing a GC for Function Creation](docs/executor.md) for more information.
             node: GCNode = node_stack.pop(0)
             # if _LOG_DEBUG:
@@ -1084,15 +1562,54 @@ class ExecutionContext:
                     node_stack.append(gc_node_graph_entry)
         return gc_node_graph
 
+    def prefetch(self, gcs: Iterable[GCABC]) -> None:
+        """Fetch the GCA's & GCB's of the GC's into the GPI cache with one query.
+        Only sub-GC's referenced by signature are fetched. Sub-GC's that are
+        already in the cache are not queried.
+        """
+        signatures: list[bytes] = [
+            xgc for gc in gcs for xgc in (gc["gca"], gc["gcb"]) if isinstance(xgc, bytes)
+        ]
+        if signatures:
+            self.gpi.get_many(signatures)
+
+    def prefetch_tree(self, gc: GCABC) -> None:
+        """Load the sub-GC closures of an unfamiliar GC into the GPI cache.
+        The GC may not be in the Gene Pool yet so the closures of its GCA & GCB are
+        fetched, each with one recursive query (see GenePoolInterface.prefetch_tree()).
+        Sub-GC's that are already in the GPI cache are not fetched.
+        """
+        for xgc in (gc["gca"], gc["gcb"]):
+            if isinstance(xgc, bytes):
+                self.gpi.prefetch_tree(xgc)
+
     def result_cache(self, root: GCNode) -> None:
         """Apply result caching to the GC function.
-        This optimisations uses the functools lru_cache to cache the results of the function.
-        The cache is only applied if the GC is eligible for caching.
+        This optimisations memoises the results of the function in a ResultCache.
+        The cache is only applied if the GC is eligible for caching: the GC must be pure
+        (see is_pure()), have inputs, not be a PGC & have the `consider_cache` property set.
+
+        The function is wrapped with the cache when it is defined (see new_function()).
+        Cache sizes adapt to the observed hit rate within the memory budget of the
+        execution context. Use result_cache_info() for the cache statistics.
         """
+        self.new_result_cache(root.gc, root.finfo.name())
 
-        # Note: This is a placeholder for future implementation
-        # Need to figure out how to profile & resource manage the cache.
-        # Thoughts: Cache size is a function of usage & memory available.
+    def result_cache_info(self) -> str:
+        """Log and return the statistics of all the function result caches."""
+        return "\n".join(rcache.info() for rcache in self.result_caches.values())
+
+    def set_executable(self, finfo: FunctionInfo) -> FunctionInfo:
+        """Set the executable of a function defined in the execution context.
+        GC functions call each other by name so a memoised function (see result_cache())
+        replaces the original in the namespace.
+        """
+        executable = self.namespace[finfo.name()]
+        rcache = self.result_caches.get(finfo.gc["signature"])
+        if rcache is not None:
+            executable = self.namespace[finfo.name()] = rcache.wrap(executable)
+        finfo.executable = executable
+        return finfo
 
     def simplification(self, root: GCNode) -> None:
         """Apply simplification to the GC function.
@@ -1114,7 +1631,8 @@ class ExecutionContext:
                 is typically used for writing out the execution context to a file.
 
         Returns:
-            GCNode: The GC node graph or None if the GC already exists as a suitable function.
+            GCNode: The GC node graph or None if the GC already exists as a suitable function
+                or the functions were defined from the function cache.
         """
         sig: bytes = gc["signature"] if isinstance(gc, GCABC) else gc
         assert isinstance(sig, bytes), f"Invalid signature type: {type(sig)}"
@@ -1138,5 +1656,17 @@ class ExecutionContext:
         # The GC node graph is needed to determine connectivity and so we reset the num_lines
         # and re-assess
         assert isinstance(gc, GCABC), "GC must be a GCABC instance at this stage."
+        if self.function_cache is None or not executable:
+            root, _ = self.create_graphs(gc, executable)
+            return root
+
+        # Use the function cache if there is an entry for the GC else create one
+        key: str = self.function_cache.key(sig, self._line_limit, self._fwconfig)
+        entry: FunctionCacheEntry | None = self.function_cache.get(key)
+        if entry is not None:
+            self.load_functions(entry)
+            return None
+        self._written.clear()
         root, _ = self.create_graphs(gc, executable)
+        self.function_cache.put(key, self.function_cache_entry())
         return root
@@ -0,0 +1,193 @@
+"""Persistent on-disk cache of GC function definitions.
+
+Writing a GC function walks the GC node graph, generates the code string & defines it with
+exec(). Every worker process repeats this for the same popular GC's. The function cache
+stores the generated source and the compiled (marshalled) code objects of the functions
+defined when writing a GC so that a new execution context can define them without
+rebuilding the node graph or compiling the code.
+
+Entries are content addressed by the GC signature, the execution context line limit and the
+function write configuration (see FunctionCache.key()). Function names are local to an
+execution context so names are remapped when an entry is loaded (see rename_functions()).
+Code objects are specific to the Python bytecode version: entries are stored in a
+directory named for the Python implementation & version and each entry starts with the
+bytecode magic number. Entries written by a different Python version are misses. If the
+Python implementation does not cache bytecode (sys.implementation.cache_tag is None) the
+function cache is disabled: every get() is a miss and put() does nothing.
+"""
+
+from __future__ import annotations
+
+from hashlib import sha256
+from importlib.util import MAGIC_NUMBER
+from marshal import dumps, loads
+from os import getpid, replace
+from pathlib import Path
+from re import Match
+from re import compile as re_compile
+from sys import implementation
+from types import CodeType
+from typing import NamedTuple
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.worker.executor.fw_config import FWConfig
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+# Increment when the entry format or the generated code changes to invalidate existing entries
+FUNCTION_CACHE_VERSION: int = 1
+FUNCTION_CACHE_SUFFIX: str = ".egpf"
+# GC function names in generated code (see FunctionInfo.name())
+_FUNCTION_NAME = re_compile(r"\bf_[0-9a-f]+\b")
+
+
+class FunctionRecord(NamedTuple):
+    """A GC function definition."""
+
+    # The GC signature
+    signature: bytes
+    # The function name in the execution context it was written in
+    name: str
+    # The number of lines in the function
+    line_count: int
+    # The generated function code
+    source: str
+    # The compiled function code
+    code: CodeType
+
+
+class FunctionCacheEntry(NamedTuple):
+    """The functions defined when a GC was written."""
+
+    # The functions defined
+    functions: tuple[FunctionRecord, ...]
+    # Functions (name, signature) called that already existed i.e. were not defined
+    calls: tuple[tuple[str, bytes], ...]
+    # Signatures of the codons inlined (which may require imports)
+    codons: tuple[bytes, ...]
+
+
+def rename_functions(code: CodeType, names: dict[str, str]) -> CodeType:
+    """Return the code object with GC function names replaced as mapped by names.
+
+    Function names are global names in generated code: the name a function is defined
+    as and the names of the functions it calls.
+
+    Args:
+        code: The compiled code object.
+        names: Map of the existing function names to the new function names.
+
+    Returns:
+        The code object with the functions renamed.
+    """
+    return code.replace(
+        co_name=names.get(code.co_name, code.co_name),
+        co_qualname=names.get(code.co_qualname, code.co_qualname),
+        co_names=tuple(names.get(name, name) for name in code.co_names),
+        co_consts=tuple(
+            rename_functions(c, names) if isinstance(c, CodeType) else c for c in code.co_consts
+        ),
+    )
+
+
+def rename_source(source: str, names: dict[str, str]) -> str:
+    """Return the source code with GC function names replaced as mapped by names."""
+
+    def _rename(match: Match[str]) -> str:
+        return names.get(match.group(), match.group())
+
+    return _FUNCTION_NAME.sub(_rename, source)
+
+
+class FunctionCache:
+    """A persistent on-disk cache of GC function definitions.
+
+    The cache is safe to share between processes: entries are written to a temporary
+    file and atomically moved into place. Unreadable entries are treated as misses and
+    removed. The cache is disabled (path is None) if the Python implementation does not
+    cache bytecode.
+    """
+
+    __slots__ = ("hits", "misses", "path")
+
+    def __init__(self, path: str | Path) -> None:
+        """Create a function cache.
+
+        Args:
+            path: The cache directory. It is created if it does not exist. Entries are
+                stored in a sub-directory for the Python implementation & version.
+        """
+        self.hits: int = 0
+        self.misses: int = 0
+        self.path: Path | None = None
+        if implementation.cache_tag is None:
+            _logger.warning("Python bytecode caching is disabled: function cache disabled.")
+        else:
+            self.path = Path(path) / implementation.cache_tag
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        if self.path is not None:
+            for entry in self.path.glob(f"*{FUNCTION_CACHE_SUFFIX}"):
+                entry.unlink(missing_ok=True)
+
+    def get(self, key: str) -> FunctionCacheEntry | None:
+        """Return the cache entry for key or None if there is no valid entry."""
+        if self.path is None:
+            self.misses += 1
+            return None
+        path: Path = self.path / f"{key}{FUNCTION_CACHE_SUFFIX}"
+        try:
+            data: bytes = path.read_bytes()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            if not data.startswith(MAGIC_NUMBER):
+                raise ValueError("Python bytecode version mismatch.")
+            functions, calls, codons = loads(data[len(MAGIC_NUMBER) :])
+            entry = FunctionCacheEntry(
+                tuple(FunctionRecord(*record) for record in functions), calls, codons
+            )
+        except (EOFError, TypeError, ValueError) as e:
+            _logger.warning("Removing invalid function cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def info(self) -> str:
+        """Log and return the cache statistics."""
+        info_str = f"Function cache {self.path} hits: {self.hits}, misses: {self.misses}"
+        _logger.info(info_str)
+        return info_str
+
+    def key(self, signature: bytes, line_limit: int, fwconfig: FWConfig) -> str:
+        """Return the cache key for a GC function.
+
+        Args:
+            signature: The GC signature.
+            line_limit: The execution context function line limit.
+            fwconfig: The function write configuration.
+
+        Returns:
+            The hexadecimal SHA256 key.
+        """
+        config: str = f"{FUNCTION_CACHE_VERSION}:{line_limit}:{fwconfig!r}"
+        return sha256(signature + config.encode()).hexdigest()
+
+    def put(self, key: str, entry: FunctionCacheEntry) -> None:
+        """Store the entry for key replacing any existing entry."""
+        if self.path is None:
+            return
+        # marshal only supports the exact builtin types
+        data = (tuple(tuple(record) for record in entry.functions), entry.calls, entry.codons)
+        path: Path = self.path / f"{key}{FUNCTION_CACHE_SUFFIX}"
+        tmp: Path = self.path / f"{key}.{getpid()}.tmp"
+        tmp.write_bytes(MAGIC_NUMBER + dumps(data))
+        replace(tmp, path)
@@ -25,6 +25,12 @@ class FunctionInfo:
     # TODO: This keeps the GCABC hanging around. It should not. Should be pulled from
     # the GPI everytime it is accessed to reduce memory usage.
     gc: GCABC
+    # The batch variant of the function (if it has been written)
+    batch_executable: Callable = NULL_EXECUTABLE
+
+    def batch_name(self) -> str:
+        """Return the batch variant function name."""
+        return f"{self.name()}_b"
 
     def call_str(self, ivns: Sequence[str]) -> str:
         """Return the function call string using the map of input variable names."""
@@ -20,6 +20,9 @@ class FWConfig:
     # Enable lean mode to remove all comments, docstrings and pretty spacing.
     # This saves memory in the execution_context.
     lean: bool = True
+    # Write the batch variant of the function. The batch variant takes an iterable of
+    # input tuples and loops over them inside the function body returning a list of results.
+    batch: bool = False
 
     # The following attributes add a comment at the top of the function
     # with the specified information (if lean is False).
@@ -41,19 +44,27 @@ class FWConfig:
     # The following attributes enable / disable code optimisations.
     # Constant evaluation: Any constant expressions in the function are evaluated
     # prior to write time and the code is replaced with the result.
-    const_eval: bool = True
+    # NOTE: Opt in. Codons are evaluated at write time if their `deterministic` & `side_effects`
+    # properties say they are pure and `deterministic` defaults to True.
+    const_eval: bool = False
     # Result cache: Any function calls that are deterministic and do not have side effects
     # are cached. If the function is called with the same arguments, the cached
     # result is returned instead of calling the function again.
     # NOTE: This optimization is only applied if the GC property `consider_cache` is True.
-    result_cache: bool = True
+    # NOTE: Opt in. Purity is taken from the `deterministic` & `side_effects` properties and
+    # `deterministic` defaults to True.
+    result_cache: bool = False
     # Common subexpression elimination: Any common subexpressions (that are
     # deterministic & do not have side effects) are evaluated once and the result
-    # is used in place of the subexpression.
-    cse: bool = True
+    # is used in place of the subexpression. Only straight line (not conditional or
+    # loop) functions are optimised.
+    # NOTE: Opt in. Purity is taken from the `deterministic` & `side_effects` properties and
+    # `deterministic` defaults to True.
+    cse: bool = False
     # Simplification uses symbolic regression to simplify the code.
     simplification: bool = True
     # Note that dead code elimination is always performed.
 
 
 FWCONFIG_DEFAULT = FWConfig()
+FWCONFIG_BATCH = FWConfig(batch=True)
@@ -6,6 +6,7 @@ from collections.abc import Hashable, Iterable, Iterator
 from itertools import count
 from typing import TYPE_CHECKING
 
+from egpcommon.common import NULL_STR
 from egpcommon.properties import CGraphType
 from egppy.gene_pool.gene_pool_interface import GenePoolInterface
 from egppy.genetic_code.c_graph_constants import DstIfKey, DstRow, Row, SrcIfKey, SrcRow
@@ -243,8 +244,11 @@ class GCNode(Iterable, Hashable):
         "iam",
         "parent",
         "terminal_connections",
+        "incoming",
+        "outgoing",
         "num_lines",
         "local_counter",
+        "folded",
     )
 
     # For generating UIDs for GCNode instances
@@ -292,6 +296,10 @@ class GCNode(Iterable, Hashable):
         self.uid: str = f"uid{next(self._uid_counter):04x}"
         # List of code connections that terminate at this node if it is to be written
         self.terminal_connections: list[CodeConnection] = []
+        # Terminal connections indexed by destination node (see index_connections())
+        self.incoming: dict[GCNode, list[CodeConnection]] = {}
+        # Terminal connections indexed by source node (see ExecutionContext.name_connections())
+        self.outgoing: dict[GCNode, list[CodeConnection]] = {}
         # Calculated number of lines in the *potential* function
         self.num_lines: int = self.finfo.line_count
         # Sanity check
@@ -300,6 +308,9 @@ class GCNode(Iterable, Hashable):
         ) or not self.is_codon, "At this point a codon must have 0 lines."
         # The local variable counter (used to make unique variable names)
         self.local_counter: count[int] = count()
+        # The python literal code of the outputs if the codon has been constant folded
+        # See ExecutionContext.constant_evaluation()
+        self.folded: str = NULL_STR
 
         # Context within the GC Node graph not known from within the GC
         if parent is None:
@@ -435,11 +446,13 @@ class GCNode(Iterable, Hashable):
             chart_txt.append(mc_code_connection_node_str(connection, self))
         return "\n".join(title_txt + MERMAID_HEADER + chart_txt + MERMAID_FOOTER)
 
-    def function_def(self, hints: bool = False) -> str:
+    def function_def(self, hints: bool = False, batch: bool = False) -> str:
         """Return the function definition code line for the GC node.
         Args
         ----
             hints: If True then include type hints in the function definition.
+            batch: If True then define the batch variant of the function that takes an
+                iterable of input tuples and returns a list of results.
         Returns
         -------
             A tuple containing the function definition string and a tuple of ImportDef instances
@@ -448,18 +461,20 @@ class GCNode(Iterable, Hashable):
         # Define the function input parameters
         iface: Interface = self.gc["cgraph"][SrcIfKey.IS]
         inum: int = len(iface)
-        iparams = "i"
+        iparams = "ib" if batch else "i"
 
         if hints:
             # Add type hints for input parameters
-            input_types = ", ".join(str(iface[i].typ) for i in range(inum))
-            iparams += f": tuple[{input_types}]"
+            input_types = ", ".join(str(iface[i].typ) for i in range(inum)) if inum else "()"
+            iparams += f": list[tuple[{input_types}]]" if batch else f": tuple[{input_types}]"
 
         # The RuntimeContext object is only required for PGCs
         rtctxt = "rtctxt: RuntimeContext, " if self.is_pgc else ""
 
         # Start building the function definition
-        base_def = f"def {self.finfo.name()}({rtctxt}{iparams if inum else ''})"
+        # The batch variant always has an input batch parameter even if the GC has no inputs
+        name = self.finfo.batch_name() if batch else self.finfo.name()
+        base_def = f"def {name}({rtctxt}{iparams if inum or batch else ''})"
 
         if hints:
             # Add type hints for output parameters
@@ -474,11 +489,22 @@ class GCNode(Iterable, Hashable):
                 ret_type = "None"
             else:
                 raise ValueError(f"Invalid number of outputs: {onum}, in GC.")
-            return f"{base_def} -> {ret_type}:"
+            return f"{base_def} -> {f'list[{ret_type}]' if batch else ret_type}:"
 
         # Return the function definition without type hints
         return f"{base_def}:"
 
+    def index_connections(self) -> None:
+        """Index the terminal connections by destination node.
+        The index is the adjacency list of the code graph (destination node to incoming
+        connections) and is used to look up the inputs of a node without scanning all the
+        terminal connections of the function. Destination endpoints do not change once
+        the code graph is made so the index only needs to be built once.
+        """
+        self.incoming = {}
+        for connection in self.terminal_connections:
+            self.incoming.setdefault(connection.dst.node, []).append(connection)
+
     def line_count(self, limit: int) -> None:
         """Calculate the best number of lines for each function and
         mark the ones that should be written. This function traverses the graph
@@ -0,0 +1,218 @@
+"""Result cache for GC functions.
+
+Deterministic GC functions with no side effects always return the same outputs for the same
+inputs. If the inputs are frequently repeated (e.g. problems with small discrete input spaces)
+the function result can be memoised. A ResultCache is a bounded least recently used (LRU)
+memo cache that wraps a GC function. The cache size adapts to the observed hit rate and
+the total memory used by all the result caches of an execution context is limited by a
+shared CacheBudget.
+"""
+
+from sys import getsizeof
+from typing import Any, Callable
+
+from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.object_deduplicator import format_deduplicator_info
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+# Default memory budget for all the result caches in an execution context (bytes)
+DEFAULT_CACHE_BUDGET: int = 2**26
+# Initial, minimum & maximum number of entries in a result cache
+INITIAL_CACHE_SIZE: int = 2**8
+MIN_CACHE_SIZE: int = 2**4
+MAX_CACHE_SIZE: int = 2**20
+# Minimum number of lookups between cache resizing decisions
+RESIZE_WINDOW: int = 2**8
+# If the hit rate over the resize window is at least the target rate a full cache is
+# grown. If it is less than the target rate / SHRINK_FACTOR the cache is shrunk.
+TARGET_RATE: float = 0.25
+SHRINK_FACTOR: float = 4.0
+# Approximate memory used by a dictionary entry excluding the key & value (bytes)
+ENTRY_OVERHEAD: int = 104
+# Cache miss sentinel (None is a valid result)
+_MISS: object = object()
+
+
+class CacheBudget:
+    """A memory budget (in bytes) shared by the result caches of an execution context."""
+
+    __slots__ = ("size", "used")
+
+    def __init__(self, size: int = DEFAULT_CACHE_BUDGET) -> None:
+        """Create a new cache budget.
+
+        Args:
+            size: The maximum number of bytes the result caches may use.
+        """
+        self.size: int = size
+        self.used: int = 0
+
+    def release(self, nbytes: int) -> None:
+        """Release nbytes of the budget."""
+        self.used -= nbytes
+
+    def reserve(self, nbytes: int) -> bool:
+        """Reserve nbytes of the budget. Returns False if the budget would be exceeded."""
+        if self.used + nbytes > self.size:
+            return False
+        self.used += nbytes
+        return True
+
+
+class ResultCache:
+    """A bounded LRU memo cache for a GC function.
+
+    Entries are keyed by the GC function input tuple and the type of each input so that
+    equal inputs of different types (e.g. 1, 1.0 & True) are cached separately. Unhashable
+    inputs are not cached and nor are unhashable results: mutable results could be modified
+    by the caller after they have been cached. The memory used by each entry is estimated
+    from the first entry cached. When the cache is full and a new result is to be cached the
+    cache is resized depending on the hit rate since the last resize before the least
+    recently used entry is evicted.
+    """
+
+    __slots__ = (
+        "_cache",
+        "_entry_size",
+        "_window",
+        "budget",
+        "evictions",
+        "hits",
+        "maxsize",
+        "misses",
+        "name",
+        "target_rate",
+        "uncacheable",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        budget: CacheBudget,
+        size: int = INITIAL_CACHE_SIZE,
+        target_rate: float = TARGET_RATE,
+    ) -> None:
+        """Create a new result cache.
+
+        Args:
+            name: Name of the result cache (for statistics).
+            budget: The memory budget shared with other result caches.
+            size: Initial maximum number of entries in the cache.
+            target_rate: Hit rate at or above which a full cache is grown.
+        """
+        # {(input tuple, input types): result}
+        self._cache: dict[tuple[tuple[Any, ...], tuple[type, ...]], Any] = {}
+        self._entry_size: int = 0
+        # Hits & misses at the start of the current resize window
+        self._window: tuple[int, int] = (0, 0)
+        self.budget: CacheBudget = budget
+        self.evictions: int = 0
+        self.hits: int = 0
+        self.maxsize: int = size
+        self.misses: int = 0
+        self.name: str = name
+        self.target_rate: float = target_rate
+        self.uncacheable: int = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries in the cache."""
+        return len(self._cache)
+
+    def _evict(self) -> None:
+        """Evict the least recently used entry."""
+        del self._cache[next(iter(self._cache))]
+        self.budget.release(self._entry_size)
+        self.evictions += 1
+
+    def _insert(self, key: tuple[tuple[Any, ...], tuple[type, ...]], result: Any) -> None:
+        """Insert a new result into the cache making space if necessary."""
+        if not self._entry_size:
+            inputs, types = key
+            self._entry_size = sum(map(getsizeof, (key, inputs, types, result))) + ENTRY_OVERHEAD
+        if len(self._cache) >= self.maxsize:
+            self._resize()
+            while len(self._cache) >= self.maxsize:
+                self._evict()
+        # If the budget is exhausted replace the least recently used entry
+        if not self.budget.reserve(self._entry_size):
+            if not self._cache:
+                return
+            self._evict()
+            self.budget.reserve(self._entry_size)
+        self._cache[key] = result
+
+    def _resize(self) -> None:
+        """Resize the cache based on the hit rate in the current window."""
+        hits: int = self.hits - self._window[0]
+        lookups: int = hits + self.misses - self._window[1]
+        if lookups < RESIZE_WINDOW:
+            return
+        rate: float = hits / lookups
+        if rate >= self.target_rate:
+            self.maxsize = min(self.maxsize * 2, MAX_CACHE_SIZE)
+        elif rate < self.target_rate / SHRINK_FACTOR:
+            self.maxsize = max(self.maxsize // 2, MIN_CACHE_SIZE)
+        self._window = (self.hits, self.misses)
+
+    def clear(self) -> None:
+        """Clear the cache and release its memory budget."""
+        self.budget.release(len(self._cache) * self._entry_size)
+        self._cache.clear()
+
+    def info(self) -> str:
+        """Log and return cache hit, miss & eviction statistics.
+
+        Returns:
+            Formatted string containing cache statistics.
+        """
+        info_str = format_deduplicator_info(
+            self.name, self.target_rate, self.hits, self.misses, len(self._cache), self.maxsize
+        )
+        info_str += (
+            f"{self.name} Cache evictions: {self.evictions}\n"
+            f"{self.name} Cache uncacheable: {self.uncacheable}\n"
+        )
+        _logger.info(info_str)
+        return info_str
+
+    def wrap(self, func: Callable[[tuple[Any, ...]], Any]) -> Callable[[tuple[Any, ...]], Any]:
+        """Return a memoised version of the GC function func.
+
+        Args:
+            func: The GC function. It must take a single input tuple argument.
+
+        Returns:
+            The memoised function.
+        """
+        cache = self._cache
+
+        def cached(i: tuple[Any, ...]) -> Any:
+            # Equal inputs of different types (e.g. 1, 1.0 & True) may have different results
+            key = (i, tuple(map(type, i)))
+            try:
+                # Pop & re-insert to make the entry the most recently used
+                result = cache.pop(key, _MISS)
+            except TypeError:
+                # Unhashable inputs
+                self.uncacheable += 1
+                return func(i)
+            if result is _MISS:
+                self.misses += 1
+                result = func(i)
+                try:
+                    # Inputs are not hashed by pop() if the cache is empty
+                    hash((key, result))
+                except TypeError:
+                    self.uncacheable += 1
+                    return result
+                self._insert(key, result)
+                return result
+            cache[key] = result
+            self.hits += 1
+            return result
+
+        return cached
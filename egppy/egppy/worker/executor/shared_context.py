@@ -0,0 +1,79 @@
+"""Share a pre-warmed execution context with forked worker sub-processes.
+
+Each worker process would otherwise build its own execution context namespace & function
+map from scratch. Instead the parent process defines the GC functions most likely to be
+needed (the most referenced GC's in the Gene Pool) and then forks the worker sub-processes
+which inherit the populated execution context copy-on-write.
+
+CPython reference counting & the cyclic garbage collector write to the objects they touch
+which copies the (shared) memory page they are on. Objects that exist before the fork are
+moved to the permanent generation with gc.freeze() so the collector in the sub-processes
+does not visit them. Note that fork is only available on POSIX platforms.
+"""
+
+import gc
+from collections.abc import Callable, Iterable
+from multiprocessing import get_context
+from multiprocessing.process import BaseProcess
+from time import perf_counter
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.worker.executor.execution_context import ExecutionContext
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+# Number of the most referenced GC functions to define before forking
+PREWARM_LIMIT: int = 2**10
+
+
+def prewarm(ec: ExecutionContext, signatures: Iterable[bytes]) -> int:
+    """Define the GC functions in the execution context.
+
+    GC's that cannot be written are logged and skipped: pre-warming is an optimisation.
+
+    Args:
+        ec: The execution context to populate.
+        signatures: The signatures of the GC's to define e.g. GenePoolInterface.most_referenced().
+
+    Returns:
+        The number of functions in the execution context.
+    """
+    start: float = perf_counter()
+    for signature in signatures:
+        try:
+            ec.write_executable(signature)
+        except (KeyError, ValueError, AssertionError) as e:
+            _logger.warning("Unable to pre-warm GC %s: %s", signature.hex(), e)
+    _logger.info("Pre-warmed %d functions in %.3f s", len(ec.function_map), perf_counter() - start)
+    return len(ec.function_map)
+
+
+def fork_workers(num: int, target: Callable[[], None]) -> list[BaseProcess]:
+    """Fork worker sub-processes that inherit the (pre-warmed) execution contexts.
+
+    All objects that exist in the parent are frozen (see gc.freeze()) before the workers
+    are forked. The parent's objects are unfrozen after the workers have been started.
+
+    Args:
+        num: The number of worker sub-processes.
+        target: The worker function.
+
+    Returns:
+        The started worker processes.
+    """
+    context = get_context("fork")
+    workers: list[BaseProcess] = [
+        context.Process(target=target, name=f"egp-worker-{n}") for n in range(num)
+    ]
+    gc.collect()
+    gc.freeze()
+    try:
+        for worker in workers:
+            worker.start()
+    finally:
+        gc.unfreeze()
+    _logger.info("Forked %d worker sub-processes", num)
+    return workers
@@ -7,7 +7,9 @@ from egpdbmgr.configuration import DBManagerConfig, TableTypes
 from egppy.gene_pool.gene_pool_interface import GenePoolInterface
 from egppy.populations.configuration import PopulationConfig
 from egppy.worker.configuration import WorkerConfig
+from egppy.worker.evolution_pipe.mutation_executor import mutation_execution_context
 from egppy.worker.evolution_queue import evolution_queue
+from egppy.worker.executor.shared_context import PREWARM_LIMIT, fork_workers, prewarm
 from egppy.worker.fitness_queue import fitness_queue
 
 # Standard EGP logging pattern
@@ -56,8 +58,14 @@ def diverse_igp(pconfig: PopulationConfig, gpi: GenePoolInterface) -> list[Any]:
     return igp
 
 
-def init_generation(config: WorkerConfig) -> None:
-    """Initialize the generation."""
+def init_generation(config: WorkerConfig, sub_processes: int = 0) -> None:
+    """Initialize the generation.
+
+    Args:
+        config: The worker configuration.
+        sub_processes: The number of worker sub-processes to fork. If 0 the work loop
+            runs in this process.
+    """
 
     # Connect to the Gene Pool and find the best phenotypes
     gpi = GenePoolInterface(_gene_pool_db_manager_config(config))
@@ -97,8 +105,14 @@ def init_generation(config: WorkerConfig) -> None:
     # the population interface requirements.
     # for igp, pconfig in zip(igps, config.populations.configs, strict=True):
     #    igp.extend([new_gc(pconfig, gene_pool) for _ in range(pconfig.size - len(igp))])
-    evolution_queue()
-    fitness_queue()
+    if sub_processes > 0:
+        # Define the popular GC functions once so the sub-processes inherit them
+        mec = mutation_execution_context()
+        prewarm(mec, mec.gpi.most_referenced(PREWARM_LIMIT))
+        for worker in fork_workers(sub_processes, work_loop):
+            worker.join()
+    else:
+        work_loop()
 
 
 def related_igp(pconfig: PopulationConfig, gpi: GenePoolInterface) -> list[Any]:
@@ -135,3 +149,12 @@ def unrelated_igp(pconfig: PopulationConfig, gpi: GenePoolInterface) -> list[Any
     )
     _logger.debug("D")
     return igp
+
+
+def work_loop() -> None:
+    """The worker evolution & fitness work loop.
+
+    Runs in this process or in each forked worker sub-process (see init_generation()).
+    """
+    evolution_queue()
+    fitness_queue()
@@ -83,7 +83,7 @@ def init_worker(args: Namespace) -> None:
         )
     ]
 
-    init_generation(config)
+    init_generation(config, args.sub_processes)
     _logger.info("Worker shutdown complete.")
 
 
@@ -115,8 +115,9 @@ def parse_cmdline_args(args: list[str]) -> Namespace:
     parser.add_argument(
         "-s",
         "--sub_processes",
-        help="The number of subprocesses to spawn for evolution. "
-        "Default is the number of cores - 1,",
+        help="The number of subprocesses to fork for evolution. Subprocesses share the "
+        "functions of the most referenced GC's defined before forking. "
+        "Default is 0: evolution runs in the worker process.",
         type=int,
         default=0,
     )
@@ -0,0 +1,69 @@
+"""Unit test cases for the BloomFilter class."""
+
+import unittest
+from hashlib import sha256
+
+from egpcommon.bloom_filter import BloomFilter
+
+# Constants
+CAPACITY: int = 2**12
+FP_RATE: float = 0.01
+
+
+def signature(n: int) -> bytes:
+    """Return a SHA256 signature for n."""
+    return sha256(n.to_bytes(8)).digest()
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Unit tests for the BloomFilter class."""
+
+    def setUp(self) -> None:
+        """Create a filter populated to capacity."""
+        self.bloom = BloomFilter("test", CAPACITY, FP_RATE)
+        self.bloom.update(signature(n) for n in range(CAPACITY))
+
+    def test_no_false_negatives(self) -> None:
+        """Test every object added is reported as present."""
+        self.assertTrue(all(signature(n) in self.bloom for n in range(CAPACITY)))
+        self.assertEqual(self.bloom.negatives, 0)
+        self.assertEqual(self.bloom.queries, CAPACITY)
+
+    def test_false_positive_rate(self) -> None:
+        """Test the false positive rate at capacity is close to the target."""
+        absent = range(CAPACITY, 5 * CAPACITY)
+        false_positives = sum(signature(n) in self.bloom for n in absent)
+        self.assertLess(false_positives / len(absent), 2 * FP_RATE)
+        self.assertEqual(self.bloom.negatives, len(absent) - false_positives)
+        self.assertAlmostEqual(self.bloom.estimated_fp_rate(), FP_RATE, delta=FP_RATE / 2)
+        self.assertFalse(self.bloom.saturated())
+        self.bloom.add(signature(5 * CAPACITY))
+        self.assertTrue(self.bloom.saturated())
+
+    def test_info(self) -> None:
+        """Test the statistics."""
+        _ = signature(CAPACITY) in self.bloom
+        self.bloom.false_positive(3)
+        info = self.bloom.info()
+        self.assertIn(f"test Bloom filter objects: {CAPACITY} / {CAPACITY}", info)
+        self.assertIn("test Bloom filter false positives: 3", info)
+        self.assertEqual(len(self.bloom), CAPACITY)
+
+    def test_clear(self) -> None:
+        """Test clearing removes the objects & statistics."""
+        self.bloom.clear()
+        self.assertNotIn(signature(0), self.bloom)
+        self.assertEqual(len(self.bloom), 0)
+        self.assertEqual(self.bloom.negatives, 1)
+        self.bloom.verify()
+
+    def test_invalid_parameters(self) -> None:
+        """Test invalid capacity & false positive rates."""
+        with self.assertRaises(ValueError):
+            BloomFilter("test", 0)
+        with self.assertRaises(ValueError):
+            BloomFilter("test", CAPACITY, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Unit test cases for the metrics module."""
+
+import gc
+import unittest
+
+from egpcommon.metrics import (
+    Histogram,
+    Metrics,
+    metrics_registry,
+    metrics_snapshot,
+    prometheus_text,
+)
+
+
+class TestHistogram(unittest.TestCase):
+    """Unit tests for the Histogram class."""
+
+    def test_observe(self) -> None:
+        """Test observations are counted in the bucket with the smallest bound >= value."""
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 3.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["buckets"], {1.0: 2, 2.0: 3, float("inf"): 4})
+        self.assertEqual(snapshot["count"], 4)
+        self.assertAlmostEqual(snapshot["sum"], 6.0)
+        histogram.verify()
+
+    def test_reset(self) -> None:
+        """Test the histogram can be reset."""
+        histogram = Histogram()
+        histogram.observe(0.1)
+        histogram.reset()
+        self.assertEqual(histogram.snapshot()["count"], 0)
+
+    def test_invalid_bounds(self) -> None:
+        """Test the bounds must be ascending."""
+        with self.assertRaises(ValueError):
+            Histogram((2.0, 1.0)).verify()
+
+
+class TestMetrics(unittest.TestCase):
+    """Unit tests for the Metrics class."""
+
+    def setUp(self) -> None:
+        """Create some metrics."""
+        self.metrics = Metrics("test_metrics")
+        self.metrics.hits = 3
+        self.metrics.misses = 1
+        self.metrics.fetch_latency.observe(0.0005)
+
+    def test_snapshot(self) -> None:
+        """Test the snapshot has all the metrics."""
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["hits"], 3)
+        self.assertEqual(snapshot["misses"], 1)
+        self.assertEqual(snapshot["evictions"], 0)
+        self.assertEqual(snapshot["write_backs"], 0)
+        self.assertEqual(snapshot["bytes"], 0)
+        self.assertEqual(snapshot["fetch_latency"]["count"], 1)
+        self.assertAlmostEqual(self.metrics.hit_rate(), 0.75)
+        self.metrics.verify()
+
+    def test_reset(self) -> None:
+        """Test the metrics can be reset."""
+        self.metrics.reset()
+        self.assertEqual(self.metrics.hits, 0)
+        self.assertEqual(self.metrics.hit_rate(), 0.0)
+        self.assertEqual(self.metrics.snapshot()["fetch_latency"]["count"], 0)
+
+    def test_collector(self) -> None:
+        """Test the collector updates the metrics before a snapshot."""
+
+        def collector(metrics: Metrics) -> None:
+            metrics.evictions = 7
+
+        metrics = Metrics("test_collector", collector)
+        self.assertEqual(metrics.snapshot()["evictions"], 7)
+
+    def test_registry(self) -> None:
+        """Test metrics are registered while they are alive."""
+        key = f"test_metrics:{self.metrics.instance}"
+        self.assertIn(self.metrics, metrics_registry)
+        self.assertEqual(metrics_snapshot()[key]["hits"], 3)
+        del self.metrics
+        gc.collect()
+        self.assertNotIn(key, metrics_snapshot())
+
+    def test_prometheus(self) -> None:
+        """Test the Prometheus text exposition format."""
+        text = self.metrics.prometheus()
+        labels = f'name="test_metrics",instance="{self.metrics.instance}"'
+        self.assertIn("# TYPE egp_store_hits_total counter\n", text)
+        self.assertIn(f"egp_store_hits_total{{{labels}}} 3\n", text)
+        self.assertIn(f"egp_store_misses_total{{{labels}}} 1\n", text)
+        self.assertIn("# TYPE egp_store_fetch_latency_seconds histogram\n", text)
+        self.assertIn(f'egp_store_fetch_latency_seconds_bucket{{{labels},le="0.0001"}} 0\n', text)
+        self.assertIn(f'egp_store_fetch_latency_seconds_bucket{{{labels},le="0.001"}} 1\n', text)
+        self.assertIn(f'egp_store_fetch_latency_seconds_bucket{{{labels},le="+Inf"}} 1\n', text)
+        self.assertIn(f"egp_store_fetch_latency_seconds_count{{{labels}}} 1\n", text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_prometheus_families(self) -> None:
+        """Test each metric family is declared once for many metrics."""
+        other = Metrics('test "quoted"')
+        text = prometheus_text((self.metrics, other))
+        self.assertEqual(text.count("# TYPE egp_store_hits_total counter"), 1)
+        self.assertIn('name="test \\"quoted\\""', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -277,6 +277,18 @@ class TestObjectDeduplicator(unittest.TestCase):
         obj1_new = SimpleHashable("obj1")
         _ = dedup[obj1_new]
 
+    def test_metrics(self):
+        """Test the metrics are collected from the cache statistics."""
+        dedup = ObjectDeduplicator(name="metrics_test", size=2)
+        dedup.clear()
+        for obj in ((1,), (2,), (1,), (3,), (4,)):
+            _ = dedup[obj]
+        snapshot = dedup.metrics.snapshot()
+        self.assertEqual(snapshot["hits"], 1)
+        self.assertEqual(snapshot["misses"], 4)
+        self.assertEqual(snapshot["evictions"], 2)
+        self.assertIn('egp_store_hits_total{name="metrics_test"', dedup.metrics.prometheus())
+
     def test_multiple_deduplicators_independent(self):
         """Test that multiple ObjectDeduplicator instances are independent."""
         dedup1 = ObjectDeduplicator(name="test1", size=16)
@@ -314,7 +326,9 @@ class TestObjectDeduplicator(unittest.TestCase):
 
         # Check that __slots__ is defined
         self.assertTrue(hasattr(ObjectDeduplicator, "__slots__"))
-        self.assertEqual(ObjectDeduplicator.__slots__, ("_objects", "name", "target_rate"))
+        self.assertEqual(
+            ObjectDeduplicator.__slots__, ("_objects", "metrics", "name", "target_rate")
+        )
 
         # Check that instance doesn't have __dict__
         self.assertFalse(hasattr(dedup, "__dict__"))
@@ -0,0 +1,171 @@
+"""Unit tests for the async_database.py module."""
+
+from asyncio import run
+from itertools import count, repeat
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import POLL_OK, TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from egpcommon.egp_log import Logger, egp_logger
+from egpdb.async_database import db_pool_async, db_stream_async, db_transaction_async
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+_MOCK_CONFIG = {
+    "host": "_host",
+    "port": "_port",
+    "user": "_user",
+    "password": "_password",
+    "maintenance_db": "_maintenance_db",
+    "retries": 0,
+}
+_MOCK_DBNAME = "_dbname"
+_MOCK_ROWS = [(n,) for n in range(5)]
+_ITERSIZE = 2
+
+
+class MockCursor:
+    """Mock cursor class for testing. Each FETCH returns the next _ITERSIZE rows."""
+
+    def __init__(self, connection: "MockAsyncConnection") -> None:
+        """Initialize the cursor."""
+        self.connection: MockAsyncConnection = connection
+        self.rows: list[Any] = []
+
+    def __enter__(self) -> "MockCursor":
+        """Enter the context."""
+        return self
+
+    def __exit__(self, *_) -> None:
+        """Exit the context."""
+
+    def execute(self, query: Any) -> None:
+        """Record the query & update the transaction status."""
+        text: str = repr(query)
+        self.connection.queries.append(text)
+        if self.connection.errors:
+            self.connection.errors -= 1
+            raise OperationalError("Mock error")
+        if "BEGIN" in text:
+            self.connection.status = TRANSACTION_STATUS_INTRANS
+        if "COMMIT" in text or "ROLLBACK" in text:
+            self.connection.status = TRANSACTION_STATUS_IDLE
+        if "FETCH" in text:
+            self.rows = self.connection.rows[:_ITERSIZE]
+            del self.connection.rows[:_ITERSIZE]
+        else:
+            self.rows = list(self.connection.rows)
+
+    def fetchall(self) -> list[Any]:
+        """Return the rows of the last query."""
+        return self.rows
+
+
+class MockAsyncConnection:
+    """Mock asynchronous connection class for testing."""
+
+    idents = count()
+
+    def __init__(self, errors: int = 0) -> None:
+        """Initialize the connection."""
+        self.ident: int = next(self.idents)
+        self.closed: int = 0
+        self.errors: int = errors
+        self.queries: list[str] = []
+        self.rows: list[Any] = list(_MOCK_ROWS)
+        self.status: int = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.closed = 1
+
+    def cursor(self, **_) -> MockCursor:
+        """Return a new cursor."""
+        return MockCursor(self)
+
+    def get_transaction_status(self) -> int:
+        """Return the transaction status."""
+        return self.status
+
+    def isexecuting(self) -> bool:
+        """Return True if an asynchronous query is executing."""
+        return False
+
+    def poll(self) -> int:
+        """Return the poll state: operations complete immediately."""
+        return POLL_OK
+
+
+class TestAsyncDatabase(TestCase):
+    """Unit tests for the async_database.py module."""
+
+    @patch("egpdb.async_database.connect")
+    def test_db_transaction_async(self, mock_connect) -> None:
+        """A query returns a cursor of the rows & the connection is returned to the pool."""
+        mock_connect.side_effect = lambda **_: MockAsyncConnection()
+
+        async def test() -> None:
+            cursor = await db_transaction_async(_MOCK_DBNAME, _MOCK_CONFIG, "SELECT 1")
+            self.assertEqual(cursor.fetchall(), _MOCK_ROWS)
+            self.assertEqual(db_pool_async(_MOCK_DBNAME, _MOCK_CONFIG).idle(), 1)
+            await db_transaction_async(_MOCK_DBNAME, _MOCK_CONFIG, "SELECT 1")
+            self.assertEqual(len(db_pool_async(_MOCK_DBNAME, _MOCK_CONFIG)), 1)
+
+        run(test())
+        self.assertEqual(mock_connect.call_count, 1)
+        self.assertTrue(mock_connect.call_args.kwargs["async_"])
+
+    @patch("egpdb.async_database.connect")
+    def test_db_transaction_async_retry(self, mock_connect) -> None:
+        """A query that fails with an operational error is retried on a new connection."""
+        connections = [MockAsyncConnection(errors=1), MockAsyncConnection()]
+        mock_connect.side_effect = connections
+
+        async def test() -> None:
+            cursor = await db_transaction_async(_MOCK_DBNAME, _MOCK_CONFIG, "SELECT 1")
+            self.assertEqual(cursor.connection, connections[1])
+
+        with patch("egpdb.async_database.backoff_generator", return_value=repeat(0)):
+            run(test())
+        self.assertTrue(connections[0].closed)
+
+    @patch("egpdb.async_database.connect")
+    def test_db_stream_async(self, mock_connect) -> None:
+        """All the rows are streamed in batches and the transaction is committed."""
+        connection = MockAsyncConnection()
+        mock_connect.return_value = connection
+
+        async def test() -> list[Any]:
+            rows = await db_stream_async(_MOCK_DBNAME, _MOCK_CONFIG, "SELECT 1", itersize=_ITERSIZE)
+            self.assertEqual(db_pool_async(_MOCK_DBNAME, _MOCK_CONFIG).idle(), 0)
+            retval = [row async for row in rows]
+            self.assertEqual(db_pool_async(_MOCK_DBNAME, _MOCK_CONFIG).idle(), 1)
+            return retval
+
+        self.assertEqual(run(test()), _MOCK_ROWS)
+        self.assertIn("DECLARE", connection.queries[0])
+        self.assertEqual(sum("FETCH" in query for query in connection.queries), 3)
+        self.assertIn("COMMIT", connection.queries[-1])
+        self.assertEqual(connection.status, TRANSACTION_STATUS_IDLE)
+
+    @patch("egpdb.async_database.connect")
+    def test_db_stream_async_aclose(self, mock_connect) -> None:
+        """Closing a stream early rolls back the transaction and releases the connection."""
+        connection = MockAsyncConnection()
+        mock_connect.return_value = connection
+
+        async def test() -> None:
+            rows = await db_stream_async(_MOCK_DBNAME, _MOCK_CONFIG, "SELECT 1", itersize=_ITERSIZE)
+            self.assertEqual(await anext(rows), _MOCK_ROWS[0])
+            await rows.aclose()
+            self.assertEqual(db_pool_async(_MOCK_DBNAME, _MOCK_CONFIG).idle(), 1)
+
+        run(test())
+        self.assertEqual(connection.queries[-1], repr("ROLLBACK"))
+        self.assertEqual(connection.status, TRANSACTION_STATUS_IDLE)
+        self.assertFalse(connection.closed)
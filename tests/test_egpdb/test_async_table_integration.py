@@ -0,0 +1,167 @@
+"""Integration tests for async_table.py."""
+
+from asyncio import run
+from copy import deepcopy
+from inspect import stack
+from itertools import count, islice
+from json import load
+from logging import NullHandler, getLogger
+from os.path import dirname, join
+from unittest import TestCase
+
+from egpdb.async_database import db_disconnect_all_async
+from egpdb.async_table import AsyncTable
+from egpdb.configuration import TableConfig
+from egpdb.database import db_delete
+from egpdb.table import Table
+
+_logger = getLogger(__name__)
+_logger.addHandler(NullHandler())
+
+
+_CONFIG = TableConfig(
+    **{
+        "database": {"dbname": "test_db", "host": "postgres"},
+        "table": "test_table",
+        "schema": {
+            "name": {"db_type": "VARCHAR", "nullable": True},
+            "id": {"db_type": "INTEGER", "primary_key": True},
+            "left": {"db_type": "INTEGER", "nullable": True},
+            "right": {"db_type": "INTEGER", "nullable": True},
+            "uid": {"db_type": "INTEGER", "index": "btree"},
+            "updated": {"db_type": "TIMESTAMP", "default": "NOW()"},
+            "metadata": {"db_type": "INTEGER[]", "index": "btree", "nullable": True},
+        },
+        "ptr_map": {"left": "id", "right": "id"},
+        "data_file_folder": join(dirname(__file__), "data"),
+        "data_files": ["data_values.json"],
+        "delete_db": True,
+        "delete_table": True,
+        "create_db": True,
+        "create_table": True,
+        "wait_for_db": False,
+        "wait_for_table": False,
+    }
+)
+
+
+# To uniquely name databases for parallel execution
+_START_DB_COUNTER = 1200
+_NUM_DBS = 100
+_DB_COUNTER = islice(count(_START_DB_COUNTER), _NUM_DBS)
+
+
+with open(join(dirname(__file__), "data/data_values.json"), "r", encoding="utf-8") as fileptr:
+    _DEFAULT_TABLE_LENGTH = len(load(fileptr))
+
+
+def _table() -> AsyncTable:
+    """Create a uniquely named test table."""
+    config = deepcopy(_CONFIG)
+    # deepcode ignore unguarded~next~call: infinite counter
+    config["database"]["dbname"] = f"test_db_{next(_DB_COUNTER)}"
+    return AsyncTable(Table(config))
+
+
+async def _collect(rows) -> list:
+    """Return a list of the rows of an asynchronous iterator & close the connections."""
+    retval = [row async for row in rows]
+    await db_disconnect_all_async()
+    return retval
+
+
+class AsyncTableIntegrationTest(TestCase):
+    """Integration tests for the AsyncTable class."""
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Clean up the test databases."""
+        _logger.debug(stack()[0][3])
+        # deepcode ignore unguarded~next~call: infinite counter
+        for num in range(next(_DB_COUNTER) - 1, _START_DB_COUNTER - 1, -1):
+            db_delete(f"test_db_{num}", _CONFIG["database"])
+
+    def test_delete(self) -> None:
+        """Validate a delete returning a tuple."""
+        _logger.debug(stack()[0][3])
+        t = _table()
+
+        async def test() -> list:
+            return await _collect(
+                await t.delete("{id}={target}", {"target": 7}, ("uid", "id"), container="tuple")
+            )
+
+        self.assertEqual(run(test()), [(107, 7)])
+        self.assertEqual(list(t.table.select("WHERE {id} = 7")), [])
+
+    def test_recursive_select(self) -> None:
+        """Validate a streamed recursive select returning a tuple."""
+        _logger.debug(stack()[0][3])
+        t = _table()
+
+        async def test() -> list:
+            return await _collect(
+                await t.recursive_select(
+                    "WHERE {id} = 2", columns=("id", "uid", "left", "right"), container="tuple"
+                )
+            )
+
+        self.assertEqual(
+            run(test()),
+            [
+                (2, 102, 5, 6),
+                (5, 105, 10, 11),
+                (6, 106, None, 12),
+                (10, 110, None, None),
+                (11, 111, None, None),
+                (12, 112, None, None),
+            ],
+        )
+
+    def test_select_bounded(self) -> None:
+        """Validate a bounded select returning a namedtuple."""
+        _logger.debug(stack()[0][3])
+        t = _table()
+
+        async def test() -> list:
+            return await _collect(
+                await t.select(
+                    "WHERE {id} = 2", columns=("id", "uid"), container="namedtuple", bounded=True
+                )
+            )
+
+        self.assertEqual([tuple(row) for row in run(test())], [(2, 102)])
+
+    def test_select_streamed(self) -> None:
+        """Validate a streamed select of all rows is the same as the synchronous select."""
+        _logger.debug(stack()[0][3])
+        t = _table()
+
+        async def test() -> list:
+            return await _collect(await t.select("ORDER BY {id}", columns=("id", "uid")))
+
+        rows = run(test())
+        self.assertEqual(len(rows), _DEFAULT_TABLE_LENGTH)
+        self.assertEqual(rows, list(t.table.select("ORDER BY {id}", columns=("id", "uid"))))
+
+    def test_upsert(self) -> None:
+        """Validate an upsert consisting of 1 insert & 1 update returning tuples."""
+        _logger.debug(stack()[0][3])
+        t = _table()
+        data = (
+            {"id": 91, "left": 3, "right": 4, "uid": 901, "metadata": [1, 2], "name": "Harry"},
+            {"id": 0, "left": 1, "right": 2, "uid": 201, "metadata": [], "name": "Diana"},
+        )
+
+        async def test() -> list:
+            return await _collect(
+                await t.upsert(
+                    data,
+                    "{name}={EXCLUDED.name} || {temp}",
+                    {"temp": "_temp"},
+                    ("uid", "id", "name"),
+                    container="tuple",
+                )
+            )
+
+        self.assertEqual(run(test()), [(901, 91, "Harry"), (100, 0, "Diana_temp")])
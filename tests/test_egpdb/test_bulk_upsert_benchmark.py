@@ -0,0 +1,97 @@
+"""Benchmark RawTable.upsert() vs. RawTable.bulk_upsert() (COPY FROM STDIN) throughput.
+
+upsert() composes a single INSERT ... VALUES statement with an SQL literal for every value
+whereas bulk_upsert() streams the rows in the COPY text format into a temporary table and
+upserts them with INSERT ... SELECT ... ON CONFLICT. The benchmark requires a PostgreSQL server
+(see test_raw_table_integration.py). It is not a pass/fail performance test: the throughputs
+are logged in rows/s for comparison and the test assertions only check the table contents.
+"""
+
+from copy import deepcopy
+from logging import NullHandler, getLogger
+from time import perf_counter
+from typing import Any
+from unittest import TestCase
+
+from egpdb.configuration import TableConfig
+from egpdb.database import db_delete
+from egpdb.raw_table import RawTable
+
+_logger = getLogger(__name__)
+_logger.addHandler(NullHandler())
+
+
+# Constants
+NUM_ROWS: int = 2**14
+CHUNK_SIZES: tuple[int, ...] = (2**10, 2**12, 2**14)
+COLUMNS: tuple[str, ...] = ("id", "signature", "types", "meta")
+_CONFIG: dict[str, Any] = {
+    "database": {"dbname": "test_db_bulk_upsert_benchmark", "host": "postgres"},
+    "table": "test_table_bulk_upsert_benchmark",
+    "schema": {
+        "id": {"db_type": "INTEGER", "primary_key": True},
+        "signature": {"db_type": "BYTEA", "nullable": True},
+        "types": {"db_type": "INT[]", "nullable": True},
+        "meta": {"db_type": "JSONB", "nullable": True},
+    },
+    "ptr_map": {},
+    "data_file_folder": "",
+    "data_files": [],
+    "delete_db": True,
+    "delete_table": True,
+    "create_db": True,
+    "create_table": True,
+    "wait_for_db": False,
+    "wait_for_table": False,
+}
+
+
+def rows(offset: int = 0) -> list[tuple]:
+    """Return NUM_ROWS rows of values in the order of COLUMNS."""
+    return [
+        (pk, (pk + offset).to_bytes(32, "big"), [pk, offset], {"pk": pk, "offset": offset})
+        for pk in range(NUM_ROWS)
+    ]
+
+
+class TestBulkUpsertBenchmark(TestCase):
+    """Benchmark upsert() & bulk_upsert() throughput."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the benchmark table."""
+        cls.config = TableConfig(**deepcopy(_CONFIG))
+        cls.rt = RawTable(cls.config)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Delete the benchmark database."""
+        db_delete(_CONFIG["database"]["dbname"], cls.config["database"])
+
+    def _check(self, offset: int) -> None:
+        """Check the table has the rows with offset."""
+        self.assertEqual(len(self.rt), NUM_ROWS)
+        selected = sorted(self.rt.select(columns=COLUMNS))
+        self.assertEqual(
+            [(pk, bytes(sig), types, meta) for pk, sig, types, meta in selected], rows(offset)
+        )
+
+    def test_throughput(self) -> None:
+        """Compare the upsert throughput in rows/s."""
+        start: float = perf_counter()
+        self.rt.upsert(COLUMNS, rows())
+        upsert: float = NUM_ROWS / (perf_counter() - start)
+        _logger.info("upsert(): %.0f rows/s", upsert)
+        self._check(0)
+        for offset, chunk_size in enumerate(CHUNK_SIZES, 1):
+            start = perf_counter()
+            num: int = self.rt.bulk_upsert(COLUMNS, rows(offset), chunk_size=chunk_size)
+            bulk_upsert: float = NUM_ROWS / (perf_counter() - start)
+            _logger.info(
+                "bulk_upsert(chunk_size=%d): %.0f rows/s (x%.1f)",
+                chunk_size,
+                bulk_upsert,
+                bulk_upsert / upsert,
+            )
+            self.assertEqual(num, NUM_ROWS)
+            self._check(offset)
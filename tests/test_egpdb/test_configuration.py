@@ -155,6 +155,17 @@ class TestDatabaseConfig(TestCase):
         with self.assertRaises(ValueError):
             config.password = ""
 
+    def test_pool_size(self):
+        """Test the pool_size property."""
+        config = DatabaseConfig(password=PSWD_FILE)
+        self.assertEqual(config.pool_size, 0)
+        config.pool_size = 8
+        self.assertEqual(config.pool_size, 8)
+        with self.assertRaises(ValueError):
+            config.pool_size = "8"  # type: ignore
+        with self.assertRaises(ValueError):
+            config.pool_size = -1
+
     def test_port(self):
         """Test the port property."""
         config = DatabaseConfig(password=PSWD_FILE)
@@ -184,12 +195,14 @@ class TestDatabaseConfig(TestCase):
         config["maintenance_db"] = "mdb"
         config["retries"] = 8
         config["user"] = "brian"
+        config["pool_size"] = 16
         dict_config = {
             "dbname": "fred",
             "host": "127.0.0.1",
             "port": 5433,
             # deepcode ignore NoHardcodedPasswords/test: Unit test
             "password": PSWD_FILE,
+            "pool_size": 16,
             "maintenance_db": "mdb",
             "retries": 8,
             "user": "brian",
@@ -0,0 +1,61 @@
+"""Unit tests for the copy_format.py module."""
+
+from datetime import datetime
+from enum import IntEnum
+from unittest import TestCase
+from uuid import UUID
+
+from psycopg2.extras import Json
+
+from egpdb.copy_format import COPY_NULL, array_literal, copy_row, copy_rows, copy_value
+
+
+class _Colour(IntEnum):
+    """An IntEnum for testing."""
+
+    RED = 1
+
+
+class TestCopyFormat(TestCase):
+    """Unit tests for encoding values in the COPY text format."""
+
+    def test_scalars(self) -> None:
+        """Scalar values are in the PostgreSQL text input format."""
+        self.assertEqual(copy_value(True), "t")
+        self.assertEqual(copy_value(False), "f")
+        self.assertEqual(copy_value(-42), "-42")
+        self.assertEqual(copy_value(_Colour.RED), "1")
+        self.assertEqual(copy_value(0.5), "0.5")
+        self.assertEqual(copy_value("text"), "text")
+        uuid = UUID("12345678-1234-5678-1234-567812345678")
+        self.assertEqual(copy_value(uuid), str(uuid))
+        self.assertEqual(copy_value(datetime(2024, 1, 2, 3, 4, 5)), "2024-01-02T03:04:05")
+
+    def test_escapes(self) -> None:
+        """Backslash, tab, newline & carriage return are escaped."""
+        self.assertEqual(copy_value("a\\b\tc\nd\re"), "a\\\\b\\tc\\nd\\re")
+
+    def test_bytea(self) -> None:
+        """Bytes are in the BYTEA hex format with the backslash escaped."""
+        self.assertEqual(copy_value(b"\x01\xab"), "\\\\x01ab")
+        self.assertEqual(copy_value(memoryview(b"\xff")), "\\\\xff")
+
+    def test_arrays(self) -> None:
+        """Lists & tuples are array literals."""
+        self.assertEqual(array_literal([1, 2, None]), "{1,2,NULL}")
+        self.assertEqual(array_literal(((1, 2), (3, 4))), "{{1,2},{3,4}}")
+        self.assertEqual(array_literal(['a"b', "c,d"]), '{"a\\"b","c,d"}')
+        self.assertEqual(copy_value([b"\x01"]), '{"\\\\\\\\x01"}')
+
+    def test_json(self) -> None:
+        """JSON columns & dicts are JSON text."""
+        self.assertEqual(copy_value([1, 2], json=True), "[1, 2]")
+        self.assertEqual(copy_value(Json({"a": 1}), json=True), '{"a": 1}')
+        self.assertEqual(copy_value({"a": "\n"}), '{"a": "\\\\n"}')
+
+    def test_rows(self) -> None:
+        """Rows are tab separated & newline terminated with NULL as \\N."""
+        self.assertEqual(copy_row((1, None, [1]), (False, False, True)), f"1\t{COPY_NULL}\t[1]\n")
+        self.assertEqual("".join(copy_rows(((1,), (2,)), (False,))), "1\n2\n")
+        with self.assertRaises(ValueError):
+            copy_row((1, 2), (False,))
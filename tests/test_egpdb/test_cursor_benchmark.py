@@ -0,0 +1,113 @@
+"""Benchmark client-side vs. server-side (named) cursors for bounded reads.
+
+Bounded queries (primary key equality, small LIMIT & COUNT) return few rows. A server-side
+named cursor costs a DECLARE, FETCH & CLOSE round trip per query whereas a client-side cursor
+fetches the rows with the execute. The benchmark requires a PostgreSQL server (see
+test_raw_table_integration.py). It is not a pass/fail performance test: the latencies are logged
+for comparison and the test assertions only check both cursors return the same rows.
+"""
+
+from copy import deepcopy
+from logging import NullHandler, getLogger
+from time import perf_counter
+from typing import Any
+from unittest import TestCase
+
+from egpdb.configuration import TableConfig
+from egpdb.database import db_delete
+from egpdb.raw_table import RawTable, is_bounded
+
+_logger = getLogger(__name__)
+_logger.addHandler(NullHandler())
+
+
+# Constants
+NUM_ROWS: int = 2**12
+NUM_QUERIES: int = 2**9
+_CONFIG: dict[str, Any] = {
+    "database": {"dbname": "test_db_cursor_benchmark", "host": "postgres"},
+    "table": "test_table_cursor_benchmark",
+    "schema": {
+        "id": {"db_type": "INTEGER", "primary_key": True},
+        "value": {"db_type": "INTEGER", "nullable": True},
+    },
+    "ptr_map": {},
+    "data_file_folder": "",
+    "data_files": [],
+    "delete_db": True,
+    "delete_table": True,
+    "create_db": True,
+    "create_table": True,
+    "wait_for_db": False,
+    "wait_for_table": False,
+}
+
+
+def latency(
+    rt: RawTable, query_str: str, bounded: bool, prepare: bool = True
+) -> tuple[float, list[list[tuple]]]:
+    """Return the mean query latency in seconds and the rows returned."""
+    results: list[list[tuple]] = []
+    start: float = perf_counter()
+    for pk in range(NUM_QUERIES):
+        results.append(list(rt.select(query_str, {"pk": pk}, bounded=bounded, prepare=prepare)))
+    return (perf_counter() - start) / NUM_QUERIES, results
+
+
+class TestIsBounded(TestCase):
+    """Unit tests for is_bounded()."""
+
+    def test_limit(self) -> None:
+        """A small LIMIT is bounded."""
+        self.assertTrue(is_bounded("WHERE {id} > {pk} LIMIT 10"))
+        self.assertTrue(is_bounded("ORDER BY {id} limit 1"))
+
+    def test_unbounded(self) -> None:
+        """No LIMIT or a large LIMIT is not bounded."""
+        self.assertFalse(is_bounded("WHERE {id} > {pk}"))
+        self.assertFalse(is_bounded("WHERE {id} > {pk} LIMIT 1000000"))
+        self.assertFalse(is_bounded("WHERE {unlimited} = 1"))
+
+
+class TestCursorBenchmark(TestCase):
+    """Benchmark bounded reads with client-side & server-side cursors."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create & populate the benchmark table."""
+        cls.config = TableConfig(**deepcopy(_CONFIG))
+        cls.rt = RawTable(cls.config)
+        cls.rt.insert(("id", "value"), [(pk, pk * 2) for pk in range(NUM_ROWS)])
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Delete the benchmark database."""
+        db_delete(_CONFIG["database"]["dbname"], cls.config["database"])
+
+    def _compare(self, description: str, query_str: str) -> None:
+        """Compare the client-side & server-side cursor latency of query_str.
+        Client-side cursor latency is measured with & without prepared statements.
+        """
+        named, named_rows = latency(self.rt, query_str, False)
+        client, client_rows = latency(self.rt, query_str, True, False)
+        prepared, prepared_rows = latency(self.rt, query_str, True)
+        _logger.info(
+            "%s: named cursor %.1f us, client cursor %.1f us (x%.1f), "
+            "prepared client cursor %.1f us (x%.1f)",
+            description,
+            named * 1e6,
+            client * 1e6,
+            named / client,
+            prepared * 1e6,
+            named / prepared,
+        )
+        self.assertEqual(named_rows, client_rows)
+        self.assertEqual(named_rows, prepared_rows)
+
+    def test_pk_equality(self) -> None:
+        """Primary key equality lookup latency."""
+        self._compare("Primary key lookup", "WHERE {id} = {pk}")
+
+    def test_limit(self) -> None:
+        """Small LIMIT query latency."""
+        self._compare("LIMIT 10", "WHERE {id} >= {pk} ORDER BY {id} LIMIT 10")
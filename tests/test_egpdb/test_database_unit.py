@@ -1,25 +1,31 @@
 """Unit tests for the database.py module."""
 
 from copy import deepcopy
+from io import StringIO
 from itertools import count
 from threading import get_ident
 from unittest import TestCase
 from unittest.mock import patch
 
 from psycopg2 import OperationalError, ProgrammingError, errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
 
 from egpcommon.egp_log import Logger, egp_logger
 from egpdb import database
 from egpdb.common import backoff_generator
 from egpdb.database import (
+    PrepareError,
     _clean_connections,
     _connect_core,
+    _forget_connections,
     db_connect,
+    db_copy,
     db_create,
     db_delete,
     db_disconnect,
     db_disconnect_all,
     db_exists,
+    db_prepared,
     db_reconnect,
     db_transaction,
 )
@@ -952,6 +958,235 @@ class TestDatabase(TestCase):
         assert dbcur.fetchone() == 2
         assert db_connect(_MOCK_DBNAME, _MOCK_CONFIG).commit
 
+    @patch("egpdb.database.connect")
+    def test_db_transaction_bounded(self, mock_connect):
+        """A bounded read uses a client-side cursor and an unbounded read a named cursor."""
+        db_disconnect_all()
+        cursor_kwargs: list[dict] = []
+
+        class MockCursor:
+            """Mock cursor class for testing."""
+
+            def execute(self, sql_str):
+                """Execute a SQL statement."""
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def cursor(self, *_, **kwargs) -> MockCursor:
+                """Return a new cursor."""
+                cursor_kwargs.append(kwargs)
+                return MockCursor()
+
+            def close(self) -> None:
+                """Close the connection."""
+
+            def commit(self) -> None:
+                """Commit the transaction."""
+
+        mock_connect.return_value = MockConnection()
+        db_transaction(_MOCK_DBNAME, _MOCK_CONFIG, "SQL0", bounded=True)
+        db_transaction(_MOCK_DBNAME, _MOCK_CONFIG, "SQL1")
+        self.assertNotIn("name", cursor_kwargs[0])
+        self.assertIn("name", cursor_kwargs[1])
+        self.assertTrue(cursor_kwargs[1]["withhold"])
+
+    @patch("egpdb.database.connect")
+    def test_db_transaction_pooled(self, mock_connect):
+        """Pooled transactions share connections and the pool is closed on disconnect."""
+        db_disconnect_all()
+        connections: list = []
+
+        class MockCursor:
+            """Mock cursor class for testing."""
+
+            def execute(self, sql_str):
+                """Execute a SQL statement."""
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def __init__(self) -> None:
+                """Initialize the connection."""
+                self.closed = 0
+                connections.append(self)
+
+            def cursor(self, *_, **__) -> MockCursor:
+                """Return a new cursor."""
+                return MockCursor()
+
+            def close(self) -> None:
+                """Close the connection."""
+                self.closed = 1
+
+            def commit(self) -> None:
+                """Commit the transaction."""
+
+            def get_transaction_status(self) -> int:
+                """Return the transaction status."""
+                return TRANSACTION_STATUS_IDLE
+
+        mock_connect.side_effect = lambda *_, **__: MockConnection()
+        config = _MOCK_CONFIG | {"pool_size": 2}
+        db_transaction(_MOCK_DBNAME, config, "SQL0", read=False)
+        db_transaction(_MOCK_DBNAME, config, "SQL1", bounded=True)
+        self.assertEqual(len(connections), 1)
+        pool = database.db_pool(_MOCK_DBNAME, config)
+        self.assertIsNotNone(pool)
+        self.assertEqual(pool.idle(), 1)  # type: ignore
+        self.assertIsNone(database.db_pool(config["maintenance_db"], config))
+        db_disconnect(_MOCK_DBNAME, config)
+        self.assertTrue(connections[0].closed)
+        self.assertNotIn(_MOCK_DBNAME, database._pools[config["host"]])
+
+    @patch("egpdb.database.connect")
+    def test_db_copy(self, mock_connect):
+        """COPY is executed between the pre & post SQL in a single committed transaction."""
+        db_disconnect_all()
+        calls: list[str] = []
+
+        class MockCursor:
+            """Mock cursor class for testing."""
+
+            rowcount = 2
+
+            def __enter__(self) -> "MockCursor":
+                """Enter the context."""
+                return self
+
+            def __exit__(self, *_) -> None:
+                """Exit the context."""
+
+            def execute(self, sql_str):
+                """Execute a SQL statement."""
+                calls.append(sql_str)
+
+            def copy_expert(self, sql_str, data):
+                """Copy data."""
+                calls.append(sql_str + ":" + data.read())
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def cursor(self, *_, **__) -> MockCursor:
+                """Return a new cursor."""
+                return MockCursor()
+
+            def close(self) -> None:
+                """Close the connection."""
+
+            def commit(self) -> None:
+                """Commit the transaction."""
+                calls.append("COMMIT")
+
+            def rollback(self) -> None:
+                """Rollback the transaction."""
+                calls.append("ROLLBACK")
+
+        mock_connect.return_value = MockConnection()
+        data = StringIO("1\n2\n")
+        data.read()
+        self.assertEqual(db_copy(_MOCK_DBNAME, _MOCK_CONFIG, "COPY", data, "PRE", "POST"), 2)
+        self.assertEqual(calls, ["PRE", "COPY:1\n2\n", "POST", "COMMIT"])
+
+    @patch("egpdb.database.connect")
+    def test_db_prepared(self, mock_connect):
+        """A statement is prepared once per connection and executed with parameters."""
+        db_disconnect_all()
+        calls: list[tuple] = []
+
+        class MockCursor:
+            """Mock cursor class for testing."""
+
+            def execute(self, sql_str, params=None):
+                """Execute a SQL statement."""
+                text: str = sql_str.as_string(None) if hasattr(sql_str, "as_string") else sql_str
+                if "FAIL" in text:
+                    raise ProgrammingError
+                calls.append((text.split()[0], params))
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def cursor(self, *_, **__) -> MockCursor:
+                """Return a new cursor."""
+                return MockCursor()
+
+            def close(self) -> None:
+                """Close the connection."""
+
+            def commit(self) -> None:
+                """Commit the transaction."""
+
+            def rollback(self) -> None:
+                """Rollback the transaction."""
+                calls.append(("ROLLBACK", None))
+
+        mock_connect.return_value = MockConnection()
+        with patch("egpdb.database.sql.Identifier.as_string", lambda *_: '"name"'):
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key", database.sql.SQL("SQL $1"), (1,))
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key", database.sql.SQL("SQL $1"), (2,))
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key0", database.sql.SQL("SQL"))
+            self.assertEqual(
+                calls,
+                [
+                    ("PREPARE", None),
+                    ("EXECUTE", (1,)),
+                    ("EXECUTE", (2,)),
+                    ("PREPARE", None),
+                    ("EXECUTE", None),
+                ],
+            )
+            with self.assertRaises(PrepareError):
+                db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "fail", database.sql.SQL("FAIL"))
+            self.assertEqual(calls[-1], ("ROLLBACK", None))
+
+    @patch("egpdb.database.MAX_PREPARED", 1)
+    @patch("egpdb.database.connect")
+    def test_db_prepared_max(self, mock_connect):
+        """The oldest statement is deallocated when a connection holds MAX_PREPARED."""
+        db_disconnect_all()
+        calls: list[tuple] = []
+
+        class MockCursor:
+            """Mock cursor class for testing."""
+
+            def execute(self, sql_str, params=None):
+                """Execute a SQL statement."""
+                text: str = sql_str.as_string(None) if hasattr(sql_str, "as_string") else sql_str
+                calls.append((text.split()[0], params))
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def cursor(self, *_, **__) -> MockCursor:
+                """Return a new cursor."""
+                return MockCursor()
+
+            def close(self) -> None:
+                """Close the connection."""
+
+            def commit(self) -> None:
+                """Commit the transaction."""
+
+        mock_connect.return_value = connection = MockConnection()
+        with patch("egpdb.database.sql.Identifier.as_string", lambda *_: '"name"'):
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key0", database.sql.SQL("SQL"))
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key1", database.sql.SQL("SQL"))
+            db_prepared(_MOCK_DBNAME, _MOCK_CONFIG, "key1", database.sql.SQL("SQL"))
+        self.assertEqual(
+            calls,
+            [
+                ("PREPARE", None),
+                ("EXECUTE", None),
+                ("DEALLOCATE", None),
+                ("PREPARE", None),
+                ("EXECUTE", None),
+                ("EXECUTE", None),
+            ],
+        )
+        self.assertEqual(list(database._prepared[connection]), ["key1"])
+
     @patch("egpdb.database.connect")
     def test_db_disconnect_all_clears_state(self, mock_connect):
         """Verify db_disconnect_all clears _connections entirely."""
@@ -1091,3 +1326,34 @@ class TestDatabase(TestCase):
 
         # Cleanup
         db_disconnect_all()
+
+    @patch("egpdb.database.connect")
+    def test_forget_connections_after_fork(self, mock_connect):
+        """Connections inherited by a forked child are forgotten but not closed."""
+        db_disconnect_all()
+
+        class MockConnection:
+            """Mock connection class for testing."""
+
+            def __init__(self) -> None:
+                self.value = _MOCK_VALUE_1
+
+            def close(self) -> None:
+                """Close the connection."""
+                self.value = None
+
+        connection = MockConnection()
+        mock_connect.return_value = connection
+        db_connect(_MOCK_DBNAME, _MOCK_CONFIG)
+        _forget_connections()
+        self.assertEqual(database._connections, {})  # pylint: disable=protected-access
+        self.assertIn(connection, database._inherited)  # pylint: disable=protected-access
+        self.assertEqual(connection.value, _MOCK_VALUE_1)
+
+        # A new connection is made
+        mock_connect.return_value = MockConnection()
+        self.assertIsNot(db_connect(_MOCK_DBNAME, _MOCK_CONFIG), connection)
+
+        # Cleanup
+        database._inherited.clear()  # pylint: disable=protected-access
+        db_disconnect_all()
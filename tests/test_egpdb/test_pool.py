@@ -0,0 +1,259 @@
+"""Unit tests for the pool.py & async_database.py connection pooling."""
+
+from asyncio import TimeoutError as AsyncTimeoutError
+from asyncio import gather, run, wait_for
+from itertools import count
+from socket import socketpair
+from threading import Thread
+from unittest import TestCase
+
+from psycopg2.extensions import (
+    POLL_OK,
+    POLL_READ,
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+from egpdb.async_database import wait
+from egpdb.pool import AsyncConnectionPool, ConnectionPool
+
+
+class MockConnection:
+    """Mock connection class for testing."""
+
+    def __init__(self, ident: int) -> None:
+        """Initialize the connection."""
+        self.ident: int = ident
+        self.closed: int = 0
+        self.executing: bool = False
+        self.rolled_back: bool = False
+        self.status: int = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.closed = 1
+
+    def get_transaction_status(self) -> int:
+        """Return the transaction status."""
+        return self.status
+
+    def isexecuting(self) -> bool:
+        """Return True if an asynchronous query is executing."""
+        return self.executing
+
+    def rollback(self) -> None:
+        """Roll back the transaction."""
+        self.rolled_back = True
+        self.status = TRANSACTION_STATUS_IDLE
+
+
+class TestConnectionPool(TestCase):
+    """Unit tests for ConnectionPool."""
+
+    def setUp(self) -> None:
+        """Create a pool of at most 2 connections."""
+        self.idents = count()
+        self.pool = ConnectionPool(lambda: MockConnection(next(self.idents)), 2)
+
+    def test_reuse(self) -> None:
+        """A released connection is reused."""
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+        self.assertIs(self.pool.acquire(), connection)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_maxconn(self) -> None:
+        """No more than maxconn connections are acquired."""
+        connections = [self.pool.acquire(), self.pool.acquire()]
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.01)
+        acquired = []
+        thread = Thread(target=lambda: acquired.append(self.pool.acquire(timeout=10)))
+        thread.start()
+        self.pool.release(connections[0])
+        thread.join()
+        self.assertEqual(acquired, connections[:1])
+        self.assertEqual(len(self.pool), 2)
+
+    def test_rollback(self) -> None:
+        """An open transaction is rolled back when the connection is released."""
+        with self.pool.connection() as connection:
+            connection.status = TRANSACTION_STATUS_INTRANS
+        self.assertTrue(connection.rolled_back)
+        self.assertEqual(self.pool.idle(), 1)
+
+    def test_closed(self) -> None:
+        """A closed connection is not reused."""
+        with self.pool.connection() as connection:
+            connection.close()
+        self.assertEqual(len(self.pool), 0)
+        self.assertIsNot(self.pool.acquire(), connection)
+
+    def test_health_check(self) -> None:
+        """An unhealthy idle connection is replaced."""
+        pool = ConnectionPool(
+            lambda: MockConnection(next(self.idents)), 2, health_check_interval=0, check=bool
+        )
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        pool.release(connection)
+        pool._check = lambda _: False  # pylint: disable=protected-access
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertTrue(connection.closed)
+        self.assertEqual(len(pool), 1)
+
+    def test_reset(self) -> None:
+        """Reset closes idle connections and in use connections when released."""
+        idle = self.pool.acquire()
+        in_use = self.pool.acquire()
+        self.pool.release(idle)
+        self.pool.reset()
+        self.assertTrue(idle.closed)
+        self.assertFalse(in_use.closed)
+        self.pool.release(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_connect_error(self) -> None:
+        """A failed connection does not use a slot in the pool."""
+
+        def connect() -> MockConnection:
+            raise ConnectionError
+
+        pool = ConnectionPool(connect, 1)
+        with self.assertRaises(ConnectionError):
+            pool.acquire()
+        self.assertEqual(len(pool), 0)
+
+    def test_forget(self) -> None:
+        """Forgotten connections are not closed."""
+        connections = [self.pool.acquire(), self.pool.acquire()]
+        self.pool.release(connections[1])
+        self.assertCountEqual(self.pool.forget(), connections)
+        self.assertEqual(len(self.pool), 0)
+        self.assertFalse(any(c.closed for c in connections))
+
+    def test_maxconn_invalid(self) -> None:
+        """A pool must have at least one connection."""
+        with self.assertRaises(ValueError):
+            ConnectionPool(lambda: None, 0)
+
+
+class TestAsyncConnectionPool(TestCase):
+    """Unit tests for AsyncConnectionPool."""
+
+    def setUp(self) -> None:
+        """Create a pool factory."""
+        self.idents = count()
+
+    def _pool(self, maxconn: int = 2, healthy: bool = True) -> AsyncConnectionPool:
+        """Return a new pool of mock connections."""
+
+        async def connect() -> MockConnection:
+            return MockConnection(next(self.idents))
+
+        async def check(_) -> bool:
+            return healthy
+
+        return AsyncConnectionPool(connect, check, maxconn, health_check_interval=0)
+
+    def test_reuse(self) -> None:
+        """A released healthy connection is reused."""
+
+        async def test() -> None:
+            pool = self._pool()
+            async with pool.connection() as connection:
+                pass
+            async with pool.connection() as reused:
+                self.assertIs(reused, connection)
+
+        run(test())
+
+    def test_unhealthy(self) -> None:
+        """An unhealthy idle connection is replaced."""
+
+        async def test() -> None:
+            pool = self._pool(healthy=False)
+            async with pool.connection() as connection:
+                pass
+            async with pool.connection() as replaced:
+                self.assertIsNot(replaced, connection)
+            self.assertTrue(connection.closed)
+
+        run(test())
+
+    def test_maxconn(self) -> None:
+        """Tasks wait for a connection when the pool is exhausted."""
+
+        async def test() -> None:
+            pool = self._pool(maxconn=1)
+            connection = await pool.acquire()
+            with self.assertRaises(AsyncTimeoutError):
+                await wait_for(pool.acquire(), 0.01)
+
+            async def release() -> None:
+                await pool.release(connection)
+
+            acquired, _ = await gather(pool.acquire(), release())
+            self.assertIs(acquired, connection)
+            self.assertEqual(len(pool), 1)
+
+        run(test())
+
+    def test_executing(self) -> None:
+        """A connection still executing (e.g. the task was cancelled) is closed."""
+
+        async def test() -> None:
+            pool = self._pool()
+            async with pool.connection() as connection:
+                connection.executing = True
+            self.assertTrue(connection.closed)
+            self.assertEqual(len(pool), 0)
+
+        run(test())
+
+    def test_reset(self) -> None:
+        """Reset closes idle connections and in use connections when released."""
+
+        async def test() -> None:
+            pool = self._pool()
+            idle = await pool.acquire()
+            in_use = await pool.acquire()
+            await pool.release(idle)
+            await pool.reset()
+            self.assertTrue(idle.closed)
+            await pool.release(in_use)
+            self.assertTrue(in_use.closed)
+
+        run(test())
+
+
+class TestWait(TestCase):
+    """Unit tests for async_database.wait()."""
+
+    def test_wait(self) -> None:
+        """Wait polls the connection until the socket is ready and the operation completes."""
+        reader, writer = socketpair()
+        states = iter((POLL_READ, POLL_OK))
+
+        class MockAsyncConnection:
+            """Mock asynchronous connection class for testing."""
+
+            def fileno(self) -> int:
+                """Return the socket file descriptor."""
+                return reader.fileno()
+
+            def poll(self) -> int:
+                """Return the next poll state."""
+                return next(states)
+
+        async def test() -> None:
+            writer.send(b"x")
+            await wait_for(wait(MockAsyncConnection()), 1)
+
+        try:
+            run(test())
+        finally:
+            reader.close()
+            writer.close()
@@ -138,13 +138,18 @@ class RawTableIntegrationTest(TestCase):
         class MockRawTable(RawTable):
             """Mock RawTable class to raise a ProgrammingError when trying to create the table."""
 
-            def _db_transaction(self, sql_str, read=True, ctype="tuple"):
+            def _db_transaction(self, sql_str, read=True, ctype="tuple", bounded=False):
                 if "CREATE TABLE " in self._sql_to_string(
                     sql_str
                 ):  # pylint: disable=protected-access
                     raise ProgrammingError
                 return db_transaction(
-                    config["database"]["dbname"], config["database"], sql_str, read, ctype=ctype
+                    config["database"]["dbname"],
+                    config["database"],
+                    sql_str,
+                    read,
+                    ctype=ctype,
+                    bounded=bounded,
                 )
 
         with self.assertRaises(ProgrammingError):
@@ -362,6 +367,21 @@ class RawTableIntegrationTest(TestCase):
         data = rt.recursive_select("WHERE {id} = 2")
         self.assertEqual(len(tuple(data)), 6)
 
+    def test_recursive_select_max_depth(self) -> None:
+        """As it says on the tin - limiting the depth of the recursion."""
+        _logger.debug(stack()[0][3])
+        config = deepcopy(_CONFIG)
+        # deepcode ignore unguarded~next~call: infinite counter
+        config["database"]["dbname"] = f"test_db_{next(_DB_COUNTER)}"
+        rt = RawTable(config)
+        data = rt.recursive_select("WHERE {id} = 2", columns=("id", "left", "right"), max_depth=1)
+        self.assertEqual(sorted(data), [(2, 5, 6), (5, 10, 11), (6, None, 12)])
+        # The pointer columns are always returned (in no particular order)
+        data = rt.recursive_select("WHERE {id} = 2", columns=("id",), max_depth=0, ctype="dict")
+        self.assertEqual([dict(row) for row in data], [{"id": 2, "left": 5, "right": 6}])
+        with self.assertRaises(ValueError):
+            rt.recursive_select("WHERE {id} = 2", max_depth=-1)
+
     def test_recursive_select_no_ptr(self) -> None:
         """As it says on the tin - missing a ptr_map column."""
         _logger.debug(stack()[0][3])
@@ -402,6 +422,54 @@ class RawTableIntegrationTest(TestCase):
         data = rt.select("WHERE {id} = {seven}", {"seven": 7}, columns="{uid}, {left}, {right}")
         self.assertEqual(list(data), [(107, 13, None)])
 
+    def test_select_prepared(self) -> None:
+        """A bounded select is prepared once and executed with different literals."""
+        _logger.debug(stack()[0][3])
+        config = deepcopy(_CONFIG)
+        # deepcode ignore unguarded~next~call: infinite counter
+        config["database"]["dbname"] = f"test_db_{next(_DB_COUNTER)}"
+        rt = RawTable(config)
+        for _ in range(2):
+            data = rt.select(
+                "WHERE {id} = {seven}", {"seven": 7}, ("uid", "left", "right"), bounded=True
+            )
+            self.assertEqual(list(data), [(107, 13, None)])
+        data = rt.select("WHERE {id} = {seven}", {"seven": 8}, ("uid",), bounded=True)
+        self.assertEqual(list(data), [(108,)])
+        key = (config["table"], "WHERE {id} = {seven}", ("uid",))
+        self.assertIsNotNone(rt._templates[key])  # pylint: disable=protected-access
+
+    def test_select_prepared_max(self) -> None:
+        """Templates stay prepared when a connection holds the maximum number of statements."""
+        _logger.debug(stack()[0][3])
+        config = deepcopy(_CONFIG)
+        # deepcode ignore unguarded~next~call: infinite counter
+        config["database"]["dbname"] = f"test_db_{next(_DB_COUNTER)}"
+        rt = RawTable(config)
+        with patch("egpdb.database.MAX_PREPARED", 1):
+            for _ in range(2):
+                data = rt.select("WHERE {id} = {seven}", {"seven": 7}, ("uid",), bounded=True)
+                self.assertEqual(list(data), [(107,)])
+                data = rt.select("WHERE {uid} = {uid7}", {"uid7": 107}, ("id",), bounded=True)
+                self.assertEqual(list(data), [(7,)])
+        for key in (
+            (config["table"], "WHERE {id} = {seven}", ("uid",)),
+            (config["table"], "WHERE {uid} = {uid7}", ("id",)),
+        ):
+            self.assertIsNotNone(rt._templates[key])  # pylint: disable=protected-access
+
+    def test_select_unpreparable(self) -> None:
+        """A select that cannot be prepared falls back to inlined literals."""
+        _logger.debug(stack()[0][3])
+        config = deepcopy(_CONFIG)
+        # deepcode ignore unguarded~next~call: infinite counter
+        config["database"]["dbname"] = f"test_db_{next(_DB_COUNTER)}"
+        rt = RawTable(config)
+        data = rt.select("WHERE {id} = 7 LIMIT 1", {"one": 1}, columns="{one}")
+        self.assertEqual(list(data), [(1,)])
+        key = (config["table"], "WHERE {id} = 7 LIMIT 1", "{one}")
+        self.assertIsNone(rt._templates[key])  # pylint: disable=protected-access
+
     def test_update(self) -> None:
         """As it says on the tin."""
         _logger.debug(stack()[0][3])
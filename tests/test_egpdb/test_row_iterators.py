@@ -1,9 +1,17 @@
 """Unit tests for egpdb.row_iterators module."""
 
+from asyncio import run
 from unittest import TestCase
 
 from egpcommon.egp_log import Logger, egp_logger
-from egpdb.row_iterators import BaseIter, DictIter, GenIter, NamedTupleIter, TupleIter
+from egpdb.row_iterators import (
+    BaseIter,
+    DictIter,
+    GenIter,
+    NamedTupleIter,
+    TupleIter,
+    async_rows,
+)
 
 _logger: Logger = egp_logger(name=__name__)
 
@@ -89,18 +97,21 @@ class TestNamedTupleIter(TestCase):
     """Test the NamedTupleIter class."""
 
     def test_single_column_iteration(self) -> None:
-        """Iterate over rows returning namedtuples with one column.
-
-        Note: NamedTupleIter passes a generator as a single positional arg,
-        so it only works correctly with single-column results.
-        """
+        """Iterate over rows returning namedtuples with one column."""
         columns = ("x",)
         values = iter([(10,), (20,)])
         table = _MockTable({"x": {"decode": None}})
         it = NamedTupleIter(columns, values, table)
-        result = next(it)
-        # The single field receives the generator; consume it
-        self.assertIsNotNone(result)
+        self.assertEqual([row.x for row in it], [10, 20])
+
+    def test_multi_column_iteration(self) -> None:
+        """Iterate over rows returning namedtuples with decoded columns."""
+        columns = ("x", "y")
+        values = iter([(10, "a"), (20, "b")])
+        table = _MockTable({"x": {"decode": lambda v: v + 1}, "y": {"decode": None}})
+        it = NamedTupleIter(columns, values, table)
+        self.assertEqual([tuple(row) for row in it], [(11, "a"), (21, "b")])
+        self.assertEqual(next(NamedTupleIter(columns, iter([(1, "c")]), table)).y, "c")
 
 
 class TestGenIter(TestCase):
@@ -156,3 +167,29 @@ class TestBaseIter(TestCase):
         it = TupleIter(columns, values, table, code="encode")
         results = list(it)
         self.assertEqual(results, [(50,)])
+
+
+class TestAsyncRows(TestCase):
+    """Test the async_rows() asynchronous generator."""
+
+    def test_async_values(self) -> None:
+        """Rows from an asynchronous iterable are decoded into the iterator type containers."""
+
+        async def values():
+            for row in ((1, "a"), (2, "b")):
+                yield row
+
+        async def collect() -> list:
+            return [row async for row in async_rows(DictIter, ("x", "y"), values(), table)]
+
+        table = _MockTable({"x": {"decode": lambda v: v * 2}, "y": {"decode": None}})
+        self.assertEqual(run(collect()), [{"x": 2, "y": "a"}, {"x": 4, "y": "b"}])
+
+    def test_sync_values(self) -> None:
+        """Rows from a (synchronous) iterable e.g. a cursor of fetched rows are decoded."""
+
+        async def collect() -> list:
+            return [row async for row in async_rows(NamedTupleIter, ("x",), [(1,), (2,)], table)]
+
+        table = _MockTable({"x": {"decode": None}})
+        self.assertEqual([row.x for row in run(collect())], [1, 2])
@@ -0,0 +1,78 @@
+"""Unit tests for the GenePoolInterface known signatures lookups.
+
+The GPI is created without a database: the local cache is a dict and the Gene Pool
+database table store is a mock so the tests can check when the database is queried.
+"""
+
+import unittest
+from hashlib import sha256
+from unittest.mock import MagicMock
+
+from egpcommon.bloom_filter import BloomFilter
+from egppy.gene_pool.gene_pool_interface import (
+    KNOWN_FP_RATE,
+    KNOWN_MIN_CAPACITY,
+    GenePoolInterface,
+)
+
+
+def signature(n: int) -> bytes:
+    """Return a SHA256 signature for n."""
+    return sha256(n.to_bytes(8)).digest()
+
+
+# Signatures in the local cache, in the database (only) & not in the Gene Pool
+CACHED: bytes = signature(0)
+STORED: bytes = signature(1)
+ABSENT: bytes = signature(2)
+
+
+def _gpi(single_writer: bool) -> tuple[GenePoolInterface, MagicMock]:
+    """Return a GPI with CACHED in the local cache & STORED in the (mock) database.
+    The mock database table store is also returned.
+    """
+    gpi = GenePoolInterface.__new__(GenePoolInterface)
+    gpi._ggc_cache = {CACHED: MagicMock()}  # type: ignore  # pylint: disable=protected-access
+    local_dbt = MagicMock()
+    local_dbt.__contains__.side_effect = lambda sig: sig == STORED
+    gpi._local_dbt = local_dbt  # pylint: disable=protected-access
+    gpi._known = None  # pylint: disable=protected-access
+    if single_writer:
+        known = BloomFilter("Known signatures", KNOWN_MIN_CAPACITY, KNOWN_FP_RATE)
+        known.update((CACHED, STORED))
+        gpi._known = known  # pylint: disable=protected-access
+    return gpi, local_dbt
+
+
+class TestGenePoolInterfaceContains(unittest.TestCase):
+    """Test GenePoolInterface.__contains__ with & without the known signatures filter."""
+
+    def test_unfiltered(self) -> None:
+        """Without a filter only the local cache is checked: the database is not queried."""
+        gpi, local_dbt = _gpi(single_writer=False)
+        self.assertIn(CACHED, gpi)
+        self.assertNotIn(STORED, gpi)
+        self.assertNotIn(ABSENT, gpi)
+        self.assertEqual(local_dbt.__contains__.call_count, 0)
+        self.assertIn("disabled", gpi.bloom_filter_info())
+
+    def test_filtered(self) -> None:
+        """With a filter the database is only queried for signatures that may be in it."""
+        gpi, local_dbt = _gpi(single_writer=True)
+        self.assertIn(CACHED, gpi)
+        self.assertIn(STORED, gpi)
+        self.assertNotIn(ABSENT, gpi)
+        self.assertEqual(local_dbt.__contains__.call_args_list, [((STORED,),)])
+
+    def test_filtered_false_positive(self) -> None:
+        """A filter hit that is not in the database is recorded as a false positive."""
+        gpi, _ = _gpi(single_writer=True)
+        known = gpi._known  # pylint: disable=protected-access
+        assert known is not None
+        known.add(ABSENT)
+        self.assertNotIn(ABSENT, gpi)
+        self.assertEqual(known.false_positives, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+"""Unit tests for the slotted, immutable FrozenGGC.
+
+Tests cover:
+- Construction has the same members as a GGCDict
+- Immutability: mutation attempts raise TypeError
+- Members that are not set are not in the mapping
+- Compatibility with GGCDict (GCABC, equality, pickling & JSON)
+"""
+
+import pickle
+import unittest
+
+from egpcommon.common import EGP_EPOCH, SHAPEDSUNDEW9_UUID
+from egpcommon.properties import BASIC_CODON_PROPERTIES
+from egppy.genetic_code.frozen_ggc import GGC_FIELDS, FrozenGGC
+from egppy.genetic_code.genetic_code import GCABC
+from egppy.genetic_code.ggc_dict import GGCDict
+
+# Minimal valid GGC construction data
+_MINIMAL_GGC = {
+    "cgraph": {"A": [["I", 0, "None"]], "O": [["A", 0, "None"]]},
+    "code_depth": 1,
+    "generation": 0,
+    "num_codes": 1,
+    "num_codons": 1,
+    "properties": BASIC_CODON_PROPERTIES,
+    "creator": SHAPEDSUNDEW9_UUID,
+    "created": EGP_EPOCH,
+    "ancestora": None,
+    "ancestorb": None,
+    "gca": None,
+    "gcb": None,
+    "pgc": None,
+}
+
+
+class TestFrozenGGCConstruction(unittest.TestCase):
+    """FrozenGGC construction has the same members as GGCDict construction."""
+
+    def setUp(self) -> None:
+        """Create a GGCDict & a FrozenGGC from the same data."""
+        self.ggc = GGCDict(_MINIMAL_GGC)
+        self.fgc = FrozenGGC(_MINIMAL_GGC)
+
+    def test_same_members(self) -> None:
+        """Every GGCDict member (except EGC reference tracking) is the same."""
+        for key, value in self.ggc.items():
+            if key not in ("uid", "references"):
+                self.assertEqual(self.fgc[key], value, key)
+        self.assertEqual(set(self.fgc), set(self.ggc) - {"uid", "references"})
+        self.assertEqual(len(self.fgc), len(set(self.fgc)))
+
+    def test_from_ggc_dict(self) -> None:
+        """Constructing from a GGCDict reuses the GGCDict members."""
+        fgc = FrozenGGC(self.ggc)
+        self.assertIs(fgc["cgraph"], self.ggc["cgraph"])
+        self.assertIs(fgc["signature"], self.ggc["signature"])
+
+    def test_from_row(self) -> None:
+        """A FrozenGGC is returned as is by from_row()."""
+        self.assertIs(FrozenGGC.from_row(self.fgc), self.fgc)
+        self.assertEqual(FrozenGGC.from_row(dict(_MINIMAL_GGC)), self.fgc)
+
+    def test_fields(self) -> None:
+        """The members are stored in a tuple with a value for every field."""
+        self.assertEqual(len(self.fgc._values), len(GGC_FIELDS))  # pylint: disable=protected-access
+        self.assertFalse(hasattr(self.fgc, "__dict__"))
+        self.fgc.verify()
+        self.fgc.consistency()
+
+
+class TestFrozenGGCImmutability(unittest.TestCase):
+    """FrozenGGC mutation attempts must raise TypeError."""
+
+    def setUp(self) -> None:
+        """Create a FrozenGGC for immutability tests."""
+        self.fgc = FrozenGGC(_MINIMAL_GGC)
+
+    def test_setitem_raises_type_error(self) -> None:
+        """Setting an item must raise TypeError."""
+        with self.assertRaises(TypeError):
+            self.fgc["signature"] = b"\x00" * 32
+
+    def test_delitem_raises_type_error(self) -> None:
+        """Deleting an item must raise TypeError."""
+        with self.assertRaises(TypeError):
+            del self.fgc["signature"]
+
+    def test_set_members_raises_type_error(self) -> None:
+        """Members can only be set once."""
+        with self.assertRaises(TypeError):
+            self.fgc.set_members(_MINIMAL_GGC)
+
+    def test_no_attributes(self) -> None:
+        """Attributes cannot be added."""
+        with self.assertRaises(AttributeError):
+            self.fgc.foo = "bar"  # type: ignore # pylint: disable=attribute-defined-outside-init
+
+
+class TestFrozenGGCMapping(unittest.TestCase):
+    """FrozenGGC is a drop-in replacement for an immutable GGCDict."""
+
+    def setUp(self) -> None:
+        """Create a FrozenGGC for mapping tests."""
+        self.fgc = FrozenGGC(_MINIMAL_GGC)
+
+    def test_unset_member(self) -> None:
+        """A member that is not set (no meta data) is not in the mapping."""
+        self.assertNotIn("io_map", self.fgc)
+        self.assertIsNone(self.fgc.get("io_map"))
+        with self.assertRaises(KeyError):
+            _ = self.fgc["io_map"]
+
+    def test_unknown_member(self) -> None:
+        """A key that is not a GGC member is not in the mapping."""
+        self.assertNotIn("foo", self.fgc)
+        self.assertEqual(self.fgc.get("foo", 1), 1)
+        with self.assertRaises(KeyError):
+            _ = self.fgc["foo"]
+
+    def test_ggc_dict(self) -> None:
+        """FrozenGGC is a GCABC (not a GGCDict) and equal to the GGCDict with the same signature."""
+        ggc = GGCDict(_MINIMAL_GGC)
+        self.assertIsInstance(self.fgc, GCABC)
+        self.assertNotIsInstance(self.fgc, GGCDict)
+        self.assertEqual(self.fgc, ggc)
+        self.assertEqual(ggc, self.fgc)
+        self.assertEqual(hash(self.fgc), hash(ggc))
+        self.assertTrue(self.fgc.is_codon())
+
+    def test_json(self) -> None:
+        """A FrozenGGC can be recreated from its JSON representation."""
+        self.assertEqual(FrozenGGC(self.fgc.to_json()), self.fgc)
+
+    def test_pickle(self) -> None:
+        """A FrozenGGC survives a pickle round trip including unset members."""
+        fgc = pickle.loads(pickle.dumps(self.fgc))
+        self.assertEqual(fgc["signature"], self.fgc["signature"])
+        self.assertEqual(set(fgc), set(self.fgc))
+        self.assertNotIn("io_map", fgc)
+
+
+if __name__ == "__main__":
+    unittest.main()
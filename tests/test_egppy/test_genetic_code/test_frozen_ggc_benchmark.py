@@ -0,0 +1,85 @@
+"""Benchmarks comparing the memory & member access latency of GGCDict and FrozenGGC objects.
+
+These test cases measure the memory allocated per GC and the member access rate of a
+Gene Pool Interface local cache sized population of GGCDict and FrozenGGC objects. They are not
+pass/fail performance tests: results are logged for comparison and the test assertions only
+check that a FrozenGGC uses less memory than a GGCDict.
+"""
+
+import tracemalloc
+import unittest
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.genetic_code.frozen_ggc import FrozenGGC
+from egppy.genetic_code.genetic_code import GCABC
+from egppy.genetic_code.ggc_dict import GGCDict
+from tests.test_egppy.test_genetic_code.test_ggc_dict_benchmark import rows
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+KEYS: tuple[str, ...] = ("signature", "cgraph", "gca", "gcb", "properties", "num_codes")
+NUM_ACCESSES: int = 2**4
+
+
+def memory(flavor: Callable[[GCABC], GCABC], ggcs: list[GGCDict]) -> float:
+    """Return the memory allocated per GC to convert the GGCDicts to flavor objects.
+    Members are shared with the GGCDicts so only the object overhead is measured.
+    """
+    tracemalloc.start()
+    start: int = tracemalloc.get_traced_memory()[0]
+    objs: list[GCABC] = [flavor(ggc) for ggc in ggcs]
+    size: int = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size / len(objs)
+
+
+def accesses(ggcs: list[Any]) -> float:
+    """Return the member accesses per second."""
+    start: float = perf_counter()
+    for _ in range(NUM_ACCESSES):
+        for ggc in ggcs:
+            for key in KEYS:
+                _ = ggc[key]
+    return NUM_ACCESSES * len(ggcs) * len(KEYS) / (perf_counter() - start)
+
+
+class TestFrozenGGCBenchmark(unittest.TestCase):
+    """Benchmarks for GGCDict vs. FrozenGGC memory & access latency."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the GGCDict objects."""
+        cls.ggcs: list[GGCDict] = [GGCDict.from_row(row) for row in rows()]
+
+    def test_memory_per_gc(self) -> None:
+        """Compare the memory allocated per GC."""
+        ggc_dict: float = memory(GGCDict, self.ggcs)
+        frozen_ggc: float = memory(FrozenGGC, self.ggcs)
+        _logger.info(
+            "Memory per GC: GGCDict %.0f bytes, FrozenGGC %.0f bytes (x%.1f)",
+            ggc_dict,
+            frozen_ggc,
+            ggc_dict / frozen_ggc,
+        )
+        self.assertLess(frozen_ggc, ggc_dict)
+
+    def test_access_latency(self) -> None:
+        """Compare the member access rate."""
+        ggc_dict: float = accesses(self.ggcs)
+        frozen_ggc: float = accesses([FrozenGGC(ggc) for ggc in self.ggcs])
+        _logger.info(
+            "Member access: GGCDict %.1f ns, FrozenGGC %.1f ns (x%.1f)",
+            1e9 / ggc_dict,
+            1e9 / frozen_ggc,
+            frozen_ggc / ggc_dict,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
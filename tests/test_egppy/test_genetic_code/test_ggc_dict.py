@@ -4,6 +4,7 @@ Tests cover:
 - One-step construction from kwargs and EGCDict builder (T032)
 - Immutability: mutation attempts raise TypeError (T033)
 - No runtime "immutable" key lifecycle (T034)
+- Trusted construction from database rows (from_row)
 
 See specs/001-anti-pattern-fixes/contracts/genetic-code-mutability-contract.md, Contract 4.
 """
@@ -11,6 +12,7 @@ See specs/001-anti-pattern-fixes/contracts/genetic-code-mutability-contract.md,
 import unittest
 
 from egpcommon.common import EGP_EPOCH, SHAPEDSUNDEW9_UUID
+from egpcommon.egp_log import Integrity
 from egpcommon.properties import BASIC_CODON_PROPERTIES
 from egppy.genetic_code.egc_dict import EGCDict
 from egppy.genetic_code.ggc_dict import GGCDict
@@ -81,5 +83,47 @@ class TestGGCDictNoRuntimeFlag(unittest.TestCase):
         self.assertNotIn("immutable", ggc)
 
 
+class TestGGCDictFromRow(unittest.TestCase):
+    """GGCDict trusted construction from database rows."""
+
+    def setUp(self) -> None:
+        """Create a reference GGCDict and a database row for it."""
+        self.ggc = GGCDict(_MINIMAL_GGC)
+        # Database rows have the signature and no time zone on the creation time
+        self.row = dict(_MINIMAL_GGC)
+        self.row["signature"] = self.ggc["signature"]
+        self.row["created"] = EGP_EPOCH.replace(tzinfo=None)
+
+    def check_row(self, ggc: GGCDict) -> None:
+        """Check ggc has the same members as the reference GGCDict."""
+        self.assertIsInstance(ggc, GGCDict)
+        self.assertEqual(set(ggc), set(self.ggc))
+        for key in set(self.ggc) - {"uid"}:
+            self.assertEqual(ggc[key], self.ggc[key], key)
+        self.assertIs(ggc["cgraph"], self.ggc["cgraph"])
+        self.assertIs(ggc["signature"], self.ggc["signature"])
+        with self.assertRaises(TypeError):
+            ggc["foo"] = "bar"
+        ggc.verify()
+
+    def test_from_row(self) -> None:
+        """A GGCDict constructed from a row has the same members as the constructor."""
+        self.check_row(GGCDict.from_row(self.row))
+        self.assertNotIn("signature", _MINIMAL_GGC)
+
+    def test_from_row_verify(self) -> None:
+        """At the VERIFY integrity level the row is constructed with the constructor."""
+        level: int = Integrity.get_level()
+        Integrity.set_level(Integrity.VERIFY)
+        try:
+            self.check_row(GGCDict.from_row(self.row))
+        finally:
+            Integrity.set_level(level)
+
+    def test_from_row_ggc(self) -> None:
+        """A GGCDict is immutable so it is returned as is."""
+        self.assertIs(GGCDict.from_row(self.ggc), self.ggc)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+"""Benchmarks for decoding Gene Pool database rows into GGCDict objects.
+
+These test cases measure the rows per second decoded by the GGCDict constructor and by the
+trusted GGCDict.from_row() construction path. They are not pass/fail performance tests:
+timings are logged for comparison and the test assertions check that both paths construct
+the same GGCDict.
+"""
+
+import unittest
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from egpcommon.common import EGP_EPOCH, SHAPEDSUNDEW9_UUID
+from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.properties import BASIC_CODON_PROPERTIES
+from egppy.genetic_code.ggc_dict import GGCDict
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+NUM_ROWS: int = 2**12
+
+
+def rows() -> list[dict[str, Any]]:
+    """Return NUM_ROWS distinct database rows (as returned by DictIter)."""
+    retval: list[dict[str, Any]] = []
+    for generation in range(NUM_ROWS):
+        row: dict[str, Any] = {
+            "cgraph": {"A": [["I", 0, "None"]], "O": [["A", 0, "None"]]},
+            "code_depth": 1,
+            "generation": generation,
+            "num_codes": 1,
+            "num_codons": 1,
+            "properties": BASIC_CODON_PROPERTIES,
+            "creator": SHAPEDSUNDEW9_UUID,
+            "created": EGP_EPOCH.replace(tzinfo=None),
+            "ancestora": None,
+            "ancestorb": None,
+            "gca": None,
+            "gcb": None,
+            "pgc": None,
+            "inline": f"{generation} + i0",
+        }
+        row["signature"] = GGCDict(row)["signature"]
+        retval.append(row)
+    return retval
+
+
+def run(decode: Callable[[dict[str, Any]], GGCDict], data: list[dict[str, Any]]) -> float:
+    """Decode the rows and return the rows per second."""
+    start: float = perf_counter()
+    for row in data:
+        decode(row)
+    return len(data) / (perf_counter() - start)
+
+
+class TestGGCDictBenchmark(unittest.TestCase):
+    """Benchmarks for decoding database rows into GGCDict objects."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the database rows."""
+        cls.rows: list[dict[str, Any]] = rows()
+
+    def test_same_ggc(self) -> None:
+        """Both construction paths create the same GGCDict."""
+        for row in self.rows[:16]:
+            ggc: GGCDict = GGCDict(row)
+            fast: GGCDict = GGCDict.from_row(row)
+            self.assertEqual(ggc, fast)
+            self.assertEqual(
+                {k: v for k, v in ggc.items() if k != "uid"},
+                {k: v for k, v in fast.items() if k != "uid"},
+            )
+
+    def test_rows_per_second(self) -> None:
+        """Compare the constructor with the trusted construction path."""
+        constructor: float = run(GGCDict, self.rows)
+        from_row: float = run(GGCDict.from_row, self.rows)
+        _logger.info(
+            "GGCDict decode: constructor %.0f rows/s, from_row %.0f rows/s (x%.1f)",
+            constructor,
+            from_row,
+            from_row / constructor,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
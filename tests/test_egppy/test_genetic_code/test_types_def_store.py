@@ -33,14 +33,14 @@ class TestTypesDefStore(unittest.TestCase):
         ancestors1 = types_def_store.ancestors(int_type)
 
         # Check stats after first call
-        hits1 = TypesDefStore._ancestors_cache_hits
-        misses1 = TypesDefStore._ancestors_cache_misses
+        hits1 = TypesDefStore._ancestors_cache_metrics.hits
+        misses1 = TypesDefStore._ancestors_cache_metrics.misses
 
         # Second call - should be a hit
         ancestors2 = types_def_store.ancestors(int_type)
 
-        hits2 = TypesDefStore._ancestors_cache_hits
-        misses2 = TypesDefStore._ancestors_cache_misses
+        hits2 = TypesDefStore._ancestors_cache_metrics.hits
+        misses2 = TypesDefStore._ancestors_cache_metrics.misses
 
         self.assertEqual(ancestors1, ancestors2)
         self.assertEqual(hits2, hits1 + 1)
@@ -55,14 +55,14 @@ class TestTypesDefStore(unittest.TestCase):
         descendants1 = types_def_store.descendants(int_type)
 
         # Check stats after first call
-        hits1 = TypesDefStore._descendants_cache_hits
-        misses1 = TypesDefStore._descendants_cache_misses
+        hits1 = TypesDefStore._descendants_cache_metrics.hits
+        misses1 = TypesDefStore._descendants_cache_metrics.misses
 
         # Second call - should be a hit
         descendants2 = types_def_store.descendants(int_type)
 
-        hits2 = TypesDefStore._descendants_cache_hits
-        misses2 = TypesDefStore._descendants_cache_misses
+        hits2 = TypesDefStore._descendants_cache_metrics.hits
+        misses2 = TypesDefStore._descendants_cache_metrics.misses
 
         self.assertEqual(descendants1, descendants2)
         self.assertEqual(hits2, hits1 + 1)
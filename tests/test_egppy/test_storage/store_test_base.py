@@ -129,6 +129,17 @@ class StoreTestBase(unittest.TestCase):
         value = self.store.get(self.key)
         self.assertEqual(first=self.value, second=value)
 
+    def test_get_many(self) -> None:
+        """
+        Test the get_many method.
+        """
+        if self.running_in_test_base_class():
+            return
+        self.store[self.key1] = self.value1
+        self.store[self.key2] = self.value2
+        items = self.store.get_many((self.key1, self.key2, "missing_key"))
+        self.assertEqual(first=items, second={self.key1: self.value1, self.key2: self.value2})
+
     def test_get_item(self) -> None:
         """
         Test the get_item method.
@@ -211,6 +222,16 @@ class StoreTestBase(unittest.TestCase):
         self.store[self.key] = self.value
         self.assertEqual(first=self.store[self.key], second=self.value)
 
+    def test_set_many(self) -> None:
+        """
+        Test the set_many method.
+        """
+        if self.running_in_test_base_class():
+            return
+        self.store.set_many(((self.key1, self.value1), (self.key2, self.value2)))
+        self.assertEqual(first=self.store[self.key1], second=self.value1)
+        self.assertEqual(first=self.store[self.key2], second=self.value2)
+
     def test_setdefault(self) -> None:
         """
         Test the setdefault method.
@@ -1,8 +1,14 @@
 """Test the UserDictCache class."""
 
+import unittest
+from collections.abc import Hashable, Iterable
+from typing import Any
+
 from egpcommon.egp_log import Logger, egp_logger
 from egppy.storage.cache.cache import DictCache
+from egppy.storage.cache.cache_abc import CacheConfig
 from egppy.storage.cache.cacheable_obj import CacheableDict
+from egppy.storage.store.in_memory_store import InMemoryStore
 from egppy.storage.store.storable_obj_abc import StorableObjABC
 from tests.test_egppy.test_storage.store_test_base import DEFAULT_VALUES
 from tests.test_egppy.test_storage.test_cache.cache_test_base import CacheTestBase
@@ -19,3 +25,122 @@ class TestDictCacheCacheableDict(CacheTestBase):
     value: StorableObjABC = CacheableDict(DEFAULT_VALUES[0])
     value1: StorableObjABC = CacheableDict(DEFAULT_VALUES[1])
     value2: StorableObjABC = CacheableDict(DEFAULT_VALUES[2])
+
+
+class CountingStore(InMemoryStore):
+    """An in memory store that records the size of each get_many() & set_many() batch."""
+
+    def __init__(self, flavor: type[StorableObjABC]) -> None:
+        super().__init__(flavor)
+        self.batches: list[int] = []
+        self.gets: list[int] = []
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, Any]:
+        """Record the number of keys and get the items."""
+        batch = tuple(keys)
+        self.gets.append(len(batch))
+        return super().get_many(batch)
+
+    def set_many(self, items: Iterable[tuple[Hashable, Any]]) -> None:
+        """Record the batch size and set the items."""
+        batch = tuple(items)
+        self.batches.append(len(batch))
+        super().set_many(batch)
+
+
+class TestDictCacheWriteBack(unittest.TestCase):
+    """Test dirty items are written back to the next level in batches."""
+
+    def setUp(self) -> None:
+        """Create a cache with a batch size of 4."""
+        self.next_level = CountingStore(CacheableDict)
+        config: CacheConfig = {
+            "max_items": 32,
+            "purge_count": 10,
+            "next_level": self.next_level,
+            "flavor": CacheableDict,
+            "batch_size": 4,
+        }
+        self.cache = DictCache(config)
+
+    def test_purge(self) -> None:
+        """Test only the dirty purged items are written back in batches."""
+        for key in range(16):
+            self.next_level[key] = CacheableDict({"key": key})
+            self.next_level[key].clean()
+        for key in range(16):
+            if key % 4:
+                self.cache[key] = CacheableDict({"key": -key})
+            else:
+                _ = self.cache[key]
+        self.cache.purge(10)
+        self.assertEqual(self.next_level.batches, [4, 3])
+        self.assertEqual(len(self.cache), 6)
+        for key in range(10):
+            self.assertEqual(self.next_level[key]["key"], -key if key % 4 else key)
+
+    def test_flush(self) -> None:
+        """Test all the dirty items are written back in batches and cleaned."""
+        for key in range(9):
+            self.cache[key] = CacheableDict({"key": key})
+        self.cache.copyback()
+        self.assertEqual(self.next_level.batches, [4, 4, 1])
+        self.assertFalse(any(value.is_dirty() for value in self.cache.values()))
+        self.cache.flush()
+        self.assertEqual(self.next_level.batches, [4, 4, 1])
+        self.assertEqual(len(self.next_level), 9)
+
+    def test_get_many(self) -> None:
+        """Test only the items not in the cache are fetched from the next level in one call."""
+        for key in range(8):
+            self.next_level[key] = CacheableDict({"key": key})
+        _ = self.cache[0]
+        _ = self.cache[1]
+        items = self.cache.get_many((5, 1, 2, 3, 99))
+        self.assertEqual(self.next_level.gets, [4])
+        self.assertEqual(sorted(items), [1, 2, 3, 5])
+        self.assertEqual(items[2]["key"], 2)
+        # The items fetched are cached & the most recently used
+        self.assertEqual(list(self.cache), [0, 1, 5, 2, 3])
+        self.cache.get_many((0, 5))
+        self.assertEqual(self.next_level.gets, [4])
+
+    def test_load(self) -> None:
+        """Test loaded items are cached without replacing cached items."""
+        self.cache[1] = CacheableDict({"key": -1})
+        items = self.cache.load((key, CacheableDict({"key": key})) for key in range(4))
+        self.assertEqual([items[key]["key"] for key in range(4)], [0, -1, 2, 3])
+        self.assertEqual(sorted(self.cache), [0, 1, 2, 3])
+        self.assertEqual(self.next_level.gets, [])
+
+    def test_metrics(self) -> None:
+        """Test the cache hits, misses, evictions, write backs & fetch latency are counted."""
+        for key in range(16):
+            self.next_level[key] = CacheableDict({"key": key})
+            self.next_level[key].clean()
+        _ = self.cache[0]
+        _ = self.cache[0]
+        self.cache.get_many((0, 1, 2))
+        self.cache[3] = CacheableDict({"key": -3})
+        self.cache.purge(2)
+        snapshot = self.cache.metrics.snapshot()
+        self.assertEqual(snapshot["hits"], 2)
+        self.assertEqual(snapshot["misses"], 3)
+        self.assertEqual(snapshot["evictions"], 2)
+        self.assertEqual(snapshot["write_backs"], 0)
+        self.assertEqual(snapshot["fetch_latency"]["count"], 2)
+        self.cache.flush()
+        self.assertEqual(self.cache.metrics.write_backs, 1)
+        self.assertEqual(self.cache.metrics.evictions, 2)
+
+    def test_invalid_batch_size(self) -> None:
+        """Test the batch size must be positive."""
+        config: CacheConfig = {
+            "max_items": 32,
+            "purge_count": 10,
+            "next_level": self.next_level,
+            "flavor": CacheableDict,
+            "batch_size": 0,
+        }
+        with self.assertRaises(ValueError):
+            DictCache(config)
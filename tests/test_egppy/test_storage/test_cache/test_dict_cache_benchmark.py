@@ -0,0 +1,133 @@
+"""Benchmarks for the DictCache.
+
+These test cases measure DictCache throughput under mixed hit/miss workloads. They are not
+pass/fail performance tests: timings are logged for comparison and the test assertions
+check that the LRU eviction purges the same items as the reference (sort based) eviction.
+"""
+
+import unittest
+from collections.abc import Hashable
+from random import randrange, seed
+from time import perf_counter
+from typing import Any
+
+from egpcommon.egp_log import Logger, egp_logger
+from egppy.storage.cache.cache import DictCache
+from egppy.storage.cache.cacheable_obj import CacheableDict
+from egppy.storage.store.in_memory_store import InMemoryStore
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+MAX_ITEMS: int = 2**13
+PURGE_COUNT: int = MAX_ITEMS // 4
+NUM_KEYS: int = 4 * MAX_ITEMS
+NUM_OPS: int = 2**16
+# Percentage of operations on the hot keys (which fit in the cache)
+HIT_RATES: tuple[int, ...] = (50, 80, 95)
+
+
+class SortPurgeDictCache(DictCache):
+    """Reference DictCache that purges by sorting the items by access sequence number.
+    This is how DictCache.purge() worked prior to the LRU ordered dictionary.
+    """
+
+    def purge(self, num: int) -> None:
+        """Purge the cache of the num least recently used items."""
+        if num >= len(self):
+            self.flush()
+            return
+        victims = sorted(((k, v.seq_num()) for k, v in self.data.items()), key=lambda x: x[1])
+        for key, _ in victims[:num]:
+            value = self.data.pop(key)
+            if value.is_dirty():
+                self.next_level[key] = value
+
+
+def workload(hit_rate: int) -> list[tuple[bool, int]]:
+    """Return a list of (write, key) operations. hit_rate % of the operations are on a
+    set of hot keys that fits in the cache, the rest are on any key. 1 in 8 are writes.
+    """
+    hot: int = MAX_ITEMS // 2
+    return [
+        (not randrange(8), randrange(hot) if randrange(100) < hit_rate else randrange(NUM_KEYS))
+        for _ in range(NUM_OPS)
+    ]
+
+
+def run(cache: DictCache, ops: list[tuple[bool, int]], values: list[CacheableDict]) -> float:
+    """Run the operations on the cache and return the operations per second."""
+    start: float = perf_counter()
+    for write, key in ops:
+        if write:
+            cache[key] = values[key]
+        else:
+            _ = cache[key]
+    return len(ops) / (perf_counter() - start)
+
+
+class TestDictCacheBenchmark(unittest.TestCase):
+    """Benchmarks for the DictCache."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the next level values."""
+        cls.values: list[CacheableDict] = [CacheableDict({"key": n}) for n in range(NUM_KEYS)]
+
+    def new_cache(self, cache_type: type[DictCache]) -> DictCache:
+        """Return a new cache of cache_type with a populated next level store."""
+        store: InMemoryStore = InMemoryStore(CacheableDict)
+        store.update(enumerate(self.values))
+        config: dict[str, Any] = {
+            "max_items": MAX_ITEMS,
+            "purge_count": PURGE_COUNT,
+            "next_level": store,
+            "flavor": CacheableDict,
+        }
+        return cache_type(config)  # type: ignore
+
+    def test_mixed_hit_miss(self) -> None:
+        """Compare the sort based purge with the LRU purge for different hit rates."""
+        for hit_rate in HIT_RATES:
+            seed(hit_rate)
+            ops = workload(hit_rate)
+            keys: list[list[Hashable]] = []
+            rates: list[float] = []
+            for cache_type in (SortPurgeDictCache, DictCache):
+                cache = self.new_cache(cache_type)
+                rates.append(run(cache, ops, self.values))
+                keys.append(sorted(cache.data))  # type: ignore
+            self.assertEqual(keys[0], keys[1])
+            _logger.info(
+                "DictCache %d%% hot: sort purge %.0f ops/s, LRU purge %.0f ops/s (x%.1f)",
+                hit_rate,
+                rates[0],
+                rates[1],
+                rates[1] / rates[0],
+            )
+
+    def test_purge(self) -> None:
+        """Time purging a full cache."""
+        for cache_type in (SortPurgeDictCache, DictCache):
+            cache = self.new_cache(cache_type)
+            for key in range(MAX_ITEMS):
+                _ = cache[key]
+            start: float = perf_counter()
+            cache.purge(PURGE_COUNT)
+            duration: float = perf_counter() - start
+            self.assertEqual(len(cache), MAX_ITEMS - PURGE_COUNT)
+            self.assertNotIn(0, cache)
+            self.assertIn(MAX_ITEMS - 1, cache)
+            _logger.info(
+                "%s purge %d of %d items: %.3f ms",
+                cache_type.__name__,
+                PURGE_COUNT,
+                MAX_ITEMS,
+                duration * 1000.0,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Test case for LogFileStore class."""
+
+import unittest
+from hashlib import sha256
+from os.path import getsize, join
+from tempfile import TemporaryDirectory
+
+from egppy.storage.store.log_file_store import LogFileStore
+from egppy.storage.store.storable_obj import StorableDict, StorableList, StorableSet, StorableTuple
+from egppy.storage.store.storable_obj_abc import StorableObjABC
+from tests.test_egppy.test_storage.store_test_base import DEFAULT_VALUES, StoreTestBase
+
+
+def signature(n: int) -> bytes:
+    """Return a 32 byte key for n."""
+    return sha256(n.to_bytes(8)).digest()
+
+
+class TestLogFileStoreStorableDict(StoreTestBase):
+    """Test cases for LogFileStore class with StorableDict."""
+
+    store_type = LogFileStore
+    value_type = StorableDict
+    value: StorableObjABC = StorableDict(DEFAULT_VALUES[0])
+    value1: StorableObjABC = StorableDict(DEFAULT_VALUES[1])
+    value2: StorableObjABC = StorableDict(DEFAULT_VALUES[2])
+
+
+class TestLogFileStoreStorableList(StoreTestBase):
+    """Test cases for LogFileStore class with StorableList."""
+
+    store_type = LogFileStore
+    value_type = StorableList
+    value: StorableObjABC = StorableList(DEFAULT_VALUES[0])
+    value1: StorableObjABC = StorableList(DEFAULT_VALUES[1])
+    value2: StorableObjABC = StorableList(DEFAULT_VALUES[2])
+
+
+class TestLogFileStoreStorableSet(StoreTestBase):
+    """Test cases for LogFileStore class with StorableSet."""
+
+    store_type = LogFileStore
+    value_type = StorableSet
+    value: StorableObjABC = StorableSet(DEFAULT_VALUES[0])
+    value1: StorableObjABC = StorableSet(DEFAULT_VALUES[1])
+    value2: StorableObjABC = StorableSet(DEFAULT_VALUES[2])
+
+
+class TestLogFileStoreStorableTuple(StoreTestBase):
+    """Test cases for LogFileStore class with StorableTuple."""
+
+    store_type = LogFileStore
+    value_type = StorableTuple
+    value: StorableObjABC = StorableTuple(DEFAULT_VALUES[0])
+    value1: StorableObjABC = StorableTuple(DEFAULT_VALUES[1])
+    value2: StorableObjABC = StorableTuple(DEFAULT_VALUES[2])
+
+
+class TestLogFileStoreBytesKey(StoreTestBase):
+    """Test cases for LogFileStore class with bytes (signature) keys."""
+
+    store_type = LogFileStore
+    value_type = StorableDict
+    value: StorableObjABC = StorableDict(DEFAULT_VALUES[0])
+    value1: StorableObjABC = StorableDict(DEFAULT_VALUES[1])
+    value2: StorableObjABC = StorableDict(DEFAULT_VALUES[2])
+    key = signature(0)
+    key1 = signature(1)
+    key2 = signature(2)
+
+
+class TestLogFileStorePersistence(unittest.TestCase):
+    """Test cases for reopening, tombstones & compaction of a LogFileStore log."""
+
+    def setUp(self) -> None:
+        """Create a log file in a temporary directory."""
+        self.tmpdir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.file_path: str = join(self.tmpdir.name, "store.log")
+        self.store = LogFileStore(StorableDict, self.file_path, compact_size=2**10)
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.store.close()
+        self.tmpdir.cleanup()
+
+    def test_reopen(self) -> None:
+        """Test the index is rebuilt from the log including overwrites & tombstones."""
+        self.store.set_many((signature(n), StorableDict({"n": n})) for n in range(4))
+        self.store[signature(1)] = StorableDict({"n": -1})
+        del self.store[signature(2)]
+        self.store.close()
+        store = LogFileStore(StorableDict, self.file_path)
+        self.assertEqual(set(store), {signature(0), signature(1), signature(3)})
+        self.assertEqual(store[signature(1)], StorableDict({"n": -1}))
+        self.assertEqual(store.dead_size, self.store.dead_size)
+        store.verify()
+        store.close()
+
+    def test_truncated_record(self) -> None:
+        """Test a partially written record at the end of the log is discarded."""
+        self.store.set_many((signature(n), StorableDict({"n": n})) for n in range(2))
+        self.store.close()
+        size: int = getsize(self.file_path)
+        with open(self.file_path, "ab") as file:
+            file.write(b"\x00\x00\x20\x00")
+        store = LogFileStore(StorableDict, self.file_path)
+        self.assertEqual(len(store), 2)
+        self.assertEqual(getsize(self.file_path), size)
+        store.close()
+
+    def test_compact(self) -> None:
+        """Test overwriting items compacts the log when the dead space is large enough."""
+        for n in range(64):
+            self.store[signature(n % 4)] = StorableDict({"n": n})
+        self.assertGreater(self.store.compactions, 0)
+        self.assertLess(self.store.file_size, 2 * self.store.compact_size)
+        self.assertEqual(self.store.file_size, getsize(self.file_path))
+        self.assertEqual(self.store[signature(3)], StorableDict({"n": 63}))
+        self.store.compact()
+        self.assertEqual(self.store.dead_size, 0)
+        self.assertEqual(len(self.store), 4)
+        self.store.verify()
+        self.store.close()
+        store = LogFileStore(StorableDict, self.file_path)
+        self.assertEqual(
+            store.get_many((signature(0), signature(5))), {signature(0): StorableDict({"n": 60})}
+        )
+        store.close()
+
+    def test_invalid_file(self) -> None:
+        """Test a file that is not a log file store is rejected."""
+        with open(join(self.tmpdir.name, "bad.log"), "wb") as file:
+            file.write(b"Not a log file store\n")
+        with self.assertRaises(ValueError):
+            LogFileStore(StorableDict, join(self.tmpdir.name, "bad.log"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Test case for the SharedMemoryStore class."""
+
+import unittest
+from hashlib import sha256
+from multiprocessing import get_context
+from typing import Any
+
+from egppy.storage.store.in_memory_store import InMemoryStore
+from egppy.storage.store.shared_memory_store import SharedMemoryStore
+from egppy.storage.store.storable_obj import StorableDict
+
+
+def key(n: int) -> bytes:
+    """Return a 32 byte key for n."""
+    return sha256(n.to_bytes(8)).digest()
+
+
+class RowDict(StorableDict):
+    """A storable dictionary with a trusted row constructor."""
+
+    rows: int = 0
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "RowDict":
+        """Count the rows constructed."""
+        cls.rows += 1
+        return cls(row)
+
+
+def child(store: SharedMemoryStore) -> None:
+    """Forked process: Read the parent's item & write a new one."""
+    assert store[key(0)] == StorableDict({"n": 0})
+    store[key(1)] = StorableDict({"n": 1})
+
+
+class TestSharedMemoryStore(unittest.TestCase):
+    """Test cases for the SharedMemoryStore class."""
+
+    def setUp(self) -> None:
+        """Create a shared memory store in front of an in memory store."""
+        self.next_level = InMemoryStore(StorableDict)
+        self.store = SharedMemoryStore(
+            StorableDict, capacity=8, next_level=self.next_level, ways=2, value_size=64
+        )
+
+    def tearDown(self) -> None:
+        """Destroy the shared memory."""
+        self.store.close()
+
+    def test_read_through(self) -> None:
+        """Test misses are fetched from the next level & then hit."""
+        self.next_level[key(0)] = StorableDict({"n": 0})
+        self.assertEqual(self.store[key(0)], StorableDict({"n": 0}))
+        self.assertEqual((self.store.metrics.hits, self.store.metrics.misses), (0, 1))
+        del self.next_level[key(0)]
+        self.assertEqual(self.store[key(0)], StorableDict({"n": 0}))
+        self.assertEqual((self.store.metrics.hits, self.store.metrics.misses), (1, 1))
+        with self.assertRaises(KeyError):
+            _ = self.store[key(1)]
+
+    def test_write_through(self) -> None:
+        """Test items set are written to the next level."""
+        self.store.set_many((key(n), StorableDict({"n": n})) for n in range(3))
+        self.store[key(3)] = StorableDict({"n": 3})
+        self.assertEqual(len(self.next_level), 4)
+        self.assertEqual(len(self.store), 4)
+        self.assertEqual(set(self.store), {key(n) for n in range(4)})
+        del self.store[key(3)]
+        self.assertNotIn(key(3), self.store)
+        self.assertNotIn(key(3), self.next_level)
+
+    def test_get_many(self) -> None:
+        """Test misses are fetched from the next level together."""
+        self.store[key(0)] = StorableDict({"n": 0})
+        self.next_level[key(1)] = StorableDict({"n": 1})
+        items = self.store.get_many((key(0), key(1), key(2)))
+        self.assertEqual(items, {key(0): StorableDict({"n": 0}), key(1): StorableDict({"n": 1})})
+        self.assertEqual((self.store.metrics.hits, self.store.metrics.misses), (1, 2))
+
+    def test_eviction(self) -> None:
+        """Test the store is bounded & oversize values are not stored."""
+        for n in range(32):
+            self.store[key(n)] = StorableDict({"n": n})
+        self.assertLessEqual(len(self.store), 8)
+        self.assertGreater(self.store.metrics.evictions, 0)
+        self.store[key(99)] = StorableDict({"n": "x" * 64})
+        self.assertEqual(self.store.metrics.rejections, 1)
+        self.assertEqual(len(self.next_level), 33)
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.store.verify()
+
+    def test_read_through_lock_busy(self) -> None:
+        """Test misses are not stored while another process holds the lock."""
+        self.next_level[key(0)] = StorableDict({"n": 0})
+        with self.store._lock:  # pylint: disable=protected-access
+            self.assertEqual(self.store[key(0)], StorableDict({"n": 0}))
+            self.assertEqual(self.store.get_many((key(0),)), {key(0): StorableDict({"n": 0})})
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.store[key(0)], StorableDict({"n": 0}))
+        self.assertEqual(len(self.store), 1)
+
+    def test_from_row(self) -> None:
+        """Test hits are constructed with the flavor from_row() if it has one."""
+        store = SharedMemoryStore(RowDict, capacity=8, ways=2, value_size=64)
+        try:
+            store[key(0)] = RowDict({"n": 0})
+            RowDict.rows = 0
+            self.assertEqual(store[key(0)], RowDict({"n": 0}))
+            self.assertEqual(store.get_many((key(0),)), {key(0): RowDict({"n": 0})})
+            self.assertEqual(RowDict.rows, 2)
+        finally:
+            store.close()
+
+    def test_forked_process(self) -> None:
+        """Test items are shared with a forked process."""
+        self.store[key(0)] = StorableDict({"n": 0})
+        process = get_context("fork").Process(target=child, args=(self.store,))
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+        # The next level is not shared: the item is from the shared memory
+        self.assertNotIn(key(1), self.next_level)
+        self.assertEqual(self.store[key(1)], StorableDict({"n": 1}))
+        self.assertEqual(self.store.metrics.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
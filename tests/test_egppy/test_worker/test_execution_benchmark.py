@@ -0,0 +1,253 @@
+"""Benchmarks for the ExecutionContext.
+
+These test cases measure the performance of execution context operations on the
+XOR stack GC's. They are not pass/fail performance tests: timings are logged for
+comparison and the test assertions check that the optimised paths produce the same
+results as the reference paths.
+"""
+
+import unittest
+from functools import partial
+from random import getrandbits, seed
+from time import perf_counter
+from typing import Any
+
+from egpcommon.common import ACYBERGENESIS_PROBLEM
+from egpcommon.egp_log import Logger, egp_logger
+from egpcommon.properties import CGraphType, GCType
+from egppy.genetic_code.ggc_dict import GCABC
+from egppy.worker.executor.execution_context import ExecutionContext
+from egppy.worker.executor.fw_config import FWConfig
+from egppy.worker.executor.gc_node import GCNode
+
+from .xor_stack_gc import (
+    CODON_SIGS,
+    INT_T,
+    create_gc_matrix,
+    expand_gc_matrix,
+    gpi,
+    inherit_members,
+)
+
+# Standard EGP logging pattern
+_logger: Logger = egp_logger(name=__name__)
+
+
+# Constants
+NUM_CALLS: int = 100000
+BATCH_SIZE: int = 1000
+LINE_LIMIT: int = 64
+# Large enough that each benchmarked GC is written as a single function
+SINGLE_FUNCTION_LINE_LIMIT: int = 2**15 - 1
+NUM_REPORT_GCS: int = 8
+# Function writing benchmark
+NUM_WRITES: int = 20
+WRITE_LINE_LIMITS: tuple[int, ...] = (64, 1024)
+
+
+def exec_str_execute(ec: ExecutionContext, signature: bytes, args: tuple[Any, ...]) -> Any:
+    """Reference execution path: compile & execute a call string for every call.
+    This is how ExecutionContext.execute() worked prior to the direct call fast path.
+    """
+    lns: dict[str, Any] = {"i": args}
+    exec(  # pylint: disable=exec-used
+        f"result = {ec.function_map[signature].name()}({'i' if args else ''})", ec.namespace, lns
+    )
+    return lns["result"]
+
+
+def if_then_else_gc(gca: GCABC, gcb: GCABC) -> GCABC:
+    """Return an IF_THEN_ELSE GC with gca as the "then" branch and gcb as the "else" branch.
+    The condition is the last input.
+    """
+    num_inputs: int = max(gca["num_inputs"], gcb["num_inputs"])
+    return inherit_members(
+        {
+            "ancestora": gca,
+            "ancestorb": gcb,
+            "gca": gca,
+            "gcb": gcb,
+            "cgraph": {
+                "F": [["I", num_inputs, "bool"]],
+                "A": [["I", i, INT_T] for i in range(gca["num_inputs"])],
+                "B": [["I", i, INT_T] for i in range(gcb["num_inputs"])],
+                "O": [["A", i, INT_T] for i in range(gca["num_outputs"])],
+                "P": [["B", i, INT_T] for i in range(gcb["num_outputs"])],
+            },
+            "pgc": gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+            "problem": ACYBERGENESIS_PROBLEM,
+            "properties": {"gc_type": GCType.ORDINARY, "graph_type": CGraphType.IF_THEN_ELSE},
+            "num_codons": gca["num_codons"] + gcb["num_codons"],
+        },
+        True,
+    )
+
+
+def for_loop_gc(body: GCABC) -> GCABC:
+    """Return a FOR_LOOP GC that folds the 2 input, 1 output body GC over an iterable.
+    Inputs are the iterable and the initial state.
+    """
+    return inherit_members(
+        {
+            "ancestora": body,
+            "ancestorb": None,
+            "gca": body,
+            "gcb": None,
+            "cgraph": {
+                "L": [["I", 0, "tuple"]],
+                "S": [["I", 1, INT_T]],
+                "A": [["S", 0, INT_T], ["L", 0, INT_T]],
+                "T": [["A", 0, INT_T]],
+                "O": [["A", 0, INT_T]],
+            },
+            "pgc": gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+            "problem": ACYBERGENESIS_PROBLEM,
+            "properties": {"gc_type": GCType.ORDINARY, "graph_type": CGraphType.FOR_LOOP},
+            "num_codons": body["num_codons"],
+        },
+        True,
+    )
+
+
+def calls_per_second(func, signature: bytes, args: tuple[Any, ...], num: int) -> float:
+    """Return the number of calls per second of func(signature, args) over num calls."""
+    start = perf_counter()
+    for _ in range(num):
+        func(signature, args)
+    return num / (perf_counter() - start)
+
+
+class TestExecutionBenchmark(unittest.TestCase):
+    """Benchmarks for the execution context."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the XOR stack GC's & choose the one with the most codons."""
+        seed(0)
+        gcm: dict[int, dict[int, list[GCABC]]] = expand_gc_matrix(create_gc_matrix(4), 4)
+        gene_pool: list[GCABC] = [gc for ni in gcm.values() for rs in ni.values() for gc in rs]
+        cls.gcm: dict[int, dict[int, list[GCABC]]] = gcm
+        gene_pool.sort(key=lambda gc: gc["num_codons"], reverse=True)
+        cls.gc: GCABC = gene_pool[0]
+        cls.report_gcs: list[GCABC] = gene_pool[:NUM_REPORT_GCS]
+
+    def test_execute_calls_per_second(self) -> None:
+        """Compare the exec() string call path with the direct call fast path."""
+        ec = ExecutionContext(gpi, LINE_LIMIT)
+        sig: bytes = self.gc["signature"]
+        ec.write_executable(self.gc)
+        args = tuple(getrandbits(64) for _ in range(self.gc["num_inputs"]))
+        self.assertEqual(exec_str_execute(ec, sig, args), ec.execute(sig, args))
+
+        before = calls_per_second(partial(exec_str_execute, ec), sig, args, NUM_CALLS)
+        after = calls_per_second(ec.execute, sig, args, NUM_CALLS)
+        _logger.info(
+            "Execute %s (%d codons): exec() %.0f calls/s, direct %.0f calls/s (x%.1f)",
+            sig.hex()[-8:],
+            self.gc["num_codons"],
+            before,
+            after,
+            after / before,
+        )
+        self.assertGreater(after, 0.0)
+
+    def test_execute_batch_calls_per_second(self) -> None:
+        """Compare per input tuple execute() calls with the batch variant of the function."""
+        ec = ExecutionContext(gpi, LINE_LIMIT)
+        sig: bytes = self.gc["signature"]
+        batch = [
+            tuple(getrandbits(64) for _ in range(self.gc["num_inputs"])) for _ in range(BATCH_SIZE)
+        ]
+        seed(1)
+        expected = [ec.execute(sig, args) for args in batch]
+        seed(1)
+        self.assertEqual(ec.execute_batch(sig, batch), expected)
+
+        num_batches: int = max(1, NUM_CALLS // BATCH_SIZE)
+        start = perf_counter()
+        for _ in range(num_batches):
+            for args in batch:
+                ec.execute(sig, args)
+        before = num_batches * BATCH_SIZE / (perf_counter() - start)
+        start = perf_counter()
+        for _ in range(num_batches):
+            ec.execute_batch(sig, batch)
+        after = num_batches * BATCH_SIZE / (perf_counter() - start)
+        _logger.info(
+            "Execute %s (%d codons): execute() %.0f evals/s, execute_batch() %.0f evals/s (x%.1f)",
+            sig.hex()[-8:],
+            self.gc["num_codons"],
+            before,
+            after,
+            after / before,
+        )
+        self.assertGreater(after, 0.0)
+
+    def test_cse_lines_and_calls_per_second(self) -> None:
+        """Report the function lines & execution rate with and without CSE for each GC."""
+        for gc in self.report_gcs:
+            sig: bytes = gc["signature"]
+            args = tuple(getrandbits(64) for _ in range(gc["num_inputs"]))
+            results: list[tuple[int, float, Any]] = []
+            for fwconfig in (FWConfig(cse=False), FWConfig(cse=True)):
+                ec = ExecutionContext(gpi, SINGLE_FUNCTION_LINE_LIMIT, fwconfig)
+                node = ec.write_executable(gc)
+                assert isinstance(node, GCNode), "node is not a GCNode"
+                num_lines = ec.function_def(node, fwconfig).count("\n")
+                rate = calls_per_second(ec.execute, sig, args, NUM_CALLS)
+                seed(2)
+                results.append((num_lines, rate, ec.execute(sig, args)))
+            (before_lines, before, expected), (after_lines, after, result) = results
+            self.assertEqual(result, expected)
+            _logger.info(
+                "CSE %s (%d codons): %d -> %d lines, %.0f -> %.0f calls/s (x%.1f)",
+                sig.hex()[-8:],
+                gc["num_codons"],
+                before_lines,
+                after_lines,
+                before,
+                after,
+                after / before,
+            )
+            self.assertLessEqual(after_lines, before_lines)
+
+    def test_write_conditional_and_loop(self) -> None:
+        """Time writing deep IF_THEN_ELSE & FOR_LOOP GC's at different line limits."""
+        branches = sorted(self.gcm[3][3], key=lambda gc: gc["num_codons"], reverse=True)
+        body = max(self.gcm[2][1], key=lambda gc: gc["num_codons"])
+        gcs: dict[str, GCABC] = {
+            "IF_THEN_ELSE": if_then_else_gc(branches[0], branches[1]),
+            "FOR_LOOP": for_loop_gc(body),
+        }
+        for name, gc in gcs.items():
+            for line_limit in WRITE_LINE_LIMITS:
+                start = perf_counter()
+                for _ in range(NUM_WRITES):
+                    ExecutionContext(gpi, line_limit).write_executable(gc)
+                duration = (perf_counter() - start) / NUM_WRITES
+                _logger.info(
+                    "Write %s (%d codons) line limit %d: %.2f ms",
+                    name,
+                    gc["num_codons"],
+                    line_limit,
+                    duration * 1000.0,
+                )
+                self.assertGreater(duration, 0.0)
+
+        # Sanity check the written functions
+        ec = ExecutionContext(gpi, WRITE_LINE_LIMITS[-1])
+        args = (1, 2, 3)
+        seed(4)
+        expected = ec.execute(branches[0], args)
+        seed(4)
+        self.assertEqual(ec.execute(gcs["IF_THEN_ELSE"], args + (True,)), expected)
+        seed(5)
+        state = 0
+        for item in args:
+            state = ec.execute(body, (state, item))
+        seed(5)
+        self.assertEqual(ec.execute(gcs["FOR_LOOP"], (args, 0)), state)
+
+
+if __name__ == "__main__":
+    unittest.main()
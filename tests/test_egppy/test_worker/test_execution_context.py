@@ -2,10 +2,13 @@
 
 import unittest
 from random import choice, getrandbits, randint, seed
+from re import findall
+from tempfile import TemporaryDirectory
 
 from egpcommon.common import ACYBERGENESIS_PROBLEM, random_int_tuple_generator
 from egpcommon.egp_log import Logger, egp_logger
-from egpcommon.properties import CGraphType, GCType
+from egpcommon.properties import BASIC_ORDINARY_PROPERTIES, CGraphType, GCType
+from egppy.genetic_code.c_graph_constants import DstIfKey, SrcIfKey
 from egppy.genetic_code.ggc_dict import GCABC
 from egppy.worker.executor.context_writer import (
     FWC4FILE,
@@ -14,6 +17,8 @@ from egppy.worker.executor.context_writer import (
     write_function_to_file,
 )
 from egppy.worker.executor.execution_context import ExecutionContext, FunctionInfo
+from egppy.worker.executor.function_cache import FunctionCache
+from egppy.worker.executor.fw_config import FWConfig
 from egppy.worker.executor.gc_node import GCNode
 
 from .xor_stack_gc import (
@@ -62,6 +67,73 @@ class TestExecutor(unittest.TestCase):
             gc for ni in cls.gcm.values() for rs in ni.values() for gc in rs
         ]
 
+    def test_connection_indexes(self) -> None:
+        """Test the connections are bucketed by destination and source node."""
+        node = self.ec2.write_executable(primitive_gcs["one_to_two"])
+        assert isinstance(node, GCNode), "node is not a GCNode"
+        rtc = node.terminal_connections
+        self.assertEqual(sum(len(conns) for conns in node.incoming.values()), len(rtc))
+        self.assertEqual(sum(len(conns) for conns in node.outgoing.values()), len(rtc))
+        for connection in rtc:
+            self.assertIn(connection, node.incoming[connection.dst.node])
+            self.assertIn(connection, node.outgoing[connection.src.node])
+
+    def _rshift_literal_gc(self) -> GCABC:
+        """Create a GC that right shifts the literal 1 codon by itself."""
+        rshift_gc = self.gpi[CODON_SIGS["RSHIFT_SIG"]]
+        literal_1_gc = self.gpi[CODON_SIGS["LITERAL_1_SIG"]]
+        return inherit_members(
+            {
+                "ancestora": literal_1_gc,
+                "ancestorb": rshift_gc,
+                "created": "2025-03-29 22:05:08.489847+00:00",
+                "gca": literal_1_gc,
+                "gcb": rshift_gc,
+                "cgraph": {
+                    "A": [],
+                    "B": [
+                        ["A", 0, rshift_gc["cgraph"][SrcIfKey.IS][0].typ.name],
+                        ["A", 0, rshift_gc["cgraph"][SrcIfKey.IS][1].typ.name],
+                    ],
+                    "O": [["B", 0, rshift_gc["cgraph"][DstIfKey.OD][0].typ.name]],
+                },
+                "pgc": self.gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+                "problem": ACYBERGENESIS_PROBLEM,
+                "properties": BASIC_ORDINARY_PROPERTIES,
+            }
+        )
+
+    def test_constant_evaluation(self) -> None:
+        """Test a pure codon with literal codon inputs is not folded by default."""
+        gc = self._rshift_literal_gc()
+        ec = ExecutionContext(self.gpi, NUM_LINES[-1])
+        node = ec.write_executable(gc)
+        assert isinstance(node, GCNode), "node is not a GCNode"
+        fdef = ec.function_def(node)
+        self.assertNotEqual(fdef, "def f_0():\n\to0 = 0\n\treturn o0")
+        self.assertIn(">>", fdef)
+        self.assertEqual(ec.execute(gc, tuple()), 0)
+
+    def test_constant_evaluation_folded(self) -> None:
+        """Test a pure codon with literal codon inputs is folded to a literal when enabled."""
+        gc = self._rshift_literal_gc()
+        fwconfig = FWConfig(const_eval=True)
+        ec = ExecutionContext(self.gpi, NUM_LINES[-1], fwconfig)
+        node = ec.write_executable(gc)
+        assert isinstance(node, GCNode), "node is not a GCNode"
+        self.assertEqual(ec.function_def(node, fwconfig), "def f_0():\n\to0 = 0\n\treturn o0")
+        self.assertEqual(ec.execute(gc, tuple()), 0)
+
+    def test_constant_evaluation_partial(self) -> None:
+        """Test a pure codon with a GC input is not folded when constant evaluation is enabled."""
+        gc = primitive_gcs["rshift_1"]
+        fwconfig = FWConfig(const_eval=True)
+        ec = ExecutionContext(self.gpi, NUM_LINES[-1], fwconfig)
+        node = ec.write_executable(gc)
+        assert isinstance(node, GCNode), "node is not a GCNode"
+        self.assertIn(">>", ec.function_def(node, fwconfig))
+        self.assertEqual(ec.execute(gc, (6,)), 3)
+
     def test_execute_advanced_matrix(self) -> None:
         """This is a complex test that uses the XOR stack
         to generate multiple different execution contexts
@@ -123,6 +195,123 @@ class TestExecutor(unittest.TestCase):
         self.assertIsInstance(r2, tuple)
         self.assertEqual(r1, r2)
 
+    def test_execute_batch(self) -> None:
+        """Test the batch variant of functions produce the same results as execute()."""
+        seed(2)
+        for gci in random_int_tuple_generator(20, len(self.gene_pool)):
+            gc: GCABC = self.gene_pool[gci]
+            batch = [tuple(getrandbits(64) for _ in range(gc["num_inputs"])) for _ in range(8)]
+            for ec in (self.ec1, self.ec2):
+                seed(gci)
+                expected = [ec.execute(gc["signature"], args) for args in batch]
+                seed(gci)
+                self.assertEqual(ec.execute_batch(gc["signature"], batch), expected)
+
+    def test_execute_batch_codon(self) -> None:
+        """Test the batch variant of a codon with no inputs."""
+        results = self.ec1.execute_batch(CODON_SIGS["SIXTYFOUR_SIG"], [tuple()] * 3, True)
+        self.assertEqual(results.tolist(), [64, 64, 64])
+
+    def test_execute_cse(self) -> None:
+        """Test a duplicated pure subexpression is evaluated once into one shared temporary."""
+        xor_gc = self.gpi[CODON_SIGS["XOR_SIG"]]
+        xor_i = [ep.typ.name for ep in xor_gc["cgraph"][SrcIfKey.IS]]
+        xor_o = xor_gc["cgraph"][DstIfKey.OD][0].typ.name
+        # Two identical XOR codons of the same inputs...
+        dup_gc = inherit_members(
+            {
+                "ancestora": xor_gc,
+                "ancestorb": xor_gc,
+                "created": "2025-03-29 22:05:08.489847+00:00",
+                "gca": xor_gc,
+                "gcb": xor_gc,
+                "cgraph": {
+                    "A": [["I", 0, xor_i[0]], ["I", 1, xor_i[1]]],
+                    "B": [["I", 0, xor_i[0]], ["I", 1, xor_i[1]]],
+                    "O": [["A", 0, xor_o], ["B", 0, xor_o]],
+                },
+                "pgc": self.gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+                "problem": ACYBERGENESIS_PROBLEM,
+                "properties": BASIC_ORDINARY_PROPERTIES,
+            }
+        )
+        # ...feeding a third XOR codon: t0 = i0 ^ i1; t1 = i0 ^ i1; o0 = t0 ^ t1
+        gc = inherit_members(
+            {
+                "ancestora": dup_gc,
+                "ancestorb": xor_gc,
+                "created": "2025-03-29 22:05:08.489847+00:00",
+                "gca": dup_gc,
+                "gcb": xor_gc,
+                "cgraph": {
+                    "A": [["I", 0, xor_i[0]], ["I", 1, xor_i[1]]],
+                    "B": [["A", 0, xor_i[0]], ["A", 1, xor_i[1]]],
+                    "O": [["B", 0, xor_o]],
+                },
+                "pgc": self.gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+                "problem": ACYBERGENESIS_PROBLEM,
+                "properties": BASIC_ORDINARY_PROPERTIES,
+            }
+        )
+        seed(3)
+        args = (getrandbits(64), getrandbits(64))
+        lines: list[list[str]] = []
+        for fwconfig in (
+            FWConfig(const_eval=False, cse=False, result_cache=False),
+            FWConfig(const_eval=False, cse=True, result_cache=False),
+        ):
+            ec = ExecutionContext(self.gpi, NUM_LINES[-1], fwconfig)
+            node = ec.write_executable(gc)
+            assert isinstance(node, GCNode), "node is not a GCNode"
+            lines.append(ec.function_def(node, fwconfig).split("\n"))
+            self.assertEqual(ec.execute(gc, args), 0)
+        self.assertLess(len(lines[1]), len(lines[0]))
+        temps = [findall(r"^\t(t\d+) = ", line) for line in lines[1]]
+        shared = [t for ts in temps for t in ts]
+        self.assertEqual(len(shared), 1)
+        # The remaining XOR uses the one shared temporary for both of its inputs
+        (o_line,) = [line for line in lines[1] if line.startswith("\to0 = ")]
+        self.assertEqual(findall(r"\bt\d+\b", o_line), shared * 2)
+
+    def test_function_cache(self) -> None:
+        """Test functions defined from the function cache give the same results."""
+        seed(6)
+        with TemporaryDirectory() as temp_dir:
+            fcache = FunctionCache(temp_dir)
+            for gci in set(random_int_tuple_generator(10, len(self.gene_pool) - 1)):
+                gc: GCABC = self.gene_pool[gci + 1]
+                args = tuple(getrandbits(64) for _ in range(gc["num_inputs"]))
+                results = []
+                for _ in range(2):
+                    ec = ExecutionContext(self.gpi, NUM_LINES[4], function_cache=fcache)
+                    # Populate the context with something so that function names differ
+                    ec.write_executable(self.gene_pool[0])
+                    node = ec.write_executable(gc)
+                    seed(gci)
+                    results.append((node, ec.execute(gc, args)))
+                self.assertIsNotNone(results[0][0])
+                self.assertIsNone(results[1][0])
+                self.assertEqual(results[1][1], results[0][1])
+            self.assertGreater(fcache.hits, 0)
+
+    def test_function_cache_batch(self) -> None:
+        """Test batch variants with a function cache give the same results and are not cached."""
+        seed(7)
+        with TemporaryDirectory() as temp_dir:
+            fcache = FunctionCache(temp_dir)
+            for gci in set(random_int_tuple_generator(10, len(self.gene_pool) - 1)):
+                gc: GCABC = self.gene_pool[gci + 1]
+                batch = [tuple(getrandbits(64) for _ in range(gc["num_inputs"])) for _ in range(4)]
+                results = []
+                # The first batch writes the function, the second loads it from the cache
+                for _ in range(2):
+                    ec = ExecutionContext(self.gpi, NUM_LINES[4], function_cache=fcache)
+                    seed(gci)
+                    results.append(ec.execute_batch(gc, batch))
+                    self.assertFalse(ec.function_cache_entry().functions)
+                self.assertEqual(results[1], results[0])
+            self.assertGreater(fcache.hits, 0)
+
     def test_for_loop_simple(self) -> None:
         """Test FOR_LOOP generation and execution."""
         # Create a simple FOR_LOOP GC
@@ -159,7 +348,8 @@ class TestExecutor(unittest.TestCase):
             },
             True,
         )
-        self.ec2.write_executable(ggc)
+        node = self.ec2.write_executable(ggc)
+        assert isinstance(node, GCNode), "node is not a GCNode"
         # write_function_to_file(self.ec2, ggc, "temp.md", oft=OutputFileType.MARKDOWN)
 
         # Execute
@@ -180,8 +370,78 @@ class TestExecutor(unittest.TestCase):
         result = self.ec2.execute(ggc, (iterable, initial_state))
         self.assertEqual(result, expected)
 
+        # The literal shift amount is loop invariant and is hoisted into the first iteration
+        lines = self.ec2.function_def(node).split("\n\t")
+        loop_line = next(n for n, line in enumerate(lines) if line.startswith("for "))
+        self.assertRegex(lines[loop_line + 1], r"^\tif t\d+:$")
+        self.assertRegex(lines[loop_line + 2], r"^\t\tt\d+ = 1$")
+        self.assertFalse(any(line.endswith(" = 1") for line in lines[loop_line + 3 :]))
+        self.assertEqual(self.ec2.execute(ggc, (tuple(), initial_state)), initial_state)
+
         # write_function_to_file(self.ec2, ggc, "temp.md", oft=OutputFileType.MARKDOWN)
 
+    def test_for_loop_hoisted_raises(self) -> None:
+        """Test a hoisted loop invariant codon is only executed if the loop body is.
+
+        The body is state ^ (x >> n) where x >> n is loop invariant. A negative shift
+        count raises a ValueError which must only be raised if the loop iterates.
+        """
+        rshift_gc = self.gpi[CODON_SIGS["RSHIFT_SIG"]]
+        xor_gc = self.gpi[CODON_SIGS["XOR_SIG"]]
+        rshift_i = [ep.typ.name for ep in rshift_gc["cgraph"][SrcIfKey.IS]]
+        xor_i = [ep.typ.name for ep in xor_gc["cgraph"][SrcIfKey.IS]]
+        xor_o = xor_gc["cgraph"][DstIfKey.OD][0].typ.name
+        body_gc = inherit_members(
+            {
+                "ancestora": rshift_gc,
+                "ancestorb": xor_gc,
+                "created": "2025-03-29 22:05:08.489847+00:00",
+                "gca": rshift_gc,
+                "gcb": xor_gc,
+                "cgraph": {
+                    "A": [["I", 1, rshift_i[0]], ["I", 2, rshift_i[1]]],
+                    "B": [["I", 0, xor_i[0]], ["A", 0, xor_i[1]]],
+                    "O": [["B", 0, xor_o]],
+                },
+                "pgc": self.gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+                "problem": ACYBERGENESIS_PROBLEM,
+                "properties": BASIC_ORDINARY_PROPERTIES,
+            }
+        )
+        ggc = inherit_members(
+            {
+                "ancestora": body_gc,
+                "ancestorb": None,
+                "gca": body_gc,
+                "gcb": None,
+                "cgraph": {
+                    "L": [["I", 0, "tuple"]],
+                    "S": [["I", 1, "Integral"]],
+                    "A": [["S", 0, "Integral"], ["I", 2, "Integral"], ["I", 3, "Integral"]],
+                    "T": [["A", 0, "Integral"]],
+                    "O": [["A", 0, "Integral"]],
+                    "P": [["I", 1, "Integral"]],
+                },
+                "pgc": gpi[CODON_SIGS["CUSTOM_PGC_SIG"]],
+                "problem": ACYBERGENESIS_PROBLEM,
+                "properties": {"gc_type": GCType.ORDINARY, "graph_type": CGraphType.FOR_LOOP},
+                "num_codons": body_gc["num_codons"],
+            },
+            True,
+        )
+        ec = ExecutionContext(self.gpi, NUM_LINES[-1])
+        node = ec.write_executable(ggc)
+        assert isinstance(node, GCNode), "node is not a GCNode"
+        self.assertIn(">>", next(ln for ln in ec.function_def(node).split("\n") if "\t\t\t" in ln))
+
+        # Zero iterations: The invariant is not evaluated & the initial state is returned
+        self.assertEqual(ec.execute(ggc, (tuple(), 5, 8, -1)), 5)
+        # The invariant is evaluated once and the result reused every iteration
+        self.assertEqual(ec.execute(ggc, ((1, 2, 3), 5, 8, 1)), 5 ^ 4 ^ 4 ^ 4)
+        # The invariant raises as it would if it were not hoisted
+        with self.assertRaises(ValueError):
+            ec.execute(ggc, ((1,), 5, 8, -1))
+
     def test_if_then_else_execution(self) -> None:
         """Test IF_THEN_ELSE execution."""
         # Create a simple IF_THEN_ELSE GC
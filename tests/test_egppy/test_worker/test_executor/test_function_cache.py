@@ -0,0 +1,119 @@
+"""Unit tests for the persistent GC function cache."""
+
+import unittest
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import patch
+
+from egppy.worker.executor.function_cache import (
+    FunctionCache,
+    FunctionCacheEntry,
+    FunctionRecord,
+    rename_functions,
+    rename_source,
+)
+from egppy.worker.executor.fw_config import FWConfig
+
+# Constants
+SOURCE: str = "def f_a(i):\n\to0 = f_3((i[0],)) ^ i[1]\n\treturn o0"
+SIGNATURE: bytes = bytes(32)
+
+
+def f_3(i: tuple[Any, ...]) -> int:
+    """A sub-GC function."""
+    return i[0] >> 1
+
+
+class TestFunctionCache(unittest.TestCase):
+    """Unit tests for FunctionCache."""
+
+    def setUp(self) -> None:
+        """Create a function cache in a temporary directory."""
+        self.temp_dir = TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.fcache = FunctionCache(self.temp_dir.name)
+        self.entry = FunctionCacheEntry(
+            (FunctionRecord(SIGNATURE, "f_a", 2, SOURCE, compile(SOURCE, "<string>", "exec")),),
+            (("f_3", bytes(31) + b"\x01"),),
+            (bytes(31) + b"\x02",),
+        )
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_key(self) -> None:
+        """Test the key depends on the signature, line limit & configuration."""
+        key = self.fcache.key(SIGNATURE, 64, FWConfig())
+        self.assertEqual(key, self.fcache.key(SIGNATURE, 64, FWConfig()))
+        self.assertNotEqual(key, self.fcache.key(bytes(31) + b"\x01", 64, FWConfig()))
+        self.assertNotEqual(key, self.fcache.key(SIGNATURE, 32, FWConfig()))
+        self.assertNotEqual(key, self.fcache.key(SIGNATURE, 64, FWConfig(cse=True)))
+
+    def test_put_get(self) -> None:
+        """Test an entry round trips & the code object is executable."""
+        key = self.fcache.key(SIGNATURE, 64, FWConfig())
+        self.assertIsNone(self.fcache.get(key))
+        self.fcache.put(key, self.entry)
+        entry = self.fcache.get(key)
+        assert entry is not None, "Entry not found."
+        self.assertEqual(entry.calls, self.entry.calls)
+        self.assertEqual(entry.codons, self.entry.codons)
+        record = entry.functions[0]
+        self.assertIsInstance(record, FunctionRecord)
+        self.assertEqual(record.source, SOURCE)
+        namespace: dict[str, Any] = {"f_3": f_3}
+        exec(record.code, namespace)  # pylint: disable=exec-used
+        self.assertEqual(namespace["f_a"]((6, 1)), 2)
+        self.assertEqual((self.fcache.hits, self.fcache.misses), (1, 1))
+
+    def test_invalid_entries(self) -> None:
+        """Test entries from another Python version & corrupt entries are misses."""
+        key = self.fcache.key(SIGNATURE, 64, FWConfig())
+        self.fcache.put(key, self.entry)
+        assert self.fcache.path is not None, "Function cache disabled."
+        path: Path = next(self.fcache.path.iterdir())
+        data: bytes = path.read_bytes()
+        path.write_bytes(bytes(len(MAGIC_NUMBER)) + data[len(MAGIC_NUMBER) :])
+        self.assertIsNone(self.fcache.get(key))
+        self.assertFalse(path.exists())
+        path.write_bytes(data[: len(data) // 2])
+        self.assertIsNone(self.fcache.get(key))
+        self.assertFalse(path.exists())
+
+    def test_clear(self) -> None:
+        """Test all entries are removed."""
+        key = self.fcache.key(SIGNATURE, 64, FWConfig())
+        self.fcache.put(key, self.entry)
+        self.fcache.clear()
+        self.assertIsNone(self.fcache.get(key))
+
+    def test_disabled(self) -> None:
+        """Test the cache is disabled if Python does not cache bytecode."""
+        with patch("egppy.worker.executor.function_cache.implementation") as mock_implementation:
+            mock_implementation.cache_tag = None
+            fcache = FunctionCache(self.temp_dir.name)
+        self.assertIsNone(fcache.path)
+        key = fcache.key(SIGNATURE, 64, FWConfig())
+        fcache.put(key, self.entry)
+        self.assertIsNone(fcache.get(key))
+        fcache.clear()
+        self.assertEqual((fcache.hits, fcache.misses), (0, 1))
+
+    def test_rename(self) -> None:
+        """Test the function & the functions it calls are renamed."""
+        names: dict[str, str] = {"f_a": "f_1b", "f_3": "f_4"}
+        code = rename_functions(self.entry.functions[0].code, names)
+        namespace: dict[str, Any] = {"f_4": f_3}
+        exec(code, namespace)  # pylint: disable=exec-used
+        self.assertNotIn("f_a", namespace)
+        self.assertEqual(namespace["f_1b"]((6, 1)), 2)
+        self.assertEqual(namespace["f_1b"].__name__, "f_1b")
+        self.assertEqual(
+            rename_source(SOURCE, names), "def f_1b(i):\n\to0 = f_4((i[0],)) ^ i[1]\n\treturn o0"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for the GC function result cache."""
+
+import unittest
+from itertools import product
+from random import choice, seed
+from typing import Any
+
+from egppy.worker.executor.result_cache import (
+    ENTRY_OVERHEAD,
+    INITIAL_CACHE_SIZE,
+    MIN_CACHE_SIZE,
+    RESIZE_WINDOW,
+    CacheBudget,
+    ResultCache,
+)
+
+
+def xor_sum(i: tuple[Any, ...]) -> int:
+    """A deterministic GC like function."""
+    result = 0
+    for x in i:
+        result ^= sum(x) if isinstance(x, list) else x
+    return result
+
+
+class TestResultCache(unittest.TestCase):
+    """Unit tests for ResultCache."""
+
+    def setUp(self) -> None:
+        """Create a result cache wrapping a counting function."""
+        self.calls: int = 0
+        self.budget = CacheBudget()
+        self.rcache = ResultCache("test", self.budget)
+
+        def counted(i: tuple[Any, ...]) -> int:
+            self.calls += 1
+            return xor_sum(i)
+
+        self.func = self.rcache.wrap(counted)
+
+    def test_hit_and_miss(self) -> None:
+        """Test repeated inputs are returned from the cache."""
+        self.assertEqual(self.func((1, 2)), 3)
+        self.assertEqual(self.func((1, 2)), 3)
+        self.assertEqual(self.func((2, 2)), 0)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.rcache.hits, 1)
+        self.assertEqual(self.rcache.misses, 2)
+        self.assertEqual(len(self.rcache), 2)
+
+    def test_typed_inputs(self) -> None:
+        """Test equal inputs of different types are cached separately."""
+        func = self.rcache.wrap(lambda i: i[0] * 2)
+        for _ in range(2):
+            results = [func((1,)), func((1.0,)), func((True,))]
+            self.assertEqual([type(r) for r in results], [int, float, int])
+        self.assertEqual(self.rcache.misses, 3)
+        self.assertEqual(self.rcache.hits, 3)
+        self.assertEqual(len(self.rcache), 3)
+
+    def test_none_result(self) -> None:
+        """Test None is a cacheable result."""
+        func = self.rcache.wrap(lambda i: None)
+        self.assertIsNone(func((1,)))
+        self.assertIsNone(func((1,)))
+        self.assertEqual(self.rcache.hits, 1)
+
+    def test_unhashable(self) -> None:
+        """Test unhashable inputs & results are not cached."""
+        self.assertEqual(self.func(([1, 2],)), 3)
+        self.assertEqual(self.func(([1, 2],)), 3)
+        self.assertEqual(self.calls, 2)
+        func = self.rcache.wrap(list)
+        self.assertEqual(func((1, 2)), [1, 2])
+        self.assertIsNot(func((1, 2)), func((1, 2)))
+        self.assertEqual(self.rcache.uncacheable, 5)
+        self.assertEqual(self.rcache.hits, 0)
+        self.assertEqual(len(self.rcache), 0)
+
+    def test_lru_eviction(self) -> None:
+        """Test the least recently used entry is evicted when the cache is full."""
+        rcache = ResultCache("lru", self.budget, size=2)
+        func = rcache.wrap(xor_sum)
+        func((1,))
+        func((2,))
+        func((1,))
+        func((3,))
+        self.assertEqual(rcache.evictions, 1)
+        func((1,))
+        self.assertEqual(rcache.hits, 2)
+        func((2,))
+        self.assertEqual(rcache.misses, 4)
+
+    def test_small_discrete_inputs(self) -> None:
+        """Test a small discrete input space (tic-tac-toe like) almost always hits."""
+        seed(0)
+        states = list(product(range(3), repeat=4))
+        for _ in range(100 * len(states)):
+            self.func(choice(states))
+        self.assertEqual(self.calls, len(states))
+        self.assertGreater(self.rcache.hits / (self.rcache.hits + self.rcache.misses), 0.98)
+        self.assertGreaterEqual(self.rcache.maxsize, INITIAL_CACHE_SIZE)
+
+    def test_grow_and_shrink(self) -> None:
+        """Test the cache grows with a high hit rate and shrinks with a low hit rate."""
+        for n in range(INITIAL_CACHE_SIZE):
+            self.func((n,))
+        for _ in range(RESIZE_WINDOW):
+            self.func((0,))
+        self.func((INITIAL_CACHE_SIZE,))
+        self.assertEqual(self.rcache.maxsize, INITIAL_CACHE_SIZE * 2)
+        for n in range(INITIAL_CACHE_SIZE * 2, INITIAL_CACHE_SIZE * 8):
+            self.func((n,))
+        self.assertLess(self.rcache.maxsize, INITIAL_CACHE_SIZE * 2)
+        self.assertGreaterEqual(self.rcache.maxsize, MIN_CACHE_SIZE)
+
+    def test_budget(self) -> None:
+        """Test the cache does not exceed the memory budget."""
+        budget = CacheBudget(4 * ENTRY_OVERHEAD)
+        rcache = ResultCache("budget", budget)
+        func = rcache.wrap(xor_sum)
+        for n in range(10):
+            func((n,))
+        self.assertLessEqual(budget.used, budget.size)
+        self.assertGreater(rcache.evictions, 0)
+        rcache.clear()
+        self.assertEqual(budget.used, 0)
+
+    def test_info(self) -> None:
+        """Test the statistics string."""
+        self.func((1,))
+        self.func((1,))
+        info = self.rcache.info()
+        self.assertIn("test Cache hits: 1", info)
+        self.assertIn("test Cache misses: 1", info)
+        self.assertIn("test Cache evictions: 0", info)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Unit tests for sharing a pre-warmed execution context with forked sub-processes."""
+
+import unittest
+from multiprocessing import get_context
+from random import getrandbits, seed
+from typing import Any
+
+from egppy.genetic_code.ggc_dict import GCABC
+from egppy.worker.executor.execution_context import ExecutionContext
+from egppy.worker.executor.shared_context import fork_workers, prewarm
+
+from ..xor_stack_gc import create_gc_matrix, expand_gc_matrix, gpi
+
+# Constants
+NUM_GCS: int = 8
+NUM_WORKERS: int = 2
+
+
+class TestSharedContext(unittest.TestCase):
+    """Unit tests for prewarm() & fork_workers()."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the XOR stack GC's."""
+        seed(0)
+        gcm: dict[int, dict[int, list[GCABC]]] = expand_gc_matrix(create_gc_matrix(4), 4)
+        cls.gcs: list[GCABC] = [gc for ni in gcm.values() for rs in ni.values() for gc in rs][
+            :NUM_GCS
+        ]
+
+    def test_prewarm(self) -> None:
+        """Test the GC functions are defined."""
+        ec = ExecutionContext(gpi)
+        self.assertGreaterEqual(prewarm(ec, (gc["signature"] for gc in self.gcs)), NUM_GCS)
+        for gc in self.gcs:
+            self.assertIn(gc["signature"], ec.function_map)
+
+    def test_fork_workers(self) -> None:
+        """Test forked workers execute the inherited functions without defining new ones."""
+        ec = ExecutionContext(gpi)
+        num_functions: int = prewarm(ec, (gc["signature"] for gc in self.gcs))
+        queue = get_context("fork").Queue()
+        args: list[tuple[Any, ...]] = [
+            tuple(getrandbits(64) for _ in range(gc["num_inputs"])) for gc in self.gcs
+        ]
+
+        def target() -> None:
+            seed(7)
+            results = [ec.execute(gc, arg) for gc, arg in zip(self.gcs, args)]
+            queue.put((len(ec.function_map), results))
+
+        workers = fork_workers(NUM_WORKERS, target)
+        outputs = [queue.get(timeout=60) for _ in workers]
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+        seed(7)
+        expected = [ec.execute(gc, arg) for gc, arg in zip(self.gcs, args)]
+        for nfuncs, results in outputs:
+            self.assertEqual(nfuncs, num_functions)
+            self.assertEqual(results, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
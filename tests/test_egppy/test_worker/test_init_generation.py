@@ -6,7 +6,12 @@ from unittest.mock import MagicMock, patch
 from egpdb.configuration import DatabaseConfig
 from egpdbmgr.configuration import DBManagerConfig, TableTypes
 from egppy.worker.configuration import WorkerConfig
-from egppy.worker.init_generation import _gene_pool_db_manager_config, init_generation
+from egppy.worker.executor.shared_context import PREWARM_LIMIT
+from egppy.worker.init_generation import (
+    _gene_pool_db_manager_config,
+    init_generation,
+    work_loop,
+)
 
 
 class TestInitGenerationConfigMapping(unittest.TestCase):
@@ -72,3 +77,31 @@ class TestInitGenerationWiring(unittest.TestCase):
         self.assertEqual(call_arg.managed_type, TableTypes.POOL)
         mock_evolution_queue.assert_called_once_with()
         mock_fitness_queue.assert_called_once_with()
+
+    @patch("egppy.worker.init_generation.fork_workers")
+    @patch("egppy.worker.init_generation.prewarm")
+    @patch("egppy.worker.init_generation.mutation_execution_context")
+    @patch("egppy.worker.init_generation.GenePoolInterface")
+    def test_init_generation_forks_sub_processes(
+        self,
+        _: MagicMock,
+        mock_mec: MagicMock,
+        mock_prewarm: MagicMock,
+        mock_fork_workers: MagicMock,
+    ) -> None:
+        """Pre-warm the mutation execution context & fork sub-processes that share it."""
+        worker_config = WorkerConfig(
+            databases={"pool_db": DatabaseConfig(dbname="pool", host="postgres")},
+            gene_pool="pool_db",
+            microbiome="pool_db",
+        )
+        worker = MagicMock()
+        mock_fork_workers.return_value = [worker, worker]
+
+        init_generation(worker_config, 2)
+
+        mec = mock_mec.return_value
+        mec.gpi.most_referenced.assert_called_once_with(PREWARM_LIMIT)
+        mock_prewarm.assert_called_once_with(mec, mec.gpi.most_referenced.return_value)
+        mock_fork_workers.assert_called_once_with(2, work_loop)
+        self.assertEqual(worker.join.call_count, 2)
@@ -114,7 +114,7 @@ def cast_interfaces_to_int(gc: GGCDict) -> GGCDict:
     meta codons.
     """
 
-    to_int: dict[str, GGCDict] = {"EGPNumber": gpi[CODON_SIGS["TO_INT_SIG"]]}
+    to_int: dict[str, GCABC] = {"EGPNumber": gpi[CODON_SIGS["TO_INT_SIG"]]}
 
     # Downcast the outputs
     while oepl := [oep for oep in gc["cgraph"][DstIfKey.OD] if oep.typ != INT_TD]:
@@ -131,7 +131,7 @@ def cast_interfaces_to_int(gc: GGCDict) -> GGCDict:
     return gc
 
 
-def cast_to_int_at_output_idx(mc: GGCDict, gc: GGCDict, idx: int) -> GGCDict:
+def cast_to_int_at_output_idx(mc: GCABC, gc: GGCDict, idx: int) -> GGCDict:
     """Cast the output at the given index to 'int'.
     This is done by stacking a meta codon that does the right conversion
     as GCB and wiring through the inputs and outputs directly